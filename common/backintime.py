@@ -21,23 +21,29 @@ import argparse
 import atexit
 import subprocess
 from datetime import datetime
-from time import sleep
+from time import sleep, perf_counter
 import json
 import pathlib
 import tools
 # Workaround for situations where startApp() is not invoked.
 # E.g. when using --diagnostics and other argparse.Action
-tools.initiate_translation(None)
+# Translation is loaded on first use of _() only.
+tools.initiate_lazy_translation()
 
-import config
 import logger
-import snapshots
-import sshtools
-import mount
-import password
-import encfstools
-import cli
-from diagnostics import collect_diagnostics, collect_minimal_diagnostics
+# Commands only load the modules they really use
+config = tools.lazyImport('config')
+snapshots = tools.lazyImport('snapshots')
+sshtools = tools.lazyImport('sshtools')
+mount = tools.lazyImport('mount')
+password = tools.lazyImport('password')
+encfstools = tools.lazyImport('encfstools')
+changetracker = tools.lazyImport('changetracker')
+pathindex = tools.lazyImport('pathindex')
+snapshotdiff = tools.lazyImport('snapshotdiff')
+scheduler = tools.lazyImport('scheduler')
+cli = tools.lazyImport('cli')
+diagnostics = tools.lazyImport('diagnostics')
 from exceptions import MountException
 from applicationinstance import ApplicationInstance
 from version import __version__
@@ -56,6 +62,9 @@ def takeSnapshotAsync(cfg, checksum = False):
     Args:
         cfg (config.Config): config that should be used
     """
+    if startByScheduler(cfg, force = True, checksum = checksum):
+        return
+
     cmd = []
     if cfg.ioniceOnUser():
         cmd.extend(('ionice', '-c2', '-n7'))
@@ -82,6 +91,35 @@ def takeSnapshotAsync(cfg, checksum = False):
             pass
     subprocess.Popen(cmd, env = env)
 
+def startByScheduler(cfg, force = True, checksum = False):
+    """
+    Let a running scheduler daemon take a new snapshot of the current profile.
+
+    Args:
+        cfg (config.Config): config that should be used
+        force (bool):        take the snapshot even if it wouldn't need to
+        checksum (bool):     force 'rsync --checksum'
+
+    Returns:
+        bool:                ``True`` if the daemon started the snapshot
+    """
+    if not cfg.schedulerDaemon():
+        return False
+
+    answer = scheduler.request(cfg,
+                               'backup',
+                               profile_id = cfg.currentProfile(),
+                               force = force,
+                               checksum = checksum)
+    if not answer or answer.get('result') != 'ok':
+        return False
+
+    if answer.get('pid') is None:
+        logger.debug('Scheduler daemon already took the scheduled snapshot')
+    else:
+        logger.debug('Snapshot started by scheduler daemon (PID %s)' % answer['pid'])
+    return True
+
 def takeSnapshot(cfg, force = True):
     """
     Take a new snapshot.
@@ -195,8 +233,7 @@ def createParsers(app_name = 'backintime'):
     #define main argument parser
     parser = argparse.ArgumentParser(prog = app_name,
                                      parents = [commonArgsParser],
-                                     description = '%(app)s - a simple backup tool for Linux.'
-                                                   % {'app': config.Config.APP_NAME},
+                                     description = 'Back In Time - a simple backup tool for Linux.',
                                      epilog = "For backwards compatibility commands can also be used with trailing '--'. "
                                               "All listed arguments will work with all commands. Some commands have extra arguments. "
                                               "Run '%(app_name)s <COMMAND> -h' to see the extra arguments."
@@ -267,6 +304,51 @@ def createParsers(app_name = 'backintime'):
                                                  nargs = '?',
                                                  help = 'File size used for benchmark.')
 
+    command = 'benchmark-transport'
+    description = 'Benchmark scp, rsync and sshfs for all ciphers and ' \
+                  'compression settings. Results are printed as JSON.'
+    benchmarkTransportCP = subparsers.add_parser(command,
+                                                 epilog = epilogCommon,
+                                                 help = description,
+                                                 description = description)
+    benchmarkTransportCP.set_defaults(func = benchmarkTransport)
+    parsers[command] = benchmarkTransportCP
+    benchmarkTransportCP.add_argument           ('FILE_SIZE',
+                                                 type = int,
+                                                 action = 'store',
+                                                 default = 40,
+                                                 nargs = '?',
+                                                 help = 'File size in MiB used for scp benchmark.')
+    benchmarkTransportCP.add_argument           ('--files',
+                                                 type = int,
+                                                 action = 'store',
+                                                 default = 1000,
+                                                 help = 'Number of small files used for rsync and sshfs benchmark.')
+    benchmarkTransportCP.add_argument           ('--cipher',
+                                                 action = 'append',
+                                                 dest = 'ciphers',
+                                                 metavar = 'CIPHER',
+                                                 help = 'Only benchmark CIPHER. Can be used multiple times. '
+                                                        'Default is to use all ciphers.')
+    benchmarkTransportCP.add_argument           ('--no-compression',
+                                                 action = 'store_true',
+                                                 help = 'Only benchmark without SSH compression.')
+
+    command = 'change-tracker'
+    description = 'Control the change tracker which watches include folders ' \
+                  'for changes between snapshots.'
+    changeTrackerCP =      subparsers.add_parser(command,
+                                                 epilog = epilogCommon,
+                                                 help = description,
+                                                 description = description)
+    changeTrackerCP.set_defaults(func = changeTracker)
+    parsers[command] = changeTrackerCP
+    changeTrackerCP.add_argument                ('ACTION',
+                                                 action = 'store',
+                                                 choices = ['start', 'stop', 'restart', 'status'],
+                                                 nargs = '?',
+                                                 help = 'Command to send to change tracker daemon.')
+
     command = 'check-config'
     description = 'Check the profiles configuration and install crontab entries.'
     checkConfigCP =        subparsers.add_parser(command,
@@ -296,6 +378,36 @@ def createParsers(app_name = 'backintime'):
                                                  help = 'Decode PATH. If no PATH is specified on command line ' +\
                                                  'a list of filenames will be read from stdin.')
 
+    command = 'diff'
+    description = 'Show files and folders which were added, removed or modified between two snapshots.'
+    diffCP =               subparsers.add_parser(command,
+                                                 parents = [snapshotPathParser],
+                                                 epilog = epilogCommon,
+                                                 help = description,
+                                                 description = description)
+    diffCP.set_defaults(func = diff)
+    parsers[command] = diffCP
+    diffCP.add_argument                         ('SNAPSHOT_ID1',
+                                                 type = str,
+                                                 action = 'store',
+                                                 help = 'ID or index of the snapshot to compare from.')
+    diffCP.add_argument                         ('SNAPSHOT_ID2',
+                                                 type = str,
+                                                 action = 'store',
+                                                 help = 'ID or index of the snapshot to compare to.')
+    diffCP.add_argument                         ('PATH',
+                                                 type = str,
+                                                 action = 'store',
+                                                 nargs = '?',
+                                                 default = '/',
+                                                 help = 'Only compare this file or folder. Default: /')
+    diffCP.add_argument                         ('--use-logs',
+                                                 action = 'store_true',
+                                                 help = 'Use the path index of both snapshots and only check files listed ' +\
+                                                 'as changed in the snapshot logs for modifications. Much faster. ' +\
+                                                 'Falls back to comparing all files if an index or a log is ' +\
+                                                 'incomplete or snapshots in between were removed.')
+
     command = 'last-snapshot'
     nargs = 0
     aliases.append((command, nargs))
@@ -410,6 +522,39 @@ def createParsers(app_name = 'backintime'):
                                                  help = 'Only restore files which do not exist or are newer than ' +\
                                                         'those in destination. Using "rsync --update" option.')
 
+    command = 'scheduler'
+    description = 'Control the resident scheduler daemon which takes ' \
+                  'scheduled snapshots of all profiles.'
+    schedulerCP =          subparsers.add_parser(command,
+                                                 epilog = epilogCommon,
+                                                 help = description,
+                                                 description = description)
+    schedulerCP.set_defaults(func = schedulerDaemon)
+    parsers[command] = schedulerCP
+    schedulerCP.add_argument                    ('ACTION',
+                                                 action = 'store',
+                                                 choices = ['start', 'stop', 'restart', 'reload', 'status'],
+                                                 nargs = '?',
+                                                 help = 'Command to send to scheduler daemon.')
+
+    command = 'search'
+    description = 'Search files and folders matching PATTERN in all snapshots.'
+    searchCP =             subparsers.add_parser(command,
+                                                 parents = [snapshotPathParser],
+                                                 epilog = epilogCommon,
+                                                 help = description,
+                                                 description = description)
+    searchCP.set_defaults(func = search)
+    parsers[command] = searchCP
+    searchCP.add_argument                       ('PATTERN',
+                                                 type = str,
+                                                 action = 'store',
+                                                 help = 'Shell pattern like "*.txt". Without wildcards all names ' +\
+                                                 'containing PATTERN are found. A PATTERN with "/" is compared with the full path.')
+    searchCP.add_argument                       ('--case-sensitive',
+                                                 action = 'store_true',
+                                                 help = 'Compare case sensitive.')
+
     command = 'shutdown'
     nargs = 0
     description = 'Shut down the computer after the snapshot is done.'
@@ -427,6 +572,9 @@ def createParsers(app_name = 'backintime'):
                                                  epilog = epilogCommon,
                                                  help = description,
                                                  description = description)
+    smartRemoveCP.add_argument                  ('--dry-run',
+                                                 action = 'store_true',
+                                                 help = 'Only show which snapshots would be kept or removed.')
     smartRemoveCP.set_defaults(func = smartRemove)
     parsers[command] = smartRemoveCP
 
@@ -509,8 +657,9 @@ def startApp(app_name='backintime'):
     args = argParse(None)
 
     # Name, Version, As Root, OS
-    for key, val in collect_minimal_diagnostics().items():
-        logger.debug(f'{key}: {val}')
+    if logger.DEBUG:
+        for key, val in diagnostics.collect_minimal_diagnostics().items():
+            logger.debug(f'{key}: {val}')
 
     # Add source path to $PATH environ if running from source
     if tools.runningFromSource():
@@ -758,9 +907,9 @@ class printDiagnostics(argparse.Action):
 
     def __call__(self, *args, **kwargs):
 
-        diagnostics = collect_diagnostics()
+        result = diagnostics.collect_diagnostics()
 
-        print(json.dumps(diagnostics, indent=4))
+        print(json.dumps(result, indent=4))
 
         sys.exit(RETURN_OK)
 
@@ -796,6 +945,10 @@ def backupJob(args):
     Raises:
         SystemExit:     0
     """
+    cfg = getConfig(args)
+    if startByScheduler(cfg, force = False, checksum = cfg.forceUseChecksum):
+        sys.exit(RETURN_OK)
+
     cli.BackupJobDaemon(backup, args).start()
 
 def shutdown(args):
@@ -1018,6 +1171,40 @@ def benchmarkCipher(args):
         logger.error("SSH is not configured for profile '%s'!" % cfg.profileName())
         sys.exit(RETURN_ERR)
 
+def benchmarkTransport(args):
+    """
+    Command for benchmarking scp, rsync and sshfs transfers to remote host
+    with all (or the chosen) ciphers and compression settings. Results are
+    printed as JSON.
+
+    Args:
+        args (argparse.Namespace):
+                        previously parsed arguments
+
+    Raises:
+        SystemExit:     0 if benchmark was done, 1 if SSH is not configured
+                        or the remote host couldn't be used
+    """
+    force_stdout = setQuiet(args)
+    printHeader()
+    cfg = getConfig(args)
+    if cfg.snapshotsMode() in ('ssh', 'ssh_encfs'):
+        compression = (False,) if args.no_compression else (False, True)
+        ssh = sshtools.SSH(cfg)
+        try:
+            result = ssh.benchmarkTransport(size = args.FILE_SIZE,
+                                            files = args.files,
+                                            ciphers = args.ciphers,
+                                            compression = compression)
+        except MountException as e:
+            logger.error(str(e))
+            sys.exit(RETURN_ERR)
+        print(json.dumps(result, indent = 4), file = force_stdout)
+        sys.exit(RETURN_OK)
+    else:
+        logger.error("SSH is not configured for profile '%s'!" % cfg.profileName())
+        sys.exit(RETURN_ERR)
+
 def pwCache(args):
     """
     Command for starting password cache daemon.
@@ -1048,6 +1235,106 @@ def pwCache(args):
         daemon.run()
     sys.exit(ret)
 
+def changeTracker(args):
+    """
+    Command for starting the change tracker daemon of the current profile.
+
+    Args:
+        args (argparse.Namespace):
+                        previously parsed arguments
+
+    Raises:
+        SystemExit:     0 if daemon is running, 1 if not
+    """
+    force_stdout = setQuiet(args)
+    printHeader()
+    cfg = getConfig(args)
+    ret = RETURN_OK
+    daemon = changetracker.ChangeTrackerDaemon(cfg)
+    if args.ACTION and args.ACTION != 'status':
+        getattr(daemon, args.ACTION)()
+    elif args.ACTION == 'status':
+        print('%(app)s Change Tracker: ' % {'app': cfg.APP_NAME}, end=' ', file = force_stdout)
+        if daemon.status():
+            print(cli.bcolors.OKGREEN + 'running' + cli.bcolors.ENDC, file = force_stdout)
+            ret = RETURN_OK
+        else:
+            print(cli.bcolors.FAIL + 'not running' + cli.bcolors.ENDC, file = force_stdout)
+            ret = RETURN_ERR
+    else:
+        daemon.run()
+    sys.exit(ret)
+
+def schedulerDaemon(args):
+    """
+    Command for starting the resident scheduler daemon.
+
+    Args:
+        args (argparse.Namespace):
+                        previously parsed arguments
+
+    Raises:
+        SystemExit:     0 if daemon is running, 1 if not
+    """
+    force_stdout = setQuiet(args)
+    printHeader()
+    cfg = getConfig(args)
+    ret = RETURN_OK
+    daemon = scheduler.SchedulerDaemon(cfg)
+    if args.ACTION and args.ACTION != 'status':
+        getattr(daemon, args.ACTION)()
+    elif args.ACTION == 'status':
+        print('%(app)s Scheduler: ' % {'app': cfg.APP_NAME}, end=' ', file = force_stdout)
+        answer = scheduler.request(cfg, 'status')
+        if daemon.status() and answer:
+            running = ', '.join(sorted(answer['running'])) or '-'
+            print(cli.bcolors.OKGREEN + 'running' + cli.bcolors.ENDC, file = force_stdout)
+            print('Running snapshots (profile IDs): %s' % running, file = force_stdout)
+            ret = RETURN_OK
+        else:
+            print(cli.bcolors.FAIL + 'not running' + cli.bcolors.ENDC, file = force_stdout)
+            ret = RETURN_ERR
+    else:
+        daemon.run()
+    sys.exit(ret)
+
+def search(args):
+    """
+    Command for searching files in all snapshots of current profile. Matches
+    are printed while searching, newest snapshot first.
+
+    Args:
+        args (argparse.Namespace):
+                        previously parsed arguments
+
+    Raises:
+        SystemExit:     0 if something was found, 1 if not
+    """
+    force_stdout = setQuiet(args)
+    cfg = getConfig(args)
+    _mount(cfg)
+
+    sids = snapshots.listSnapshots(cfg)
+    if not sids:
+        logger.error("There are no snapshots in '%s'" % cfg.profileName())
+
+    found = False
+    lastSid = None
+    for sid, path in pathindex.search(sids, args.PATTERN, args.case_sensitive):
+        path = os.fsdecode(path)
+        if args.quiet:
+            print('{} {}'.format(sid, path), file=force_stdout)
+        else:
+            if sid != lastSid:
+                print('SnapshotID: {}'.format(sid), file=force_stdout)
+                lastSid = sid
+            print('    {}'.format(path), file=force_stdout)
+        found = True
+
+    if not args.keep_mount:
+        _umount(cfg)
+    sys.exit(RETURN_OK if found else RETURN_ERR)
+
 def decode(args):
     """
     Command for decoding paths given paths with 'encfsctl'.
@@ -1082,6 +1369,48 @@ def decode(args):
     _umount(cfg)
     sys.exit(RETURN_OK)
 
+def diff(args):
+    """
+    Command for showing differences between two snapshots. Differences are
+    printed while comparing as lines of ``+ path`` (added), ``- path``
+    (removed) or ``M path`` (modified). Folders end with ``/``.
+
+    Args:
+        args (argparse.Namespace):
+                        previously parsed arguments
+
+    Raises:
+        SystemExit:     0
+    """
+    force_stdout = setQuiet(args)
+    cfg = getConfig(args)
+    _mount(cfg)
+
+    sids = snapshots.listSnapshots(cfg)
+    if not sids:
+        logger.error("There are no snapshots in '%s'" % cfg.profileName())
+        if not args.keep_mount:
+            _umount(cfg)
+        sys.exit(RETURN_ERR)
+    sid1 = cli.selectSnapshot(sids, cfg, args.SNAPSHOT_ID1, 'SnapshotID 1')
+    sid2 = cli.selectSnapshot(sids, cfg, args.SNAPSHOT_ID2, 'SnapshotID 2')
+
+    decode = None
+    if args.use_logs and cfg.snapshotsMode() == 'ssh_encfs':
+        decode = encfstools.Decode(cfg)
+    try:
+        for change in snapshotdiff.diff(sid1, sid2, args.PATH,
+                                        useLogs = args.use_logs,
+                                        decode = decode):
+            print(change, file = force_stdout)
+    finally:
+        if decode:
+            decode.close()
+
+    if not args.keep_mount:
+        _umount(cfg)
+    sys.exit(RETURN_OK)
+
 def remove(args, force = False):
     """
     Command for removing snapshots.
@@ -1134,7 +1463,27 @@ def smartRemove(args):
     sn = snapshots.Snapshots(cfg)
 
     enabled, keep_all, keep_one_per_day, keep_one_per_week, keep_one_per_month = cfg.smartRemove()
-    if enabled:
+    if enabled and args.dry_run:
+        _mount(cfg)
+        sids = snapshots.listSnapshots(cfg)
+        start = perf_counter()
+        keep = sn.smartRemovePlan(sids,
+                                  datetime.today(),
+                                  keep_all,
+                                  keep_one_per_day,
+                                  keep_one_per_week,
+                                  keep_one_per_month)
+        duration = perf_counter() - start
+        for sid in sids:
+            if sid in keep:
+                print('keep   {} ({})'.format(sid.displayID, ', '.join(keep[sid])))
+            else:
+                print('remove {}'.format(sid.displayID))
+        print('Smart Remove would remove {} of {} snapshots (plan computed in {:.1f} ms).'
+              .format(len(sids) - len(keep), len(sids), duration * 1000))
+        _umount(cfg)
+        sys.exit(RETURN_OK)
+    elif enabled:
         _mount(cfg)
         del_snapshots = sn.smartRemoveList(datetime.today(),
                                            keep_all,
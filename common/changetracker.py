@@ -0,0 +1,569 @@
+#    Back In Time
+#    Copyright (C) 2008-2022 Oprea Dan, Bart de Koning, Richard Bailey,
+#    Germar Reitze
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""Track changed folders in include folders between two snapshots.
+
+:py:class:`ChangeTrackerDaemon` watches all include folders of a profile with
+inotify and appends every changed folder to a journal file. Only the direct
+entries of a changed folder need to be synced again. Folders which were
+created or moved into a watched folder are written with a leading
+:py:data:`JOURNAL_TREE` and need to be synced recursively.
+:py:class:`ChangeTracker` is used by :py:func:`snapshots.Snapshots.takeSnapshot`
+to read the folders changed since the last snapshot. This allows to skip
+rsync completely if nothing has changed or to limit rsync to changed folders.
+
+The journal can only be trusted if the same daemon instance was running
+since the last snapshot was taken. Otherwise :py:func:`ChangeTracker.dirtyFolders`
+returns ``None`` and a full snapshot is taken. Folders which are already
+committed are removed from the journal, so it doesn't grow forever.
+
+Changes in Back In Time's own data folder, mount root, snapshot folder and
+in excluded files are ignored. Otherwise writing the journal would be
+reported as a change again.
+"""
+import os
+import sys
+import time
+import ctypes
+import ctypes.util
+import errno
+import fcntl
+import fnmatch
+import hashlib
+import select
+import struct
+import uuid
+
+import configfile
+import logger
+import tools
+
+# inotify event masks (see 'man inotify')
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_DONT_FOLLOW = 0x02000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0x00000800
+IN_CLOEXEC = 0x00080000
+
+WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM \
+    | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+
+JOURNAL_HEADER = '# backintime change journal'
+JOURNAL_OVERFLOW = '!overflow'
+JOURNAL_TREE = '+'
+
+
+class Inotify:
+    """
+    Minimal ``ctypes`` wrapper around Linux inotify.
+
+    Raises:
+        OSError:    if inotify is not available
+    """
+    EVENT_HEADER = struct.Struct('iIII')
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6',
+                           use_errno=True)
+        self._addWatch = libc.inotify_add_watch
+        self._addWatch.argtypes = (ctypes.c_int, ctypes.c_char_p,
+                                   ctypes.c_uint32)
+        self._rmWatch = libc.inotify_rm_watch
+        self._rmWatch.argtypes = (ctypes.c_int, ctypes.c_int)
+        self.fd = libc.inotify_init1(IN_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+
+    def addWatch(self, path, mask=WATCH_MASK):
+        """
+        Watch folder ``path``.
+
+        Args:
+            path (str):     folder which should be watched
+            mask (int):     inotify events
+
+        Returns:
+            int:            watch descriptor
+
+        Raises:
+            OSError:        if the watch could not be added (e.g.
+                            ``fs.inotify.max_user_watches`` is exceeded)
+        """
+        wd = self._addWatch(self.fd, os.fsencode(path),
+                            mask | IN_ONLYDIR | IN_DONT_FOLLOW)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), path)
+        return wd
+
+    def rmWatch(self, wd):
+        """
+        Stop watching watch descriptor ``wd``. Errors are ignored because the
+        watch might already be gone together with its folder.
+
+        Args:
+            wd (int):       watch descriptor
+        """
+        self._rmWatch(self.fd, wd)
+
+    def read(self, timeout=None):
+        """
+        Wait for events.
+
+        Args:
+            timeout (float):    seconds to wait or ``None`` to wait forever
+
+        Returns:
+            list:               list of tuples ``(wd, mask, name)``
+        """
+        ready = select.select([self.fd], [], [], timeout)[0]
+        if not ready:
+            return []
+
+        buf = os.read(self.fd, 64 * 1024)
+        events = []
+        offset = 0
+        while offset < len(buf):
+            wd, mask, cookie, length = self.EVENT_HEADER.unpack_from(buf,
+                                                                     offset)
+            offset += self.EVENT_HEADER.size
+            name = buf[offset:offset + length].rstrip(b'\0')
+            offset += length
+            events.append((wd, mask, os.fsdecode(name)))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+def configHash(cfg, profile_id=None):
+    """
+    Hash of all settings which have influence on the content of a snapshot.
+    If they change the journal can't be used anymore.
+
+    Args:
+        cfg (config.Config):    current config
+        profile_id (str):       profile ID
+
+    Returns:
+        str:                    hex digest
+    """
+    h = hashlib.sha1()
+    for item in (cfg.include(profile_id),
+                 cfg.exclude(profile_id),
+                 cfg.snapshotsMode(profile_id),
+                 cfg.snapshotsFullPath(profile_id)):
+        h.update(repr(item).encode('utf-8', 'surrogateescape'))
+    return h.hexdigest()
+
+
+def minimizeFolders(folders):
+    """
+    Remove folders which are inside of other folders in ``folders``.
+
+    Args:
+        folders (iterable): absolute paths
+
+    Returns:
+        list:               sorted list of top-most folders
+    """
+    ret = []
+    for folder in sorted(set(folders)):
+        if ret and (folder == ret[-1]
+                    or folder.startswith(ret[-1].rstrip(os.sep) + os.sep)):
+            continue
+        ret.append(folder)
+    return ret
+
+
+def dirtyItems(folders, trees):
+    """
+    Combine changed ``folders`` and changed ``trees``. Folders inside of
+    one of the trees are dropped because the whole tree is synced anyway.
+
+    Args:
+        folders (iterable): folders whose direct entries changed
+        trees (iterable):   new folders which changed recursively
+
+    Returns:
+        list:               sorted list of tuples ``(folder, recursive)``
+    """
+    trees = minimizeFolders(trees)
+    treeSet = set(trees)
+    ret = [(tree, True) for tree in trees]
+    for folder in set(folders):
+        parent = folder
+        while parent not in treeSet and len(parent) > 1:
+            parent = os.path.dirname(parent)
+        if parent not in treeSet:
+            ret.append((folder, False))
+    return sorted(ret)
+
+
+class ChangeTracker:
+    """
+    Read the journal written by :py:class:`ChangeTrackerDaemon`.
+
+    Args:
+        cfg (config.Config):    current config
+        profile_id (str):       profile ID
+    """
+    def __init__(self, cfg, profile_id=None):
+        self.config = cfg
+        self.profile_id = profile_id
+        self.journalFile = cfg.changeTrackerJournal(profile_id)
+        self.stateFile = cfg.changeTrackerState(profile_id)
+        self.watcherId = None
+        self.offset = 0
+
+    def readJournal(self):
+        """
+        Read all folders from journal which were written after ``offset``
+        stored in state file.
+
+        Returns:
+            tuple:  ``(watcher_id, config_hash, items, overflow, offset)``
+                    or ``None`` if there is no journal. ``items`` like
+                    :py:func:`dirtyItems`
+        """
+        state = configfile.ConfigFile()
+        state.load(self.stateFile)
+
+        try:
+            with open(self.journalFile, 'rb') as f:
+                fcntl.flock(f, fcntl.LOCK_SH)
+                header = os.fsdecode(f.readline().rstrip(b'\n')).split(' ')
+                if ' '.join(header[:4]) != JOURNAL_HEADER or len(header) != 6:
+                    return None
+
+                watcherId, hash_ = header[4:]
+                offset = f.tell()
+                if state.strValue('watcher_id') == watcherId:
+                    offset = max(state.intValue('offset'), offset)
+                    f.seek(offset)
+
+                folders = set()
+                trees = set()
+                overflow = False
+                for line in f:
+                    offset += len(line)
+                    line = os.fsdecode(line.rstrip(b'\n'))
+                    if line == JOURNAL_OVERFLOW:
+                        overflow = True
+                    elif line.startswith(JOURNAL_TREE):
+                        trees.add(line[len(JOURNAL_TREE):])
+                    elif line:
+                        folders.add(line)
+        except FileNotFoundError:
+            return None
+
+        return (watcherId, hash_, dirtyItems(folders, trees), overflow, offset)
+
+    def dirtyFolders(self):
+        """
+        Folders changed since the last snapshot.
+
+        Returns:
+            list:   changed folders as tuples ``(folder, recursive)`` (see
+                    :py:func:`dirtyItems`) or ``None`` if it is unknown what
+                    has changed
+        """
+        self.watcherId = None
+        journal = self.readJournal()
+        if journal is None:
+            logger.debug('No change journal', self)
+            return None
+
+        watcherId, hash_, items, overflow, self.offset = journal
+
+        if not ChangeTrackerDaemon(self.config, self.profile_id).status():
+            logger.debug('Change tracker daemon is not running', self)
+            return None
+
+        self.watcherId = watcherId
+
+        state = configfile.ConfigFile()
+        state.load(self.stateFile)
+
+        if state.strValue('watcher_id') != watcherId:
+            logger.debug('Change tracker was restarted since last snapshot',
+                         self)
+            return None
+
+        if hash_ != configHash(self.config, self.profile_id):
+            logger.debug('Settings changed since change tracker was started',
+                         self)
+            self.watcherId = None
+            return None
+
+        if overflow:
+            logger.debug('Change tracker lost events', self)
+            return None
+
+        return items
+
+    def commit(self):
+        """
+        Remember the journal position read by :py:func:`dirtyFolders` after
+        a snapshot was taken successfully and remove the committed folders
+        from the journal.
+        """
+        if not self.watcherId:
+            return
+
+        state = configfile.ConfigFile()
+        state.setStrValue('watcher_id', self.watcherId)
+        state.setIntValue('offset', self.truncateJournal())
+        state.save(self.stateFile)
+
+    def truncateJournal(self):
+        """
+        Remove everything up to ``offset`` from the journal but keep its
+        header and folders which were written after :py:func:`dirtyFolders`.
+        The daemon appends to the journal, so it will continue at the new
+        end of the file.
+
+        Returns:
+            int:    new offset of the first uncommitted folder
+        """
+        try:
+            with open(self.journalFile, 'r+b') as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                header = f.readline()
+                if os.fsdecode(header.rstrip(b'\n')).split(' ')[4:5] \
+                        != [self.watcherId]:
+                    return self.offset
+                f.seek(self.offset)
+                uncommitted = f.read()
+                f.seek(len(header))
+                f.write(uncommitted)
+                f.truncate()
+                return len(header)
+        except OSError as e:
+            logger.debug('Failed to truncate change journal: %s' % str(e),
+                         self)
+            return self.offset
+
+    def reset(self):
+        """
+        Forget the journal position so the next snapshot will be a full one.
+        """
+        try:
+            os.remove(self.stateFile)
+        except FileNotFoundError:
+            pass
+
+
+class ChangeTrackerDaemon(tools.Daemon):
+    """
+    Watch all include folders of a profile with inotify and write every
+    changed folder into the change journal. New folders are written as
+    trees with a leading :py:data:`JOURNAL_TREE`. Changes are collected for
+    ``FLUSH_INTERVAL`` seconds and written once per folder. The daemon needs
+    to be restarted after include or exclude settings have changed.
+
+    Args:
+        cfg (config.Config):    current config
+        profile_id (str):       profile ID
+    """
+    FLUSH_INTERVAL = 1
+
+    def __init__(self, cfg, profile_id=None, *args, **kwargs):
+        self.config = cfg
+        self.profile_id = profile_id
+        super(ChangeTrackerDaemon, self).__init__(
+            cfg.changeTrackerPid(profile_id), *args, **kwargs)
+        self.watches = {}
+        self.dirty = set()
+        self.dirtyTrees = set()
+        self.overflow = False
+
+        # our own files would be reported as changes on every flush()
+        self.ignoredFolders = [cfg._LOCAL_DATA_FOLDER,
+                               cfg._LOCAL_MOUNT_ROOT]
+        if cfg.snapshotsMode(profile_id) == 'local':
+            self.ignoredFolders.append(cfg.snapshotsFullPath(profile_id))
+        self.ignoredFolders = [os.path.realpath(p).rstrip(os.sep)
+                               for p in self.ignoredFolders if p]
+        self.excludes = [x.rstrip(os.sep) for x in cfg.exclude(profile_id)]
+
+    def run(self):
+        """
+        Start watching and write changes into the journal until SIGTERM.
+        """
+        try:
+            self.inotify = Inotify()
+        except (OSError, AttributeError) as e:
+            logger.error('inotify is not available: %s' % str(e), self)
+            sys.exit(1)
+
+        journalFile = self.config.changeTrackerJournal(self.profile_id)
+        with open(journalFile, 'wb') as f:
+            f.write(('%s %s %s\n' % (
+                JOURNAL_HEADER,
+                uuid.uuid4().hex,
+                configHash(self.config, self.profile_id))).encode())
+        # append only, because ChangeTracker.commit() truncates the journal
+        self.journal = open(journalFile, 'ab')
+
+        for path, item_type in self.config.include(self.profile_id):
+            if item_type == 0:
+                self.watchTree(path)
+            else:
+                self.watch(os.path.dirname(path))
+
+        logger.debug('Watching %s folders' % len(self.watches), self)
+
+        lastFlush = time.monotonic()
+        while True:
+            try:
+                events = self.inotify.read(self.FLUSH_INTERVAL)
+            except InterruptedError:
+                continue
+            except KeyboardInterrupt:
+                break
+
+            for wd, mask, name in events:
+                self.handleEvent(wd, mask, name)
+
+            if time.monotonic() - lastFlush >= self.FLUSH_INTERVAL:
+                self.flush()
+                lastFlush = time.monotonic()
+
+    def isIgnored(self, path):
+        """
+        ``True`` if changes in ``path`` should not be tracked because it is
+        one of Back In Time's own folders or it is excluded.
+        """
+        for folder in self.ignoredFolders:
+            if path == folder or path.startswith(folder + os.sep):
+                return True
+        name = os.path.basename(path)
+        return any(fnmatch.fnmatch(name, x) or fnmatch.fnmatch(path, x)
+                   for x in self.excludes)
+
+    def watch(self, path):
+        if self.isIgnored(path):
+            return
+        try:
+            self.watches[self.inotify.addWatch(path)] = path
+        except OSError as e:
+            if e.errno == errno.ENOSPC:
+                logger.error('Too many inotify watches. Increase '
+                             'fs.inotify.max_user_watches', self)
+                self.overflow = True
+            elif e.errno not in (errno.ENOENT, errno.ENOTDIR):
+                logger.debug(str(e), self)
+
+    def watchTree(self, path):
+        if self.isIgnored(path):
+            return
+        self.watch(path)
+        for root, dirs, files in os.walk(path):
+            dirs[:] = [d for d in dirs
+                       if not self.isIgnored(os.path.join(root, d))]
+            for d in dirs:
+                self.watch(os.path.join(root, d))
+
+    def unwatchTree(self, path):
+        """
+        Stop watching folder ``path`` and all folders inside. Used for moved
+        folders, whose watches would keep their old path otherwise.
+        """
+        prefix = path + os.sep
+        for wd, p in list(self.watches.items()):
+            if p == path or p.startswith(prefix):
+                self.inotify.rmWatch(wd)
+                del self.watches[wd]
+
+    def handleEvent(self, wd, mask, name):
+        """
+        Mark the folder of an inotify event as dirty. Newly created folders
+        are watched and marked as dirty trees. Folders moved away are
+        unwatched and watched again with their new path if they were moved
+        to another watched folder.
+        """
+        if mask & IN_Q_OVERFLOW:
+            self.overflow = True
+            return
+
+        if mask & IN_IGNORED:
+            self.watches.pop(wd, None)
+            return
+
+        path = self.watches.get(wd)
+        if path is None:
+            return
+
+        if name and self.isIgnored(os.path.join(path, name)):
+            return
+
+        if mask & IN_ISDIR and mask & IN_MOVED_FROM:
+            self.unwatchTree(os.path.join(path, name))
+
+        if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+            self.watchTree(os.path.join(path, name))
+            self.markDirty(os.path.join(path, name), self.dirtyTrees)
+
+        if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+            path = os.path.dirname(path)
+
+        self.markDirty(path, self.dirty)
+
+    def markDirty(self, path, dirty):
+        if '\n' in path:
+            # can't be written into the journal
+            self.overflow = True
+        else:
+            dirty.add(path)
+
+    def flush(self):
+        """
+        Write collected folders into the journal.
+        """
+        if not self.dirty and not self.dirtyTrees and not self.overflow:
+            return
+
+        lines = [os.fsencode((JOURNAL_TREE if recursive else '') + folder)
+                 + b'\n'
+                 for folder, recursive in dirtyItems(self.dirty,
+                                                     self.dirtyTrees)]
+        if self.overflow:
+            lines.append(JOURNAL_OVERFLOW.encode() + b'\n')
+
+        fcntl.flock(self.journal, fcntl.LOCK_EX)
+        try:
+            self.journal.writelines(lines)
+            self.journal.flush()
+        finally:
+            fcntl.flock(self.journal, fcntl.LOCK_UN)
+
+        self.dirty.clear()
+        self.dirtyTrees.clear()
+        self.overflow = False
@@ -36,6 +36,7 @@ import socket
 import random
 import getpass
 import shlex
+import subprocess
 
 # Workaround: Mostly relevant on TravisCI but not exclusively.
 # While unittesting and without regular invocation of BIT the GNU gettext
@@ -43,7 +44,7 @@ import shlex
 # The bigger problem with config.py is that it do use translatable strings.
 # Strings like this do not belong into a config file or its context.
 try:
-    _('Warning')
+    _
 except NameError:
     _ = lambda val: val
 
@@ -53,6 +54,7 @@ import logger
 import sshtools
 import encfstools
 import password
+import probecache
 import pluginmanager
 from exceptions import PermissionDeniedByPolicy, \
                        InvalidChar, \
@@ -170,6 +172,8 @@ class Config(configfile.ConfigFileWithProfiles):
         tools.makeDirs(self._LOCAL_CONFIG_FOLDER)
         tools.makeDirs(self._LOCAL_DATA_FOLDER)
         tools.makeDirs(self._LOCAL_MOUNT_ROOT)
+        probecache.setCacheFile(os.path.join(self._LOCAL_DATA_FOLDER,
+                                             'probe_cache.json'))
 
         self._DEFAULT_CONFIG_PATH = os.path.join(self._LOCAL_CONFIG_FOLDER, 'config')
 
@@ -415,6 +419,7 @@ class Config(configfile.ConfigFileWithProfiles):
             symlink = self.snapshotsSymlink(profile_id = profile_id, tmp_mount = tmp_mount)
             return os.path.join(self._LOCAL_MOUNT_ROOT, symlink)
 
+    @configfile.cachedProfileValue
     def snapshotsFullPath(self, profile_id = None):
         """
         Returns the full path for the snapshots: .../backintime/machine/user/profile_id/
@@ -511,6 +516,7 @@ class Config(configfile.ConfigFileWithProfiles):
             self.setProfileStrValue('snapshots.path', value, profile_id)
         return True
 
+    @configfile.cachedProfileValue
     def snapshotsMode(self, profile_id=None):
         #? Use mode (or backend) for this snapshot. Look at 'man backintime'
         #? section 'Modes'.;local|local_encfs|ssh|ssh_encfs
@@ -570,12 +576,14 @@ class Config(configfile.ConfigFileWithProfiles):
             self.setIntValue('internal.manual_starts_countdown', val - 1)
 
     # SSH
+    @configfile.cachedProfileValue
     def sshSnapshotsPath(self, profile_id = None):
         #?Snapshot path on remote host. If the path is relative (no leading '/')
         #?it will start from remote Users homedir. An empty path will be replaced
         #?with './'.;absolute or relative path
         return self.profileStrValue('snapshots.ssh.path', '', profile_id)
 
+    @configfile.cachedProfileValue
     def sshSnapshotsFullPath(self, profile_id = None):
         """
         Returns the full path for the snapshots: .../backintime/machine/user/profile_id/
@@ -590,6 +598,7 @@ class Config(configfile.ConfigFileWithProfiles):
         self.setProfileStrValue('snapshots.ssh.path', value, profile_id)
         return True
 
+    @configfile.cachedProfileValue
     def sshHost(self, profile_id = None):
         #?Remote host used for mode 'ssh' and 'ssh_encfs'.;IP or domain address
         return self.profileStrValue('snapshots.ssh.host', '', profile_id)
@@ -597,6 +606,7 @@ class Config(configfile.ConfigFileWithProfiles):
     def setSshHost(self, value, profile_id = None):
         self.setProfileStrValue('snapshots.ssh.host', value, profile_id)
 
+    @configfile.cachedProfileValue
     def sshPort(self, profile_id = None):
         #?SSH Port on remote host.;0-65535
         return self.profileIntValue('snapshots.ssh.port', '22', profile_id)
@@ -615,6 +625,7 @@ class Config(configfile.ConfigFileWithProfiles):
     def setSshCipher(self, value, profile_id = None):
         self.setProfileStrValue('snapshots.ssh.cipher', value, profile_id)
 
+    @configfile.cachedProfileValue
     def sshUser(self, profile_id = None):
         #?Remote SSH user;;local users name
         return self.profileStrValue('snapshots.ssh.user', getpass.getuser(), profile_id)
@@ -890,6 +901,7 @@ class Config(configfile.ConfigFileWithProfiles):
 
         return (host, user, profile)
 
+    @configfile.cachedProfileValue
     def hostUserProfile(self, profile_id = None):
         default_host, default_user, default_profile = self.hostUserProfileDefault(profile_id)
         #?Set Host for snapshot path;;local hostname
@@ -925,6 +937,7 @@ class Config(configfile.ConfigFileWithProfiles):
 
         return paths
 
+    @configfile.cachedProfileValue
     def include(self, profile_id = None):
         #?Include this file or folder. <I> must be a counter starting with 1;absolute path::
         #?Specify if \fIprofile<N>.snapshots.include.<I>.value\fR is a folder (0) or a file (1).;0|1;0
@@ -943,6 +956,7 @@ class Config(configfile.ConfigFileWithProfiles):
             return []
         return value.split(':')
 
+    @configfile.cachedProfileValue
     def exclude(self, profile_id = None):
         """
         Gets the exclude patterns
@@ -1165,12 +1179,24 @@ class Config(configfile.ConfigFileWithProfiles):
         self.setProfileIntValue('snapshots.smart_remove.keep_one_per_month', keep_one_per_month, profile_id)
 
     def smartRemoveRunRemoteInBackground(self, profile_id = None):
-        #?If using mode SSH or SSH-encrypted, run smart_remove in background on remote machine
+        #?If using mode SSH or SSH-encrypted, remove snapshots with one job
+        #?running on the remote machine. Snapshot IDs are streamed to it over
+        #?a single SSH connection. The backup waits until the remote job has
+        #?finished. Despite its name this does not run in background.
         return self.profileBoolValue('snapshots.smart_remove.run_remote_in_background', False, profile_id)
 
     def setSmartRemoveRunRemoteInBackground(self, value, profile_id = None):
         self.setProfileBoolValue('snapshots.smart_remove.run_remote_in_background', value, profile_id)
 
+    def smartRemoveRemoteParallel(self, profile_id = None):
+        #?Number of snapshots removed in parallel on the remote machine if
+        #?smart_remove.run_remote_in_background is enabled.;1-16
+        value = self.profileIntValue('snapshots.smart_remove.remote_parallel', 2, profile_id)
+        return max(1, min(value, 16))
+
+    def setSmartRemoveRemoteParallel(self, value, profile_id = None):
+        self.setProfileIntValue('snapshots.smart_remove.remote_parallel', value, profile_id)
+
     def notify(self, profile_id = None):
         #?Display notifications (errors, warnings) through libnotify.
         return self.profileBoolValue('snapshots.notify.enabled', True, profile_id)
@@ -1271,6 +1297,44 @@ class Config(configfile.ConfigFileWithProfiles):
         self.setProfileBoolValue('snapshots.bwlimit.enabled', enabled, profile_id)
         self.setProfileIntValue('snapshots.bwlimit.value', value, profile_id)
 
+    def parallelRsyncEnabled(self, profile_id = None):
+        #?Split include folders (or their top-level subfolders) into groups
+        #?and run one rsync process per group in parallel. This can speed up
+        #?snapshots of huge trees on fast local drives.
+        return self.profileBoolValue('snapshots.parallel_rsync.enabled', False, profile_id)
+
+    def parallelRsync(self, profile_id = None):
+        #?Number of rsync processes running in parallel.;2-32
+        value = self.profileIntValue('snapshots.parallel_rsync.value', 4, profile_id)
+        return max(1, min(value, 32))
+
+    def setParallelRsync(self, enabled, value, profile_id = None):
+        self.setProfileBoolValue('snapshots.parallel_rsync.enabled', enabled, profile_id)
+        self.setProfileIntValue('snapshots.parallel_rsync.value', value, profile_id)
+
+    def changeTrackerEnabled(self, profile_id = None):
+        #?Use the journal of 'backintime change-tracker' to skip rsync if
+        #?nothing has changed since the last snapshot and to limit rsync to
+        #?changed folders otherwise (only in mode 'local').
+        return self.profileBoolValue('snapshots.change_tracker.enabled', False, profile_id)
+
+    def setChangeTrackerEnabled(self, value, profile_id = None):
+        self.setProfileBoolValue('snapshots.change_tracker.enabled', value, profile_id)
+
+    def cowBackend(self, profile_id = None):
+        #?Clone the previous snapshot copy-on-write and let rsync update the
+        #?clone in place instead of using --link-dest (only in mode 'local').
+        #?'btrfs' uses subvolume snapshots, 'reflink' uses reflink copies
+        #?(e.g. XFS) and 'auto' picks whatever the snapshot folder
+        #?supports.;none|auto|btrfs|reflink
+        value = self.profileStrValue('snapshots.cow_backend', 'none', profile_id)
+        if value not in ('none', 'auto', 'btrfs', 'reflink'):
+            value = 'none'
+        return value
+
+    def setCowBackend(self, value, profile_id = None):
+        self.setProfileStrValue('snapshots.cow_backend', value, profile_id)
+
     def noSnapshotOnBattery(self, profile_id = None):
         #?Don't take snapshots if the Computer runs on battery.
         return self.profileBoolValue('snapshots.no_on_battery', False, profile_id)
@@ -1420,6 +1484,42 @@ class Config(configfile.ConfigFileWithProfiles):
     def setGlobalFlock(self, value):
         self.setBoolValue('global.use_flock', value)
 
+    def schedulerDaemon(self):
+        #?Trigger scheduled snapshots from the resident
+        #?'backintime scheduler' daemon. Cron starts the daemon at boot and
+        #?scheduled cron jobs hand over to it while it is running.
+        return self.boolValue('global.scheduler_daemon', False)
+
+    def setSchedulerDaemon(self, value):
+        self.setBoolValue('global.scheduler_daemon', value)
+
+    def globalFlockMaxParallel(self):
+        #?Number of snapshots (from different profiles or users) which may
+        #?run at the same time if \fIglobal.use_flock\fR is enabled. With more
+        #?than one, snapshots are only serialized per backup target (device
+        #?or SSH host). Needs to be the same for all users.;1-99;1
+        return max(1, self.intValue('global.flock.max_parallel', 1))
+
+    def setGlobalFlockMaxParallel(self, value):
+        self.setIntValue('global.flock.max_parallel', value)
+
+    def globalFlockMaxParallelPerTarget(self):
+        #?Number of snapshots which may run at the same time on the same
+        #?backup target (device or SSH host). Only used if
+        #?\fIglobal.flock.max_parallel\fR is greater than 1.;1-99;1
+        return max(1, self.intValue('global.flock.max_parallel_per_target', 1))
+
+    def setGlobalFlockMaxParallelPerTarget(self, value):
+        self.setIntValue('global.flock.max_parallel_per_target', value)
+
+    def decodeWorkers(self):
+        #?Number of 'encfsctl decode' processes used in parallel to decode
+        #?snapshot logs of encrypted profiles.;1-16;2
+        return min(16, max(1, self.intValue('global.decode_workers', 2)))
+
+    def setDecodeWorkers(self, value):
+        self.setIntValue('global.decode_workers', value)
+
     def appInstanceFile(self):
         return os.path.join(self._LOCAL_DATA_FOLDER, 'app.lock')
 
@@ -1449,6 +1549,27 @@ class Config(configfile.ConfigFileWithProfiles):
             self._LOCAL_DATA_FOLDER,
             "worker%s.lock" % self.fileId(profile_id))
 
+    def takeSnapshotEventsFolder(self):
+        return os.path.join(self._LOCAL_DATA_FOLDER, "worker.events")
+
+    def changeTrackerJournal(self, profile_id = None):
+        return os.path.join(self._LOCAL_DATA_FOLDER,
+                            "changes%s.journal" % self.fileId(profile_id))
+
+    def changeTrackerState(self, profile_id = None):
+        return os.path.join(self._LOCAL_DATA_FOLDER,
+                            "changes%s.state" % self.fileId(profile_id))
+
+    def changeTrackerPid(self, profile_id = None):
+        return os.path.join(self._LOCAL_DATA_FOLDER,
+                            "changetracker%s.pid" % self.fileId(profile_id))
+
+    def schedulerPid(self):
+        return os.path.join(self._LOCAL_DATA_FOLDER, "scheduler.pid")
+
+    def schedulerSocket(self):
+        return os.path.join(self._LOCAL_DATA_FOLDER, "scheduler.sock")
+
     def takeSnapshotUserCallback(self):
         return os.path.join(self._LOCAL_CONFIG_FOLDER, "user-callback")
 
@@ -1642,8 +1763,27 @@ class Config(configfile.ConfigFileWithProfiles):
         else:
             logger.debug("Crontab didn't change. Skip writing.")
 
+        if self.schedulerDaemon():
+            self.startSchedulerDaemon()
+
         return True
 
+    def startSchedulerDaemon(self):
+        """
+        Start the scheduler daemon in background unless it is already
+        running. Cron only starts it at boot, so this is needed after it
+        was enabled or if it died.
+        """
+        if tools.Daemon(self.schedulerPid()).status():
+            return
+        if not tools.checkCommand('backintime'):
+            logger.error("Command 'backintime' not found", self)
+            return
+        logger.debug('Start scheduler daemon', self)
+        subprocess.Popen(self.schedulerCmd(),
+                         shell = True,
+                         start_new_session = True)
+
     def removeOldCrontab(self, crontab):
         #We have to check if the self.SYSTEM_ENTRY_MESSAGE is in use,
         #if not then the entries are most likely from Back In Time 0.9.26
@@ -1671,6 +1811,10 @@ class Config(configfile.ConfigFileWithProfiles):
         if not tools.checkCommand('backintime'):
             logger.error("Command 'backintime' not found", self)
             return newCrontab
+        schedulerDaemon = self.schedulerDaemon()
+        if schedulerDaemon:
+            newCrontab.append(self.SYSTEM_ENTRY_MESSAGE)
+            newCrontab.append('@reboot ' + self.schedulerCmd())
         for profile_id in self.profiles():
             cronLine = self.cronLine(profile_id)
             if not isinstance(cronLine, str):
@@ -1786,6 +1930,14 @@ class Config(configfile.ConfigFileWithProfiles):
 
         return cron_line
 
+    def schedulerCmd(self):
+        cmd = tools.which('backintime') + ' '
+        if not self._LOCAL_CONFIG_PATH is self._DEFAULT_CONFIG_PATH:
+            cmd += '--config %s ' % self._LOCAL_CONFIG_PATH
+        if logger.DEBUG:
+            cmd += '--debug '
+        return cmd + 'scheduler start >/dev/null 2>&1'
+
     def cronCmd(self, profile_id):
         if not tools.checkCommand('backintime'):
             logger.error("Command 'backintime' not found", self)
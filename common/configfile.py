@@ -18,19 +18,222 @@
 
 import os
 import collections
+import functools
 import re
+import stat
+import tempfile
+import threading
+import weakref
 import logger
 
+# Parsed config files shared by all ConfigFile instances. Entries are keyed by
+# the real path of the file and only used as long as its stat signature
+# (mtime, size, inode, device) doesn't change.
+_CACHE = collections.OrderedDict()
+_CACHE_SIZE = 512
+_CACHE_LOCK = threading.Lock()
+
+
+def _signature(st):
+    return (st.st_mtime_ns, st.st_size, st.st_ino, st.st_dev)
+
+
+def _cachePut(path, st, text):
+    with _CACHE_LOCK:
+        entry = {'signature': _signature(st), 'text': text, 'parsed': {}}
+        _CACHE[path] = entry
+        _CACHE.move_to_end(path)
+
+        while len(_CACHE) > _CACHE_SIZE:
+            _CACHE.popitem(last=False)
+
+        return entry
+
+
+def _cacheGet(path):
+    """
+    Return the cache entry for ``path``. The file is read if there is no
+    entry yet or if the file has changed since.
+
+    Args:
+        path (str): real path of the file
+
+    Returns:
+        dict:       cache entry with ``text`` and ``parsed``
+
+    Raises:
+        OSError:    if the file can't be read
+    """
+    st = os.stat(path)
+
+    with _CACHE_LOCK:
+        entry = _CACHE.get(path)
+        if entry is not None and entry['signature'] == _signature(st):
+            _CACHE.move_to_end(path)
+            return entry
+
+    with open(path, 'rt') as f:
+        st = os.fstat(f.fileno())
+        text = f.read()
+
+    return _cachePut(path, st, text)
+
+
+def _parse(path, maxsplit=1):
+    """
+    Parsed content of config file ``path``. The returned dict is shared
+    and must not be changed.
+
+    Raises:
+        OSError:    if the file can't be read
+    """
+    entry = _cacheGet(path)
+
+    with _CACHE_LOCK:
+        result = entry['parsed'].get(maxsplit)
+
+        if result is None:
+            result = {}
+
+            for line in entry['text'].split('\n'):
+                items = line.split('=', maxsplit)
+
+                if len(items) == 2:
+                    result[items[0]] = items[1]
+
+            entry['parsed'][maxsplit] = result
+
+    return result
+
+
+def _write(path, text):
+    """
+    Write ``text`` to ``path`` atomically by replacing it with a temporary
+    file from the same folder. Mode and owner of an existing file are kept.
+    New files and files in folders without write access are written
+    directly.
+
+    Raises:
+        OSError:    if the file can't be written
+    """
+    try:
+        st = os.stat(path)
+        fd, tmp = tempfile.mkstemp(prefix='.%s.' % os.path.basename(path),
+                                   dir=os.path.dirname(path))
+
+    except OSError:
+        with open(path, 'wt') as f:
+            f.write(text)
+
+        return
+
+    try:
+        with os.fdopen(fd, 'wt') as f:
+            f.write(text)
+
+        os.chmod(tmp, stat.S_IMODE(st.st_mode))
+
+        if (st.st_uid, st.st_gid) != (os.geteuid(), os.getegid()):
+            try:
+                os.chown(tmp, st.st_uid, st.st_gid)
+            except OSError:
+                pass
+
+        os.replace(tmp, path)
+
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+        raise
+
+
+def clearCache():
+    """
+    Drop all cached config files.
+    """
+    with _CACHE_LOCK:
+        _CACHE.clear()
+
+
+# ConfigFile instances with cached profile values. Cached values may depend on
+# the process (e.g. mountpoints contain the PID) so they are dropped in forked
+# child processes.
+_INSTANCES = weakref.WeakSet()
+
+
+def _afterFork():
+    for instance in list(_INSTANCES):
+        instance.changed()
+
+
+os.register_at_fork(after_in_child=_afterFork)
+
+
+def cachedProfileValue(func):
+    """
+    Decorator for getters of :py:class:`ConfigFileWithProfiles` subclasses
+    with the signature ``getter(self, profile_id=None)``. The typed result is
+    computed once per profile and kept until any option changes, so
+    following calls don't need to look up and convert the raw values again.
+    Lists are returned as copies.
+    """
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(self, profile_id=None):
+        if profile_id is None:
+            profile_id = self.current_profile_id
+        else:
+            profile_id = str(profile_id)
+
+        values = self._profileValues.get(profile_id)
+        if values is None:
+            values = self._profileValues[profile_id] = {}
+
+        try:
+            value = values[name]
+        except KeyError:
+            value = values[name] = func(self, profile_id)
+
+        if isinstance(value, list):
+            return list(value)
+
+        return value
+
+    return wrapper
+
 
 class ConfigFile(object):
     """Store options in a plain text file in form of: key=value
     """
+    # Incremented on every change. Lets other objects validate values they
+    # derived from the options.
+    changeCount = 0
 
     def __init__(self):
         self.dict = {}
         self.errorHandler = None
         self.questionHandler = None
 
+    @property
+    def dict(self):
+        return self._dict
+
+    @dict.setter
+    def dict(self, value):
+        self._dict = value
+        self.changed()
+
+    def changed(self):
+        """
+        Called whenever options got changed. Subclasses can override this to
+        drop values derived from the options.
+        """
+        self.changeCount += 1
+
     def setErrorHandler(self, handler):
         """
         Register a function that should be called for notifying errors.
@@ -78,7 +281,8 @@ class ConfigFile(object):
 
     def save(self, filename):
         """
-        Save all options to file.
+        Save all options to file. The file is only written if its content
+        changes and is replaced atomically.
 
         Args:
             filename (str): full path
@@ -93,13 +297,23 @@ class ConfigFile(object):
             """
             return re.sub(r'\d+', lambda m: m.group(0).zfill(6), key)
 
+        keys = list(self.dict.keys())
+        keys.sort(key=numsort)
+        text = ''.join('%s=%s\n' % (key, self.dict[key]) for key in keys)
+
         try:
-            with open(filename, 'wt') as f:
-                keys = list(self.dict.keys())
-                keys.sort(key=numsort)
+            path = os.path.realpath(filename)
 
-                for key in keys:
-                    f.write("%s=%s\n" % (key, self.dict[key]))
+            try:
+                if _cacheGet(path)['text'] == text:
+                    # nothing changed
+                    return True
+
+            except FileNotFoundError:
+                pass
+
+            _write(path, text)
+            _cachePut(path, os.stat(path), text)
 
         except OSError as e:
             logger.error('Failed to save config: %s' % str(e), self)
@@ -122,31 +336,28 @@ class ConfigFile(object):
 
     def append(self, filename, maxsplit=1):
         """
-        Load options from file and append them to current options.
+        Load options from file and append them to current options. Parsed
+        files are cached as long as they don't change on disk.
 
         Args:
             filename (str): full path
             maxsplit (int): split lines only n times on '='
         """
-        lines = []
-
         if not os.path.isfile(filename):
             return
 
         try:
-            with open(filename, 'rt') as f:
-                lines = f.readlines()
+            parsed = _parse(os.path.realpath(filename), maxsplit)
 
         except OSError as e:
             logger.error('Failed to load config: %s' % str(e), self)
             self.notifyError(
                 '{}: {}'.format(_('Failed to load config'), str(e)))
 
-        for line in lines:
-            items = line.strip('\n').split('=', maxsplit)
+            return
 
-            if len(items) == 2:
-                self.dict[items[0]] = items[1]
+        self.dict.update(parsed)
+        self.changed()
 
     def remapKey(self, old_key, new_key):
         """
@@ -164,6 +375,7 @@ class ConfigFile(object):
                     self.dict[new_key] = self.dict[old_key]
 
                 del self.dict[old_key]
+                self.changed()
 
     def remapKeyRegex(self, pattern, replace):
         """
@@ -220,6 +432,7 @@ class ConfigFile(object):
             value (str):    store this value
         """
         self.dict[key] = value
+        self.changed()
 
     def intValue(self, key, default=0):
         """
@@ -439,6 +652,7 @@ class ConfigFile(object):
         """
         if key in self.dict:
             del self.dict[key]
+            self.changed()
 
     def removeKeysStartsWith(self, prefix):
         """
@@ -457,6 +671,9 @@ class ConfigFile(object):
         for key in removeKeys:
             del self.dict[key]
 
+        if removeKeys:
+            self.changed()
+
     def keys(self):
         return list(self.dict.keys())
 
@@ -471,6 +688,7 @@ class ConfigFileWithProfiles(ConfigFile):
 
     def __init__(self, default_profile_name=''):
         ConfigFile.__init__(self)
+        _INSTANCES.add(self)
 
         self.default_profile_name = default_profile_name
         self.current_profile_id = '1'
@@ -519,9 +737,18 @@ class ConfigFileWithProfiles(ConfigFile):
                 self.dict[new_key] = self.dict[old_key]
                 del self.dict[old_key]
 
+            self.changed()
+
         if self.intValue('profiles.version') != 1:
             self.setIntValue('profiles.version', 1)
 
+    def changed(self):
+        """
+        Drop values cached by :py:func:`cachedProfileValue`.
+        """
+        super(ConfigFileWithProfiles, self).changed()
+        self._profileValues = {}
+
     def profiles(self):
         """
         List of all available profile IDs. Profile IDs are strings!
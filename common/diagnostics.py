@@ -18,10 +18,10 @@ from pathlib import Path
 import pwd
 import platform
 import locale
-import subprocess
 import json
 import re
 import config
+import probecache
 import tools
 import version
 
@@ -253,7 +253,7 @@ def _get_extern_versions(cmd,
                          pattern=None,
                          try_json=False,
                          error_pattern=None):
-    """Get the version of an external tools using :class:`subprocess.Popen`.
+    """Get the version of an external tools using :py:func:`probecache.probe`.
 
     Args:
         cmd (list[str]): Commandline arguments that will be passed
@@ -274,14 +274,9 @@ def _get_extern_versions(cmd,
     """
 
     try:
-        # as context manager to prevent ResourceWarning's
-        with subprocess.Popen(cmd,
-                              env={'LC_ALL': 'C'},
-                              stdout=subprocess.PIPE,
-                              stderr=subprocess.PIPE,
-                              universal_newlines=True) as proc:
-            error_output = proc.stderr.read()
-            std_output = proc.stdout.read()
+        # cached as long as the binary doesn't change
+        returncode, std_output, error_output = probecache.probe(
+            cmd, env={'LC_ALL': 'C'})
 
     except FileNotFoundError:
         result = f'(no {cmd[0]})'
@@ -0,0 +1,334 @@
+#    Back In Time
+#    Copyright (C) 2008-2022 Oprea Dan, Bart de Koning, Richard Bailey,
+#    Germar Reitze
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""Directory listings used by the files view of the GUI.
+
+Listings are read with :py:func:`os.scandir` in batches so huge folders can
+be shown while they are still being read. Complete listings are kept in a
+:py:class:`ListingCache` keyed by snapshot, path and modification time of the
+folder.
+
+Most files in a folder are hardlinks to the same inode in all snapshots.
+When a listing of the same folder in another snapshot is known, entries with
+the same name and inode are taken from it instead of calling ``stat()``,
+which is expensive on network filesystems like sshfs.
+"""
+import os
+import threading
+import collections
+
+
+class Entry(collections.namedtuple('Entry',
+                                   ('name', 'isDir', 'size', 'mtime', 'inode'),
+                                   defaults = (0, ))):
+    """
+    A single entry of a directory listing.
+
+    Args:
+        name (str):     file name
+        isDir (bool):   ``True`` if it is a folder or a symlink to a folder
+        size (int):     size in bytes
+        mtime (float):  modification time in seconds since epoch
+        inode (int):    inode number or 0 if unknown
+    """
+    __slots__ = ()
+
+    @property
+    def hidden(self):
+        return self.name.startswith('.')
+
+
+# column numbers used for sorting, same order as in the files view
+NAME = 0
+SIZE = 1
+TYPE = 2
+MTIME = 3
+
+
+def entry(dirEntry):
+    """
+    Create an :py:class:`Entry` from a :py:class:`os.DirEntry`. Symlinks
+    are followed; broken symlinks show the symlink itself.
+
+    Args:
+        dirEntry (os.DirEntry): entry from :py:func:`os.scandir`
+
+    Returns:
+        Entry:                  listing entry
+    """
+    try:
+        inode = dirEntry.inode()
+    except OSError:
+        inode = 0
+
+    try:
+        isDir = dirEntry.is_dir()
+    except OSError:
+        isDir = False
+
+    try:
+        st = dirEntry.stat()
+    except OSError:
+        try:
+            st = dirEntry.stat(follow_symlinks = False)
+        except OSError:
+            return Entry(dirEntry.name, isDir, 0, 0.0, inode)
+
+    return Entry(dirEntry.name, isDir, st.st_size, st.st_mtime, inode)
+
+
+def scan(path, batchSize = 2000, firstBatchSize = 200, reference = None):
+    """
+    Read the folder ``path`` in batches. The first batch is small so the
+    first entries can be shown quickly.
+
+    Args:
+        path (str):             folder to read
+        batchSize (int):        number of entries per batch
+        firstBatchSize (int):   number of entries in the first batch
+        reference (list):       listing of the same folder in another
+                                snapshot. Its entries are reused for files
+                                with the same name and inode (hardlinks)
+
+    Yields:
+        list:                   batches of :py:class:`Entry`
+
+    Raises:
+        OSError:                if ``path`` can not be read
+    """
+    known = {}
+    if reference:
+        known = {e.name: e for e in reference if e.inode}
+    batch = []
+    size = firstBatchSize
+    with os.scandir(path) as it:
+        for dirEntry in it:
+            e = known.get(dirEntry.name)
+            if e is None or e.inode != dirEntry.inode():
+                e = entry(dirEntry)
+            batch.append(e)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+                size = batchSize
+    if batch:
+        yield batch
+
+
+def mtime(path):
+    """
+    Modification time of folder ``path`` in nanoseconds. It changes if
+    entries are added, removed or renamed.
+
+    Raises:
+        OSError:    if ``path`` doesn't exist
+    """
+    return os.stat(path).st_mtime_ns
+
+
+def extension(name):
+    """
+    File extension of ``name`` without dot, ``''`` if there is none.
+    """
+    ext = os.path.splitext(name)[1]
+    return ext[1:]
+
+
+def sortKey(column):
+    """
+    Key function used to sort entries by ``column``. Folders are always
+    sorted before files; names are compared case insensitive.
+
+    Args:
+        column (int):   one of :py:data:`NAME`, :py:data:`SIZE`,
+                        :py:data:`TYPE` or :py:data:`MTIME`
+
+    Returns:
+        function:       key function for :py:func:`sorted`
+    """
+    if column == SIZE:
+        return lambda e: (e.size, e.name.casefold())
+    if column == TYPE:
+        return lambda e: (extension(e.name).casefold(), e.name.casefold())
+    if column == MTIME:
+        return lambda e: (e.mtime, e.name.casefold())
+    return lambda e: e.name.casefold()
+
+
+def sortOrder(entries, column = NAME, reverse = False):
+    """
+    Order in which ``entries`` should be shown.
+
+    Args:
+        entries (list):     :py:class:`Entry` instances
+        column (int):       column to sort by
+        reverse (bool):     sort descending. Folders stay in front
+
+    Returns:
+        list:               indexes of ``entries`` in sorted order
+    """
+    key = sortKey(column)
+    dirs = [i for i, e in enumerate(entries) if e.isDir]
+    files = [i for i, e in enumerate(entries) if not e.isDir]
+    dirs.sort(key = lambda i: key(entries[i]), reverse = reverse)
+    files.sort(key = lambda i: key(entries[i]), reverse = reverse)
+    return dirs + files
+
+
+class ListingCache(object):
+    """
+    LRU cache of complete directory listings keyed by snapshot, path and
+    modification time of the folder. The cache is limited by the total
+    number of entries of all listings, so a few huge folders can't exhaust
+    memory. It is thread safe, so listings can be prefetched in background.
+
+    Args:
+        maxEntries (int):   max number of entries of all listings together
+    """
+    def __init__(self, maxEntries = 1000000):
+        self.maxEntries = maxEntries
+        self.listings = collections.OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, sid, path, mtime):
+        """
+        Cached listing of ``path`` in snapshot ``sid``. Listings of an older
+        state of the folder are dropped.
+
+        Args:
+            sid (snapshots.SID):    snapshot
+            path (str):             path inside the snapshot
+            mtime (int):            current modification time of the folder
+                                    as returned by :py:func:`mtime`
+
+        Returns:
+            list:   :py:class:`Entry` instances or ``None`` if not cached
+        """
+        key = (sid, path)
+        with self.lock:
+            try:
+                cachedMtime, entries = self.listings[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            if cachedMtime != mtime:
+                self._remove(key)
+                self.misses += 1
+                return None
+            self.listings.move_to_end(key)
+            self.hits += 1
+            return entries
+
+    def contains(self, sid, path, mtime):
+        """
+        ``True`` if a listing of this state of the folder is cached. Unlike
+        :py:func:`get` this does not count as hit or miss.
+        """
+        with self.lock:
+            cached = self.listings.get((sid, path))
+            return cached is not None and cached[0] == mtime
+
+    def reference(self, path):
+        """
+        Most recently used listing of ``path`` in any snapshot. Used as
+        ``reference`` for :py:func:`scan`.
+
+        Returns:
+            list:   :py:class:`Entry` instances or ``None``
+        """
+        with self.lock:
+            for (sid, p), (mtime, entries) in reversed(self.listings.items()):
+                if p == path:
+                    return entries
+        return None
+
+    def put(self, sid, path, mtime, entries):
+        """
+        Store the complete listing ``entries`` of ``path`` in snapshot
+        ``sid``. Listings bigger than the whole cache are not stored.
+        """
+        key = (sid, path)
+        with self.lock:
+            self._remove(key)
+            if len(entries) > self.maxEntries:
+                return
+            self.listings[key] = (mtime, entries)
+            self.size += len(entries)
+            while self.size > self.maxEntries:
+                key, (mtime, old) = self.listings.popitem(last = False)
+                self.size -= len(old)
+
+    def remove(self, sid, path):
+        with self.lock:
+            self._remove((sid, path))
+
+    def _remove(self, key):
+        old = self.listings.pop(key, None)
+        if old is not None:
+            self.size -= len(old[1])
+
+    def clear(self):
+        with self.lock:
+            self.listings.clear()
+            self.size = 0
+
+    def hitRate(self):
+        """
+        Ratio of :py:func:`get` calls answered from cache.
+
+        Returns:
+            float:  hit rate between 0.0 and 1.0
+        """
+        total = self.hits + self.misses
+        if not total:
+            return 0.0
+        return self.hits / total
+
+
+def prefetch(cache, jobs, interrupted = lambda: False):
+    """
+    Read folders which are not cached yet and add them to ``cache``.
+
+    Args:
+        cache (ListingCache):   cache to fill
+        jobs (list):            tuples of (sid, path, full path on disk)
+        interrupted (function): return ``True`` to stop
+
+    Returns:
+        int:                    number of folders read
+    """
+    count = 0
+    for sid, path, fullPath in jobs:
+        if interrupted():
+            break
+        try:
+            folderMtime = mtime(fullPath)
+            if cache.contains(sid, path, folderMtime):
+                continue
+            entries = []
+            for batch in scan(fullPath, reference = cache.reference(path)):
+                if interrupted():
+                    return count
+                entries.extend(batch)
+        except OSError:
+            continue
+        cache.put(sid, path, folderMtime, entries)
+        count += 1
+    return count
@@ -20,12 +20,16 @@ import subprocess
 import re
 import shutil
 import tempfile
+import collections
+import itertools
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from packaging.version import Version
 
 import config
 import password
 import password_ipc
+import probecache
 import tools
 import sshtools
 import logger
@@ -166,11 +170,8 @@ class EncFS_mount(MountControl):
         """
         logger.debug('Check version', self)
         if self.reverse:
-            proc = subprocess.Popen(['encfs', '--version'],
-                                    stdout = subprocess.PIPE,
-                                    stderr = subprocess.STDOUT,
-                                    universal_newlines = True)
-            output = proc.communicate()[0]
+            returncode, stdout, stderr = probecache.probe(['encfs', '--version'])
+            output = stdout + stderr
             m = re.search(r'(\d\.\d\.\d)', output)
             if m and Version(m.group(1)) <= Version('1.7.2'):
                 logger.debug('Wrong encfs version %s' % m.group(1), self)
@@ -345,9 +346,22 @@ class Encode(object):
     """
     encode path with encfsctl.
     ENCFS_SSH will replace config.ENCODE whit this
+
+    EncFS encodes each path component on its own, depending only on the
+    component and its (encoded) parent folder. Encoded components are kept
+    in a LRU cache keyed by ``(encoded parent, component)`` so paths whose
+    components were all seen before are encoded without asking
+    ``encfsctl``. As config.ENCODE is used for rsync include, exclude and
+    remote paths as well as snapshot paths, they all share the cache.
     """
+    # max number of path components kept in cache
+    CACHE_SIZE = 100000
+
     def __init__(self, encfs):
         self.encfs = encfs
+        self.cache = collections.OrderedDict()
+        self.cacheHits = 0
+        self.cacheMisses = 0
         self.password = self.encfs.password
         self.chroot = self.encfs.rev_root.currentMountpoint
         if not self.chroot[-1] == os.sep:
@@ -382,6 +396,56 @@ class Encode(object):
                                     universal_newlines = True)
 
     def path(self, path):
+        """
+        return encrypted path from cache or encode it with encfsctl.
+
+        encfsctl drops leading slashes and keeps all other slashes, so do we.
+        """
+        stripped = path.lstrip(os.sep)
+        parts = stripped.split(os.sep)
+        enc = []
+        parent = ''
+        for part in parts:
+            if part:
+                key = (parent, part)
+                part = self.cache.get(key)
+                if part is None:
+                    break
+                self.cache.move_to_end(key)
+                parent = os.path.join(parent, part)
+            enc.append(part)
+        else:
+            self.cacheHits += 1
+            return os.sep.join(enc)
+
+        self.cacheMisses += 1
+        ret = self.encode(path)
+        encParts = ret.split(os.sep)
+        if len(encParts) == len(parts):
+            parent = ''
+            for part, encPart in zip(parts, encParts):
+                if not part or not encPart:
+                    continue
+                self.cache[(parent, part)] = encPart
+                self.cache.move_to_end((parent, part))
+                parent = os.path.join(parent, encPart)
+            while len(self.cache) > self.CACHE_SIZE:
+                self.cache.popitem(last = False)
+        return ret
+
+    def hitRate(self):
+        """
+        Ratio of paths which could be encoded from cache.
+
+        Returns:
+            float:  hit rate between 0.0 and 1.0
+        """
+        total = self.cacheHits + self.cacheMisses
+        if not total:
+            return 0.0
+        return self.cacheHits / total
+
+    def encode(self, path):
         """
         write plain path to encfsctl stdin and read encrypted path from stdout
         """
@@ -460,9 +524,93 @@ class Encode(object):
         stop encfsctl process
         """
         if 'p' in vars(self) and self.p.returncode is None:
-            logger.debug('stop \'encfsctl encode\' process', self)
+            logger.debug('stop \'encfsctl encode\' process '
+                         '(cache hit rate {:.0%} of {} paths)'.format(
+                             self.hitRate(),
+                             self.cacheHits + self.cacheMisses),
+                         self)
             self.p.communicate()
 
+class DecodePool(object):
+    """
+    Decode takesnapshot.log with multiple 'encfsctl decode' processes in
+    parallel.
+
+    Lines are split into batches of :py:data:`Decode.BATCH_LINES` which are
+    distributed round robin to the workers. Each worker is a
+    :py:class:`Decode` instance with its own process and thread. Results
+    are yielded in original order as soon as a batch is done.
+
+    Args:
+        cfg (config.Config):    current config
+        workers (int):          number of workers. Defaults to
+                                :py:func:`config.Config.decodeWorkers`
+    """
+    def __init__(self, cfg, workers = None):
+        self.config = cfg
+        if workers is None:
+            workers = cfg.decodeWorkers()
+        self.workers = [Decode(cfg) for _ in range(max(1, workers))]
+        # one thread per worker as Decode is not thread safe
+        self.executors = [ThreadPoolExecutor(max_workers = 1)
+                          for _ in self.workers]
+
+    def __del__(self):
+        self.close()
+
+    @staticmethod
+    def _decodeBatch(decode, batch):
+        decode.prefetchLog(batch)
+        return [decode.log(line) for line in batch]
+
+    def log(self, line):
+        """
+        decode paths in a single line of takesnapshot.log
+        """
+        return self.workers[0].log(line)
+
+    def logLines(self, lines):
+        """
+        Decode paths in many lines of takesnapshot.log in parallel.
+
+        Args:
+            lines (iterable):   lines from takesnapshot.log
+
+        Yields:
+            str:                decoded lines in same order
+        """
+        lines = iter(lines)
+        batchSize = self.workers[0].BATCH_LINES
+        pending = collections.deque()
+        try:
+            for index in itertools.count():
+                # keep two batches per worker in flight
+                while len(pending) < 2 * len(self.workers):
+                    batch = list(itertools.islice(lines, batchSize))
+                    if not batch:
+                        break
+                    worker = (index + len(pending)) % len(self.workers)
+                    pending.append(self.executors[worker].submit(
+                        self._decodeBatch, self.workers[worker], batch))
+                if not pending:
+                    return
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+            for future in pending:
+                if not future.cancelled():
+                    future.exception()
+
+    def close(self):
+        """
+        stop all workers
+        """
+        for executor in getattr(self, 'executors', ()):
+            executor.shutdown(wait = True)
+        for decode in getattr(self, 'workers', ()):
+            decode.close()
+
 class Bounce(object):
     """
     Dummy class that will simply return all input.
@@ -483,15 +631,37 @@ class Bounce(object):
     def remote(self, path):
         return path
 
+    def list(self, list_):
+        return list(list_)
+
     def close(self):
         pass
 
 class Decode(object):
     """
     decode path with encfsctl.
+
+    Decoded paths are kept in a LRU cache keyed by the encrypted path. As
+    EncFS encrypts each path component on its own, the decoded parent
+    folders of each path are cached, too. Many paths can be decoded at once
+    with :py:func:`list` which writes them to ``encfsctl`` in batches before
+    reading the results instead of waiting for each path on its own.
     """
+    # max number of encrypted paths kept in cache
+    CACHE_SIZE = 100000
+    # max number of bytes written to encfsctl before reading the results.
+    # Must stay below the pipe buffer size so encfsctl never blocks on a
+    # full stdout pipe while we are still writing to its stdin.
+    PIPELINE_BYTES = 32 * 1024
+    # number of lines buffered by callers which decode a stream of paths
+    BATCH_LINES = 1000
+
     def __init__(self, cfg, string = True):
         self.config = cfg
+        self.cache = collections.OrderedDict()
+        self.cacheHits = 0
+        self.cacheMisses = 0
+        self._collect = None
         self.mode = cfg.snapshotsMode()
 
         if self.mode == 'local_encfs':
@@ -614,37 +784,157 @@ class Decode(object):
                                       universal_newlines = self.string,   #return string (if True) or bytes
                                       bufsize = 0)
 
-    def path(self, path):
+    def _process(self):
         """
-        write encrypted path to encfsctl stdin and read plain path from stdout
-        if stdout is empty (most likely because there was an error) return crypt path
+        Return a running 'encfsctl decode' process. Start or restart it
+        if necessary.
         """
-        if self.string:
-            assert isinstance(path, str), 'path is not str type: %s' % path
-        else:
-            assert isinstance(path, bytes), 'path is not bytes type: %s' % path
         if not 'p' in vars(self):
             self.startProcess()
         if not self.p.returncode is None:
             logger.warning('\'encfsctl decode\' process terminated. Restarting.', self)
             del self.p
             self.startProcess()
-        self.p.stdin.write(path + self.newline)
-        ret = self.p.stdout.readline()
-        ret = ret.strip(self.newline)
-        if ret:
-            return ret
-        return path
+        return self.p
+
+    def _checkType(self, path):
+        if self.string:
+            assert isinstance(path, str), 'path is not str type: %s' % path
+        else:
+            assert isinstance(path, bytes), 'path is not bytes type: %s' % path
+
+    def _cacheGet(self, path):
+        try:
+            ret = self.cache[path]
+        except KeyError:
+            self.cacheMisses += 1
+            return None
+        self.cache.move_to_end(path)
+        self.cacheHits += 1
+        return ret
+
+    def _cachePut(self, path, plain):
+        """
+        Store decoded ``plain`` for ``path`` and all its parent folders.
+        """
+        sep = os.sep if self.string else os.sep.encode()
+        self.cache[path] = plain
+        self.cache.move_to_end(path)
+        crypt = path.rstrip(sep).split(sep)
+        dec = plain.rstrip(sep).split(sep)
+        if plain != path and len(crypt) == len(dec):
+            for i in range(1, len(crypt)):
+                parent = sep.join(crypt[:i])
+                if parent:
+                    self.cache[parent] = sep.join(dec[:i])
+                    self.cache.move_to_end(parent)
+        while len(self.cache) > self.CACHE_SIZE:
+            self.cache.popitem(last = False)
+
+    def _decode(self, paths):
+        """
+        Decode ``paths`` with encfsctl. Paths are written in batches of at
+        most :py:data:`PIPELINE_BYTES` before the results are read.
+
+        Args:
+            paths (list):   encrypted paths not containing newlines
+
+        Returns:
+            list:           decoded paths in same order. Paths which could
+                            not be decoded are returned unchanged
+        """
+        output = list(paths)
+        # a newline inside a path would break the line based protocol
+        todo = [i for i, path in enumerate(paths) if not self.newline in path]
+        start = 0
+        while start < len(todo):
+            size = 0
+            stop = start
+            while stop < len(todo) and (stop == start
+                    or size + len(paths[todo[stop]]) + 1 <= self.PIPELINE_BYTES):
+                size += len(paths[todo[stop]]) + 1
+                stop += 1
+            batch = todo[start:stop]
+            proc = self._process()
+            proc.stdin.write(self.newline.join([paths[i] for i in batch]) + self.newline)
+            for i in batch:
+                ret = proc.stdout.readline().strip(self.newline)
+                if ret:
+                    output[i] = ret
+            start = stop
+        return output
+
+    def path(self, path):
+        """
+        write encrypted path to encfsctl stdin and read plain path from stdout
+        if stdout is empty (most likely because there was an error) return crypt path
+        """
+        self._checkType(path)
+        if self._collect is not None:
+            self._collect.append(path)
+            return path
+        ret = self._cacheGet(path)
+        if ret is None:
+            ret = self._decode([path])[0]
+            if ret != path:
+                self._cachePut(path, ret)
+        return ret
 
     #TODO: rename this, 'list' is corrupting sphinx doc
     def list(self, list_):
         """
-        decode a list of paths
+        decode a list of paths. All paths which are not cached yet are sent
+        to encfsctl in batches instead of one by one.
         """
-        output = []
+        list_ = list(list_)
+        decoded = {}
         for path in list_:
-            output.append(self.path(path))
-        return output
+            self._checkType(path)
+            if not path in decoded:
+                decoded[path] = self._cacheGet(path)
+        missing = [path for path, ret in decoded.items() if ret is None]
+        for path, ret in zip(missing, self._decode(missing)):
+            decoded[path] = ret
+            if ret != path:
+                self._cachePut(path, ret)
+        return [decoded[path] for path in list_]
+
+    def prefetchLog(self, lines):
+        """
+        Decode all paths found in log ``lines`` in one batch so following
+        calls of :py:func:`log` for these lines are answered from cache.
+
+        Args:
+            lines (list):   lines from takesnapshot.log
+        """
+        self._collect = []
+        try:
+            for line in lines:
+                self.log(line)
+            paths = self._collect
+        finally:
+            self._collect = None
+        self.list(paths)
+
+    def logLines(self, lines):
+        """
+        Decode paths in many lines of takesnapshot.log. All paths of a batch
+        of :py:data:`BATCH_LINES` lines are decoded at once.
+
+        Args:
+            lines (iterable):   lines from takesnapshot.log
+
+        Yields:
+            str:                decoded lines in same order
+        """
+        lines = iter(lines)
+        while True:
+            batch = list(itertools.islice(lines, self.BATCH_LINES))
+            if not batch:
+                return
+            self.prefetchLog(batch)
+            for line in batch:
+                yield self.log(line)
 
     def log(self, line):
         """
@@ -0,0 +1,241 @@
+#    Back In Time
+#    Copyright (C) 2008-2022 Oprea Dan, Bart de Koning, Richard Bailey,
+#    Germar Reitze
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""Index of all paths in a snapshot, used to search in all snapshots.
+
+Every snapshot gets a ``pathindex.gz`` file next to ``fileinfo.bz2`` with
+the sorted paths of all files and folders in the snapshot. Paths are front
+coded (each path only stores the part which differs from the path before)
+and compressed, so the index is small and can be read quickly even over
+sshfs. Searching reads these indexes instead of walking the snapshots.
+
+Snapshots taken before the index was introduced are searched through their
+``fileinfo.bz2`` which lists the same paths. Their index is created on the
+fly during the first search.
+"""
+import os
+import re
+import bz2
+import gzip
+import fnmatch
+import logger
+
+FILENAME = 'pathindex.gz'
+MAGIC = b'BITPATHINDEX 1\n'
+
+# bytes read from the compressed index at once
+CHUNK = 1024 * 1024
+
+
+def commonPrefix(a, b):
+    """
+    Length of the common prefix of ``a`` and ``b``. Uses bisection on
+    slices which is a lot faster than comparing byte by byte in Python.
+    """
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        mid = (low + high + 1) // 2
+        if a[:mid] == b[:mid]:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+def write(filename, paths):
+    """
+    Write the index ``filename``. The file is replaced atomically so readers
+    never see a partial index.
+
+    Args:
+        filename (str): path of the index file
+        paths (iterable): full paths (bytes) of all files and folders
+    """
+    tmp = filename + '.tmp'
+    try:
+        with gzip.open(tmp, 'wb', compresslevel = 6) as f:
+            f.write(MAGIC)
+            last = b''
+            for path in sorted(paths):
+                n = commonPrefix(last, path)
+                f.write(b'%d %s\0' % (n, path[n:]))
+                last = path
+        os.replace(tmp, filename)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def read(filename):
+    """
+    Read all paths from index ``filename`` in sorted order.
+
+    Args:
+        filename (str): path of the index file
+
+    Yields:
+        bytes:          full paths
+
+    Raises:
+        OSError:        if the index can not be read
+        ValueError:     if ``filename`` is not a valid index
+    """
+    with gzip.open(filename, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError('{} is not a path index'.format(filename))
+        last = b''
+        rest = b''
+        while True:
+            data = f.read(CHUNK)
+            if not data:
+                break
+            records = (rest + data).split(b'\0')
+            rest = records.pop()
+            for record in records:
+                n, sep, suffix = record.partition(b' ')
+                last = last[:int(n)] + suffix
+                yield last
+        if rest:
+            raise ValueError('{} is truncated'.format(filename))
+
+
+def fileInfoPaths(filename):
+    """
+    Read paths from a snapshots ``fileinfo.bz2``. Used for snapshots which
+    don't have an index yet.
+
+    Yields:
+        bytes:  full paths in the order of ``filename``
+    """
+    with bz2.BZ2File(filename, 'rb') as f:
+        for line in f:
+            line = line.rstrip(b'\n')
+            index = line.find(b'/')
+            if index >= 0:
+                yield line[index:]
+
+
+def matcher(pattern, caseSensitive = False):
+    """
+    Create a function which checks if a path matches ``pattern``.
+
+    ``pattern`` is a shell pattern like ``*.txt``. Without wildcards
+    (``*``, ``?`` or ``[``) it matches all names which contain ``pattern``.
+    A pattern without ``/`` is compared with the file name only, otherwise
+    with the full path.
+
+    Args:
+        pattern (str):          pattern to search for
+        caseSensitive (bool):   compare case sensitive
+
+    Returns:
+        function:               takes a path (bytes) and returns ``True``
+                                if it matches
+    """
+    if not any(c in pattern for c in '*?['):
+        pattern = '*{}*'.format(pattern)
+    flags = 0 if caseSensitive else re.IGNORECASE
+    regex = re.compile(fnmatch.translate(pattern), flags)
+
+    if '/' in pattern:
+        return lambda path: regex.match(os.fsdecode(path)) is not None
+
+    def match(path):
+        name = path[path.rfind(b'/') + 1:]
+        return bool(name) and regex.match(os.fsdecode(name)) is not None
+    return match
+
+
+def paths(sid):
+    """
+    All paths in snapshot ``sid``. If the snapshot has no index yet, paths
+    are read from its ``fileinfo.bz2`` and the index is created once all
+    paths were read.
+
+    Args:
+        sid (snapshots.SID):    snapshot
+
+    Yields:
+        bytes:                  full paths
+    """
+    filename = sid.path(FILENAME)
+    if os.path.exists(filename):
+        try:
+            yield from read(filename)
+            return
+        except (OSError, ValueError, EOFError) as e:
+            logger.warning('Failed to read path index of {}: {}'.format(
+                           sid, str(e)))
+            return
+
+    fileInfo = sid.path(sid.FILEINFO)
+    if not os.path.exists(fileInfo):
+        logger.warning('Snapshot {} has no path index'.format(sid))
+        return
+
+    collected = []
+    try:
+        for path in fileInfoPaths(fileInfo):
+            collected.append(path)
+            yield path
+    except (OSError, EOFError) as e:
+        logger.warning('Failed to read {} of {}: {}'.format(
+                       sid.FILEINFO, sid, str(e)))
+        return
+    try:
+        write(filename, collected)
+    except OSError as e:
+        logger.debug('Failed to create path index of {}: {}'.format(
+                     sid, str(e)))
+
+
+def search(sids, pattern, caseSensitive = False,
+           callback = None, interrupted = lambda: False):
+    """
+    Search ``pattern`` in all snapshots ``sids``. Results are yielded as
+    soon as they are found, snapshot by snapshot in the order of ``sids``.
+
+    Args:
+        sids (list):            :py:class:`snapshots.SID` to search in
+        pattern (str):          see :py:func:`matcher`
+        caseSensitive (bool):   compare case sensitive
+        callback (function):    called with each snapshot before it is
+                                searched
+        interrupted (function): return ``True`` to stop
+
+    Yields:
+        tuple:                  (sid, path) of all matches. ``path`` is
+                                bytes
+    """
+    match = matcher(pattern, caseSensitive)
+    for sid in sids:
+        if interrupted():
+            return
+        if callback:
+            callback(sid)
+        it = paths(sid)
+        try:
+            for count, path in enumerate(it):
+                if match(path):
+                    yield (sid, path)
+                if not count % 10000 and interrupted():
+                    return
+        finally:
+            it.close()
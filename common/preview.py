@@ -0,0 +1,149 @@
+#    Back In Time
+#    Copyright (C) 2008-2022 Oprea Dan, Bart de Koning, Richard Bailey,
+#    Germar Reitze
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""Open files from snapshots in other applications without risking them.
+
+Files in snapshots are hardlinked into other snapshots, so an application
+which changes a file would silently change the backup. Instead of always
+copying the file first, the cheapest safe way is used:
+
+1. :py:data:`DIRECT`: the file can't be changed by the current user
+   because it belongs to another user and neither the file nor its folder
+   are writable, or the snapshots are mounted read-only. It is opened in
+   place.
+2. :py:data:`REFLINK`: a copy-on-write clone (``cp --reflink=always``) in a
+   temporary folder next to the snapshots. It shares all data with the
+   original, so even huge files are cloned immediately.
+3. :py:data:`COPY`: a full copy in a local temporary folder. Only used if
+   the filesystem doesn't support reflinks (e.g. ext4 or sshfs).
+"""
+import os
+import shutil
+import subprocess
+from tempfile import TemporaryDirectory
+import logger
+
+DIRECT = 'direct'
+REFLINK = 'reflink'
+COPY = 'copy'
+
+PREFIX = '.preview_'
+
+
+def isReadOnly(path):
+    """
+    ``True`` if the file ``path`` can't be changed, replaced or removed by
+    the current user. Missing write permissions are not enough if the user
+    owns the file, because the owner (or an editor) can simply change them.
+    Folders are never considered read-only because files inside of them
+    might be writable.
+
+    Args:
+        path (str): full path
+
+    Returns:
+        bool:       ``True`` if it is safe to open ``path`` directly
+    """
+    if os.path.isdir(path):
+        return False
+    try:
+        if os.statvfs(path).f_flag & os.ST_RDONLY:
+            return True
+        st = os.stat(path)
+    except OSError:
+        return False
+    uid = os.geteuid()
+    if uid == 0 or st.st_uid == uid:
+        return False
+    return not os.access(path, os.W_OK) \
+        and not os.access(os.path.dirname(path), os.W_OK)
+
+
+def identical(path1, path2):
+    """
+    ``True`` if ``path1`` and ``path2`` are the same file. Unchanged files are
+    hardlinked between snapshots, so comparing them is not necessary.
+
+    Args:
+        path1 (str):    full path
+        path2 (str):    full path
+
+    Returns:
+        bool:           ``True`` if both are the same inode
+    """
+    try:
+        return os.path.isfile(path1) and os.path.samefile(path1, path2)
+    except OSError:
+        return False
+
+
+def reflink(src, dest):
+    """
+    Clone ``src`` (file or folder) to ``dest`` with
+    ``cp --reflink=always``.
+
+    Returns:
+        bool:   ``True`` if successful
+    """
+    proc = subprocess.run(['cp', '-a', '--reflink=always', '--', src, dest],
+                          stdout=subprocess.DEVNULL,
+                          stderr=subprocess.DEVNULL)
+    return proc.returncode == 0
+
+
+def create(path, suffix = '', cowDir = None):
+    """
+    Create a preview of ``path`` which can be opened by other applications
+    without changing the original.
+
+    Args:
+        path (str):     file or folder in a snapshot
+        suffix (str):   suffix for temporary folders
+        cowDir (str):   folder on the same filesystem as ``path`` where
+                        reflink clones can be created. ``None`` to skip
+                        reflinks
+
+    Returns:
+        tuple:          (path to open, ``TemporaryDirectory`` which must be
+                        cleaned up later or ``None``, method used)
+    """
+    if isReadOnly(path):
+        return (path, None, DIRECT)
+
+    name = os.path.basename(path.rstrip(os.sep))
+
+    if cowDir:
+        try:
+            d = TemporaryDirectory(prefix = PREFIX, suffix = suffix,
+                                   dir = cowDir)
+        except OSError as e:
+            logger.debug('Failed to create preview folder in {}: {}'.format(
+                         cowDir, str(e)))
+        else:
+            dest = os.path.join(d.name, name)
+            if reflink(path, dest):
+                return (dest, d, REFLINK)
+            d.cleanup()
+
+    d = TemporaryDirectory(suffix = suffix)
+    dest = os.path.join(d.name, name)
+    if os.path.isdir(path):
+        shutil.copytree(path, dest, symlinks = True)
+    else:
+        shutil.copy(path, dest)
+    logger.debug('Copied {} for preview'.format(path))
+    return (dest, d, COPY)
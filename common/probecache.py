@@ -0,0 +1,145 @@
+#    Back In Time
+#    Copyright (C) 2008-2022 Oprea Dan, Bart de Koning, Richard Bailey,
+#    Germar Reitze
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""Cache the output of external tool probes like ``rsync --version``.
+
+Results are keyed by the resolved binary, its arguments and environment and
+are only valid as long as modification time and size of the binary don't
+change. The cache is kept in memory and persisted in the user data folder
+(see :py:func:`setCacheFile`), so following processes don't need to run the
+probe again after the tool was probed once.
+"""
+import os
+import json
+import shutil
+import subprocess
+import tempfile
+import threading
+
+import logger
+
+CACHE_FILE = None
+
+_cache = None
+_lock = threading.Lock()
+
+
+def setCacheFile(path):
+    """
+    Persist the cache in ``path``. Until this was called probes are only
+    cached in memory. :py:class:`config.Config` sets this to a file inside
+    its local data folder.
+
+    Args:
+        path (str):     full path to the cache file or ``None``
+    """
+    global CACHE_FILE, _cache
+    with _lock:
+        if path != CACHE_FILE:
+            CACHE_FILE = path
+            _cache = None
+
+
+def _load():
+    global _cache
+    if _cache is None:
+        if CACHE_FILE is None:
+            _cache = {}
+            return _cache
+        try:
+            with open(CACHE_FILE, 'rt') as f:
+                _cache = json.load(f)
+            if not isinstance(_cache, dict):
+                raise ValueError('Invalid probe cache')
+        except (OSError, ValueError) as e:
+            logger.debug('Failed to load probe cache %s: %s'
+                         % (CACHE_FILE, str(e)))
+            _cache = {}
+    return _cache
+
+
+def _save():
+    if CACHE_FILE is None:
+        return
+    try:
+        os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix='.probe_cache_',
+                                   dir=os.path.dirname(CACHE_FILE))
+        with os.fdopen(fd, 'wt') as f:
+            json.dump(_cache, f)
+        os.replace(tmp, CACHE_FILE)
+
+    except OSError as e:
+        logger.debug('Failed to save probe cache %s: %s'
+                     % (CACHE_FILE, str(e)))
+
+
+def probe(cmd, env=None):
+    """
+    Run the probe ``cmd`` or return its cached result.
+
+    Args:
+        cmd (list):     command and arguments. ``cmd[0]`` is searched in
+                        'PATH' if it isn't an absolute path
+        env (dict):     environment for the probe
+
+    Returns:
+        tuple:          (returncode, stdout, stderr)
+
+    Raises:
+        FileNotFoundError:  if ``cmd[0]`` doesn't exist
+    """
+    binary = shutil.which(cmd[0])
+    if binary is None:
+        raise FileNotFoundError(2, 'No such file or directory', cmd[0])
+
+    binary = os.path.realpath(binary)
+    st = os.stat(binary)
+    key = json.dumps([binary] + list(cmd[1:]) + [env])
+
+    with _lock:
+        entry = _load().get(key)
+        if entry and entry['mtime'] == st.st_mtime_ns \
+                and entry['size'] == st.st_size:
+            return entry['returncode'], entry['stdout'], entry['stderr']
+
+    with subprocess.Popen([binary] + list(cmd[1:]),
+                          env=env,
+                          stdout=subprocess.PIPE,
+                          stderr=subprocess.PIPE,
+                          universal_newlines=True) as proc:
+        stdout, stderr = proc.communicate()
+
+    with _lock:
+        _load()[key] = {'mtime': st.st_mtime_ns,
+                        'size': st.st_size,
+                        'returncode': proc.returncode,
+                        'stdout': stdout,
+                        'stderr': stderr}
+        _save()
+
+    return proc.returncode, stdout, stderr
+
+
+def clear():
+    """
+    Drop all cached probes in memory and on disk.
+    """
+    global _cache
+    with _lock:
+        _cache = {}
+        _save()
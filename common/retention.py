@@ -0,0 +1,600 @@
+#    Back In Time
+#    Copyright (C) 2008-2022 Oprea Dan, Bart de Koning, Richard Bailey,
+#    Germar Reitze
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""Retention policies which decide which snapshots get removed.
+
+Policies are applied in order to a :py:class:`Catalog` (the snapshots and
+their metadata in memory) and fill one :py:class:`Plan`. Policies with fixed
+rules (remove older than, Smart Remove) decide in memory. Policies which
+depend on the state of the filesystem (min free space, min free inodes) add
+an ordered list of candidates which are removed one after another during
+:py:func:`execute` until the policy is satisfied.
+
+The same plan can be executed against the real snapshots or against a
+:py:class:`SimulatedStorage` with a synthetic snapshot history (see
+:py:func:`syntheticCatalog` and :py:func:`simulate`).
+"""
+import bisect
+import datetime
+import operator
+import random
+import time
+
+import logger
+
+
+def sidBound(date, tag):
+    """
+    Snapshot ID string for ``date`` (midnight if it is a
+    :py:class:`datetime.date`). This is the same as
+    ``snapshots.SID(date, cfg).sid``.
+
+    Args:
+        date (datetime.date):   date
+        tag (str):              snapshot tag of the profile
+
+    Returns:
+        str:                    snapshot ID
+    """
+    if isinstance(date, datetime.datetime):
+        return '-'.join((date.strftime('%Y%m%d-%H%M%S'), tag))
+
+    return '-'.join((date.strftime('%Y%m%d-000000'), tag))
+
+
+class Catalog(object):
+    """
+    Snapshots sorted from oldest to newest with lazily loaded metadata.
+
+    Args:
+        snapshots (list):   :py:class:`snapshots.SID` instances or any
+                            objects with the attributes ``sid``, ``failed``
+                            and ``name``
+        keepNamed (bool):   named snapshots must not be removed
+    """
+    def __init__(self, snapshots, keepNamed=False):
+        self.snapshots = sorted(snapshots, key=operator.attrgetter('sid'))
+        self.keys = [sid.sid for sid in self.snapshots]
+        self.keepNamed = keepNamed
+        self._failed = {}
+        self._named = {}
+
+    def __len__(self):
+        return len(self.snapshots)
+
+    def __iter__(self):
+        return iter(self.snapshots)
+
+    @property
+    def newest(self):
+        return self.snapshots[-1] if self.snapshots else None
+
+    def failed(self, sid):
+        try:
+            return self._failed[sid]
+        except KeyError:
+            self._failed[sid] = bool(sid.failed)
+            return self._failed[sid]
+
+    def protected(self, sid):
+        """
+        ``True`` if ``sid`` is named and named snapshots must be kept.
+        """
+        if not self.keepNamed:
+            return False
+
+        try:
+            return self._named[sid]
+        except KeyError:
+            self._named[sid] = bool(sid.name)
+            return self._named[sid]
+
+    def bounds(self, lo, hi):
+        """
+        Indexes of all snapshots with ``lo <= sid < hi``.
+
+        Args:
+            lo (str):   lower snapshot ID
+            hi (str):   upper snapshot ID
+
+        Returns:
+            tuple:      (start, stop) indexes in :py:attr:`snapshots`
+        """
+        return (bisect.bisect_left(self.keys, lo),
+                bisect.bisect_left(self.keys, hi))
+
+
+class Plan(object):
+    """
+    Result of applying retention policies to a :py:class:`Catalog`.
+
+    Attributes:
+        keep (dict):        snapshots which must be kept and a list of
+                            reasons for each
+        remove (dict):      snapshots which will be removed in one batch and
+                            the policy which removes them (ordered)
+        conditional (list): tuples of (policy, candidates) for policies
+                            which remove candidates until they are satisfied
+    """
+    def __init__(self):
+        self.keep = {}
+        self.remove = {}
+        self.conditional = []
+
+    def keepSnapshot(self, sid, reason):
+        self.keep.setdefault(sid, []).append(reason)
+
+    def removeSnapshot(self, sid, reason):
+        if sid not in self.remove:
+            self.remove[sid] = reason
+
+    def remaining(self, catalog):
+        """
+        Snapshots of ``catalog`` which are not removed in this plan so far,
+        sorted from oldest to newest.
+        """
+        return [sid for sid in catalog if sid not in self.remove]
+
+
+class Policy(object):
+    """
+    Base class for retention policies.
+    """
+    name = ''
+
+    def apply(self, catalog, plan):
+        """
+        Add the decisions of this policy to ``plan``.
+
+        Args:
+            catalog (Catalog):  snapshots
+            plan (Plan):        plan to change
+        """
+        raise NotImplementedError
+
+    def satisfied(self):
+        """
+        Only for conditional policies. ``True`` if no more snapshots need to
+        be removed.
+        """
+        return True
+
+
+class RemoveOlderThan(Policy):
+    """
+    Remove all snapshots older than ``date``. The newest snapshot is always
+    kept.
+
+    Args:
+        date (datetime.date):   oldest date to keep
+        tag (str):              snapshot tag of the profile
+    """
+    name = 'older'
+
+    def __init__(self, date, tag):
+        self.bound = sidBound(date, tag)
+
+    def apply(self, catalog, plan):
+        logger.debug('Remove snapshots older than: {}'.format(self.bound[:15]),
+                     self)
+        for sid in plan.remaining(catalog)[:-1]:
+            if sid.sid >= self.bound:
+                break
+
+            if not catalog.protected(sid):
+                plan.removeSnapshot(sid, self.name)
+
+
+class SmartRemove(Policy):
+    """
+    Keep all snapshots of the last days and then one snapshot per day, week,
+    month and year. The first healthy snapshot (not failed) of each bucket
+    is kept.
+
+    The snapshots are sorted once in :py:class:`Catalog`. Each bucket is
+    located by binary search, so this is
+    O(buckets * log(snapshots)).
+
+    Args:
+        now (datetime.datetime):    date and time when takeSnapshot was
+                                    started
+        keepAll (int):              keep all snapshots for the last
+                                    ``keepAll`` days
+        keepOnePerDay (int):        keep one snapshot per day for the last
+                                    ``keepOnePerDay`` days
+        keepOnePerWeek (int):       keep one snapshot per week for the last
+                                    ``keepOnePerWeek`` weeks
+        keepOnePerMonth (int):      keep one snapshot per month for the last
+                                    ``keepOnePerMonth`` months
+        tag (str):                  snapshot tag of the profile
+    """
+    name = 'smart'
+
+    def __init__(self, now, keepAll, keepOnePerDay, keepOnePerWeek,
+                 keepOnePerMonth, tag):
+        self.now = now or datetime.datetime.today()
+        self.keepAll = keepAll
+        self.keepOnePerDay = keepOnePerDay
+        self.keepOnePerWeek = keepOnePerWeek
+        self.keepOnePerMonth = keepOnePerMonth
+        self.tag = tag
+
+    @staticmethod
+    def incMonth(date):
+        if date.month == 12:
+            return datetime.date(date.year + 1, 1, 1)
+        return datetime.date(date.year, date.month + 1, 1)
+
+    @staticmethod
+    def decMonth(date):
+        if date.month == 1:
+            return datetime.date(date.year - 1, 12, 1)
+        return datetime.date(date.year, date.month - 1, 1)
+
+    def keepSet(self, catalog):
+        """
+        Snapshots which must be kept and why.
+
+        Args:
+            catalog (Catalog):  snapshots
+
+        Returns:
+            dict:               snapshots as keys and a list of reasons
+                                ('last', 'all', 'day', 'week', 'month',
+                                'year') as values
+        """
+        keep = {}
+
+        if not len(catalog):
+            return keep
+
+        now = self.now.date()
+        snapshots = catalog.snapshots
+
+        def add(sid, reason):
+            keep.setdefault(sid, []).append(reason)
+
+        def bounds(min_date, max_date):
+            return catalog.bounds(sidBound(min_date, self.tag),
+                                  sidBound(max_date, self.tag))
+
+        def keepFirst(min_date, max_date, reason):
+            lo, hi = bounds(min_date, max_date)
+
+            # keep the newest healthy snapshot in this bucket
+            for i in range(hi - 1, lo - 1, -1):
+                if not catalog.failed(snapshots[i]):
+                    add(snapshots[i], reason)
+                    return
+
+            # all snapshots failed, so keep the newest at all
+            if hi > lo:
+                add(snapshots[hi - 1], reason)
+
+        # keep the last snapshot
+        add(snapshots[-1], 'last')
+
+        # keep all for the last keepAll days
+        if self.keepAll > 0:
+            lo, hi = bounds(now - datetime.timedelta(days=self.keepAll-1),
+                            now + datetime.timedelta(days=1))
+            for sid in snapshots[lo:hi]:
+                add(sid, 'all')
+
+        # keep one per day for the last keepOnePerDay days
+        d = now
+        for i in range(0, self.keepOnePerDay):
+            keepFirst(d, d + datetime.timedelta(days=1), 'day')
+            d -= datetime.timedelta(days=1)
+
+        # keep one per week for the last keepOnePerWeek weeks
+        d = now - datetime.timedelta(days=now.weekday() + 1)
+        for i in range(0, self.keepOnePerWeek):
+            keepFirst(d, d + datetime.timedelta(days=8), 'week')
+            d -= datetime.timedelta(days=7)
+
+        # keep one per month for the last keepOnePerMonth months
+        d1 = datetime.date(now.year, now.month, 1)
+        d2 = self.incMonth(d1)
+        for i in range(0, self.keepOnePerMonth):
+            keepFirst(d1, d2, 'month')
+            d2 = d1
+            d1 = self.decMonth(d1)
+
+        # keep one per year for all years
+        first_year = int(catalog.keys[0][:4])
+        for i in range(first_year, now.year+1):
+            keepFirst(datetime.date(i, 1, 1), datetime.date(i+1, 1, 1), 'year')
+
+        return keep
+
+    def apply(self, catalog, plan):
+        remaining = Catalog(plan.remaining(catalog), catalog.keepNamed)
+        # share already loaded metadata
+        remaining._failed = catalog._failed
+        remaining._named = catalog._named
+
+        if len(remaining) <= 1:
+            logger.debug('There is only one snapshot, so keep it', self)
+            for sid in remaining:
+                plan.keepSnapshot(sid, 'last')
+            return
+
+        keep = self.keepSet(remaining)
+
+        for sid in remaining:
+            if sid in keep:
+                for reason in keep[sid]:
+                    plan.keepSnapshot(sid, reason)
+
+            elif catalog.protected(sid):
+                plan.keepSnapshot(sid, 'named')
+
+            else:
+                plan.removeSnapshot(sid, self.name)
+
+
+class MinFreeSpace(Policy):
+    """
+    Remove the oldest snapshots until there is at least ``minMib`` free
+    space. The newest snapshot is always kept.
+
+    Args:
+        minMib (int):       minimum free space in MiB
+        freeSpace (method): callable which returns the current free space in
+                            MiB or ``None`` if it is unknown
+    """
+    name = 'free space'
+
+    def __init__(self, minMib, freeSpace):
+        self.minMib = minMib
+        self.freeSpace = freeSpace
+
+    def apply(self, catalog, plan):
+        candidates = [sid for sid in plan.remaining(catalog)[:-1]
+                      if not catalog.protected(sid)]
+        plan.conditional.append((self, candidates))
+
+    def satisfied(self):
+        free = self.freeSpace()
+
+        if free is None:
+            logger.warning('Failed to get free space. Skipping', self)
+            return True
+
+        logger.debug('free disk space: {} MiB'.format(free), self)
+        return free >= self.minMib
+
+
+class MinFreeInodes(Policy):
+    """
+    Remove the oldest snapshots until at least ``minPercent`` of all inodes
+    are free. The newest snapshot is always kept.
+
+    Args:
+        minPercent (int):   minimum free inodes in percent
+        inodes (method):    callable which returns a tuple of free and total
+                            inodes or ``None`` if they are unknown
+    """
+    name = 'free inodes'
+
+    def __init__(self, minPercent, inodes):
+        self.minPercent = minPercent
+        self.inodes = inodes
+
+    def apply(self, catalog, plan):
+        candidates = [sid for sid in plan.remaining(catalog)[:-1]
+                      if not catalog.protected(sid)]
+        plan.conditional.append((self, candidates))
+
+    def satisfied(self):
+        inodes = self.inodes()
+
+        if inodes is None:
+            return True
+
+        free, total = inodes
+        logger.debug('free inodes: %.2f%%' % (100.0 / total * free), self)
+        return free >= total * (self.minPercent / 100.0)
+
+
+def plan(catalog, policies):
+    """
+    Apply all ``policies`` in order.
+
+    Args:
+        catalog (Catalog):  snapshots
+        policies (list):    :py:class:`Policy` instances
+
+    Returns:
+        Plan:               the retention plan
+    """
+    result = Plan()
+
+    for policy in policies:
+        policy.apply(catalog, result)
+
+    return result
+
+
+def execute(plan, remove, removeBatch):
+    """
+    Remove all snapshots of ``plan``. First all snapshots decided in memory
+    are removed in one batch. Afterwards candidates of conditional policies
+    are removed one by one until the policy is satisfied. Removed
+    candidates are added to ``plan.remove``.
+
+    Args:
+        plan (Plan):            plan to execute
+        remove (method):        callable which removes one snapshot
+        removeBatch (method):   callable which removes a list of snapshots
+
+    Returns:
+        list:                   all removed snapshots
+    """
+    removed = list(plan.remove)
+
+    if removed:
+        removeBatch(removed)
+
+    for policy, candidates in plan.conditional:
+        for sid in candidates:
+            if sid in plan.remove:
+                continue
+
+            if policy.satisfied():
+                break
+
+            logger.debug('Remove snapshot {} because of {}'.format(
+                         sid, policy.name))
+            remove(sid)
+            plan.removeSnapshot(sid, policy.name)
+            removed.append(sid)
+
+    return removed
+
+
+class SyntheticSnapshot(object):
+    """
+    Snapshot in a synthetic history used for simulations.
+
+    Args:
+        sid (str):      snapshot ID
+        failed (bool):  snapshot failed
+        name (str):     snapshot name
+        size (int):     space in MiB freed if the snapshot is removed
+        inodes (int):   inodes freed if the snapshot is removed
+    """
+    __slots__ = ('sid', 'failed', 'name', 'size', 'inodes')
+
+    def __init__(self, sid, failed=False, name='', size=0, inodes=0):
+        self.sid = sid
+        self.failed = failed
+        self.name = name
+        self.size = size
+        self.inodes = inodes
+
+    def __repr__(self):
+        return self.sid
+
+
+def syntheticCatalog(count,
+                     end=None,
+                     interval=datetime.timedelta(hours=1),
+                     failedRatio=0.0,
+                     namedRatio=0.0,
+                     size=100,
+                     inodes=1000,
+                     tag='123',
+                     keepNamed=False,
+                     seed=None):
+    """
+    Create a catalog with ``count`` snapshots, one every ``interval`` until
+    ``end``.
+
+    Args:
+        count (int):                    number of snapshots
+        end (datetime.datetime):        date of the newest snapshot
+        interval (datetime.timedelta):  time between two snapshots
+        failedRatio (float):            ratio of failed snapshots
+        namedRatio (float):             ratio of named snapshots
+        size (int):                     MiB freed by removing a snapshot
+        inodes (int):                   inodes freed by removing a snapshot
+        tag (str):                      snapshot tag
+        keepNamed (bool):               named snapshots must not be removed
+        seed:                           seed for random failed and named
+                                        snapshots
+
+    Returns:
+        Catalog:                        synthetic snapshots
+    """
+    if end is None:
+        end = datetime.datetime.today()
+
+    rnd = random.Random(seed)
+    snapshots = []
+
+    for i in range(count):
+        date = end - interval * i
+        snapshots.append(SyntheticSnapshot(
+            '-'.join((date.strftime('%Y%m%d-%H%M%S'), tag)),
+            failed=rnd.random() < failedRatio,
+            name='snapshot %s' % i if rnd.random() < namedRatio else '',
+            size=size,
+            inodes=inodes))
+
+    return Catalog(snapshots, keepNamed)
+
+
+class SimulatedStorage(object):
+    """
+    Free space and inodes of a simulated snapshot storage. Removing a
+    :py:class:`SyntheticSnapshot` frees its size and inodes.
+
+    Args:
+        freeSpace (int):    free space in MiB
+        freeInodes (int):   free inodes
+        totalInodes (int):  total inodes
+    """
+    def __init__(self, freeSpace=0, freeInodes=0, totalInodes=1):
+        self.free = freeSpace
+        self.freeInodes = freeInodes
+        self.totalInodes = totalInodes
+        self.removed = []
+
+    def freeSpace(self):
+        return self.free
+
+    def inodes(self):
+        return (self.freeInodes, self.totalInodes)
+
+    def remove(self, sid):
+        self.free += sid.size
+        self.freeInodes += sid.inodes
+        self.removed.append(sid)
+
+    def removeBatch(self, sids):
+        for sid in sids:
+            self.remove(sid)
+
+
+def simulate(catalog, policies, storage=None):
+    """
+    Compute and execute a plan against a :py:class:`SimulatedStorage`.
+
+    Args:
+        catalog (Catalog):          snapshots, usually from
+                                    :py:func:`syntheticCatalog`
+        policies (list):            :py:class:`Policy` instances. Conditional
+                                    policies should use the methods of
+                                    ``storage``
+        storage (SimulatedStorage): simulated storage
+
+    Returns:
+        tuple:                      (:py:class:`Plan`, seconds needed to
+                                    compute the plan, seconds needed to
+                                    execute it)
+    """
+    if storage is None:
+        storage = SimulatedStorage()
+
+    start = time.perf_counter()
+    result = plan(catalog, policies)
+    planned = time.perf_counter()
+    execute(result, storage.remove, storage.removeBatch)
+
+    return result, planned - start, time.perf_counter() - planned
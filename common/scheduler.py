@@ -0,0 +1,535 @@
+#    Back In Time
+#    Copyright (C) 2008-2022 Oprea Dan, Bart de Koning, Richard Bailey,
+#    Germar Reitze
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""Resident scheduler for automatic snapshots.
+
+:py:class:`SchedulerDaemon` triggers scheduled snapshots if
+``global.scheduler_daemon`` is enabled. It keeps config, plugins, rsync
+capabilities and mounts of remote profiles loaded and forks a child
+process for every snapshot. CLI and GUI can talk to it through a local
+socket with :py:func:`request`.
+
+The per-profile cron jobs are kept as fallback if the daemon is not
+running. While it is running ``backup-job`` hands over to it and each
+profile is triggered only once per minute, no matter if by the daemon
+itself or by cron.
+
+The protocol is one JSON object per line, e.g.
+``{"command": "backup", "profile_id": "2", "force": true}``. The daemon
+answers with one JSON object containing ``result`` (``ok`` or ``error``).
+"""
+import os
+import json
+import datetime
+import select
+import signal
+import socket
+import subprocess
+
+import config
+import logger
+import mount
+import snapshots
+import tools
+from exceptions import MountException
+
+# minute, hour, day of month, month, day of week
+CRON_RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+
+def cronFieldValues(field, low, high):
+    """
+    Expand one field of a cron time expression.
+
+    Args:
+        field (str):    cron field like ``*``, ``*/5``, ``1-5`` or ``8,12``
+        low (int):      lowest valid value
+        high (int):     highest valid value
+
+    Returns:
+        set:            all matching values
+
+    Raises:
+        ValueError:     if ``field`` is invalid
+    """
+    values = set()
+    for part in field.split(','):
+        step = 1
+        if '/' in part:
+            part, step = part.split('/', 1)
+            step = int(step)
+            if step < 1:
+                raise ValueError('Invalid step in cron field %s' % field)
+
+        if part == '*':
+            start, end = low, high
+        elif '-' in part:
+            start, end = (int(i) for i in part.split('-', 1))
+        else:
+            start = end = int(part)
+
+        values.update(range(start, end + 1, step))
+    return values
+
+
+def cronMatch(expression, now):
+    """
+    Check if the time fields of a cron line match ``now``.
+
+    Args:
+        expression (str):           first five fields of a cron line
+        now (datetime.datetime):    time to check
+
+    Returns:
+        bool:                       ``True`` if ``expression`` matches
+    """
+    fields = expression.split()
+    if len(fields) != 5:
+        return False
+
+    current = (now.minute,
+               now.hour,
+               now.day,
+               now.month,
+               (now.weekday() + 1) % 7)
+
+    for field, value, (low, high) in zip(fields, current, CRON_RANGES):
+        try:
+            values = cronFieldValues(field, low, high)
+        except ValueError:
+            logger.error('Invalid cron expression: %s' % expression)
+            return False
+        if high == 7 and 7 in values:
+            # 0 and 7 are both sunday
+            values.add(0)
+        if value not in values:
+            return False
+    return True
+
+
+def request(cfg, command, timeout=5, **kwargs):
+    """
+    Send ``command`` to a running :py:class:`SchedulerDaemon`.
+
+    Args:
+        cfg (config.Config):    current config
+        command (str):          ``status``, ``backup`` or ``reload``
+        timeout (int):          socket timeout in seconds
+        **kwargs:               additional arguments for ``command``
+
+    Returns:
+        dict:                   answer of the daemon or ``None`` if no
+                                daemon is listening
+    """
+    path = cfg.schedulerSocket()
+    if not os.path.exists(path):
+        return None
+
+    message = dict(kwargs, command=command, config=cfg._LOCAL_CONFIG_PATH)
+    data = b''
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(path)
+            sock.sendall(json.dumps(message).encode() + b'\n')
+            while not data.endswith(b'\n'):
+                chunk = sock.recv(4096)
+                if not chunk:
+                    break
+                data += chunk
+        return json.loads(data.decode())
+
+    except (OSError, ValueError) as e:
+        logger.debug('Scheduler daemon not available: %s' % str(e))
+        return None
+
+
+class SchedulerDaemon(tools.Daemon):
+    """
+    Trigger scheduled snapshots of all profiles and run snapshots requested
+    through the local socket. Each snapshot runs in a forked child process,
+    so modules, config, plugins and probed rsync capabilities don't need
+    to be loaded again. Remote profiles stay mounted while the daemon is
+    running. The config is reloaded if the config file changed or on SIGHUP.
+
+    Args:
+        cfg (config.Config):    current config
+    """
+    MAX_REQUEST = 65536
+
+    def __init__(self, cfg, *args, **kwargs):
+        self.config = cfg
+        super(SchedulerDaemon, self).__init__(cfg.schedulerPid(),
+                                              *args, **kwargs)
+        self.server = None
+        self.children = {}
+        self.mounts = {}
+        self.lastMinute = None
+        self.triggered = {}
+        self.configMtime = None
+        self.reloadRequested = False
+
+    def run(self):
+        """
+        Schedule snapshots and answer requests until SIGTERM.
+        """
+        signal.signal(signal.SIGHUP, self.reloadHandler)
+        self.configMtime = self.configFileMtime()
+        self.warmUp()
+        self.listen()
+        logger.info('Scheduler daemon started', self)
+
+        try:
+            while True:
+                self.tick()
+
+        except KeyboardInterrupt:
+            pass
+
+        finally:
+            self.shutdown()
+
+    def tick(self):
+        """
+        One iteration of the main loop: trigger due profiles once per minute,
+        answer one pending request and reap finished snapshots.
+        """
+        if self.reloadRequested:
+            self.reload()
+
+        now = datetime.datetime.now().replace(second=0, microsecond=0)
+        if now != self.lastMinute:
+            self.lastMinute = now
+            if self.configFileMtime() != self.configMtime:
+                self.reload()
+            self.schedule(now)
+
+        try:
+            readable = select.select([self.server], [], [], 1)[0]
+        except InterruptedError:
+            readable = []
+
+        if readable:
+            self.handleClient()
+
+        self.reap()
+
+    def warmUp(self):
+        """
+        Load everything which would otherwise be loaded by every single
+        snapshot process.
+        """
+        # later calls are answered from the probe cache
+        tools.rsyncCaps()
+        self.config.PLUGIN_MANAGER.load(cfg=self.config)
+        self.mountAll()
+
+    def reload(self):
+        """
+        Reload the config and warm up again.
+        """
+        logger.info('Reload config', self)
+        self.reloadRequested = False
+        self.umountAll()
+
+        dataPath = None
+        if self.config._LOCAL_DATA_FOLDER != self.config._DEFAULT_LOCAL_DATA_FOLDER:
+            dataPath = self.config.DATA_FOLDER_ROOT
+        self.config = config.Config(config_path=self.config._LOCAL_CONFIG_PATH,
+                                    data_path=dataPath)
+        self.configMtime = self.configFileMtime()
+
+        self.config.PLUGIN_MANAGER.load(cfg=self.config, force=True)
+        self.mountAll()
+
+    def reloadHandler(self, signum, frame):
+        # reload on next tick
+        self.reloadRequested = True
+
+    def configFileMtime(self):
+        try:
+            return os.stat(self.config._LOCAL_CONFIG_PATH).st_mtime_ns
+        except OSError:
+            return None
+
+    def mountAll(self):
+        """
+        Mount all scheduled profiles which need to be mounted and keep them
+        mounted until the daemon stops.
+        """
+        for profile_id in self.config.profiles():
+            if self.config.scheduleMode(profile_id) == self.config.NONE:
+                continue
+            mode = self.config.snapshotsMode(profile_id)
+            if self.config.SNAPSHOT_MODES[mode][0] is None:
+                continue
+
+            try:
+                self.mounts[profile_id] = mount.Mount(
+                    cfg=self.config, profile_id=profile_id).mount()
+
+            except MountException as e:
+                logger.warning('Failed to keep profile %s mounted: %s'
+                               % (profile_id, str(e)), self)
+
+    def umountAll(self):
+        for profile_id, hash_id in self.mounts.items():
+            try:
+                mount.Mount(cfg=self.config,
+                            profile_id=profile_id).umount(hash_id)
+
+            except MountException as e:
+                logger.error(str(e), self)
+
+        self.mounts = {}
+
+    def due(self, profile_id, now):
+        """
+        Check if the schedule of ``profile_id`` matches ``now``.
+
+        Args:
+            profile_id (str):           profile ID
+            now (datetime.datetime):    current minute
+
+        Returns:
+            bool:                       ``True`` if a snapshot is due
+        """
+        if self.config.scheduleMode(profile_id) in (self.config.NONE,
+                                                    self.config.AT_EVERY_BOOT,
+                                                    self.config.UDEV):
+            return False
+
+        cronLine = self.config.cronLine(profile_id)
+        if not isinstance(cronLine, str) or not cronLine:
+            return False
+
+        return cronMatch(' '.join(cronLine.split()[:5]), now)
+
+    def schedule(self, now):
+        if not self.config.schedulerDaemon():
+            # cron takes the snapshots
+            return
+        for profile_id in self.config.profiles():
+            if self.due(profile_id, now):
+                logger.info('Profile %s is scheduled' % profile_id, self)
+                self.trigger(profile_id, now)
+
+    def trigger(self, profile_id, now, checksum=False):
+        """
+        Take a scheduled snapshot of ``profile_id`` unless it was already
+        triggered in this minute. Scheduled cron jobs run ``backup-job``
+        which hands over to the daemon, so both the daemon and cron
+        trigger the same schedule.
+
+        Args:
+            profile_id (str):           profile ID
+            now (datetime.datetime):    current minute
+            checksum (bool):            force ``--checksum``
+
+        Returns:
+            int:                        PID of the child process or
+                                        ``None`` if nothing was started
+        """
+        if self.triggered.get(profile_id) == now:
+            logger.debug('Profile %s was already triggered' % profile_id,
+                         self)
+            return None
+        self.triggered[profile_id] = now
+        # 'backup-job' doesn't force the snapshot either
+        return self.spawn(profile_id, force=False, checksum=checksum,
+                          scheduled=True)
+
+    def spawn(self, profile_id, force=True, checksum=False, scheduled=False):
+        """
+        Fork a child process to take a snapshot of ``profile_id``.
+
+        Args:
+            profile_id (str):   profile ID
+            force (bool):       take the snapshot even if it wouldn't need to
+            checksum (bool):    force ``--checksum``
+            scheduled (bool):   use the same priorities as cron jobs
+                                instead of those for manual snapshots
+
+        Returns:
+            int:                PID of the child process or ``None`` if a
+                                snapshot of this profile is already running
+        """
+        if profile_id in self.children.values():
+            logger.info('Snapshot of profile %s is already running'
+                        % profile_id, self)
+            return None
+
+        pid = os.fork()
+        if pid:
+            self.children[pid] = profile_id
+            return pid
+
+        # child
+        ret = 1
+        try:
+            self.server.close()
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGHUP, signal.SIG_DFL)
+            self.config.setCurrentProfile(profile_id)
+            self.config.forceUseChecksum = checksum
+            tools.envLoad(self.config.cronEnvFile())
+            self.setPriority(scheduled)
+            ret = int(bool(snapshots.Snapshots(self.config).backup(force)))
+
+        except BaseException as e:
+            logger.error('Snapshot of profile %s failed: %s'
+                         % (profile_id, str(e)), self)
+
+        finally:
+            # don't run exit handlers of the daemon (e.g. removing its pidfile)
+            os._exit(ret)
+
+    def setPriority(self, scheduled):
+        """
+        Lower CPU and IO priority of the current snapshot process like
+        ``config.Config.cronCmd`` and ``backintime.takeSnapshotAsync`` do
+        with ``nice`` and ``ionice``.
+
+        Args:
+            scheduled (bool):   ``True`` for scheduled snapshots
+        """
+        if scheduled:
+            nice = self.config.niceOnCron()
+            ionice = self.config.ioniceOnCron()
+        else:
+            nice = False
+            ionice = self.config.ioniceOnUser()
+
+        if nice:
+            os.nice(19 - os.nice(0))
+        if ionice and tools.checkCommand('ionice'):
+            subprocess.run(['ionice', '-c2', '-n7', '-p', str(os.getpid())],
+                           stdout=subprocess.DEVNULL,
+                           stderr=subprocess.DEVNULL)
+
+    def reap(self):
+        """
+        Collect exit codes of finished snapshot processes.
+        """
+        while self.children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.children = {}
+                break
+
+            if not pid:
+                break
+
+            profile_id = self.children.pop(pid, None)
+            logger.debug('Snapshot of profile %s finished with status %s'
+                         % (profile_id, status),
+                         self)
+
+    def listen(self):
+        path = self.config.schedulerSocket()
+        if os.path.exists(path):
+            os.remove(path)
+
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(path)
+        os.chmod(path, 0o600)
+        self.server.listen(5)
+
+    def handleClient(self):
+        conn, _ = self.server.accept()
+        with conn:
+            conn.settimeout(5)
+            try:
+                data = b''
+                while not data.endswith(b'\n') and len(data) < self.MAX_REQUEST:
+                    chunk = conn.recv(4096)
+                    if not chunk:
+                        break
+                    data += chunk
+                answer = self.handleRequest(json.loads(data.decode()))
+
+            except (OSError, ValueError) as e:
+                answer = {'result': 'error', 'message': str(e)}
+
+            try:
+                conn.sendall(json.dumps(answer).encode() + b'\n')
+            except OSError as e:
+                logger.debug('Failed to answer request: %s' % str(e), self)
+
+    def handleRequest(self, message):
+        """
+        Answer one request received through the socket.
+
+        Args:
+            message (dict): request with at least ``command``
+
+        Returns:
+            dict:           answer
+        """
+        command = message.get('command')
+
+        if message.get('config') not in (None, self.config._LOCAL_CONFIG_PATH):
+            return {'result': 'error',
+                    'message': 'Daemon uses config %s'
+                               % self.config._LOCAL_CONFIG_PATH}
+
+        if command == 'status':
+            return {'result': 'ok',
+                    'pid': os.getpid(),
+                    'running': {profile_id: pid for pid, profile_id
+                                in self.children.items()},
+                    'mounted': sorted(self.mounts)}
+
+        if command == 'reload':
+            self.reloadHandler(None, None)
+            return {'result': 'ok'}
+
+        if command == 'backup':
+            profile_id = str(message.get('profile_id', '1'))
+            if profile_id not in self.config.profiles():
+                return {'result': 'error',
+                        'message': 'Profile-ID not found: %s' % profile_id}
+
+            force = bool(message.get('force', True))
+            checksum = bool(message.get('checksum', False))
+            if not force:
+                # scheduled cron job ('backup-job')
+                now = datetime.datetime.now().replace(second=0, microsecond=0)
+                if self.triggered.get(profile_id) == now:
+                    return {'result': 'ok', 'pid': None}
+                pid = self.trigger(profile_id, now, checksum=checksum)
+            else:
+                pid = self.spawn(profile_id, force=True, checksum=checksum)
+            if pid is None:
+                return {'result': 'error',
+                        'message': 'A backup is already running'}
+            return {'result': 'ok', 'pid': pid}
+
+        return {'result': 'error', 'message': 'Unknown command %s' % command}
+
+    def shutdown(self):
+        if self.server:
+            self.server.close()
+            self.server = None
+            try:
+                os.remove(self.config.schedulerSocket())
+            except OSError:
+                pass
+
+        self.umountAll()
+        logger.info('Scheduler daemon stopped', self)
@@ -0,0 +1,391 @@
+#    Back In Time
+#    Copyright (C) 2008-2022 Oprea Dan, Bart de Koning, Richard Bailey,
+#    Germar Reitze
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""Differences between two snapshots.
+
+:py:func:`walk` walks both snapshots side by side. Unchanged files are
+hardlinked between snapshots, so entries with the same inode are equal by
+definition. If both snapshots are on the same filesystem the inode number
+from the directory listing is enough to detect them, so unchanged files
+don't need a single ``stat()`` call.
+
+:py:func:`fromIndex` doesn't walk the snapshots at all. Added and removed
+paths are taken from the path index of both snapshots (see
+:py:mod:`pathindex`). Only paths which rsync reported as changed in the logs
+of all snapshots between the two are checked for modifications. This only
+works if none of the snapshots in between was removed, because their logs
+would be missing.
+
+Added and removed folders are reported as a single change without their
+content.
+"""
+import os
+import stat
+import collections
+import logger
+import pathindex
+import snapshots
+import snapshotlog
+
+ADDED = 'added'
+REMOVED = 'removed'
+MODIFIED = 'modified'
+
+SYMBOLS = {ADDED: '+', REMOVED: '-', MODIFIED: 'M'}
+
+
+class Change(collections.namedtuple('Change', ('status', 'path', 'isDir'))):
+    """
+    A difference between two snapshots.
+
+    Args:
+        status (str):   :py:data:`ADDED`, :py:data:`REMOVED` or
+                        :py:data:`MODIFIED`
+        path (str):     path inside the snapshots
+        isDir (bool):   ``True`` if it is a folder (in the newer snapshot for
+                        modified entries)
+    """
+    __slots__ = ()
+
+    def __str__(self):
+        return '{} {}{}'.format(SYMBOLS[self.status],
+                                self.path,
+                                os.sep if self.isDir and self.path != os.sep
+                                else '')
+
+
+def _join(root, path):
+    return os.path.join(root, path.lstrip(os.sep))
+
+
+def _lstat(path):
+    try:
+        return os.lstat(path)
+    except OSError:
+        return None
+
+
+def _listdir(path):
+    try:
+        with os.scandir(path) as it:
+            return {entry.name: entry for entry in it}
+    except OSError as e:
+        logger.debug('Failed to read {}: {}'.format(path, str(e)))
+        return {}
+
+
+def modified(st1, st2, path1, path2):
+    """
+    Check if two different inodes have different content. Like rsync's
+    quick check, files with same size and modification time are considered
+    equal. Folders are never modified themselves, only their content.
+
+    Args:
+        st1 (os.stat_result):   ``lstat()`` of ``path1``
+        st2 (os.stat_result):   ``lstat()`` of ``path2``
+        path1 (str):            full path in the older snapshot
+        path2 (str):            full path in the newer snapshot
+
+    Returns:
+        bool:                   ``True`` if modified
+    """
+    if stat.S_IFMT(st1.st_mode) != stat.S_IFMT(st2.st_mode):
+        return True
+    if stat.S_ISDIR(st1.st_mode):
+        return False
+    if stat.S_ISLNK(st1.st_mode):
+        try:
+            return os.readlink(path1) != os.readlink(path2)
+        except OSError:
+            return True
+    return st1.st_size != st2.st_size \
+        or int(st1.st_mtime) != int(st2.st_mtime)
+
+
+def walk(old, new, path = os.sep, interrupted = lambda: False):
+    """
+    Compare ``path`` in two snapshots by walking both of them.
+
+    Args:
+        old (str):              backup folder of the older snapshot
+                                (:py:func:`snapshots.SID.pathBackup`)
+        new (str):              backup folder of the newer snapshot
+        path (str):             file or folder inside the snapshots
+        interrupted (function): return ``True`` to stop
+
+    Yields:
+        Change:                 differences, folder by folder
+    """
+    path = os.sep + path.strip(os.sep)
+    st1 = _lstat(_join(old, path))
+    st2 = _lstat(_join(new, path))
+    if st1 is None and st2 is None:
+        return
+    if st1 is None:
+        yield Change(ADDED, path, stat.S_ISDIR(st2.st_mode))
+        return
+    if st2 is None:
+        yield Change(REMOVED, path, stat.S_ISDIR(st1.st_mode))
+        return
+    if st1.st_dev == st2.st_dev and st1.st_ino == st2.st_ino:
+        return
+    if not (stat.S_ISDIR(st1.st_mode) and stat.S_ISDIR(st2.st_mode)):
+        if modified(st1, st2, _join(old, path), _join(new, path)):
+            yield Change(MODIFIED, path, stat.S_ISDIR(st2.st_mode))
+        return
+
+    # inode numbers from the folder listing are only comparable if both
+    # snapshots are on the same filesystem
+    sameDevice = st1.st_dev == st2.st_dev
+
+    stack = [path]
+    while stack:
+        if interrupted():
+            return
+        folder = stack.pop()
+        entries1 = _listdir(_join(old, folder))
+        entries2 = _listdir(_join(new, folder))
+        folders = []
+        for name in sorted(entries1.keys() | entries2.keys()):
+            child = os.path.join(folder, name)
+            e1 = entries1.get(name)
+            e2 = entries2.get(name)
+            if e1 is None:
+                yield Change(ADDED, child, e2.is_dir(follow_symlinks = False))
+                continue
+            if e2 is None:
+                yield Change(REMOVED, child, e1.is_dir(follow_symlinks = False))
+                continue
+            if sameDevice and e1.inode() == e2.inode():
+                continue
+            try:
+                st1 = e1.stat(follow_symlinks = False)
+                st2 = e2.stat(follow_symlinks = False)
+            except OSError as e:
+                logger.debug('Failed to compare {}: {}'.format(child, str(e)))
+                continue
+            if st1.st_dev == st2.st_dev and st1.st_ino == st2.st_ino:
+                continue
+            if stat.S_ISDIR(st1.st_mode) and stat.S_ISDIR(st2.st_mode):
+                folders.append(child)
+            elif modified(st1, st2, e1.path, e2.path):
+                yield Change(MODIFIED, child, stat.S_ISDIR(st2.st_mode))
+        # depth first in order of names
+        stack.extend(reversed(folders))
+
+
+def logPaths(lines):
+    """
+    Paths of changed files and folders from snapshot log lines. Lines look
+    like ``[C] >f.st...... home/user/file`` (see ``--itemize-changes`` in
+    ``man rsync``).
+
+    Args:
+        lines (iterable):   log lines
+
+    Yields:
+        str:                changed paths starting with ``/``
+    """
+    for line in lines:
+        if not line.startswith('[C] ') or len(line) < 17:
+            continue
+        itemize = line[4:15]
+        path = line[16:].rstrip('\n')
+        if itemize[1] == 'L':
+            path = path.split(' -> ', 1)[0]
+        elif itemize[0] == 'h':
+            path = path.split(' => ', 1)[0]
+        yield os.sep + path.rstrip(os.sep)
+
+
+def changedPaths(sids, decode = None):
+    """
+    Paths which changed in snapshots ``sids`` according to their logs.
+
+    Args:
+        sids (list):                snapshots which were taken between the
+                                    two snapshots to compare, including the
+                                    newer one
+        decode (encfstools.Decode): used for decoding logs of encrypted
+                                    profiles or ``None``
+
+    Returns:
+        set:                        changed paths or ``None`` if any of the
+                                    logs doesn't list changes (e.g. because
+                                    of a lower log level)
+    """
+    paths = set()
+    for sid in sids:
+        found = False
+        for path in logPaths(sid.log(snapshotlog.LogFilter.CHANGES, decode)):
+            paths.add(path)
+            found = True
+        if not found:
+            logger.debug('Snapshot log of {} lists no changes'.format(sid))
+            return None
+    return paths
+
+
+def indexedPaths(sid):
+    """
+    All paths in snapshot ``sid`` from its path index or its
+    ``fileinfo.bz2``.
+
+    Args:
+        sid (snapshots.SID):    snapshot
+
+    Returns:
+        set:                    paths starting with ``/`` or ``None`` if
+                                neither of them can be read
+    """
+    filename = sid.path(pathindex.FILENAME)
+    try:
+        if os.path.exists(filename):
+            paths = pathindex.read(filename)
+        else:
+            paths = pathindex.fileInfoPaths(sid.path(sid.FILEINFO))
+        return {os.fsdecode(path) for path in paths}
+    except (OSError, ValueError, EOFError) as e:
+        logger.debug('Failed to read paths of {}: {}'.format(sid, str(e)))
+        return None
+
+
+def historyComplete(first, sids):
+    """
+    Check if each of ``sids`` was taken right after the snapshot before it,
+    so their logs cover all changes since ``first``. Snapshots removed in
+    between (e.g. by smart remove) break the chain.
+
+    Args:
+        first (snapshots.SID):  older snapshot to compare
+        sids (list):            snapshots after ``first`` up to the newer
+                                one, oldest first
+
+    Returns:
+        bool:                   ``True`` if no snapshot is missing
+    """
+    prev = first
+    for sid in sids:
+        if sid.info.strValue('snapshot_previous') != prev.sid:
+            logger.debug('Previous snapshot of {} is unknown or was removed'
+                         .format(sid))
+            return False
+        prev = sid
+    return True
+
+
+def fromIndex(old, new, paths1, paths2, candidates, path = os.sep):
+    """
+    Compare ``path`` in two snapshots by their path indexes. Only
+    ``candidates`` which exist in both snapshots are checked for
+    modifications.
+
+    Args:
+        old (str):          backup folder of the older snapshot
+        new (str):          backup folder of the newer snapshot
+        paths1 (set):       all paths in ``old``, see :py:func:`indexedPaths`
+        paths2 (set):       all paths in ``new``
+        candidates (set):   paths which might have been modified, see
+                            :py:func:`changedPaths`
+        path (str):         file or folder inside the snapshots
+
+    Yields:
+        Change:             differences in order of paths
+    """
+    path = os.sep + path.strip(os.sep)
+    prefix = path.rstrip(os.sep) + os.sep
+
+    def inside(p):
+        return p != os.sep and (p == path or p.startswith(prefix))
+
+    changes = []
+    for status, root, paths in ((ADDED, new, paths2 - paths1),
+                                (REMOVED, old, paths1 - paths2)):
+        paths = {p for p in paths if inside(p)}
+        for p in paths:
+            # content of added or removed folders is not reported
+            if os.path.dirname(p) in paths:
+                continue
+            st = _lstat(_join(root, p))
+            changes.append(Change(status, p,
+                                  st is not None and stat.S_ISDIR(st.st_mode)))
+
+    for p in candidates:
+        if not inside(p) or p not in paths1 or p not in paths2:
+            continue
+        path1 = _join(old, p)
+        path2 = _join(new, p)
+        st1 = _lstat(path1)
+        st2 = _lstat(path2)
+        if st1 is None or st2 is None:
+            continue
+        if st1.st_dev == st2.st_dev and st1.st_ino == st2.st_ino:
+            continue
+        if modified(st1, st2, path1, path2):
+            changes.append(Change(MODIFIED, p, stat.S_ISDIR(st2.st_mode)))
+
+    yield from sorted(changes, key = lambda c: c.path)
+
+
+def diff(sid1, sid2, path = os.sep, useLogs = False, decode = None,
+         interrupted = lambda: False):
+    """
+    Differences of ``path`` from snapshot ``sid1`` to snapshot ``sid2``.
+
+    Args:
+        sid1 (snapshots.SID):       snapshot to compare from
+        sid2 (snapshots.SID):       snapshot to compare to
+        path (str):                 file or folder inside the snapshots
+        useLogs (bool):             use the path indexes and only check
+                                    paths listed as changed in the logs of
+                                    the snapshots in between (see
+                                    :py:func:`fromIndex`). Falls back to
+                                    walking if an index or a log is missing
+                                    or snapshots in between were removed
+        decode (encfstools.Decode): used for decoding logs of encrypted
+                                    profiles or ``None``
+        interrupted (function):     return ``True`` to stop
+
+    Yields:
+        Change:                     differences
+    """
+    old = sid1.pathBackup()
+    new = sid2.pathBackup()
+
+    if useLogs and not sid1.isRoot and not sid2.isRoot:
+        first, last = min(sid1, sid2), max(sid1, sid2)
+        between = [sid for sid in snapshots.listSnapshots(sid1.config,
+                                                          reverse = False)
+                   if first < sid <= last]
+        candidates = None
+        paths1 = paths2 = None
+        if historyComplete(first, between):
+            candidates = changedPaths(between, decode)
+        if candidates is not None:
+            paths1 = indexedPaths(sid1)
+        if paths1 is not None:
+            paths2 = indexedPaths(sid2)
+        if paths2 is not None:
+            for change in fromIndex(old, new, paths1, paths2, candidates, path):
+                if interrupted():
+                    return
+                yield change
+            return
+        logger.info('Snapshot logs or indexes are incomplete. Compare all '
+                    'files.')
+
+    yield from walk(old, new, path, interrupted)
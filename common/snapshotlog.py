@@ -145,6 +145,36 @@ class LogFilter(object):
         else:
             return line
 
+    def filterLines(self, lines):
+        """
+        Filter and decode ``lines`` like :py:func:`filter`. If a ``decode``
+        instance is used, lines are decoded in batches with its
+        ``logLines()``.
+
+        Args:
+            lines (list):   log lines read from disk without trailing newline
+
+        Yields:
+            str:            decoded lines or ``None`` for filtered lines
+        """
+        if not self.decode:
+            for line in lines:
+                yield self.filter(line)
+            return
+
+        def keep(line):
+            return line and (not self.regex or self.regex.match(line))
+
+        decoded = self.decode.logLines(line for line in lines if keep(line))
+        try:
+            for line in lines:
+                if keep(line):
+                    yield next(decoded)
+                else:
+                    yield self.filter(line)
+        finally:
+            decoded.close()
+
 class SnapshotLog(object):
     """
     Read and write Snapshot log to "~/.local/share/backintime/takesnapshot_<N>.log".
@@ -197,8 +227,8 @@ class SnapshotLog(object):
             with open(self.logFileName, 'rt') as f:
                 if logFilter.header and not skipLines:
                     yield logFilter.header
-                for line in f.readlines():
-                    line = logFilter.filter(line.rstrip('\n'))
+                lines = [line.rstrip('\n') for line in f.readlines()]
+                for line in logFilter.filterLines(lines):
                     if not line is None:
                         count += 1
                         if count <= skipLines:
@@ -25,20 +25,29 @@ import bz2
 import pwd
 import getpass
 import grp
+import hashlib
 import subprocess
 import shutil
 import time
 import re
 import fcntl
+import shlex
+import signal
+import threading
+import tempfile
 from tempfile import TemporaryDirectory
+import changetracker
 import config
 import configfile
 import logger
 import tools
 import encfstools
 import mount
+import pathindex
 import progress
+import retention
 import snapshotlog
+import statusevents
 from applicationinstance import ApplicationInstance
 from exceptions import MountException, LastSnapshotSymlink
 
@@ -60,6 +69,7 @@ class Snapshots:
     """
     SNAPSHOT_VERSION = 3
     GLOBAL_FLOCK = '/tmp/backintime.lock'
+    FLOCK_POLL_INTERVAL = 5
 
     def __init__(self, cfg = None):
         self.config = cfg
@@ -85,12 +95,32 @@ class Snapshots:
         self.lastBusyCheck = datetime.datetime(1, 1, 1)
         self.flock = None
         self.restorePermissionFailed = False
+        self.notifier = None
 
     # TODO: make own class for takeSnapshotMessage
     def clearTakeSnapshotMessage(self):
         """Delete message and progress file"""
         Path(self.config.takeSnapshotMessageFile()).unlink(missing_ok=True)
         Path(self.config.takeSnapshotProgressFile()).unlink(missing_ok=True)
+        self.notifyStatus(statusevents.MESSAGE)
+
+    def notifyStatus(self, event):
+        """
+        Tell GUI and systray icon that the state of the backup changed, so
+        they read message and progress files again.
+
+        Args:
+            event (str):    event from :py:mod:`statusevents`
+        """
+        if self.notifier is None:
+            self.notifier = statusevents.Notifier(
+                self.config.takeSnapshotEventsFolder(),
+                self.config.currentProfile())
+        try:
+            self.notifier.send(event)
+        except Exception as e:
+            logger.debug('Failed to send status event: {}'.format(str(e)),
+                         self)
 
     # TODO: make own class for takeSnapshotMessage
     def takeSnapshotMessage(self):
@@ -180,6 +210,8 @@ class Snapshots:
             logger.debug('Failed to set takeSnapshot message '
                          f'to {message_fn}: {str(exc)}', self)
 
+        self.notifyStatus(statusevents.MESSAGE)
+
         # Error message?
         if type_id == 1:
             self.snapshotLog.append('[E] ' + message, 1)
@@ -661,6 +693,10 @@ class Snapshots:
         if isinstance(sid, RootSnapshot):
             return
 
+        # copy-on-write snapshots can be dropped at once
+        if self.config.snapshotsMode() == 'local':
+            self.deleteSubvolume(sid.pathBackup())
+
         # build the rsync command and it's arguments
         rsync = tools.rsyncRemove(self.config)
 
@@ -780,9 +816,10 @@ class Snapshots:
                                    'status is not available', self)
 
                 instance.startApplication()
+                self.notifyStatus(statusevents.STARTED)
 
                 # global flock to block backups from other profiles or users
-                # (and run them serialized)
+                # (and run them serialized or limited per backup target)
                 self.flockExclusive()
                 logger.info('Lock', self)
 
@@ -799,6 +836,7 @@ class Snapshots:
                 except MountException as ex:
                     logger.error(str(ex), self)
                     instance.exitApplication()
+                    self.notifyStatus(statusevents.FINISHED)
                     logger.info('Unlock', self)
                     time.sleep(2)
 
@@ -958,6 +996,7 @@ class Snapshots:
                     logger.error(str(ex), self)
 
                 instance.exitApplication()
+                self.notifyStatus(statusevents.FINISHED)
                 self.flockRelease()
                 logger.info('Unlock', self)
 
@@ -998,6 +1037,7 @@ class Snapshots:
                 #pg.setStrValue('eta', m.group(4))
                 pg.save()
                 del(pg)
+                self.notifyStatus(statusevents.PROGRESS)
             else:
                 ret.append(l)
         return '\n'.join(ret)
@@ -1117,12 +1157,15 @@ class Snapshots:
                         f' command was {cmd}. Also see the previous '
                         'WARNING message for a more details.', parent=self)
 
-    def backupInfo(self, sid):
+    def backupInfo(self, sid, prev_sid = None):
         """
         Save infos about the snapshot into the 'info' file.
 
         Args:
-            sid (SID):  snapshot that should get an info file
+            sid (SID):      snapshot that should get an info file
+            prev_sid (SID): snapshot which was the latest one when ``sid``
+                            was taken. Its changes are logged relative to it
+                            (see :py:mod:`snapshotdiff`)
         """
         logger.info("Create info file", self)
         machine = self.config.host()
@@ -1135,6 +1178,8 @@ class Snapshots:
         i.setStrValue('snapshot_user', user)
         i.setIntValue('snapshot_profile_id', profile_id)
         i.setIntValue('snapshot_tag', sid.tag)
+        if prev_sid:
+            i.setStrValue('snapshot_previous', prev_sid.sid)
         i.setListValue('user', ('int:uid', 'str:name'), list(self.userCache.items()))
         i.setListValue('group', ('int:gid', 'str:name'), list(self.groupCache.items()))
         i.setStrValue('filesystem_mounts', json.dumps(tools.filesystemMountInfo()))
@@ -1143,7 +1188,8 @@ class Snapshots:
     def backupPermissions(self, sid):
         """
         Save permissions (owner, group, read-, write- and executable)
-        for all files in Snapshot ``sid`` into snapshots fileInfoDict.
+        for all files in Snapshot ``sid`` into snapshots fileInfoDict and
+        write the path index used for searching (see :py:mod:`pathindex`).
 
         Args:
             sid (SID):  snapshot that should be scanned
@@ -1163,7 +1209,8 @@ class Snapshots:
 
         # backup permissions of /
         # bugfix for https://github.com/bit-team/backintime/issues/708
-        self.backupPermissionsCallback(b'/', (fileInfoDict, decode))
+        pending = []
+        self.backupPermissionsCallback(b'/', (fileInfoDict, decode, pending))
 
         rsync = ['rsync', '--dry-run', '-s', '-r', '--out-format=%n']
         rsync.extend(tools.rsyncSshArgs(self.config))
@@ -1182,14 +1229,23 @@ class Snapshots:
 
             proc = tools.Execute(rsync,
                                  callback=self.backupPermissionsCallback,
-                                 user_data=(fileInfoDict, decode),
+                                 user_data=(fileInfoDict, decode, pending),
                                  parent=self,
                                  conv_str=False,
                                  join_stderr=False)
             rc = proc.run()
+        self.collectPermissions(fileInfoDict, decode, pending)
 
         sid.fileInfo = fileInfoDict
 
+        # the same list of paths is used to search in all snapshots
+        try:
+            pathindex.write(sid.path(pathindex.FILENAME), fileInfoDict.keys())
+        except OSError as e:
+            logger.error('Failed to write {}: {}'.format(pathindex.FILENAME,
+                                                         str(e)),
+                         self)
+
         return rc
 
     def backupPermissionsCallback(self, line, user_data):
@@ -1198,11 +1254,28 @@ class Snapshots:
 
         Args:
             line(bytes):        output from rsync command
-            user_data (tuple):  two item tuple of (:py:class:`FileInfoDict`,
-                                :py:class:`encfstools.Decode`)
+            user_data (tuple):  three item tuple of (:py:class:`FileInfoDict`,
+                                :py:class:`encfstools.Decode`, list of
+                                pending lines)
+        """
+        fileInfoDict, decode, pending = user_data
+        pending.append(line)
+        if len(pending) >= encfstools.Decode.BATCH_LINES:
+            self.collectPermissions(fileInfoDict, decode, pending)
+
+    def collectPermissions(self, fileInfoDict, decode, pending):
+        """
+        Decode all ``pending`` paths at once, collect their permissions into
+        ``fileInfoDict`` and empty ``pending``.
+
+        Args:
+            fileInfoDict (FileInfoDict):    dict of permissions
+            decode (encfstools.Decode):     instance used for decoding paths
+            pending (list):                 paths (bytes) from rsync output
         """
-        fileInfoDict, decode = user_data
-        self.collectPermission(fileInfoDict, b'/' + decode.path(line).rstrip(b'/'))
+        for path in decode.list(pending):
+            self.collectPermission(fileInfoDict, b'/' + path.rstrip(b'/'))
+        pending.clear()
 
     def collectPermission(self, fileinfo, path):
         """
@@ -1224,6 +1297,461 @@ class Snapshots:
             group = self.groupName(info.st_gid).encode('utf-8', 'replace')
             fileinfo[path] = (mode, user, group)
 
+    def cowBackend(self):
+        """
+        Resolve the copy-on-write backend configured for the current profile.
+
+        Returns:
+            str:    ``'btrfs'``, ``'reflink'`` or ``None`` if snapshots should
+                    be hard-linked with ``--link-dest`` as usual
+        """
+        backend = self.config.cowBackend()
+        if backend == 'none' or self.config.snapshotsMode() != 'local':
+            return None
+
+        path = self.config.snapshotsFullPath()
+        if backend == 'auto':
+            if tools.filesystem(path) == 'btrfs' \
+                    and tools.checkCommand('btrfs'):
+                backend = 'btrfs'
+
+            elif tools.reflinkSupported(path):
+                backend = 'reflink'
+
+            else:
+                logger.debug('Copy-on-write is not supported in %s' % path,
+                             self)
+                return None
+
+        return backend
+
+    def cowClone(self, prev_sid, new_snapshot, backend):
+        """
+        Clone the backup folder of ``prev_sid`` into ``new_snapshot`` using
+        copy-on-write. With ``btrfs`` the new backup folder becomes a
+        subvolume snapshot of the previous one (or a new subvolume filled
+        with a reflink copy if the previous snapshot isn't a subvolume yet).
+        With ``reflink`` the previous backup folder is copied with
+        ``cp --reflink=always``.
+
+        Args:
+            prev_sid (SID):             previous snapshot
+            new_snapshot (NewSnapshot): new snapshot
+            backend (str):              ``'btrfs'`` or ``'reflink'``
+
+        Returns:
+            bool:                       ``True`` if cloning succeeded
+        """
+        src = prev_sid.pathBackup()
+        dest = new_snapshot.pathBackup()
+        copy = ['cp', '-a', '--reflink=always', '--', src + os.sep + '.', dest]
+
+        if backend == 'btrfs':
+            if tools.isBtrfsSubvolume(src):
+                cmds = [['btrfs', 'subvolume', 'snapshot', src, dest]]
+            else:
+                cmds = [['btrfs', 'subvolume', 'create', dest], copy]
+        else:
+            cmds = [copy]
+
+        logger.info('Clone %s with %s' % (prev_sid, backend), self)
+        self.setTakeSnapshotMessage(0, _('Clone previous snapshot'))
+
+        try:
+            if backend == 'btrfs':
+                os.rmdir(dest)
+
+            for cmd in cmds:
+                if tools.Execute(cmd, parent=self).run():
+                    raise OSError('%s returned an error' % cmd[0])
+
+        except OSError as e:
+            logger.error('Failed to clone %s with %s: %s'
+                         % (prev_sid, backend, str(e)), self)
+            if not self.deleteSubvolume(dest):
+                shutil.rmtree(dest, ignore_errors=True)
+            os.makedirs(dest, exist_ok=True)
+            return False
+
+        return True
+
+    def deleteSubvolume(self, path):
+        """
+        Delete ``path`` with ``btrfs subvolume delete`` if it is a btrfs
+        subvolume.
+
+        Args:
+            path (str): full path
+
+        Returns:
+            bool:       ``True`` if ``path`` was a subvolume and got deleted
+        """
+        if not tools.isBtrfsSubvolume(path):
+            return False
+
+        proc = tools.Execute(['btrfs', 'subvolume', 'delete', path],
+                             parent=self)
+        return proc.run() == 0
+
+    def cloneSnapshot(self, prev_sid, new_snapshot, dirty, include_folders,
+                      cloned=False):
+        """
+        Prepare ``new_snapshot`` for a rsync run limited to ``dirty``
+        folders. The previous snapshot is cloned with hard links
+        (``cp -al``) and the changed entries are removed from the clone
+        again (see :py:func:`hardlinkClone`), so rsync will recreate them
+        with ``--link-dest`` exactly like a full run would do. If ``cloned``
+        is ``True`` the previous snapshot was already cloned copy-on-write
+        (see :py:func:`cowClone`) and rsync will update them in place.
+
+        Only the direct entries of changed folders are synced (rsync needs
+        ``--dirs`` instead of ``--recursive``). New folders are synced with
+        all their content.
+
+        Args:
+            prev_sid (SID):             previous snapshot
+            new_snapshot (NewSnapshot): new snapshot
+            dirty (list):               changed folders as tuples
+                                        (folder, recursive), see
+                                        :py:func:`changetracker.ChangeTracker.dirtyFolders`
+            include_folders (list):     folders to include. list of tuples
+                                        (item, int)
+            cloned (bool):              ``new_snapshot`` already contains a
+                                        copy-on-write clone of ``prev_sid``
+
+        Returns:
+            str:                        path of a file which can be used
+                                        with ``--files-from`` or ``None``
+                                        if a full snapshot should be taken
+        """
+        # Deleted folders are covered by their nearest existing parent
+        folders = set()
+        trees = set()
+        for folder, recursive in dirty:
+            while not os.path.isdir(folder) and len(folder) > 1:
+                folder = os.path.dirname(folder)
+                recursive = False
+            (trees if recursive else folders).add(folder)
+        items = changetracker.dirtyItems(folders, trees)
+
+        # cloning doesn't save anything if a whole include folder is new
+        for tree in trees:
+            prefix = tree.rstrip(os.sep) + os.sep
+            if any(path == tree or path.startswith(prefix)
+                   for path, item_type in include_folders):
+                logger.debug('Change tracker: %s changed completely. Take a '
+                             'full snapshot' % tree, self)
+                return None
+
+        logger.info('Change tracker: clone %s and sync %s changed folders'
+                    % (prev_sid, len(items)), self)
+
+        if not cloned and not self.hardlinkClone(prev_sid,
+                                                 new_snapshot,
+                                                 items):
+            return None
+
+        # a trailing slash makes rsync --dirs sync the content of a folder
+        fd, files_from = tempfile.mkstemp(prefix='files_from_',
+                                          dir=self.config._LOCAL_DATA_FOLDER)
+        with os.fdopen(fd, 'wb') as f:
+            for folder, recursive in items:
+                subfolders = [folder]
+                if recursive:
+                    subfolders = (root for root, dirs, files
+                                  in os.walk(folder))
+                for subfolder in subfolders:
+                    f.write(os.fsencode(
+                        os.path.join(subfolder.lstrip(os.sep) or os.curdir,
+                                     '')) + b'\n')
+
+        return files_from
+
+    def hardlinkClone(self, prev_sid, new_snapshot, items):
+        """
+        Clone the backup folder of ``prev_sid`` into ``new_snapshot`` with
+        hard links (``cp -al``). Changed trees are removed from the clone.
+        Of all other changed folders only files, symlinks and other
+        non-folders are removed, because rsync would otherwise change their
+        attributes in place which would change the previous snapshot, too.
+
+        Args:
+            prev_sid (SID):             previous snapshot
+            new_snapshot (NewSnapshot): new snapshot
+            items (list):               changed folders as tuples
+                                        (folder, recursive)
+
+        Returns:
+            bool:                       ``True`` if cloning succeeded
+        """
+        self.setTakeSnapshotMessage(0, _('Clone previous snapshot'))
+
+        dest = new_snapshot.pathBackup()
+        proc = tools.Execute(['cp', '-al', '--',
+                              prev_sid.pathBackup() + os.sep + '.',
+                              dest],
+                             parent=self)
+
+        try:
+            if proc.run():
+                raise OSError('cp returned an error')
+
+            for folder, recursive in items:
+                path = new_snapshot.pathBackup(folder)
+                if not os.path.isdir(path) or os.path.islink(path):
+                    continue
+                if recursive:
+                    shutil.rmtree(path)
+                    continue
+                with os.scandir(path) as it:
+                    for entry in it:
+                        if not entry.is_dir(follow_symlinks=False):
+                            os.remove(entry.path)
+
+        except OSError as e:
+            logger.error('Failed to clone %s: %s' % (prev_sid, str(e)), self)
+            shutil.rmtree(dest, ignore_errors=True)
+            os.makedirs(dest, exist_ok=True)
+            return False
+
+        return True
+
+    def rsyncSingle(self, cmd, params):
+        """
+        Run one rsync process to take the snapshot.
+
+        Args:
+            cmd (list):     full rsync command
+            params (list):  list of two bool '[error, changes]' handled by
+                            :py:func:`rsyncCallback`
+
+        Returns:
+            int:            rsync exit code
+        """
+        proc = tools.Execute(cmd,
+                             # TODO
+                             # interprets the user_data in params as: list of
+                             # two bool [error, changes] but params is reused
+                             # as return value of this function with [changes,
+                             # error]. Use a separate variable to avoid
+                             # confusion!
+                             callback=self.rsyncCallback,
+                             user_data=params,
+                             filters=(self.filterRsyncProgress,),
+                             parent=self)
+
+        # TODO
+        # introduce centralized log msg builder to avoid spread severity level
+        # indicators like "[I]" here?
+        self.snapshotLog.append('[I] ' + proc.printable_cmd, 3)
+
+        # TODO
+        # Process return value with rsync exit code to recognize errors that
+        # cannot be recognized by parsing the rsync output currently
+
+        # Fix for #1491 and #489
+        # Note that the return value (containing the exit code) of the
+        # rsync child process is not the only way to detect errors (and
+        # sometimes not reliably delivers <> 0 in case of an error):
+        # Errors are also indicated via the pass-by-ref argument
+        # user_data="params" list (updated by the callback function that
+        # parses the rsync output for error message patterns).
+        return proc.run()
+
+    def rsyncParallel(self, rsync_prefix, shards, rsync_dest, params,
+                      expandedFolders = ()):
+        """
+        Run one rsync process per group of include folders in parallel. All
+        of them write into the same destination. Each process protects the
+        folders of all other groups from being deleted by
+        ``--delete-excluded``.
+
+        Itemized output of all processes is handled by
+        :py:func:`rsyncCallback` (serialized) and merged into ``params``.
+
+        Args:
+            rsync_prefix (list):    rsync command and common options
+            shards (list):          list of include folder lists as returned
+                                    by :py:func:`rsyncShards`
+            rsync_dest (str):       destination path for rsync
+            params (list):          list of two bool '[error, changes]'
+            expandedFolders (list): include folders which were replaced by
+                                    their content in ``shards``
+
+        Returns:
+            int:                    merged exit code. The first exit code
+                                    which is treated as error or the highest
+                                    non-error exit code
+        """
+        lock = threading.Lock()
+
+        def callback(line, user_data):
+            with lock:
+                self.rsyncCallback(line, user_data)
+
+        def progress(line):
+            with lock:
+                return self.filterRsyncProgress(line)
+
+        procs = []
+        for i, shard in enumerate(shards):
+            others = [item for j, other in enumerate(shards) if j != i
+                      for item in other]
+            cmd = list(rsync_prefix)
+            cmd.extend(self.rsyncProtect(others))
+            cmd.extend(self.rsyncSuffix(shard,
+                                        expandedFolders = expandedFolders))
+            cmd.append(rsync_dest)
+
+            proc = tools.Execute(cmd,
+                                 callback=callback,
+                                 user_data=[False, False],
+                                 filters=(progress,),
+                                 parent=self)
+            self.snapshotLog.append('[I] ' + proc.printable_cmd, 3)
+            procs.append(proc)
+
+        logger.info('Run %s rsync processes in parallel' % len(procs), self)
+
+        # signals can only be handled in main thread. Forward them to all
+        # rsync processes.
+        def forward(method):
+            def handler(signum, frame):
+                for proc in procs:
+                    getattr(proc, method)(signum, frame)
+            return handler
+
+        handlers = {}
+        try:
+            for signum, method in ((signal.SIGTSTP, 'pause'),
+                                   (signal.SIGCONT, 'resume'),
+                                   (signal.SIGHUP, 'kill')):
+                handlers[signum] = signal.signal(signum, forward(method))
+        except ValueError:
+            # signal only work in main thread
+            pass
+
+        exit_codes = [None] * len(procs)
+
+        def run(idx):
+            exit_codes[idx] = procs[idx].run()
+
+        threads = [threading.Thread(target=run, args=(idx,))
+                   for idx in range(len(procs))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for signum, handler in handlers.items():
+            signal.signal(signum, handler)
+
+        for proc in procs:
+            params[0] = params[0] or proc.user_data[0]
+            params[1] = params[1] or proc.user_data[1]
+
+        logger.debug('rsync exit codes: %s' % exit_codes, self)
+
+        errors = [code for code in exit_codes if code not in (0, 23, 24)]
+        if errors:
+            return errors[0]
+
+        return max(exit_codes)
+
+    def rsyncShards(self, include_folders, workers):
+        """
+        Split ``include_folders`` into at most ``workers`` groups. If there
+        are less include folders than ``workers`` the folders will be
+        replaced by their top-level content (unless they contain more than
+        1000 files or are the root folder ``/``). Nested include folders
+        result in one single group.
+
+        Args:
+            include_folders (list): folders to include. list of tuples
+                                    (item, int) where ``int`` is 0 if
+                                    ``item`` is a folder or 1 if ``item`` is
+                                    a file
+            workers (int):          maximum number of groups
+
+        Returns:
+            list:                   list of ``include_folders`` like lists
+        """
+        items = list(include_folders)
+
+        # nested include folders would be transferred by multiple processes
+        for path, item_type in items:
+            prefix = path.rstrip(os.sep) + os.sep
+            if item_type == 0 and any(other.startswith(prefix)
+                                      for other, t in items if other != path):
+                logger.debug('Nested include folders. Run only one rsync '
+                             'process', self)
+                return [items]
+
+        if len(items) < workers:
+            expanded = []
+            for item in items:
+                expanded.extend(self.rsyncExpandFolder(item))
+            items = expanded
+
+        shards = [[] for i in range(min(workers, len(items)))]
+        for idx, item in enumerate(items):
+            shards[idx % len(shards)].append(item)
+
+        return [shard for shard in shards if shard]
+
+    def rsyncExpandFolder(self, item):
+        """
+        Replace include folder ``item`` by its top-level content. Excludes
+        are not applied here but left to rsync's filter rules (see
+        ``expandedFolders`` in :py:func:`rsyncInclude`). Empty folders are
+        kept as they are.
+
+        Args:
+            item (tuple):   include item (path, int)
+
+        Returns:
+            list:           list of include items
+        """
+        path, item_type = item
+        if item_type != 0 or path == '/':
+            return [item]
+
+        try:
+            entries = list(os.scandir(path))
+        except OSError as e:
+            logger.debug('Failed to list %s: %s' % (path, str(e)), self)
+            return [item]
+
+        if not entries or \
+                sum(1 for e in entries if not e.is_dir(follow_symlinks=False)) > 1000:
+            return [item]
+
+        return [(entry.path, 0 if entry.is_dir(follow_symlinks=False) else 1)
+                for entry in sorted(entries, key=lambda e: e.name)]
+
+    def rsyncProtect(self, include_folders):
+        """
+        Format protect filter rules for rsync so ``include_folders`` and their
+        parent folders won't be removed by ``--delete-excluded`` in
+        destination.
+
+        Args:
+            include_folders (list): list of tuples (item, int)
+
+        Returns:
+            OrderedSet:             rsync filter options
+        """
+        items = tools.OrderedSet()
+        encode = self.config.ENCODE
+
+        for include_folder in include_folders:
+            folder = include_folder[0]
+            while len(folder) > 1:
+                items.add('--filter=P {}'.format(encode.include(folder)))
+                folder = os.path.split(folder)[0]
+
+        return items
+
     def takeSnapshot(self, sid, now, include_folders):
         """This is the main backup routine.
 
@@ -1313,14 +1841,38 @@ class Snapshots:
         if snapshots:
             prev_sid = snapshots[0]
 
+        # folders changed since the last snapshot (None if unknown)
+        tracker = None
+        dirty = None
+        if self.config.changeTrackerEnabled() \
+                and not new_snapshot.saveToContinue:
+            tracker = changetracker.ChangeTracker(self.config)
+            dirty = tracker.dirtyFolders()
+            if not prev_sid or prev_sid.failed:
+                dirty = None
+
+        if dirty == [] and not self.config.takeSnapshotRegardlessOfChanges():
+            self.remove(new_snapshot)
+
+            logger.info('Change tracker: nothing changed, no new snapshot '
+                        'necessary', self)
+            self.snapshotLog.append(
+                '[I] ' + _('Nothing changed, no new snapshot necessary'), 3)
+
+            prev_sid.setLastChecked()
+            tracker.commit()
+
+            if not list(self.config.anacrontabFiles()):
+                tools.writeTimeStamp(self.config.anacronSpoolFile())
+
+            return [False, False]
+
         # rsync prefix & suffix
         rsync_prefix = tools.rsyncPrefix(self.config, no_perms=False)
 
         if self.config.excludeBySizeEnabled():
             rsync_prefix.append('--max-size=%sM' % self.config.excludeBySize())
 
-        rsync_suffix = self.rsyncSuffix(include_folders)
-
         # When there is no snapshots it takes the last snapshot from the other folders
         # It should delete the excluded folders then
         rsync_prefix.extend(('--delete', '--delete-excluded'))
@@ -1336,7 +1888,22 @@ class Snapshots:
         # (see log format section in "man rsyncd.conf")
         rsync_prefix.extend(('-i', '--out-format=BACKINTIME: %i %n%L'))
 
-        if prev_sid:
+        # Clone the previous snapshot copy-on-write and update it in place.
+        # --inplace must never be combined with --link-dest because it would
+        # modify files which are hard-linked into older snapshots.
+        cow = None
+        if prev_sid and not new_snapshot.saveToContinue:
+            cow = self.cowBackend()
+            if cow and not self.cowClone(prev_sid, new_snapshot, cow):
+                cow = None
+
+        if cow:
+            # rsync defaults to --whole-file for local transfers which would
+            # rewrite every changed file and drop all extents shared with
+            # the clone
+            rsync_prefix.extend(('--inplace', '--no-whole-file'))
+
+        elif prev_sid:
             link_dest = encode.path(os.path.join(prev_sid.sid, 'backup'))
             link_dest = os.path.join(os.pardir, os.pardir, link_dest)
             rsync_prefix.append('--link-dest=%s' % link_dest)
@@ -1344,47 +1911,49 @@ class Snapshots:
         # sync changed folders
         logger.info("Call rsync to take the snapshot", self)
         new_snapshot.saveToContinue = True
-        cmd = rsync_prefix + rsync_suffix
 
         # No quoting (quote='') because of new argument protection of rsync.
-        cmd.append(self.rsyncRemotePath(
+        rsync_dest = self.rsyncRemotePath(
             new_snapshot.pathBackup(use_mode=['ssh', 'ssh_encfs']),
-            quote=''))
+            quote='')
 
         self.setTakeSnapshotMessage(0, _('Taking snapshot'))
 
-        # run rsync
-        proc = tools.Execute(cmd,
-                             # TODO
-                             # interprets the user_data in params as: list of
-                             # two bool [error, changes] but params is reused
-                             # as return value of this function with [changes,
-                             # error]. Use a separate variable to avoid
-                             # confusion!
-                             callback=self.rsyncCallback,
-                             user_data=params,
-                             filters=(self.filterRsyncProgress,),
-                             parent=self)
-
-        # TODO
-        # introduce centralized log msg builder to avoid spread severity level
-        # indicators like "[I]" here?
-        self.snapshotLog.append('[I] ' + proc.printable_cmd, 3)
-
-        # TODO
-        # Process return value with rsync exit code to recognize errors that
-        # cannot be recognized by parsing the rsync output currently
-
-        rsync_exit_code = proc.run()
-            # Fix for #1491 and #489
-            # Note that the return value (containing the exit code) of the
-            # rsync child process is not the only way to detect errors (and
-            # sometimes not reliably delivers <> 0 in case of an error):
-            # Errors are also indicated via the pass-by-ref argument
-            # user_data="params" list (updated by the callback function that
-            # parses the rsync output for error message patterns).
+        files_from = None
+        if dirty and self.config.snapshotsMode() == 'local':
+            files_from = self.cloneSnapshot(prev_sid,
+                                            new_snapshot,
+                                            dirty,
+                                            include_folders,
+                                            cloned=bool(cow))
+
+        shards = [include_folders]
+        if files_from:
+            rsync_prefix.extend(('--files-from=%s' % files_from,
+                                 '--no-recursive',
+                                 '--dirs'))
+
+        elif self.config.parallelRsyncEnabled():
+            shards = self.rsyncShards(include_folders,
+                                      self.config.parallelRsync())
+
+        if len(shards) > 1:
+            expanded = [path.rstrip(os.sep) for path, item_type in include_folders
+                        if item_type == 0 and path != '/']
+            rsync_exit_code = self.rsyncParallel(rsync_prefix,
+                                                 shards,
+                                                 rsync_dest,
+                                                 params,
+                                                 expanded)
+        else:
+            rsync_exit_code = self.rsyncSingle(
+                rsync_prefix + self.rsyncSuffix(include_folders) + [rsync_dest],
+                params)
 
         # cleanup
+        if files_from:
+            os.remove(files_from)
+
         try:
             os.remove(self.config.takeSnapshotProgressFile())
 
@@ -1456,6 +2025,9 @@ class Snapshots:
             if prev_sid:
                 prev_sid.setLastChecked()
 
+            if tracker and not has_errors:
+                tracker.commit()
+
             if not has_errors and not list(self.config.anacrontabFiles()):
                 tools.writeTimeStamp(self.config.anacronSpoolFile())
 
@@ -1502,7 +2074,10 @@ class Snapshots:
 
             return [False, True]
 
-        self.backupInfo(sid)
+        self.backupInfo(sid, prev_sid)
+
+        if tracker and not has_errors:
+            tracker.commit()
 
         if not has_errors and not list(self.config.anacrontabFiles()):
             tools.writeTimeStamp(self.config.anacronSpoolFile())
@@ -1613,6 +2188,50 @@ class Snapshots:
             y = y - 1
         return datetime.date(y, m, 1)
 
+    def smartRemovePlan(self,
+                        snapshots,
+                        now_full,
+                        keep_all,
+                        keep_one_per_day,
+                        keep_one_per_week,
+                        keep_one_per_month):
+        """
+        Decide which snapshots Smart Remove will keep and why.
+
+        See :py:class:`retention.SmartRemove` for details.
+
+        Args:
+            snapshots (list):               full list of :py:class:`SID`
+                                            objects
+            now_full (datetime.datetime):   date and time when takeSnapshot
+                                            was started
+            keep_all (int):                 keep all snapshots for the
+                                            last ``keep_all`` days
+            keep_one_per_day (int):         keep one snapshot per day for the
+                                            last ``keep_one_per_day`` days
+            keep_one_per_week (int):        keep one snapshot per week for the
+                                            last ``keep_one_per_week`` weeks
+            keep_one_per_month (int):       keep one snapshot per month for
+                                            the last ``keep_one_per_month``
+                                            months
+
+        Returns:
+            dict:                           snapshots to keep as keys and a
+                                            list of reasons ('last', 'all',
+                                            'day', 'week', 'month', 'year',
+                                            'named') as values
+        """
+        catalog = retention.Catalog(snapshots,
+                                    self.config.dontRemoveNamedSnapshots())
+        policy = retention.SmartRemove(now_full,
+                                       keep_all,
+                                       keep_one_per_day,
+                                       keep_one_per_week,
+                                       keep_one_per_month,
+                                       self.config.tag())
+
+        return retention.plan(catalog, [policy]).keep
+
     def smartRemoveList(self,
                         now_full,
                         keep_all,
@@ -1645,88 +2264,24 @@ class Snapshots:
             logger.debug('There is only one snapshot, so keep it', self)
             return []
 
-        if now_full is None:
-            now_full = datetime.datetime.today()
-
-        now = now_full.date()
-
-        # keep the last snapshot
-        keep = set([snapshots[0]])
-
-        # keep all for the last keep_all days
-        if keep_all > 0:
-            keep |= self.smartRemoveKeepAll(
-                snapshots,
-                now - datetime.timedelta(days=keep_all-1),
-                now + datetime.timedelta(days=1))
-
-        # keep one per day for the last keep_one_per_day days
-        if keep_one_per_day > 0:
-            d = now
-            for i in range(0, keep_one_per_day):
-                keep |= self.smartRemoveKeepFirst(
-                    snapshots,
-                    d,
-                    d + datetime.timedelta(days=1),
-                    keep_healthy=True)
-                d -= datetime.timedelta(days=1)
-
-        # keep one per week for the last keep_one_per_week weeks
-        if keep_one_per_week > 0:
-            d = now - datetime.timedelta(days=now.weekday() + 1)
-
-            for i in range(0, keep_one_per_week):
-                keep |= self.smartRemoveKeepFirst(
-                    snapshots,
-                    d,
-                    d + datetime.timedelta(days=8),
-                    keep_healthy=True)
-                d -= datetime.timedelta(days=7)
-
-        # keep one per month for the last keep_one_per_month months
-        if keep_one_per_month > 0:
-            d1 = datetime.date(now.year, now.month, 1)
-            d2 = self.incMonth(d1)
-
-            for i in range(0, keep_one_per_month):
-                keep |= self.smartRemoveKeepFirst(
-                    snapshots, d1, d2, keep_healthy=True)
-                d2 = d1
-                d1 = self.decMonth(d1)
-
-        # keep one per year for all years
-        first_year = int(snapshots[-1].sid[:4])
-
-        for i in range(first_year, now.year+1):
-            keep |= self.smartRemoveKeepFirst(snapshots,
-                                              datetime.date(i, 1, 1),
-                                              datetime.date(i+1, 1, 1),
-                                              keep_healthy=True)
+        keep = self.smartRemovePlan(snapshots,
+                                    now_full,
+                                    keep_all,
+                                    keep_one_per_day,
+                                    keep_one_per_week,
+                                    keep_one_per_month)
 
         logger.debug(f'Keep snapshots: {keep}', self)
 
-        del_snapshots = []
-
-        for sid in snapshots:
-            if sid in keep:
-                continue
-
-            if self.config.dontRemoveNamedSnapshots():
-                if sid.name:
-                    logger.debug(
-                        f'Keep snapshot: {sid}, because it has a name', self)
-                    continue
-
-            del_snapshots.append(sid)
-
-        return del_snapshots
+        return [sid for sid in snapshots if sid not in keep]
 
     def smartRemove(self, del_snapshots, log = None):
         """
         Remove multiple snapshots either with
-        :py:func:`Snapshots.remove` or in background on the remote host
-        if mode is `ssh` or `ssh_encfs` and smart-remove in background is
-        activated.
+        :py:func:`Snapshots.remove` or with one job on the remote host (see
+        :py:func:`smartRemoveRemote`) if mode is `ssh` or `ssh_encfs` and
+        :py:func:`config.Config.smartRemoveRunRemoteInBackground` is
+        enabled. Both block until all snapshots were removed.
 
         Args:
             del_snapshots (list):   list of :py:class:`SID` that should be removed
@@ -1739,75 +2294,9 @@ class Snapshots:
             log = lambda x: self.setTakeSnapshotMessage(0, x)
 
         if self.config.snapshotsMode() in ['ssh', 'ssh_encfs'] and self.config.smartRemoveRunRemoteInBackground():
-            logger.info('[smart remove] remove snapshots in background: %s'
+            logger.info('[smart remove] remove snapshots on remote host: %s'
                         % del_snapshots, self)
-            lckFile = os.path.normpath(
-                os.path.join(
-                    del_snapshots[0].path(use_mode=['ssh', 'ssh_encfs']),
-                    os.pardir,
-                    'smartremove.lck'
-                )
-            )
-
-            maxLength = self.config.sshMaxArgLength()
-            if not maxLength:
-                import sshMaxArg
-                user_host = '%s@%s' % (self.config.sshUser(),
-                                       self.config.sshHost())
-                maxLength = sshMaxArg.probe_max_ssh_command_size(self.config)
-                self.config.setSshMaxArgLength(maxLength)
-                self.config.save()
-                sshMaxArg.report_result(user_host, maxLength)
-
-            additionalChars = len(self.config.sshPrefixCmd(cmd_type = str))
-
-            head = 'screen -d -m bash -c "('
-            # create temp dir used for delete files with rsync
-            head += 'TMP=\\$(mktemp -d); '
-            # make sure $TMP dir was created
-            head += 'test -z \\\"\\$TMP\\\" && exit 1; '
-            # make sure $TMP is empty
-            head += 'test -n \\\"\\$(ls \\$TMP)\\\" && exit 1; '
-            if logger.DEBUG:
-                head += 'logger -t \\\"backintime smart-remove [$BASHPID]\\\" \\\"start\\\"; '
-            head += 'flock -x 9; '
-            if logger.DEBUG:
-                head += 'logger -t \\\"backintime smart-remove [$BASHPID]\\\" \\\"got exclusive flock\\\"; '
-
-            tail = 'rmdir \\$TMP) 9>\\\"%s\\\""' %lckFile
-
-            cmds = []
-
-            for sid in del_snapshots:
-                remote = self.rsyncRemotePath(sid.path(use_mode = ['ssh', 'ssh_encfs']), use_mode = [], quote = '\\\"')
-                rsync = ' '.join(tools.rsyncRemove(self.config, run_local = False))
-                rsync += ' \\\"\\$TMP/\\\" {}; '.format(remote)
-
-                s = 'test -e \\\"%s\\\" && (' %sid.path(use_mode = ['ssh', 'ssh_encfs'])
-
-                if logger.DEBUG:
-                    s += 'logger -t \\\"backintime smart-remove [$BASHPID]\\\" '
-                    s += '\\\"snapshot %s still exist\\\"; ' %sid
-                    s += 'sleep 1; ' #add one second delay because otherwise you might not see serialized process with small snapshots
-
-                s += rsync
-                s += 'rmdir \\\"%s\\\"; ' %sid.path(use_mode = ['ssh', 'ssh_encfs'])
-
-                if logger.DEBUG:
-                    s += 'logger -t \\\"backintime smart-remove [$BASHPID]\\\" '
-                    s += '\\\"snapshot %s remove done\\\"' %sid
-
-                s += '); '
-                cmds.append(s)
-
-            for cmd in tools.splitCommands(cmds,
-                                           head = head,
-                                           tail = tail,
-                                           maxLength = maxLength - additionalChars):
-                tools.Execute(self.config.sshCommand([cmd,],
-                                                     quote = False,
-                                                     nice = False,
-                                                     ionice = False)).run()
+            self.smartRemoveRemote(del_snapshots, log)
         else:
             logger.info("[smart remove] remove snapshots: %s"
                         %del_snapshots, self)
@@ -1816,14 +2305,136 @@ class Snapshots:
                 log(_('Smart remove') + ' %s/%s' %(i, len(del_snapshots)))
                 self.remove(sid)
 
+    # Remote job used by smartRemoveRemote. Positional arguments are the
+    # number of parallel workers, the lock file and the rsync command used to
+    # empty the snapshots. Snapshot paths are read line by line from stdin.
+    # Progress is reported with lines starting with 'BACKINTIME: '.
+    SMART_REMOVE_SCRIPT = (
+        'PARALLEL=$1; LCK=$2; shift 2; '
+        'REMOVE=\''
+        'p=$1; t=$2; shift 2; '
+        'if ! test -e "$p"; then echo "BACKINTIME: missing $p"; exit 0; fi; '
+        'if "$@" "$t/" "$p" >/dev/null && rmdir "$p"; '
+        'then echo "BACKINTIME: done $p"; '
+        'else echo "BACKINTIME: failed $p"; fi\'; '
+        # create temp dir used for delete files with rsync
+        'TMP=$(mktemp -d); '
+        'test -z "$TMP" && exit 1; '
+        # make sure $TMP is empty
+        'test -n "$(ls "$TMP")" && exit 1; '
+        'exec 9>"$LCK"; '
+        'flock -x 9; '
+        'echo "BACKINTIME: locked"; '
+        'xargs -d "\\n" -P "$PARALLEL" -I{} '
+        'bash -c "$REMOVE" backintime-remove {} "$TMP" "$@"; '
+        'rmdir "$TMP"'
+    )
+
+    def smartRemoveRemoteCommand(self, lckFile):
+        """
+        Command which runs the remote smart-remove job. It reads the paths of
+        snapshots which should be removed from stdin, removes them with
+        bounded parallelism and reports its progress on stdout with lines
+        like ``BACKINTIME: done <path>``.
+
+        Args:
+            lckFile (str):  lock file on remote host used to serialize
+                            multiple smart-remove jobs
+
+        Returns:
+            list:           command (without ssh) with all args quoted for
+                            the remote shell
+        """
+        cmd = ['bash', '-c', self.SMART_REMOVE_SCRIPT, 'backintime-smart-remove',
+               str(self.config.smartRemoveRemoteParallel()), lckFile]
+        cmd.extend(tools.rsyncRemove(self.config, run_local = False))
+        return [shlex.quote(i) for i in cmd]
+
+    def smartRemoveRemote(self, del_snapshots, log):
+        """
+        Remove snapshots on the remote host over a single SSH connection.
+        Snapshot paths are streamed to :py:attr:`SMART_REMOVE_SCRIPT` on
+        stdin so there is no limit on the number of snapshots in one run.
+
+        Args:
+            del_snapshots (list):   list of :py:class:`SID` that should be
+                                    removed
+            log (method):           callable method that will handle
+                                    progress log
+
+        Returns:
+            bool:                   ``True`` if all snapshots were removed
+        """
+        paths = [sid.path(use_mode = ['ssh', 'ssh_encfs'])
+                 for sid in del_snapshots]
+        lckFile = os.path.normpath(os.path.join(paths[0],
+                                                os.pardir,
+                                                'smartremove.lck'))
+
+        cmd = self.config.sshCommand(self.smartRemoveRemoteCommand(lckFile),
+                                     nice = False,
+                                     ionice = False)
+        logger.debug('[smart remove] call command: %s' % ' '.join(cmd), self)
+
+        proc = subprocess.Popen(cmd,
+                                stdin = subprocess.PIPE,
+                                stdout = subprocess.PIPE,
+                                stderr = subprocess.STDOUT,
+                                universal_newlines = True)
+
+        def feed():
+            try:
+                for path in paths:
+                    proc.stdin.write(path + '\n')
+                proc.stdin.close()
+            except BrokenPipeError:
+                pass
+
+        feeder = threading.Thread(target = feed, daemon = True)
+        feeder.start()
+
+        count = 0
+        failed = 0
+        for line in proc.stdout:
+            line = line.rstrip('\n')
+            state, _sep, path = line.partition(' ')[2].partition(' ')
+
+            if not line.startswith('BACKINTIME: '):
+                logger.warning('[smart remove] %s' % line, self)
+            elif state == 'locked':
+                logger.debug('[smart remove] got exclusive flock', self)
+            elif state in ('done', 'missing', 'failed'):
+                count += 1
+                if state == 'failed':
+                    failed += 1
+                    logger.error('[smart remove] failed to remove %s'
+                                 % path, self)
+                log(_('Smart remove') + ' %s/%s' % (count, len(paths)))
+
+        feeder.join()
+        proc.wait()
+
+        if proc.returncode or failed or count < len(paths):
+            logger.error('[smart remove] remote job returned %s. Removed %s '
+                         'of %s snapshots with %s errors.'
+                         % (proc.returncode, count - failed, len(paths),
+                            failed), self)
+            return False
+
+        return True
+
     def freeSpace(self, now):
         """
         Remove old snapshots on based on different rules (only if enabled).
-        First rule is to remove snapshots older than X years. Next will call
-        :py:func:`smartRemove` to remove snapshots based on
-        configurable intervals. Third rule is to remove the oldest snapshot
-        until there is enough free space. Last rule will remove the oldest
-        snapshot until there are enough free inodes.
+        First rule is to remove snapshots older than X years. Next will
+        remove snapshots based on configurable intervals (Smart Remove).
+        Third rule is to remove the oldest snapshot until there is enough
+        free space. Last rule will remove the oldest snapshot until there are
+        enough free inodes.
+
+        All rules are combined into one :py:class:`retention.Plan`. Snapshots
+        removed by the first two rules are removed in one batch with
+        :py:func:`smartRemove`.
 
         'last_snapshot' symlink will be fixed when done.
 
@@ -1836,124 +2447,93 @@ class Snapshots:
             logger.debug('No snapshots. Skip freeSpace', self)
             return
 
-        last_snapshot = snapshots[-1]
+        catalog = retention.Catalog(snapshots,
+                                    self.config.dontRemoveNamedSnapshots())
+        plan = retention.plan(catalog, self.retentionPolicies(now))
 
-        #remove old backups
-        if self.config.removeOldSnapshotsEnabled():
-            self.setTakeSnapshotMessage(0, _('Removing old snapshots'))
+        if plan.remove:
+            logger.debug('Retention plan: {}'.format(plan.remove), self)
 
-            oldBackupId = SID(self.config.removeOldSnapshotsDate(), self.config)
-            logger.debug("Remove snapshots older than: {}".format(oldBackupId.withoutTag), self)
+        def removeBatch(sids):
+            if any(plan.remove[sid] == 'older' for sid in sids):
+                self.setTakeSnapshotMessage(0, _('Removing old snapshots'))
+            else:
+                self.setTakeSnapshotMessage(0, _('Smart remove'))
+            self.smartRemove(sids)
 
-            while True:
-                if len(snapshots) <= 1:
-                    break
-                if snapshots[0] >= oldBackupId:
-                    break
+        removed = retention.execute(plan, self.remove, removeBatch)
 
-                if self.config.dontRemoveNamedSnapshots():
-                    if snapshots[0].name:
-                        del snapshots[0]
-                        continue
+        #set correct last snapshot again
+        if removed:
+            self.createLastSnapshotSymlink(catalog.newest)
+
+    def retentionPolicies(self, now):
+        """
+        Retention policies enabled in the current profile in the order they
+        are applied: remove snapshots older than X, Smart Remove, keep min
+        free space and keep min free inodes.
 
-                msg = 'Remove snapshot {} because it is older than {}'
-                logger.debug(msg.format(snapshots[0].withoutTag, oldBackupId.withoutTag), self)
-                self.remove(snapshots[0])
-                del snapshots[0]
+        Args:
+            now (datetime.datetime):    date and time when takeSnapshot was
+                                        started
+
+        Returns:
+            list:                       :py:class:`retention.Policy`
+                                        instances
+        """
+        policies = []
+        tag = self.config.tag()
+
+        if self.config.removeOldSnapshotsEnabled():
+            policies.append(retention.RemoveOlderThan(
+                self.config.removeOldSnapshotsDate(), tag))
 
-        # smart remove
         enabled, keep_all, keep_one_per_day, keep_one_per_week, keep_one_per_month = self.config.smartRemove()
 
         if enabled:
-            self.setTakeSnapshotMessage(0, _('Smart remove'))
-            del_snapshots = self.smartRemoveList(now,
-                                                 keep_all,
-                                                 keep_one_per_day,
-                                                 keep_one_per_week,
-                                                 keep_one_per_month)
-            self.smartRemove(del_snapshots)
-
-        # try to keep min free space
-        if self.config.minFreeSpaceEnabled():
-            self.setTakeSnapshotMessage(0, _('Trying to keep min free space'))
+            policies.append(retention.SmartRemove(now,
+                                                  keep_all,
+                                                  keep_one_per_day,
+                                                  keep_one_per_week,
+                                                  keep_one_per_month,
+                                                  tag))
 
+        if self.config.minFreeSpaceEnabled():
             minFreeSpace = self.config.minFreeSpaceMib()
-
             logger.debug("Keep min free disk space: {} MiB".format(minFreeSpace), self)
 
-            snapshots = listSnapshots(self.config, reverse = False)
-
-            while True:
-                if len(snapshots) <= 1:
-                    break
-
-                free_space = self.statFreeSpaceLocal(self.config.snapshotsFullPath())
+            def freeSpace():
+                self.setTakeSnapshotMessage(0, _('Trying to keep min free space'))
+                free = self.statFreeSpaceLocal(self.config.snapshotsFullPath())
+                if free is None:
+                    free = self.statFreeSpaceSsh()
+                return free
 
-                if free_space is None:
-                    free_space = self.statFreeSpaceSsh()
+            policies.append(retention.MinFreeSpace(minFreeSpace, freeSpace))
 
-                if free_space is None:
-                    logger.warning('Failed to get free space. Skipping', self)
-                    break
-
-                if free_space >= minFreeSpace:
-                    break
-
-                if self.config.dontRemoveNamedSnapshots():
-                    if snapshots[0].name:
-                        del snapshots[0]
-                        continue
-
-                msg = "free disk space: {} MiB. Remove snapshot {}"
-                logger.debug(msg.format(free_space, snapshots[0].withoutTag), self)
-                self.remove(snapshots[0])
-                del snapshots[0]
-
-        #try to keep free inodes
         if self.config.minFreeInodesEnabled():
             minFreeInodes = self.config.minFreeInodes()
-            self.setTakeSnapshotMessage(
-                0,
-                _('Trying to keep min {perc} free inodes')
-                .format(perc=f'{minFreeInodes}%')
-            )
             logger.debug(
                 "Keep min {perc}% free inodes".format(perc=minFreeInodes),
                 self)
 
-            snapshots = listSnapshots(self.config, reverse = False)
-
-            while True:
-                if len(snapshots) <= 1:
-                    break
-
+            def inodes():
+                self.setTakeSnapshotMessage(
+                    0,
+                    _('Trying to keep min {perc} free inodes')
+                    .format(perc=f'{minFreeInodes}%')
+                )
                 try:
                     info = os.statvfs(self.config.snapshotsPath())
-                    free_inodes = info.f_favail
-                    max_inodes  = info.f_files
+                    return (info.f_favail, info.f_files)
                 except Exception as e:
                     logger.debug('Failed to get free inodes for snapshot path %s: %s'
                                  % (self.config.snapshotsPath(), str(e)),
                                  self)
-                    break
 
-                if free_inodes >= max_inodes * (minFreeInodes / 100.0):
-                    break
+            policies.append(retention.MinFreeInodes(minFreeInodes, inodes))
 
-                if self.config.dontRemoveNamedSnapshots():
-                    if snapshots[0].name:
-                        del snapshots[0]
-                        continue
-
-                logger.debug("free inodes: %.2f%%. Remove snapshot %s"
-                            %((100.0 / max_inodes * free_inodes), snapshots[0].withoutTag),
-                            self)
-                self.remove(snapshots[0])
-                del snapshots[0]
-
-        #set correct last snapshot again
-        if last_snapshot is not snapshots[-1]:
-            self.createLastSnapshotSymlink(snapshots[-1])
+        return policies
 
     def statFreeSpaceLocal(self, path):
         """
@@ -2201,31 +2781,119 @@ class Snapshots:
     def flockExclusive(self):
         """
         Block :py:func:`backup` from other profiles or users
-        and run them serialized
+        and run them serialized.
+
+        If ``global.flock.max_parallel`` is greater than 1, snapshots to
+        different targets (see :py:func:`flockTarget`) run concurrently.
+        A snapshot first waits for one of ``max_parallel_per_target`` slots
+        of its target and then for one of ``max_parallel`` global slots.
         """
-        if self.config.globalFlock():
+        if not self.config.globalFlock():
+            return
+
+        maxParallel = self.config.globalFlockMaxParallel()
+        if maxParallel <= 1:
             logger.debug('Set flock %s' %self.GLOBAL_FLOCK, self)
-            self.flock = open(self.GLOBAL_FLOCK, 'w')
-            fcntl.flock(self.flock, fcntl.LOCK_EX)  # blocks (waits) until an existing flock is released
-            # make it rw by all if that's not already done.
-            perms = stat.S_IRUSR | stat.S_IWUSR | stat.S_IRGRP | \
-                    stat.S_IWGRP | stat.S_IROTH | stat.S_IWOTH
-            s = os.fstat(self.flock.fileno())
-            if not s.st_mode & perms == perms:
-                logger.debug('Set flock permissions %s' %self.GLOBAL_FLOCK, self)
-                os.fchmod(self.flock.fileno(), perms)
+            flock = self.flockOpen(self.GLOBAL_FLOCK)
+            fcntl.flock(flock, fcntl.LOCK_EX)  # blocks (waits) until an existing flock is released
+            self.flock = [flock]
+            return
+
+        target = self.flockTarget()
+        targetFlock = '%s.%s' % (self.GLOBAL_FLOCK,
+                                 hashlib.md5(target.encode()).hexdigest()[:8])
+        logger.debug('Wait for a free slot on target %s' % target, self)
+        self.flock = [
+            self.flockSlot(targetFlock,
+                           self.config.globalFlockMaxParallelPerTarget()),
+            self.flockSlot(self.GLOBAL_FLOCK, maxParallel)
+        ]
+
+    def flockSlot(self, path, count):
+        """
+        Wait until one of ``count`` lock files based on ``path`` is free and
+        lock it. The first slot is ``path`` itself, so older versions using
+        a single global flock are still serialized against this one.
+
+        Args:
+            path (str):     lock file of the first slot
+            count (int):    number of slots
+
+        Returns:
+            file:           locked file object
+        """
+        slots = [path] + ['%s.%d' % (path, i) for i in range(1, count)]
+        while True:
+            for slot in slots:
+                flock = self.flockOpen(slot)
+                try:
+                    fcntl.flock(flock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    flock.close()
+                    continue
+                logger.debug('Set flock %s' % slot, self)
+                return flock
+
+            time.sleep(self.FLOCK_POLL_INTERVAL)
+
+    def flockOpen(self, path):
+        """
+        Open lock file ``path`` and make it rw by all.
+
+        Args:
+            path (str): lock file
+
+        Returns:
+            file:       opened file object
+        """
+        flock = open(path, 'w')
+        # make it rw by all if that's not already done.
+        perms = stat.S_IRUSR | stat.S_IWUSR | stat.S_IRGRP | \
+                stat.S_IWGRP | stat.S_IROTH | stat.S_IWOTH
+        s = os.fstat(flock.fileno())
+        if not s.st_mode & perms == perms:
+            logger.debug('Set flock permissions %s' % path, self)
+            os.fchmod(flock.fileno(), perms)
+        return flock
+
+    def flockTarget(self):
+        """
+        Identify the backup target of the current profile so concurrent
+        snapshots can be grouped by target.
+
+        Returns:
+            str:    ``host:port`` in SSH modes, otherwise the device
+                    of the snapshot folder
+        """
+        mode = self.config.snapshotsMode()
+        if mode in ('ssh', 'ssh_encfs'):
+            return 'ssh:%s:%s' % (self.config.sshHost(), self.config.sshPort())
+
+        if mode == 'local_encfs':
+            path = self.config.localEncfsPath()
+        else:
+            path = self.config.snapshotsPath()
+
+        while path and not os.path.exists(path):
+            path = os.path.dirname(path)
+
+        try:
+            return 'dev:%s' % os.stat(path or os.sep).st_dev
+        except OSError:
+            return 'path:%s' % path
 
     def flockRelease(self):
         """
         Release lock so other snapshots can continue
         """
-        if self.flock:
-            logger.debug('Release flock %s' %self.GLOBAL_FLOCK, self)
-            fcntl.fcntl(self.flock, fcntl.LOCK_UN)
-            self.flock.close()
+        for flock in self.flock or []:
+            logger.debug('Release flock %s' % flock.name, self)
+            fcntl.flock(flock, fcntl.LOCK_UN)
+            flock.close()
         self.flock = None
 
-    def rsyncSuffix(self, includeFolders = None, excludeFolders = None):
+    def rsyncSuffix(self, includeFolders = None, excludeFolders = None,
+                    expandedFolders = ()):
         """
         Create suffixes for rsync.
 
@@ -2234,6 +2902,7 @@ class Snapshots:
                                     Where ``int`` is ``0`` if ``item`` is a
                                     folder or ``1`` if ``item`` is a file
             excludeFolders (list):  list of folders to exclude
+            expandedFolders (list): see :py:func:`rsyncInclude`
 
         Returns:
             list:                   rsync include and exclude options
@@ -2242,7 +2911,8 @@ class Snapshots:
         rsync_exclude = self.rsyncExclude(excludeFolders)
 
         #create include patterns list
-        rsync_include, rsync_include2 = self.rsyncInclude(includeFolders)
+        rsync_include, rsync_include2 = self.rsyncInclude(includeFolders,
+                                                          expandedFolders)
 
         encode = self.config.ENCODE
         ret = ['--chmod=Du+wx']
@@ -2283,7 +2953,7 @@ class Snapshots:
             items.add('--exclude=' + exclude)
         return items
 
-    def rsyncInclude(self, includeFolders = None):
+    def rsyncInclude(self, includeFolders = None, expandedFolders = ()):
         """
         Format include list for rsync. Returns a tuple of two include strings.
         First string need to come before exclude, second after exclude.
@@ -2293,6 +2963,11 @@ class Snapshots:
                                     tuples (item, int) where ``int`` is ``0``
                                     if ``item`` is a folder or ``1`` if ``item``
                                     is a file
+            expandedFolders (list): include folders which were replaced by
+                                    their top-level content (see
+                                    :py:func:`rsyncExpandFolder`). Folders
+                                    inside them are included after exclude
+                                    so they can still be excluded
 
         Returns:
             tuple:                  two item tuple of
@@ -2314,8 +2989,13 @@ class Snapshots:
                 items2.add('--include=/**')
                 continue
 
+            expanded = os.path.dirname(folder) in expandedFolders
             folder = encode.include(folder)
-            if include_folder[1] == 0:
+            if include_folder[1] == 0 and expanded:
+                items2.add('--include={}/'.format(folder))
+                items2.add('--include={}/**'.format(folder))
+                folder = os.path.split(folder)[0]
+            elif include_folder[1] == 0:
                 items2.add('--include={}/**'.format(folder))
             else:
                 items2.add('--include={}'.format(folder))
@@ -2371,9 +3051,20 @@ class SID(object):
         TypeError:              if ``date`` is not :py:class:`str`,
                                 :py:class:`datetime.date` or
                                 :py:class:`datetime.datetime` type
+
+    SID is an immutable value object. Paths are memoized as long as the config
+    doesn't change. Metadata (name, failed flag, info and last check) are
+    loaded from disk on first access and kept until :py:func:`invalidate` is
+    called or they are changed through this instance.
     """
     __cValidSID = re.compile(r'^\d{8}-\d{6}(?:-\d{3})?$')
 
+    __slots__ = ('config', 'profileID', 'isRoot', 'sid', 'date',
+                 '_cacheKey', '_paths', '_meta')
+
+    # attributes which can't be changed after they were set once
+    _IMMUTABLE = frozenset(('config', 'profileID', 'isRoot', 'sid', 'date'))
+
     INFO     = 'info'
     NAME     = 'name'
     FAILED   = 'failed'
@@ -2381,6 +3072,9 @@ class SID(object):
     LOG      = 'takesnapshot.log.bz2'
 
     def __init__(self, date, cfg):
+        self._cacheKey = None
+        self._paths = {}
+        self._meta = {}
         self.config = cfg
         self.profileID = cfg.currentProfile()
         self.isRoot = False
@@ -2410,6 +3104,35 @@ class SID(object):
     def __repr__(self):
         return self.sid
 
+    def __setattr__(self, name, value):
+        if name in self._IMMUTABLE and hasattr(self, name):
+            raise AttributeError(
+                "can't change attribute '{}' of {}".format(name, self.sid))
+
+        super(SID, self).__setattr__(name, value)
+
+    def invalidate(self):
+        """
+        Drop memoized paths and metadata. Use this if the snapshot was changed
+        by another process or :py:class:`SID` instance.
+        """
+        self._cacheKey = None
+        self._paths = {}
+        self._meta = {}
+
+    def _pathCache(self):
+        """
+        Memoized paths. They are dropped if the config or the encoding
+        instance (encfs) has changed.
+        """
+        key = (self.config.changeCount, self.config.ENCODE)
+
+        if self._cacheKey != key:
+            self._cacheKey = key
+            self._paths = {}
+
+        return self._paths
+
     def __eq__(self, other):
         """
         Compare snapshots based on self.sid
@@ -2565,20 +3288,37 @@ class SID(object):
         Returns:
             str:                full snapshot path
         """
-        path = [i.strip(os.sep) for i in path]
-        current_mode = self.config.snapshotsMode(self.profileID)
+        path = tuple(i.strip(os.sep) for i in path)
+        cache = self._pathCache()
 
-        if 'ssh' in use_mode and current_mode == 'ssh':
-            return os.path.join(self.config.sshSnapshotsFullPath(self.profileID),
-                                self.sid, *path)
+        current_mode = cache.get('mode')
+        if current_mode is None:
+            current_mode = cache['mode'] = self.config.snapshotsMode(self.profileID)
 
-        if 'ssh_encfs' in use_mode and current_mode == 'ssh_encfs':
+        if current_mode in ('ssh', 'ssh_encfs') and current_mode in use_mode:
+            key = (current_mode, ) + path
+        else:
+            key = ('local', ) + path
+
+        ret = cache.get(key)
+        if ret is not None:
+            return ret
+
+        if key[0] == 'local':
+            ret = os.path.join(self.config.snapshotsFullPath(self.profileID),
+                               self.sid, *path)
+        else:
             ret = os.path.join(self.config.sshSnapshotsFullPath(self.profileID),
                                self.sid, *path)
-            return self.config.ENCODE.remote(ret)
 
-        return os.path.join(self.config.snapshotsFullPath(self.profileID),
-                            self.sid, *path)
+            if key[0] == 'ssh_encfs':
+                ret = self.config.ENCODE.remote(ret)
+
+        # only memoize the snapshot folder and files directly inside it
+        if len(path) <= 1:
+            cache[key] = ret
+
+        return ret
 
     def pathBackup(self, *path, **kwargs):
         """
@@ -2660,12 +3400,17 @@ class SID(object):
         Returns:
             str:        name of this snapshot
         """
+        if 'name' in self._meta:
+            return self._meta['name']
+
         nameFile = self.path(self.NAME)
         if not os.path.isfile(nameFile):
+            self._meta['name'] = ''
             return ''
         try:
             with open(nameFile, 'rt') as f:
-                return f.read()
+                self._meta['name'] = f.read()
+                return self._meta['name']
         except Exception as e:
             logger.debug('Failed to get snapshot {} name: {}'.format(
                          self.sid, str(e)),
@@ -2674,11 +3419,13 @@ class SID(object):
     @name.setter
     def name(self, name):
         nameFile = self.path(self.NAME)
+        self._meta.pop('name', None)
 
         self.makeWritable()
         try:
             with open(nameFile, 'wt') as f:
                 f.write(name)
+            self._meta['name'] = name
         except Exception as e:
             logger.debug('Failed to set snapshot {} name: {}'.format(
                          self.sid, str(e)),
@@ -2694,10 +3441,52 @@ class SID(object):
         Returns:
             str:    date and time of last check (YYYY-MM-DD HH:MM:SS)
         """
-        info = self.path(self.INFO)
-        if os.path.exists(info):
-            return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(os.path.getatime(info)))
-        return self.displayID
+        if 'lastChecked' not in self._meta:
+            info = self.path(self.INFO)
+            if os.path.exists(info):
+                self._meta['lastChecked'] = time.strftime(
+                    '%Y-%m-%d %H:%M:%S',
+                    time.localtime(os.path.getatime(info)))
+            else:
+                self._meta['lastChecked'] = self.displayID
+
+        return self._meta['lastChecked']
+
+    def prefetch(self):
+        """
+        Load name, failed flag and date of last check with a single scan of
+        the snapshot folder instead of one lookup per property. Use this in
+        background threads before showing many snapshots.
+        """
+        try:
+            with os.scandir(self.path()) as it:
+                entries = {entry.name: entry for entry in it}
+        except OSError as e:
+            logger.debug('Failed to prefetch snapshot {}: {}'.format(
+                         self.sid, str(e)),
+                         self)
+            return
+
+        self._meta['failed'] = self.FAILED in entries
+
+        name = ''
+        if self.NAME in entries:
+            try:
+                with open(entries[self.NAME].path, 'rt') as f:
+                    name = f.read()
+            except Exception as e:
+                logger.debug('Failed to get snapshot {} name: {}'.format(
+                             self.sid, str(e)),
+                             self)
+        self._meta['name'] = name
+
+        try:
+            atime = entries[self.INFO].stat().st_atime
+        except (KeyError, OSError):
+            self._meta['lastChecked'] = self.displayID
+        else:
+            self._meta['lastChecked'] = time.strftime(
+                '%Y-%m-%d %H:%M:%S', time.localtime(atime))
 
     #using @property.setter would be confusing here as there is no value to give
     def setLastChecked(self):
@@ -2705,6 +3494,7 @@ class SID(object):
         Set info files atime to current time to indicate this snapshot was
         checked against source without changes right now.
         """
+        self._meta.pop('lastChecked', None)
         info = self.path(self.INFO)
         if os.path.exists(info):
             os.utime(info, None)
@@ -2720,12 +3510,15 @@ class SID(object):
         Returns:
             bool:           ``True`` if flag is set
         """
-        failedFile = self.path(self.FAILED)
-        return os.path.isfile(failedFile)
+        if 'failed' not in self._meta:
+            self._meta['failed'] = os.path.isfile(self.path(self.FAILED))
+
+        return self._meta['failed']
 
     @failed.setter
     def failed(self, enable):
         failedFile = self.path(self.FAILED)
+        self._meta.pop('failed', None)
         if enable:
             self.makeWritable()
             try:
@@ -2750,13 +3543,21 @@ class SID(object):
         Returns:
             configfile.ConfigFile:  snapshots information
         """
+        if 'info' not in self._meta:
+            i = configfile.ConfigFile()
+            i.load(self.path(self.INFO))
+            self._meta['info'] = i.dict
+
+        # callers may change the returned instance
         i = configfile.ConfigFile()
-        i.load(self.path(self.INFO))
+        i.dict = dict(self._meta['info'])
         return i
 
     @info.setter
     def info(self, i):
         assert isinstance(i, configfile.ConfigFile), 'i is not configfile.ConfigFile type: {}'.format(i)
+        self._meta.pop('info', None)
+        self._meta.pop('lastChecked', None)
         i.save(self.path(self.INFO))
 
     @property
@@ -2830,8 +3631,9 @@ class SID(object):
             with bz2.BZ2File(logFile, 'rb') as f:
                 if logFilter.header:
                     yield logFilter.header
-                for line in f.readlines():
-                    line = logFilter.filter(line.decode('utf-8').rstrip('\n'))
+                lines = [line.decode('utf-8').rstrip('\n')
+                         for line in f.readlines()]
+                for line in logFilter.filterLines(lines):
                     if not line is None:
                         yield line
         except Exception as e:
@@ -2871,6 +3673,8 @@ class SID(object):
 
 
 class GenericNonSnapshot(SID):
+    __slots__ = ()
+
     @property
     def displayID(self):
         return self.name
@@ -2896,10 +3700,15 @@ class NewSnapshot(GenericNonSnapshot):
         cfg (config.Config):    current config
     """
 
+    __slots__ = ()
+
     NEWSNAPSHOT    = 'new_snapshot'
     SAVETOCONTINUE = 'save_to_continue'
 
     def __init__(self, cfg):
+        self._cacheKey = None
+        self._paths = {}
+        self._meta = {}
         self.config = cfg
         self.profileID = cfg.currentProfile()
         self.isRoot = False
@@ -2907,9 +3716,6 @@ class NewSnapshot(GenericNonSnapshot):
         self.sid = self.NEWSNAPSHOT
         self.date = datetime.datetime(1, 1, 1)
 
-        self.__le__ = self.__lt__
-        self.__ge__ = self.__gt__
-
     def __lt__(self, other):
         return False
 
@@ -2977,7 +3783,12 @@ class RootSnapshot(GenericNonSnapshot):
     Args:
         cfg (config.Config):    current config
     """
+    __slots__ = ()
+
     def __init__(self, cfg):
+        self._cacheKey = None
+        self._paths = {}
+        self._meta = {}
         self.config = cfg
         self.profileID = cfg.currentProfile()
         self.isRoot = True
@@ -2985,9 +3796,6 @@ class RootSnapshot(GenericNonSnapshot):
         self.sid = '/'
         self.date = datetime.datetime(datetime.MAXYEAR, 12, 31)
 
-        self.__le__ = self.__lt__
-        self.__ge__ = self.__gt__
-
     def __lt__(self, other):
         return False
 
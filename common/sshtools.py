@@ -23,6 +23,8 @@ import socket
 import re
 import atexit
 import signal
+import shutil
+import time
 from pathlib import Path
 from time import sleep
 import logger
@@ -593,6 +595,286 @@ class SSH(MountControl):
         subprocess.call(ssh)
         os.remove(temp)
 
+    def benchmarkTransport(self,
+                           size=40,
+                           files=1000,
+                           ciphers=None,
+                           compression=(False, True)):
+        """
+        Benchmark the transports really used for snapshots. For every
+        combination of cipher and compression this will measure
+
+        * raw ``scp`` throughput of a random file with ``size`` MiB,
+        * ``rsync`` transfer of ``files`` small files,
+        * ``rsync --link-dest`` scan time if nothing has changed and
+        * ``sshfs`` metadata operations (``lstat``) per second.
+
+        Args:
+            size (int):         size of the testfile in MiB
+            files (int):        number of small files used for rsync and
+                                sshfs benchmarks
+            ciphers (list):     ciphers which should be tested. If ``None``
+                                all known ciphers will be used
+            compression (tuple): compression settings which should be tested
+
+        Returns:
+            dict:               benchmark results which can be dumped as JSON
+
+        Raises:
+            exceptions.MountException:
+                                if the benchmark folder couldn't be created
+                                on remote host
+        """
+        if ciphers is None:
+            ciphers = sorted(self.config.SSH_CIPHERS.keys())
+
+        local = tempfile.mkdtemp()
+        remote = os.path.join(
+            self.path,
+            '.backintime_benchmark_%s' % self.randomId())
+
+        results = {
+            'host': self.host,
+            'port': self.port,
+            'path': self.path,
+            'size_mib': size,
+            'files': files,
+            'results': []
+        }
+
+        try:
+            bigfile = os.path.join(local, 'random')
+            with open(bigfile, 'wb') as f:
+                for i in range(size):
+                    f.write(os.urandom(1024 * 1024))
+
+            smallfiles = os.path.join(local, 'small')
+            for i in range(files):
+                folder = os.path.join(smallfiles, '%03d' % (i // 100))
+                os.makedirs(folder, exist_ok=True)
+                with open(os.path.join(folder, '%05d' % i), 'wb') as f:
+                    f.write(os.urandom(random.randint(64, 4096)))
+
+            if self._benchmarkRemote(['mkdir', '-p', remote]):
+                raise MountException(
+                    'Failed to create benchmark folder %s on remote host %s'
+                    % (remote, self.host))
+
+            for run, (cipher, compress) in enumerate(
+                    (c, z) for c in ciphers for z in compression):
+
+                logger.info('Benchmark cipher %s with compression %s'
+                            % (cipher, 'on' if compress else 'off'), self)
+
+                dest = os.path.join(remote, 'run%d' % run)
+                result = {'cipher': cipher, 'compression': compress}
+                if self._benchmarkRemote(['mkdir', '-p', dest]):
+                    logger.warning('Failed to create %s on remote host. '
+                                   'Skip this run.' % dest, self)
+                    result['error'] = 'Failed to create %s' % dest
+                    results['results'].append(result)
+                    continue
+
+                result.update(self._benchmarkScp(
+                    bigfile, dest, size, cipher, compress))
+                result.update(self._benchmarkRsync(
+                    smallfiles, dest, files, cipher, compress))
+                result.update(self._benchmarkSshfs(
+                    dest, cipher, compress))
+                results['results'].append(result)
+
+                self._benchmarkRemote(['rm', '-rf', dest])
+
+        finally:
+            self._benchmarkRemote(['rm', '-rf', remote])
+            shutil.rmtree(local, ignore_errors=True)
+
+        return results
+
+    def _benchmarkSshArgs(self, cipher, compress):
+        """
+        SSH options used for one benchmark run.
+
+        Args:
+            cipher (str):       cipher or ``default``
+            compress (bool):    enable SSH compression
+
+        Returns:
+            list:               ssh options
+        """
+        args = self.config.sshDefaultArgs(self.profile_id)
+
+        # scp, rsync's ssh and sshfs all understand ProxyJump
+        if self.proxy_host:
+            args.extend(['-o', 'ProxyJump=%s@%s:%s' % (self.proxy_user,
+                                                       self.proxy_host,
+                                                       self.proxy_port)])
+
+        if cipher != 'default':
+            args.extend(['-o', 'Ciphers=%s' % cipher])
+
+        args.extend(['-o', 'Compression=%s' % ('yes' if compress else 'no')])
+
+        return args
+
+    def _benchmarkRemote(self, cmd):
+        """
+        Run ``cmd`` on remote host without nice, ionice or prefix.
+
+        Args:
+            cmd (list):         command to run on remote host
+
+        Returns:
+            int:                return code of ssh
+        """
+        ssh = self.config.sshCommand(
+            cmd=cmd,
+            custom_args=['-p', str(self.port), self.user_host],
+            port=False,
+            cipher=False,
+            user_host=False,
+            nice=False,
+            ionice=False,
+            prefix=False,
+            profile_id=self.profile_id)
+
+        return subprocess.call(ssh,
+                               stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL)
+
+    def _benchmarkTime(self, cmd):
+        """
+        Run ``cmd`` and measure its runtime.
+
+        Args:
+            cmd (list):         command to run
+
+        Returns:
+            float:              runtime in seconds or ``None`` if ``cmd``
+                                failed
+        """
+        logger.debug('Benchmark command: %s' % ' '.join(cmd), self)
+        start = time.monotonic()
+        proc = subprocess.run(cmd,
+                              stdout=subprocess.DEVNULL,
+                              stderr=subprocess.PIPE,
+                              universal_newlines=True)
+        duration = time.monotonic() - start
+
+        if proc.returncode:
+            logger.warning('Benchmark command %s failed: %s'
+                           % (cmd[0], proc.stderr.strip()), self)
+            return None
+
+        return duration
+
+    def _benchmarkScp(self, bigfile, dest, size, cipher, compress):
+        """
+        Measure raw ``scp`` throughput.
+
+        Returns:
+            dict:               ``scp_seconds`` and ``scp_mib_per_second``
+        """
+        # scp uses -P instead of -p for port
+        cmd = ['scp', '-q', '-P', str(self.port)]
+        cmd.extend(self._benchmarkSshArgs(cipher, compress))
+        cmd.extend([bigfile, self._benchmarkUserHostPath(dest)])
+
+        duration = self._benchmarkTime(cmd)
+
+        return {
+            'scp_seconds': duration,
+            'scp_mib_per_second': self._benchmarkRate(size, duration)
+        }
+
+    def _benchmarkRsync(self, smallfiles, dest, files, cipher, compress):
+        """
+        Measure ``rsync`` transfer of many small files and the scan time of
+        an unchanged tree with ``--link-dest`` like the one a snapshot without
+        changes would cause.
+
+        Returns:
+            dict:               ``rsync_seconds``, ``rsync_files_per_second``
+                                and ``rsync_link_dest_seconds``
+        """
+        ssh = ['ssh', '-p', str(self.port)]
+        ssh.extend(self._benchmarkSshArgs(cipher, compress))
+
+        cmd = ['rsync', '-rlt', '--rsh=' + ' '.join(ssh)]
+
+        duration = self._benchmarkTime(
+            cmd + [smallfiles + os.sep,
+                   self._benchmarkUserHostPath(dest, 'full') + os.sep])
+
+        link_dest = self._benchmarkTime(
+            cmd + ['--link-dest=../full',
+                   smallfiles + os.sep,
+                   self._benchmarkUserHostPath(dest, 'linked') + os.sep])
+
+        return {
+            'rsync_seconds': duration,
+            'rsync_files_per_second': self._benchmarkRate(files, duration),
+            'rsync_link_dest_seconds': link_dest
+        }
+
+    def _benchmarkSshfs(self, dest, cipher, compress):
+        """
+        Mount ``dest`` with ``sshfs`` and measure how many ``lstat`` calls per
+        second can be done on the small files transferred before.
+
+        Returns:
+            dict:               ``sshfs_ops`` and ``sshfs_ops_per_second``
+        """
+        mountpoint = tempfile.mkdtemp()
+        sshfs = [self.mountproc, '-p', str(self.port)]
+        sshfs.extend(self._benchmarkSshArgs(cipher, compress))
+        sshfs.extend(['-o', 'idmap=user',
+                      self._benchmarkUserHostPath(dest, 'full'),
+                      mountpoint])
+
+        ops = 0
+        duration = None
+
+        try:
+            if self._benchmarkTime(sshfs) is None:
+                return {'sshfs_ops': 0, 'sshfs_ops_per_second': None}
+
+            start = time.monotonic()
+            for root, dirs, fnames in os.walk(mountpoint):
+                for name in dirs + fnames:
+                    os.lstat(os.path.join(root, name))
+                    ops += 1
+            duration = time.monotonic() - start
+
+        finally:
+            subprocess.call(['fusermount', '-u', mountpoint],
+                            stderr=subprocess.DEVNULL)
+            os.rmdir(mountpoint)
+
+        return {
+            'sshfs_ops': ops,
+            'sshfs_ops_per_second': self._benchmarkRate(ops, duration)
+        }
+
+    def _benchmarkUserHostPath(self, *path):
+        """
+        Remote ``path`` in ``user@host:path`` notation.
+        """
+        return '%s@%s:%s' % (self.user,
+                             tools.escapeIPv6Address(self.host),
+                             os.path.join(*path))
+
+    @staticmethod
+    def _benchmarkRate(amount, duration):
+        """
+        ``amount`` per second rounded to two digits or ``None`` if
+        ``duration`` is unknown.
+        """
+        if not duration:
+            return None
+
+        return round(amount / duration, 2)
+
     def checkKnownHosts(self):
         """
         Check if the remote host is in current users ``known_hosts`` file.
@@ -886,10 +1168,10 @@ class SSH(MountControl):
             cmd += 'test $err_nocache -ne 0 && cleanup $err_nocache; '
             tail.append(cmd)
 
-        # try screen, bash and flock used by smart-remove running in background
+        # try xargs, bash and flock used by smart-remove running on remote host
         if self.config.smartRemoveRunRemoteInBackground(self.profile_id):
-            cmd = 'echo \"screen -d -m bash -c ...\"; screen -d -m bash -c \"true\" >/dev/null; err_screen=$?; '
-            cmd += 'test $err_screen -ne 0 && cleanup $err_screen; '
+            cmd = 'echo \"xargs -P 2 -I{} bash -c ...\"; echo | xargs -d \"\\n\" -P 2 -I{} bash -c \"true\" >/dev/null; err_xargs=$?; '
+            cmd += 'test $err_xargs -ne 0 && cleanup $err_xargs; '
             tail.append(cmd)
 
             cmd = 'echo \"(flock -x 9) 9>smr.lock\"; bash -c \"(flock -x 9) 9>smr.lock\" >/dev/null; err_flock=$?; '
@@ -974,7 +1256,7 @@ class SSH(MountControl):
         if returncode or not output_split[-1].startswith('done'):
 
             for command in ('rm', 'nice', 'ionice',
-                            'nocache', 'screen', '(flock'):
+                            'nocache', 'xargs', '(flock'):
 
                 if output_split[-1].startswith(command):
                     command = f"'{output_split[-1]}':\n{err}"
@@ -0,0 +1,195 @@
+#    Back In Time
+#    Copyright (C) 2008-2022 Oprea Dan, Bart de Koning, Richard Bailey,
+#    Germar Reitze
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""Push notifications about the state of running backups.
+
+The backup process still writes its message and progress into files (see
+:py:func:`snapshots.Snapshots.setTakeSnapshotMessage` and
+:py:class:`progress.ProgressFile`). In addition it sends a short event to
+each :py:class:`Listener` (GUI, systray icon) whenever they change, so
+listeners only need to read those files when something happened instead
+of polling them.
+
+Each listener binds a Unix datagram socket in a common folder. The
+:py:class:`Notifier` sends every event to all sockets in that folder and
+removes sockets whose listener is gone. Sending never blocks; if a listener
+is too slow, events are dropped as the next one will make it read the
+current state anyway.
+"""
+import os
+import time
+import socket
+import logger
+
+# events sent by the backup process
+STARTED = 'started'
+MESSAGE = 'message'
+PROGRESS = 'progress'
+FINISHED = 'finished'
+
+SUFFIX = '.sock'
+
+
+class Notifier(object):
+    """
+    Send events to all listeners in ``folder``.
+
+    Args:
+        folder (str):           folder with listener sockets
+        profileID (str):        profile of the backup sending the events
+        minInterval (float):    min seconds between two :py:data:`PROGRESS`
+                                events. Other events are always sent
+    """
+    # seconds the list of listeners is cached
+    RESCAN = 1.0
+
+    def __init__(self, folder, profileID, minInterval = 0.25):
+        self.folder = folder
+        self.profileID = profileID
+        self.minInterval = minInterval
+        self.sock = None
+        self.listeners = []
+        self.lastScan = None
+        self.lastProgress = None
+
+    def _listeners(self):
+        now = time.monotonic()
+        if self.lastScan is None or now - self.lastScan > self.RESCAN:
+            self.lastScan = now
+            try:
+                self.listeners = [os.path.join(self.folder, name)
+                                  for name in os.listdir(self.folder)
+                                  if name.endswith(SUFFIX)]
+            except OSError:
+                self.listeners = []
+        return self.listeners
+
+    def send(self, event):
+        """
+        Send ``event`` to all listeners.
+
+        Args:
+            event (str):    one of :py:data:`STARTED`, :py:data:`MESSAGE`,
+                            :py:data:`PROGRESS` or :py:data:`FINISHED`
+
+        Returns:
+            int:            number of listeners which got the event
+        """
+        if event == PROGRESS:
+            now = time.monotonic()
+            if self.lastProgress is not None \
+                    and now - self.lastProgress < self.minInterval:
+                return 0
+            self.lastProgress = now
+
+        listeners = self._listeners()
+        if not listeners:
+            return 0
+
+        if self.sock is None:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            self.sock.setblocking(False)
+
+        data = '{} {}'.format(self.profileID, event).encode()
+        count = 0
+        for path in list(listeners):
+            try:
+                self.sock.sendto(data, path)
+                count += 1
+            except BlockingIOError:
+                # listener is busy and will read the current state anyway
+                pass
+            except (ConnectionRefusedError, FileNotFoundError):
+                # listener is gone
+                self._remove(path)
+            except OSError as e:
+                logger.debug('Failed to send event to {}: {}'.format(
+                             path, str(e)),
+                             self)
+        return count
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        if path in self.listeners:
+            self.listeners.remove(path)
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+
+class Listener(object):
+    """
+    Receive events from backups. Use :py:func:`fileno` with ``select`` or a
+    ``QSocketNotifier`` to wait for events.
+
+    Args:
+        folder (str):   folder with listener sockets
+
+    Raises:
+        OSError:        if the socket can not be created. E.g. if the path is
+                        longer than allowed for Unix sockets
+    """
+    def __init__(self, folder):
+        os.makedirs(folder, mode = 0o700, exist_ok = True)
+        self.path = os.path.join(folder, '{}-{}{}'.format(
+            os.getpid(), os.urandom(4).hex(), SUFFIX))
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        try:
+            self.sock.bind(self.path)
+        except OSError:
+            self.sock.close()
+            raise
+        self.sock.setblocking(False)
+
+    def __del__(self):
+        self.close()
+
+    def fileno(self):
+        return self.sock.fileno()
+
+    def read(self):
+        """
+        Read all pending events without blocking.
+
+        Returns:
+            list:   tuples of (profile ID, event) in order of arrival
+        """
+        events = []
+        while True:
+            try:
+                data = self.sock.recv(256)
+            except (BlockingIOError, OSError):
+                break
+            profileID, sep, event = data.decode(errors = 'replace').partition(' ')
+            events.append((profileID, event))
+        return events
+
+    def close(self):
+        sock = getattr(self, 'sock', None)
+        if sock is None:
+            return
+        sock.close()
+        self.sock = None
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
@@ -237,5 +237,90 @@ class TestArgParser(generic.TestCase):
         with self.assertRaises(SystemExit):
             backintime.argParse(('restore', '--local-backup', '--no-local-backup'))
 
+    ############################################################################
+    ###                         Benchmark Transport                          ###
+    ############################################################################
+    def test_cmd_benchmark_transport(self):
+        args = backintime.argParse(['benchmark-transport'])
+        self.assertIn('command', args)
+        self.assertEqual(args.command, 'benchmark-transport')
+        self.assertIs(args.func, backintime.benchmarkTransport)
+        self.assertEqual(args.FILE_SIZE, 40)
+        self.assertEqual(args.files, 1000)
+        self.assertIsNone(args.ciphers)
+        self.assertFalse(args.no_compression)
+
+    def test_cmd_benchmark_transport_multi_args(self):
+        args = backintime.argParse(['benchmark-transport', '10',
+                                    '--files', '50',
+                                    '--cipher', 'aes128-ctr',
+                                    '--cipher', 'aes256-ctr',
+                                    '--no-compression'])
+        self.assertEqual(args.FILE_SIZE, 10)
+        self.assertEqual(args.files, 50)
+        self.assertEqual(args.ciphers, ['aes128-ctr', 'aes256-ctr'])
+        self.assertTrue(args.no_compression)
+
+    ############################################################################
+    ###                                Search                                ###
+    ############################################################################
+    def test_cmd_search(self):
+        args = backintime.argParse(['search', '*.txt'])
+        self.assertEqual(args.command, 'search')
+        self.assertIs(args.func, backintime.search)
+        self.assertEqual(args.PATTERN, '*.txt')
+        self.assertFalse(args.case_sensitive)
+        self.assertFalse(args.keep_mount)
+
+    def test_cmd_search_case_sensitive(self):
+        args = backintime.argParse(['search', '--case-sensitive', 'Foo'])
+        self.assertEqual(args.PATTERN, 'Foo')
+        self.assertTrue(args.case_sensitive)
+
+    def test_cmd_search_no_pattern(self):
+        with self.assertRaises(SystemExit):
+            backintime.argParse(['search'])
+
+    ############################################################################
+    ###                                 Diff                                 ###
+    ############################################################################
+    def test_cmd_diff(self):
+        args = backintime.argParse(['diff', '1', '20151219-010324-123'])
+        self.assertEqual(args.command, 'diff')
+        self.assertIs(args.func, backintime.diff)
+        self.assertEqual(args.SNAPSHOT_ID1, '1')
+        self.assertEqual(args.SNAPSHOT_ID2, '20151219-010324-123')
+        self.assertEqual(args.PATH, '/')
+        self.assertFalse(args.use_logs)
+
+    def test_cmd_diff_path_use_logs(self):
+        args = backintime.argParse(['diff', '--use-logs', '1', '0', '/home'])
+        self.assertEqual(args.PATH, '/home')
+        self.assertTrue(args.use_logs)
+
+    def test_cmd_diff_missing_snapshot(self):
+        with self.assertRaises(SystemExit):
+            backintime.argParse(['diff', '1'])
+
+    ############################################################################
+    ###                              Scheduler                               ###
+    ############################################################################
+    def test_cmd_scheduler(self):
+        args = backintime.argParse(['scheduler', 'status'])
+        self.assertEqual(args.command, 'scheduler')
+        self.assertIs(args.func, backintime.schedulerDaemon)
+        self.assertEqual(args.ACTION, 'status')
+
+        args = backintime.argParse(['scheduler'])
+        self.assertIsNone(args.ACTION)
+
+    def test_cmd_smart_remove_dry_run(self):
+        args = backintime.argParse(['smart-remove'])
+        self.assertIs(args.func, backintime.smartRemove)
+        self.assertFalse(args.dry_run)
+
+        args = backintime.argParse(['smart-remove', '--dry-run'])
+        self.assertTrue(args.dry_run)
+
 if __name__ == '__main__':
     unittest.main()
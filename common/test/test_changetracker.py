@@ -0,0 +1,251 @@
+#    Back In Time
+#    Copyright (C) 2008-2022 Oprea Dan, Bart de Koning, Richard Bailey,
+#    Germar Reitze
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+import os
+import sys
+import unittest
+from unittest.mock import patch
+from tempfile import TemporaryDirectory
+from test import generic
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+import changetracker
+
+
+class TestMinimizeFolders(unittest.TestCase):
+    def test_minimizeFolders(self):
+        self.assertListEqual(
+            changetracker.minimizeFolders(['/foo/bar',
+                                           '/foo',
+                                           '/foobar',
+                                           '/baz/1',
+                                           '/baz/1',
+                                           '/baz/2/3']),
+            ['/baz/1', '/baz/2/3', '/foo', '/foobar'])
+
+    def test_dirtyItems(self):
+        self.assertListEqual(
+            changetracker.dirtyItems(['/foo', '/foo/bar/baz', '/foobar',
+                                      '/bar', '/bar'],
+                                     ['/foo/bar', '/foo/bar/1']),
+            [('/bar', False),
+             ('/foo', False),
+             ('/foo/bar', True),
+             ('/foobar', False)])
+
+
+@patch('changetracker.ChangeTrackerDaemon.status', return_value=True)
+class TestChangeTracker(generic.TestCaseCfg):
+    def setUp(self):
+        super(TestChangeTracker, self).setUp()
+        self.tracker = changetracker.ChangeTracker(self.cfg)
+        self.addCleanup(self.tracker.reset)
+        self.addCleanup(self.removeJournal)
+
+    def removeJournal(self):
+        if os.path.exists(self.tracker.journalFile):
+            os.remove(self.tracker.journalFile)
+
+    def writeJournal(self, *lines, watcherId='abc', hash_=None):
+        if hash_ is None:
+            hash_ = changetracker.configHash(self.cfg)
+        mode = 'at' if lines and not watcherId else 'wt'
+        with open(self.tracker.journalFile, mode) as f:
+            if watcherId:
+                f.write('%s %s %s\n' % (changetracker.JOURNAL_HEADER,
+                                        watcherId, hash_))
+            for line in lines:
+                f.write(line + '\n')
+
+    def test_no_journal(self, status):
+        self.assertIsNone(self.tracker.dirtyFolders())
+
+    def test_first_run(self, status):
+        self.writeJournal('/foo')
+        # no snapshot was taken with this journal yet
+        self.assertIsNone(self.tracker.dirtyFolders())
+
+    def test_changes_since_commit(self, status):
+        self.writeJournal('/foo')
+        self.tracker.dirtyFolders()
+        self.tracker.commit()
+
+        self.assertListEqual(self.tracker.dirtyFolders(), [])
+
+        self.writeJournal('/bar/baz', '/bar', '/foo/1', '+/foo/1/new',
+                          '/foo/1/new/2', watcherId=None)
+        expected = [('/bar', False),
+                    ('/bar/baz', False),
+                    ('/foo/1', False),
+                    ('/foo/1/new', True)]
+        self.assertListEqual(self.tracker.dirtyFolders(), expected)
+
+        # not committed yet
+        self.assertListEqual(self.tracker.dirtyFolders(), expected)
+        self.tracker.commit()
+        self.assertListEqual(self.tracker.dirtyFolders(), [])
+
+    def test_restarted(self, status):
+        self.writeJournal()
+        self.tracker.dirtyFolders()
+        self.tracker.commit()
+
+        self.writeJournal(watcherId='def')
+        self.assertIsNone(self.tracker.dirtyFolders())
+
+    def test_overflow(self, status):
+        self.writeJournal()
+        self.tracker.dirtyFolders()
+        self.tracker.commit()
+
+        self.writeJournal(changetracker.JOURNAL_OVERFLOW, watcherId=None)
+        self.assertIsNone(self.tracker.dirtyFolders())
+
+    def test_config_changed(self, status):
+        self.writeJournal(hash_='foo')
+        self.tracker.dirtyFolders()
+        self.tracker.commit()
+
+        self.assertIsNone(self.tracker.dirtyFolders())
+
+    def test_commit_truncates_journal(self, status):
+        self.writeJournal('/foo')
+        self.tracker.dirtyFolders()
+        self.tracker.commit()
+        self.writeJournal('/bar', watcherId=None)
+        self.tracker.dirtyFolders()
+        # written while the snapshot was taken
+        self.writeJournal('/baz', watcherId=None)
+        self.tracker.commit()
+
+        with open(self.tracker.journalFile, 'rt') as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].startswith(changetracker.JOURNAL_HEADER))
+        self.assertEqual(lines[1], '/baz')
+        self.assertListEqual(self.tracker.dirtyFolders(), [('/baz', False)])
+
+    def test_daemon_not_running(self, status):
+        self.writeJournal()
+        self.tracker.dirtyFolders()
+        self.tracker.commit()
+
+        status.return_value = False
+        self.assertIsNone(self.tracker.dirtyFolders())
+
+
+class TestChangeTrackerDaemon(generic.TestCaseCfg):
+    def setUp(self):
+        super(TestChangeTrackerDaemon, self).setUp()
+        try:
+            self.inotify = changetracker.Inotify()
+        except OSError as e:
+            self.skipTest('inotify not available: %s' % str(e))
+        self.addCleanup(self.inotify.close)
+
+        self.tmpDir = TemporaryDirectory()
+        self.addCleanup(self.tmpDir.cleanup)
+        os.makedirs(os.path.join(self.tmpDir.name, 'foo', 'bar'))
+
+        self.daemon = changetracker.ChangeTrackerDaemon(self.cfg)
+        self.daemon.inotify = self.inotify
+        # default excludes contain '/tmp/*'
+        self.daemon.excludes = []
+        self.daemon.journal = open(self.cfg.changeTrackerJournal(), 'wb')
+        self.addCleanup(self.daemon.journal.close)
+
+    def events(self):
+        for event in self.inotify.read(1):
+            self.daemon.handleEvent(*event)
+        self.daemon.flush()
+        with open(self.cfg.changeTrackerJournal(), 'rt') as f:
+            return f.read().splitlines()
+
+    def test_watch(self):
+        self.daemon.watchTree(self.tmpDir.name)
+        self.assertEqual(len(self.daemon.watches), 3)
+
+        with open(os.path.join(self.tmpDir.name, 'foo', 'bar', 'baz'), 'wt'):
+            pass
+        self.assertListEqual(self.events(),
+                             [os.path.join(self.tmpDir.name, 'foo', 'bar')])
+
+    def test_watch_new_folder(self):
+        self.daemon.watchTree(self.tmpDir.name)
+        new = os.path.join(self.tmpDir.name, 'new')
+        os.mkdir(new)
+        self.assertListEqual(self.events(),
+                             [self.tmpDir.name,
+                              changetracker.JOURNAL_TREE + new])
+        self.assertIn(new, self.daemon.watches.values())
+
+
+    def test_flush_not_dirty(self):
+        # the journal is written into the data folder inside of sharePath
+        self.daemon.watchTree(self.sharePath)
+        self.assertNotIn(self.cfg._LOCAL_DATA_FOLDER,
+                         self.daemon.watches.values())
+
+        self.daemon.dirty.add(self.tmpDir.name)
+        self.daemon.flush()
+        for event in self.inotify.read(1):
+            self.daemon.handleEvent(*event)
+        self.assertSetEqual(self.daemon.dirty, set())
+        self.assertFalse(self.daemon.overflow)
+
+    def test_ignore_data_folder(self):
+        dataParent = os.path.dirname(self.cfg._LOCAL_DATA_FOLDER)
+        self.daemon.watch(dataParent)
+        with open(os.path.join(dataParent, 'foo'), 'wt'):
+            pass
+        wd = next(iter(self.daemon.watches))
+        self.daemon.handleEvent(wd, changetracker.IN_MODIFY,
+                                os.path.basename(self.cfg._LOCAL_DATA_FOLDER))
+        self.assertSetEqual(self.daemon.dirty, set())
+        self.assertListEqual(self.events(), [dataParent])
+
+    def test_ignore_excluded(self):
+        self.daemon.excludes = ['.cache', '*~']
+        self.daemon.watchTree(self.tmpDir.name)
+        with open(os.path.join(self.tmpDir.name, 'foo', 'bar', 'baz~'), 'wt'):
+            pass
+        os.mkdir(os.path.join(self.tmpDir.name, '.cache'))
+        self.assertListEqual(self.events(), [])
+        self.assertNotIn(os.path.join(self.tmpDir.name, '.cache'),
+                         self.daemon.watches.values())
+
+    def test_moved_folder(self):
+        self.daemon.watchTree(self.tmpDir.name)
+        old = os.path.join(self.tmpDir.name, 'foo')
+        new = os.path.join(self.tmpDir.name, 'moved')
+        os.rename(old, new)
+        self.assertListEqual(self.events(),
+                             [self.tmpDir.name,
+                              changetracker.JOURNAL_TREE + new])
+        self.assertCountEqual(self.daemon.watches.values(),
+                              [self.tmpDir.name, new,
+                               os.path.join(new, 'bar')])
+
+        with open(os.path.join(new, 'bar', 'baz'), 'wt'):
+            pass
+        self.assertListEqual(self.events()[-1:],
+                             [os.path.join(new, 'bar')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -22,6 +22,7 @@ from test import generic
 from tempfile import TemporaryDirectory
 from unittest.mock import patch
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+import configfile
 
 
 class TestConfig(generic.TestCaseCfg):
@@ -42,6 +43,89 @@ class TestConfig(generic.TestCaseCfg):
             self.assertTrue(self.cfg.setSnapshotsPath(dirpath))
 
 
+@patch('tools.which', return_value='/usr/bin/backintime')
+@patch('tools.checkCommand', return_value=True)
+class TestSchedulerDaemonCrontab(generic.TestCaseCfg):
+    def setUp(self):
+        super(TestSchedulerDaemonCrontab, self).setUp()
+        self.cfg.setScheduleMode(self.cfg._1_HOUR)
+        self.cfg.setSchedulerDaemon(True)
+
+    def test_createNewCrontab_keeps_cron_jobs(self, checkCommand, which):
+        crontab = self.cfg.createNewCrontab([])
+        self.assertTrue(any(line.startswith('@reboot')
+                            and 'scheduler start' in line
+                            for line in crontab))
+        # cron jobs are the fallback if the daemon isn't running
+        self.assertTrue(any(line.startswith('0 * * * *')
+                            and 'backup-job' in line
+                            for line in crontab))
+
+    @patch('subprocess.Popen')
+    @patch('tools.writeCrontab', return_value=True)
+    @patch('tools.readCrontab', return_value=[])
+    def test_setupCron_starts_daemon(self, readCrontab, writeCrontab, popen,
+                                     checkCommand, which):
+        with patch('tools.Daemon.status', return_value=False):
+            self.assertTrue(self.cfg.setupCron())
+        popen.assert_called_once()
+        self.assertIn('scheduler start', popen.call_args[0][0])
+
+        popen.reset_mock()
+        with patch('tools.Daemon.status', return_value=True):
+            self.assertTrue(self.cfg.setupCron())
+        popen.assert_not_called()
+
+class TestCachedProfileValues(generic.TestCaseCfg):
+    def test_cached(self):
+        self.assertEqual(self.cfg.snapshotsMode(), 'local')
+        with patch.object(self.cfg, 'profileStrValue') as mock:
+            self.assertEqual(self.cfg.snapshotsMode(), 'local')
+            self.assertEqual(self.cfg.snapshotsMode('1'), 'local')
+            self.assertEqual(self.cfg.snapshotsMode(1), 'local')
+        mock.assert_not_called()
+
+    def test_invalidated_by_set(self):
+        fullPath = self.cfg.snapshotsFullPath()
+        self.cfg.setSnapshotsMode('ssh')
+        self.assertEqual(self.cfg.snapshotsMode(), 'ssh')
+
+        self.cfg.setHostUserProfile('foo', 'bar', '42')
+        self.assertNotEqual(self.cfg.snapshotsFullPath(), fullPath)
+        self.assertTrue(self.cfg.snapshotsFullPath().endswith(
+            os.path.join('backintime', 'foo', 'bar', '42')))
+
+        self.cfg.removeProfileKey('snapshots.mode')
+        self.assertEqual(self.cfg.snapshotsMode(), 'local')
+
+    def test_invalidated_by_dict(self):
+        self.cfg.snapshotsMode()
+        dictCopy = dict(self.cfg.dict)
+        self.cfg.setSnapshotsMode('ssh')
+        self.cfg.dict = dictCopy
+        self.assertEqual(self.cfg.snapshotsMode(), 'local')
+
+    def test_per_profile(self):
+        profile_id = self.cfg.addProfile('foo')
+        self.cfg.setSnapshotsMode('ssh', profile_id)
+        self.assertEqual(self.cfg.snapshotsMode('1'), 'local')
+        self.assertEqual(self.cfg.snapshotsMode(profile_id), 'ssh')
+
+        self.cfg.setCurrentProfile(profile_id)
+        self.assertEqual(self.cfg.snapshotsMode(), 'ssh')
+
+    def test_list_copy(self):
+        self.cfg.setInclude([('/foo', 0)])
+        include = self.cfg.include()
+        include.append(('/bar', 1))
+        self.assertListEqual(self.cfg.include(), [('/foo', 0)])
+
+    def test_fork(self):
+        self.cfg.snapshotsMode()
+        self.assertTrue(self.cfg._profileValues)
+        configfile._afterFork()
+        self.assertFalse(self.cfg._profileValues)
+
 class TestSshCommand(generic.SSHTestCase):
     @classmethod
     def setUpClass(cls):
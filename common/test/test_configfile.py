@@ -16,9 +16,11 @@
 # 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 
 import os
+import stat
 import sys
-from tempfile import NamedTemporaryFile
+from tempfile import NamedTemporaryFile, TemporaryDirectory
 import unittest
+from unittest.mock import patch
 from test import generic
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
@@ -433,6 +435,92 @@ class TestConfigFile(generic.TestCase):
                                         'baz': 'false',
                                         'bla': '0'})
 
+class TestConfigFileCache(generic.TestCase):
+    """
+    Tests for the shared parse cache and atomic save in configfile
+    """
+    def setUp(self):
+        super(TestConfigFileCache, self).setUp()
+        configfile.clearCache()
+        self.tmpDir = TemporaryDirectory()
+        self.cfgFile = os.path.join(self.tmpDir.name, 'config')
+        with open(self.cfgFile, 'wt') as f:
+            f.write('foo=bar\nbaz=a=b\n')
+
+    def tearDown(self):
+        super(TestConfigFileCache, self).tearDown()
+        self.tmpDir.cleanup()
+        configfile.clearCache()
+
+    def test_load_cached(self):
+        cf = configfile.ConfigFile()
+        cf.load(self.cfgFile)
+        with patch('builtins.open', side_effect=AssertionError('reread')):
+            cf2 = configfile.ConfigFile()
+            cf2.load(self.cfgFile)
+        self.assertDictEqual(cf2.dict, {'foo': 'bar', 'baz': 'a=b'})
+
+        # instances don't share their dict
+        cf2.setStrValue('foo', 'changed')
+        cf3 = configfile.ConfigFile()
+        cf3.load(self.cfgFile)
+        self.assertEqual(cf3.strValue('foo'), 'bar')
+
+    def test_load_maxsplit(self):
+        cf = configfile.ConfigFile()
+        cf.load(self.cfgFile)
+        cf2 = configfile.ConfigFile()
+        cf2.load(self.cfgFile, maxsplit=2)
+        self.assertEqual(cf.strValue('baz'), 'a=b')
+        self.assertNotIn('baz', cf2.dict)
+
+    def test_load_changed(self):
+        cf = configfile.ConfigFile()
+        cf.load(self.cfgFile)
+        st = os.stat(self.cfgFile)
+        with open(self.cfgFile, 'wt') as f:
+            f.write('foo=new\nbaz=a=b\n')
+        # same size and mtime but different content
+        os.utime(self.cfgFile, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+        cf.load(self.cfgFile)
+        self.assertEqual(cf.strValue('foo'), 'new')
+
+    def test_save_unchanged(self):
+        cf = configfile.ConfigFile()
+        cf.load(self.cfgFile)
+        cf.dict = {'baz': 'a=b', 'foo': 'bar'}
+        with open(self.cfgFile, 'wt') as f:
+            f.write('baz=a=b\nfoo=bar\n')
+        st = os.stat(self.cfgFile)
+        self.assertTrue(cf.save(self.cfgFile))
+        self.assertEqual(st.st_ino, os.stat(self.cfgFile).st_ino)
+        self.assertEqual(st.st_mtime_ns, os.stat(self.cfgFile).st_mtime_ns)
+
+    def test_save_atomic(self):
+        os.chmod(self.cfgFile, 0o640)
+        st = os.stat(self.cfgFile)
+        cf = configfile.ConfigFile()
+        cf.load(self.cfgFile)
+        cf.setStrValue('foo', 'new')
+        self.assertTrue(cf.save(self.cfgFile))
+
+        st2 = os.stat(self.cfgFile)
+        self.assertNotEqual(st.st_ino, st2.st_ino)
+        self.assertEqual(stat.S_IMODE(st2.st_mode), 0o640)
+        self.assertListEqual(os.listdir(self.tmpDir.name), ['config'])
+        with open(self.cfgFile, 'rt') as f:
+            self.assertEqual(f.read(), 'baz=a=b\nfoo=new\n')
+
+    def test_save_symlink(self):
+        link = os.path.join(self.tmpDir.name, 'link')
+        os.symlink(self.cfgFile, link)
+        cf = configfile.ConfigFile()
+        cf.setStrValue('foo', 'new')
+        self.assertTrue(cf.save(link))
+        self.assertTrue(os.path.islink(link))
+        with open(self.cfgFile, 'rt') as f:
+            self.assertEqual(f.read(), 'foo=new\n')
+
 class TestConfigFileWithProfiles(generic.TestCase):
     def setUp(self):
         super(TestConfigFileWithProfiles, self).setUp()
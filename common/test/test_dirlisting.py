@@ -0,0 +1,171 @@
+# Back In Time
+# Copyright (C) 2008-2022 Oprea Dan, Bart de Koning, Richard Bailey,
+# Germar Reitze
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation,Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+import os
+import sys
+import unittest
+from tempfile import TemporaryDirectory
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+import dirlisting
+from dirlisting import Entry
+
+
+class TestDirListing(unittest.TestCase):
+    def setUp(self):
+        self.tmpDir = TemporaryDirectory()
+        self.path = self.tmpDir.name
+
+    def tearDown(self):
+        self.tmpDir.cleanup()
+
+    def test_scan(self):
+        os.mkdir(os.path.join(self.path, 'folder'))
+        with open(os.path.join(self.path, 'file'), 'wt') as f:
+            f.write('foo')
+        os.symlink('folder', os.path.join(self.path, 'link'))
+        os.symlink('missing', os.path.join(self.path, 'broken'))
+
+        entries = {e.name: e for batch in dirlisting.scan(self.path)
+                   for e in batch}
+        self.assertEqual(set(entries), {'folder', 'file', 'link', 'broken'})
+        self.assertTrue(entries['folder'].isDir)
+        self.assertTrue(entries['link'].isDir)
+        self.assertFalse(entries['file'].isDir)
+        self.assertFalse(entries['broken'].isDir)
+        self.assertEqual(entries['file'].size, 3)
+        self.assertEqual(entries['file'].mtime,
+                         os.stat(os.path.join(self.path, 'file')).st_mtime)
+
+    def test_scan_batches(self):
+        for i in range(25):
+            open(os.path.join(self.path, str(i)), 'wt').close()
+        sizes = [len(batch) for batch in dirlisting.scan(
+            self.path, batchSize = 10, firstBatchSize = 2)]
+        self.assertEqual(sizes, [2, 10, 10, 3])
+
+    def test_scan_missing(self):
+        with self.assertRaises(OSError):
+            list(dirlisting.scan(os.path.join(self.path, 'missing')))
+
+    def test_hidden(self):
+        self.assertTrue(Entry('.foo', False, 0, 0).hidden)
+        self.assertFalse(Entry('foo', False, 0, 0).hidden)
+
+    def test_sortOrder(self):
+        entries = [Entry('b', False, 3, 1.0),
+                   Entry('A', False, 1, 3.0),
+                   Entry('z', True, 0, 2.0),
+                   Entry('c.txt', False, 2, 2.0),
+                   Entry('B', True, 0, 1.0)]
+        names = lambda order: [entries[i].name for i in order]
+        self.assertEqual(names(dirlisting.sortOrder(entries)),
+                         ['B', 'z', 'A', 'b', 'c.txt'])
+        # folders stay in front
+        self.assertEqual(names(dirlisting.sortOrder(entries, reverse = True)),
+                         ['z', 'B', 'c.txt', 'b', 'A'])
+        self.assertEqual(names(dirlisting.sortOrder(entries, dirlisting.SIZE)),
+                         ['B', 'z', 'A', 'c.txt', 'b'])
+        self.assertEqual(names(dirlisting.sortOrder(entries, dirlisting.MTIME)),
+                         ['B', 'z', 'b', 'c.txt', 'A'])
+        self.assertEqual(names(dirlisting.sortOrder(entries, dirlisting.TYPE)),
+                         ['B', 'z', 'A', 'b', 'c.txt'])
+
+    def test_scan_reference(self):
+        for name in ('hardlink', 'changed'):
+            with open(os.path.join(self.path, name), 'wt') as f:
+                f.write('foo')
+        ino = os.stat(os.path.join(self.path, 'hardlink')).st_ino
+        reference = [Entry('hardlink', False, 42, 1.0, ino),
+                     Entry('changed', False, 42, 1.0, 1),
+                     Entry('removed', False, 42, 1.0, 2)]
+        entries = {e.name: e for batch in dirlisting.scan(
+            self.path, reference = reference) for e in batch}
+        self.assertEqual(set(entries), {'hardlink', 'changed'})
+        self.assertIs(entries['hardlink'], reference[0])
+        self.assertEqual(entries['changed'].size, 3)
+
+    def test_cache(self):
+        cache = dirlisting.ListingCache(maxEntries = 5)
+        a = [Entry('a', False, 0, 0)] * 2
+        b = [Entry('b', False, 0, 0)] * 2
+        c = [Entry('c', False, 0, 0)] * 2
+        cache.put('sid1', '/foo', 1, a)
+        cache.put('sid2', '/foo', 1, b)
+        self.assertIs(cache.get('sid1', '/foo', 1), a)
+        self.assertIsNone(cache.get('sid1', '/bar', 1))
+
+        # least recently used listing is evicted
+        cache.put('sid1', '/bar', 1, c)
+        self.assertIsNone(cache.get('sid2', '/foo', 1))
+        self.assertIs(cache.get('sid1', '/foo', 1), a)
+        self.assertIs(cache.get('sid1', '/bar', 1), c)
+        self.assertEqual(cache.size, 4)
+        self.assertEqual((cache.hits, cache.misses), (3, 2))
+        self.assertAlmostEqual(cache.hitRate(), 0.6)
+
+        # too big for the whole cache
+        cache.put('sid3', '/foo', 1, [Entry('d', False, 0, 0)] * 6)
+        self.assertIsNone(cache.get('sid3', '/foo', 1))
+        self.assertEqual(cache.size, 4)
+
+        cache.remove('sid1', '/foo')
+        self.assertEqual(cache.size, 2)
+        cache.clear()
+        self.assertEqual(cache.size, 0)
+
+    def test_cache_mtime(self):
+        cache = dirlisting.ListingCache()
+        a = [Entry('a', False, 0, 0)]
+        cache.put('sid1', '/foo', 1, a)
+        self.assertTrue(cache.contains('sid1', '/foo', 1))
+        self.assertFalse(cache.contains('sid1', '/foo', 2))
+        # folder changed since it was cached
+        self.assertIsNone(cache.get('sid1', '/foo', 2))
+        self.assertFalse(cache.contains('sid1', '/foo', 1))
+        self.assertEqual(cache.size, 0)
+
+    def test_cache_reference(self):
+        cache = dirlisting.ListingCache()
+        a = [Entry('a', False, 0, 0)]
+        b = [Entry('b', False, 0, 0)]
+        cache.put('sid1', '/foo', 1, a)
+        cache.put('sid2', '/bar', 1, b)
+        self.assertIs(cache.reference('/foo'), a)
+        self.assertIsNone(cache.reference('/baz'))
+
+    def test_prefetch(self):
+        folders = []
+        for i in range(3):
+            folder = os.path.join(self.path, str(i))
+            os.mkdir(folder)
+            open(os.path.join(folder, 'file'), 'wt').close()
+            folders.append(('sid{}'.format(i), '/foo', folder))
+        folders.append(('sid3', '/foo', os.path.join(self.path, 'missing')))
+
+        cache = dirlisting.ListingCache()
+        self.assertEqual(dirlisting.prefetch(cache, folders), 3)
+        for sid, path, folder in folders[:3]:
+            entries = cache.get(sid, path, dirlisting.mtime(folder))
+            self.assertEqual([e.name for e in entries], ['file'])
+
+        # already cached
+        self.assertEqual(dirlisting.prefetch(cache, folders), 0)
+
+        cache.clear()
+        self.assertEqual(dirlisting.prefetch(cache, folders, lambda: True), 0)
+        self.assertEqual(cache.size, 0)
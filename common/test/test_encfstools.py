@@ -17,8 +17,40 @@
 
 import os
 import sys
+import subprocess
+from unittest.mock import patch, MagicMock
 from test import generic
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+import encfstools
+import snapshotlog
+
+# Fake 'encfsctl decode' which answers each line with the upper case path or
+# an empty line for paths starting with 'bad'.
+FAKE_ENCFSCTL = (
+    'import sys\n'
+    'for line in sys.stdin.buffer:\n'
+    '    path = line.rstrip(b"\\n")\n'
+    '    sys.stdout.buffer.write((b"" if path.startswith(b"bad") else path.upper()) + b"\\n")\n'
+    '    sys.stdout.buffer.flush()\n'
+)
+
+# Fake 'encfsctl encode' which drops leading slashes like encfsctl and
+# answers with the upper case path.
+FAKE_ENCFSCTL_ENCODE = (
+    'import sys\n'
+    'for line in sys.stdin:\n'
+    '    sys.stdout.write(line.rstrip("\\n").lstrip("/").upper() + "\\n")\n'
+    '    sys.stdout.flush()\n'
+)
+
+
+class FakeDecode(encfstools.Decode):
+    def startProcess(self):
+        self.p = subprocess.Popen([sys.executable, '-c', FAKE_ENCFSCTL],
+                                  stdin=subprocess.PIPE,
+                                  stdout=subprocess.PIPE,
+                                  universal_newlines = self.string,
+                                  bufsize = 0)
 
 class TestEncFS_mount(generic.TestCase):
 
@@ -35,3 +67,190 @@ class TestEncFS_mount(generic.TestCase):
 
     def test_dummy(self):
         self.assertTrue(True)
+
+
+class FakeEncode(encfstools.Encode):
+    def startProcess(self):
+        self.p = subprocess.Popen([sys.executable, '-c', FAKE_ENCFSCTL_ENCODE],
+                                  stdin=subprocess.PIPE,
+                                  stdout=subprocess.PIPE,
+                                  universal_newlines = True,
+                                  bufsize = 0)
+
+
+class TestEncode(generic.TestCase):
+    def setUp(self):
+        super(TestEncode, self).setUp()
+        encfs = MagicMock()
+        encfs.rev_root.currentMountpoint = '/tmp/mnt'
+        encfs.ssh.path = '/remote/backintime'
+        self.encode = FakeEncode(encfs)
+        self.addCleanup(self.encode.close)
+
+    def test_path(self):
+        self.assertEqual(self.encode.path('/foo/bar'), 'FOO/BAR')
+        self.assertEqual(self.encode.path('foo/bar/'), 'FOO/BAR/')
+        self.assertEqual(self.encode.include('/foo'), '/FOO')
+
+    def test_cache(self):
+        self.encode.path('/foo/bar/baz')
+        with patch.object(self.encode, 'encode') as mock:
+            self.assertEqual(self.encode.path('/foo/bar/baz'), 'FOO/BAR/BAZ')
+            self.assertEqual(self.encode.path('foo/bar'), 'FOO/BAR')
+            self.assertEqual(self.encode.path('/foo/bar/'), 'FOO/BAR/')
+            self.assertEqual(self.encode.remote('/remote/backintime/foo'),
+                             '/remote/backintime/FOO')
+            mock.assert_not_called()
+        self.assertEqual(self.encode.path('/foo/new'), 'FOO/NEW')
+        self.assertEqual(self.encode.cacheHits, 4)
+        self.assertEqual(self.encode.cacheMisses, 2)
+        self.assertAlmostEqual(self.encode.hitRate(), 4 / 6)
+
+    def test_cache_keyed_by_parent(self):
+        self.encode.cache[('', 'foo')] = 'X'
+        self.encode.cache[('X', 'bar')] = 'Y'
+        self.encode.cache[('FOO', 'bar')] = 'Z'
+        self.assertEqual(self.encode.path('/foo/bar'), 'X/Y')
+
+    def test_cache_size(self):
+        self.encode.CACHE_SIZE = 3
+        self.encode.path('/a/b/c/d')
+        self.assertEqual(list(self.encode.cache),
+                         [('A', 'b'), ('A/B', 'c'), ('A/B/C', 'd')])
+
+    def test_exclude(self):
+        self.assertEqual(self.encode.exclude('/foo/*/bar'), '/FOO/*/BAR')
+        self.assertIsNone(self.encode.exclude('foo*'))
+
+
+class TestDecode(generic.TestCaseCfg):
+    def setUp(self):
+        super(TestDecode, self).setUp()
+        self.cfg.SNAPSHOT_MODES['local'] = \
+            (lambda cfg: None, ) + self.cfg.SNAPSHOT_MODES['local'][1:]
+        self.decode = FakeDecode(self.cfg)
+        self.addCleanup(self.decode.close)
+
+    def test_path(self):
+        self.assertEqual(self.decode.path('foo/bar'), 'FOO/BAR')
+        self.assertEqual(self.decode.path('bad'), 'bad')
+
+    def test_path_cached(self):
+        self.decode.path('foo/bar/baz')
+        with patch.object(self.decode, '_decode') as mock:
+            self.assertEqual(self.decode.path('foo/bar/baz'), 'FOO/BAR/BAZ')
+            # parent folders are cached, too
+            self.assertEqual(self.decode.path('foo/bar'), 'FOO/BAR')
+            self.assertEqual(self.decode.path('foo'), 'FOO')
+            mock.assert_not_called()
+        self.assertEqual(self.decode.cacheHits, 3)
+
+    def test_failed_not_cached(self):
+        self.decode.path('bad/path')
+        self.assertNotIn('bad/path', self.decode.cache)
+
+    def test_cache_size(self):
+        self.decode.CACHE_SIZE = 5
+        self.decode.list(['p{}'.format(i) for i in range(10)])
+        self.assertEqual(list(self.decode.cache),
+                         ['p{}'.format(i) for i in range(5, 10)])
+
+    def test_list_pipelined(self):
+        self.decode.PIPELINE_BYTES = 20
+        paths = ['p{:02d}'.format(i) for i in range(20)]
+        with patch.object(self.decode, '_process',
+                          wraps=self.decode._process) as mock:
+            self.assertEqual(self.decode.list(paths + ['bad'] + paths),
+                             [i.upper() for i in paths] + ['bad']
+                             + [i.upper() for i in paths])
+        # 21 unique paths with 4 bytes each, 5 paths per batch
+        self.assertEqual(mock.call_count, 5)
+
+    def test_list_newline(self):
+        self.assertEqual(self.decode.list(['foo', 'a\nb', 'bar']),
+                         ['FOO', 'a\nb', 'BAR'])
+
+    def test_list_bytes(self):
+        decode = FakeDecode(self.cfg, False)
+        self.addCleanup(decode.close)
+        self.assertEqual(decode.list([b'foo', b'bar/baz']),
+                         [b'FOO', b'BAR/BAZ'])
+
+    def test_prefetchLog(self):
+        lines = ['[C] <f+++++++++ foo/bar',
+                 '[C] cL+++++++++ foo/link -> foo/target',
+                 '[I] some info']
+        self.decode.prefetchLog(lines)
+        self.assertIn('foo/bar', self.decode.cache)
+        self.assertIn('foo/target', self.decode.cache)
+        with patch.object(self.decode, '_decode') as mock:
+            self.assertEqual(
+                [self.decode.log(line) for line in lines],
+                ['[C] <f+++++++++ FOO/BAR',
+                 '[C] cL+++++++++ FOO/LINK -> FOO/TARGET',
+                 '[I] some info'])
+            mock.assert_not_called()
+
+    def test_filterLines(self):
+        logFilter = snapshotlog.LogFilter(snapshotlog.LogFilter.CHANGES,
+                                          self.decode)
+        lines = ['[C] <f+++++++++ foo', '[E] Error: foo', '']
+        with patch.object(self.decode, 'prefetchLog',
+                          wraps=self.decode.prefetchLog) as mock:
+            self.assertEqual(list(logFilter.filterLines(lines)),
+                             ['[C] <f+++++++++ FOO', None, ''])
+        mock.assert_called_once_with(['[C] <f+++++++++ foo'])
+
+    def test_logLines(self):
+        self.decode.BATCH_LINES = 2
+        lines = ['[C] <f+++++++++ foo{}'.format(i) for i in range(5)]
+        with patch.object(self.decode, 'prefetchLog',
+                          wraps=self.decode.prefetchLog) as mock:
+            self.assertEqual(list(self.decode.logLines(iter(lines))),
+                             ['[C] <f+++++++++ FOO{}'.format(i)
+                              for i in range(5)])
+        self.assertEqual(mock.call_count, 3)
+
+
+class TestDecodePool(generic.TestCaseCfg):
+    def setUp(self):
+        super(TestDecodePool, self).setUp()
+        self.cfg.SNAPSHOT_MODES['local'] = \
+            (lambda cfg: None, ) + self.cfg.SNAPSHOT_MODES['local'][1:]
+        with patch.object(encfstools, 'Decode', FakeDecode):
+            self.pool = encfstools.DecodePool(self.cfg)
+        self.addCleanup(self.pool.close)
+        for decode in self.pool.workers:
+            decode.BATCH_LINES = 3
+
+    def test_workers(self):
+        self.assertEqual(len(self.pool.workers), 2)
+        self.cfg.setDecodeWorkers(3)
+        self.assertEqual(self.cfg.decodeWorkers(), 3)
+
+    def test_logLines(self):
+        lines = ['[C] <f+++++++++ dir{}/file'.format(i) for i in range(20)]
+        self.assertEqual(list(self.pool.logLines(lines)),
+                         ['[C] <f+++++++++ DIR{}/FILE'.format(i)
+                          for i in range(20)])
+        # batches are distributed round robin
+        self.assertIn('dir0/file', self.pool.workers[0].cache)
+        self.assertIn('dir3/file', self.pool.workers[1].cache)
+        self.assertNotIn('dir3/file', self.pool.workers[0].cache)
+
+    def test_logLines_stop_early(self):
+        lines = ['[C] <f+++++++++ dir{}/file'.format(i) for i in range(100)]
+        gen = self.pool.logLines(lines)
+        self.assertEqual(next(gen), '[C] <f+++++++++ DIR0/FILE')
+        gen.close()
+        self.assertEqual(self.pool.log('[C] <f+++++++++ foo'),
+                         '[C] <f+++++++++ FOO')
+
+    def test_filterLines(self):
+        logFilter = snapshotlog.LogFilter(snapshotlog.LogFilter.CHANGES,
+                                          self.pool)
+        lines = ['[C] <f+++++++++ foo', '[E] Error: foo', '',
+                 '[C] <f+++++++++ bar']
+        self.assertEqual(list(logFilter.filterLines(lines)),
+                         ['[C] <f+++++++++ FOO', None, '',
+                          '[C] <f+++++++++ BAR'])
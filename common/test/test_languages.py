@@ -0,0 +1,53 @@
+# Back In Time
+# Copyright (C) 2008-2022 Oprea Dan, Bart de Koning, Richard Bailey,
+# Germar Reitze
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation,Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+import unittest
+from unittest import mock
+
+import languages
+import tools
+
+
+class TestLanguages(unittest.TestCase):
+    def test_data(self):
+        self.assertIn('en', languages.names)
+        self.assertEqual(languages.names['de']['_native'], 'Deutsch')
+        self.assertEqual(languages.names['de']['en'], 'German')
+        self.assertEqual(languages.completeness['en'], 100)
+        for code in languages.completeness:
+            self.assertIn(code, languages.names)
+
+    def test_loaded_once(self):
+        languages.load.cache_clear()
+        with mock.patch('json.load', wraps=languages.json.load) as load:
+            languages.names
+            languages.completeness
+            languages.names['en']
+        self.assertEqual(load.call_count, 1)
+
+    def test_unknown_attribute(self):
+        with self.assertRaises(AttributeError):
+            languages.foo
+
+    def test_native_language_and_completeness(self):
+        name, completeness = tools.get_native_language_and_completeness('de')
+        self.assertEqual(name, 'Deutsch')
+        self.assertEqual(completeness, languages.completeness['de'])
+
+
+if __name__ == '__main__':
+    unittest.main()
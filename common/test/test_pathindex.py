@@ -0,0 +1,175 @@
+# Back In Time
+# Copyright (C) 2008-2022 Oprea Dan, Bart de Koning, Richard Bailey,
+# Germar Reitze
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation,Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+import os
+import sys
+import gzip
+import unittest
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+from test import generic
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+import pathindex
+import snapshots
+
+
+class TestPathIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmpDir = TemporaryDirectory()
+        self.filename = os.path.join(self.tmpDir.name, pathindex.FILENAME)
+
+    def tearDown(self):
+        self.tmpDir.cleanup()
+
+    def test_commonPrefix(self):
+        self.assertEqual(pathindex.commonPrefix(b'', b'/foo'), 0)
+        self.assertEqual(pathindex.commonPrefix(b'/foo/bar', b'/foo/baz'), 7)
+        self.assertEqual(pathindex.commonPrefix(b'/foo', b'/foo/bar'), 4)
+        self.assertEqual(pathindex.commonPrefix(b'/foo', b'/foo'), 4)
+        self.assertEqual(pathindex.commonPrefix(b'/a', b'/b'), 1)
+
+    def test_write_read(self):
+        paths = [b'/home/user/foo bar',
+                 b'/home/user',
+                 b'/home/user/\xe4\xf6\xfc',
+                 b'/home/user/new\nline',
+                 b'/home/user/foo',
+                 b'/home',
+                 b'/etc/fstab']
+        pathindex.write(self.filename, paths)
+        self.assertEqual(list(pathindex.read(self.filename)), sorted(paths))
+        self.assertFalse(os.path.exists(self.filename + '.tmp'))
+
+    def test_write_front_coded(self):
+        paths = [b'/home/user/folder/file%05d' % i for i in range(1000)]
+        pathindex.write(self.filename, paths)
+        with gzip.open(self.filename, 'rb') as f:
+            data = f.read()
+        # only the part after the common prefix is stored
+        self.assertLess(len(data), sum(len(p) for p in paths) / 3)
+        self.assertEqual(list(pathindex.read(self.filename)), paths)
+
+    def test_read_chunks(self):
+        paths = [b'/folder/file%06d' % i for i in range(5000)]
+        pathindex.write(self.filename, paths)
+        with patch('pathindex.CHUNK', 100):
+            self.assertEqual(list(pathindex.read(self.filename)), paths)
+
+    def test_read_invalid(self):
+        with gzip.open(self.filename, 'wb') as f:
+            f.write(b'foo')
+        with self.assertRaises(ValueError):
+            list(pathindex.read(self.filename))
+
+    def test_read_truncated(self):
+        with gzip.open(self.filename, 'wb') as f:
+            f.write(pathindex.MAGIC + b'0 /foo\x000 /bar')
+        with self.assertRaises(ValueError):
+            list(pathindex.read(self.filename))
+
+    def test_matcher_substring(self):
+        match = pathindex.matcher('report')
+        self.assertTrue(match(b'/home/user/Report-2023.pdf'))
+        self.assertTrue(match(b'/home/user/report'))
+        # folders in the path don't count
+        self.assertFalse(match(b'/home/report/foo.pdf'))
+        self.assertFalse(match(b'/'))
+
+    def test_matcher_case_sensitive(self):
+        match = pathindex.matcher('report', caseSensitive = True)
+        self.assertFalse(match(b'/home/user/Report-2023.pdf'))
+        self.assertTrue(match(b'/home/user/report-2023.pdf'))
+
+    def test_matcher_glob(self):
+        match = pathindex.matcher('*.txt')
+        self.assertTrue(match(b'/home/user/foo.TXT'))
+        self.assertFalse(match(b'/home/user/foo.txt.bak'))
+
+    def test_matcher_path(self):
+        match = pathindex.matcher('/home/*/docs/*')
+        self.assertTrue(match(b'/home/user/docs/foo'))
+        self.assertFalse(match(b'/root/docs/foo'))
+
+    def test_matcher_non_utf8(self):
+        match = pathindex.matcher('*.txt')
+        self.assertTrue(match(b'/home/\xe4\xf6\xfc.txt'))
+
+
+class TestPathIndexSnapshots(generic.SnapshotsTestCase):
+    def setUp(self):
+        super(TestPathIndexSnapshots, self).setUp()
+        self.sids = []
+        for i, sid in enumerate(('20151219-030324-123',
+                                 '20151219-020324-123',
+                                 '20151219-010324-123')):
+            sid = snapshots.SID(sid, self.cfg)
+            os.makedirs(sid.path())
+            d = snapshots.FileInfoDict()
+            d[b'/tmp'] = (123, b'foo', b'bar')
+            d[b'/tmp/foo.txt'] = (456, b'foo', b'bar')
+            d[b'/tmp/bar%d.txt' % i] = (456, b'foo', b'bar')
+            sid.fileInfo = d
+            self.sids.append(sid)
+
+    def test_paths_from_fileinfo(self):
+        sid = self.sids[0]
+        indexFile = sid.path(pathindex.FILENAME)
+        self.assertFalse(os.path.exists(indexFile))
+
+        self.assertEqual(sorted(pathindex.paths(sid)),
+                         [b'/', b'/tmp', b'/tmp/bar0.txt', b'/tmp/foo.txt'])
+        # index was created while reading fileinfo.bz2
+        self.assertTrue(os.path.exists(indexFile))
+        self.assertEqual(list(pathindex.paths(sid)),
+                         [b'/', b'/tmp', b'/tmp/bar0.txt', b'/tmp/foo.txt'])
+
+    def test_paths_interrupted(self):
+        sid = self.sids[0]
+        it = pathindex.paths(sid)
+        next(it)
+        it.close()
+        # incomplete index must not be written
+        self.assertFalse(os.path.exists(sid.path(pathindex.FILENAME)))
+
+    @patch('logger.warning')
+    def test_paths_missing(self, mock_logger):
+        sid = snapshots.SID('20151219-040324-123', self.cfg)
+        os.makedirs(sid.path())
+        self.assertEqual(list(pathindex.paths(sid)), [])
+        mock_logger.assert_called_once()
+
+    def test_search(self):
+        results = list(pathindex.search(self.sids, 'foo'))
+        self.assertEqual(results, [(sid, b'/tmp/foo.txt') for sid in self.sids])
+
+        results = list(pathindex.search(self.sids, 'bar1*'))
+        self.assertEqual(results, [(self.sids[1], b'/tmp/bar1.txt')])
+
+    def test_search_callback_interrupted(self):
+        searched = []
+        results = list(pathindex.search(
+            self.sids, '*.txt',
+            callback = searched.append,
+            interrupted = lambda: len(searched) >= 2))
+        self.assertEqual(searched, self.sids[:2])
+        self.assertCountEqual(results, [(self.sids[0], b'/tmp/bar0.txt'),
+                                        (self.sids[0], b'/tmp/foo.txt')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+# Back In Time
+# Copyright (C) 2008-2022 Oprea Dan, Bart de Koning, Richard Bailey,
+# Germar Reitze
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation,Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+import os
+import sys
+import unittest
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+import preview
+
+
+class TestPreview(unittest.TestCase):
+    def setUp(self):
+        self.tmpDir = TemporaryDirectory()
+        self.snapshot = os.path.join(self.tmpDir.name, 'snapshot')
+        os.makedirs(os.path.join(self.snapshot, 'folder'))
+        self.file = os.path.join(self.snapshot, 'file')
+        with open(self.file, 'wt') as f:
+            f.write('foo')
+        with open(os.path.join(self.snapshot, 'folder', 'bar'), 'wt') as f:
+            f.write('bar')
+
+    def tearDown(self):
+        self.tmpDir.cleanup()
+
+    def test_isReadOnly(self):
+        with patch('os.access', return_value = False), \
+                patch('os.geteuid', return_value = os.getuid() + 1000):
+            self.assertTrue(preview.isReadOnly(self.file))
+            # files in folders could be changed
+            self.assertFalse(preview.isReadOnly(self.snapshot))
+        with patch('os.access', return_value = True), \
+                patch('os.geteuid', return_value = os.getuid() + 1000):
+            self.assertFalse(preview.isReadOnly(self.file))
+
+    def test_isReadOnly_owner(self):
+        # the owner could chmod a 0444 file in a 0555 folder and change it
+        with patch('os.access', return_value = False), \
+                patch('os.geteuid', return_value = os.stat(self.file).st_uid):
+            self.assertFalse(preview.isReadOnly(self.file))
+        # root can change everything
+        with patch('os.access', return_value = False), \
+                patch('os.geteuid', return_value = 0):
+            self.assertFalse(preview.isReadOnly(self.file))
+
+    def test_isReadOnly_mount(self):
+        result = os.statvfs(self.file)
+        with patch('os.statvfs') as mock_statvfs, \
+                patch('os.geteuid', return_value = os.stat(self.file).st_uid):
+            mock_statvfs.return_value.f_flag = result.f_flag | os.ST_RDONLY
+            self.assertTrue(preview.isReadOnly(self.file))
+
+    def test_identical(self):
+        link = os.path.join(self.tmpDir.name, 'link')
+        os.link(self.file, link)
+        self.assertTrue(preview.identical(self.file, link))
+
+        other = os.path.join(self.tmpDir.name, 'other')
+        with open(other, 'wt') as f:
+            f.write('foo')
+        self.assertFalse(preview.identical(self.file, other))
+        self.assertFalse(preview.identical(self.file, 'missing'))
+        self.assertFalse(preview.identical(self.snapshot, self.snapshot))
+
+    def test_create_direct(self):
+        with patch('os.access', return_value = False), \
+                patch('os.geteuid', return_value = os.getuid() + 1000):
+            path, d, method = preview.create(self.file)
+        self.assertEqual(method, preview.DIRECT)
+        self.assertEqual(path, self.file)
+        self.assertIsNone(d)
+
+    @patch('preview.reflink', return_value = True)
+    def test_create_reflink(self, mock_reflink):
+        path, d, method = preview.create(self.file, '_sid',
+                                         cowDir = self.tmpDir.name)
+        try:
+            self.assertEqual(method, preview.REFLINK)
+            self.assertEqual(os.path.basename(path), 'file')
+            # clone is next to the snapshots, so on the same filesystem
+            self.assertEqual(os.path.dirname(d.name), self.tmpDir.name)
+            self.assertTrue(os.path.basename(d.name).startswith(preview.PREFIX))
+            mock_reflink.assert_called_once_with(self.file, path)
+        finally:
+            d.cleanup()
+
+    @patch('preview.reflink', return_value = False)
+    def test_create_copy_fallback(self, mock_reflink):
+        path, d, method = preview.create(self.file, cowDir = self.tmpDir.name)
+        try:
+            self.assertEqual(method, preview.COPY)
+            with open(path, 'rt') as f:
+                self.assertEqual(f.read(), 'foo')
+            self.assertFalse(os.path.samefile(path, self.file))
+            # failed clone folder was removed
+            self.assertFalse([name for name in os.listdir(self.tmpDir.name)
+                              if name.startswith(preview.PREFIX)])
+        finally:
+            d.cleanup()
+
+    def test_create_copy_folder(self):
+        path, d, method = preview.create(self.snapshot)
+        try:
+            self.assertEqual(method, preview.COPY)
+            self.assertTrue(os.path.isfile(os.path.join(path, 'folder', 'bar')))
+        finally:
+            d.cleanup()
+        self.assertFalse(os.path.exists(path))
+
+
+if __name__ == '__main__':
+    unittest.main()
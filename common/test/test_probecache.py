@@ -0,0 +1,110 @@
+#    Back In Time
+#    Copyright (C) 2008-2022 Oprea Dan, Bart de Koning, Richard Bailey,
+#    Germar Reitze
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+import os
+import sys
+import stat
+import unittest
+from tempfile import TemporaryDirectory
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+import config
+import probecache
+
+
+class TestProbeCache(unittest.TestCase):
+    def setUp(self):
+        tmp = TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+
+        self.addCleanup(probecache.setCacheFile, probecache.CACHE_FILE)
+        probecache.setCacheFile(os.path.join(self.tmp, 'probe_cache.json'))
+
+        self.counter = os.path.join(self.tmp, 'counter')
+        self.binary = os.path.join(self.tmp, 'tool')
+        self.writeTool('1.0')
+
+    def writeTool(self, version):
+        with open(self.binary, 'wt') as f:
+            f.write('#!/bin/sh\n'
+                    'echo run >> %s\n'
+                    'echo "tool version %s"\n' % (self.counter, version))
+        os.chmod(self.binary, stat.S_IRWXU)
+
+    def runs(self):
+        with open(self.counter, 'rt') as f:
+            return len(f.readlines())
+
+    def test_cached(self):
+        self.assertEqual(probecache.probe([self.binary, '--version']),
+                         (0, 'tool version 1.0\n', ''))
+        self.assertEqual(probecache.probe([self.binary, '--version']),
+                         (0, 'tool version 1.0\n', ''))
+        self.assertEqual(self.runs(), 1)
+
+        # different arguments
+        probecache.probe([self.binary, '-V'])
+        self.assertEqual(self.runs(), 2)
+
+    def test_persistent(self):
+        probecache.probe([self.binary, '--version'])
+        self.assertTrue(os.path.exists(probecache.CACHE_FILE))
+
+        probecache._cache = None
+        self.assertEqual(probecache.probe([self.binary, '--version'])[1],
+                         'tool version 1.0\n')
+        self.assertEqual(self.runs(), 1)
+
+    def test_memory_only(self):
+        probecache.setCacheFile(None)
+        probecache.probe([self.binary, '--version'])
+        probecache.probe([self.binary, '--version'])
+        self.assertEqual(self.runs(), 1)
+        self.assertListEqual(sorted(os.listdir(self.tmp)),
+                             ['counter', 'tool'])
+
+    def test_config_data_folder(self):
+        with TemporaryDirectory() as share:
+            cfg = config.Config(os.path.join(share, 'config'), share)
+            self.assertEqual(probecache.CACHE_FILE,
+                             os.path.join(cfg._LOCAL_DATA_FOLDER,
+                                          'probe_cache.json'))
+            probecache.probe([self.binary, '--version'])
+            self.assertTrue(os.path.exists(probecache.CACHE_FILE))
+
+    def test_binary_changed(self):
+        probecache.probe([self.binary, '--version'])
+        self.writeTool('2.0.0')
+        self.assertEqual(probecache.probe([self.binary, '--version'])[1],
+                         'tool version 2.0.0\n')
+        self.assertEqual(self.runs(), 2)
+
+    def test_clear(self):
+        probecache.probe([self.binary, '--version'])
+        probecache.clear()
+        probecache.probe([self.binary, '--version'])
+        self.assertEqual(self.runs(), 2)
+
+    def test_not_found(self):
+        with self.assertRaises(FileNotFoundError):
+            probecache.probe(['nonExistingCommand', '--version'])
+
+
+if __name__ == '__main__':
+    unittest.main()
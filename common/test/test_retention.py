@@ -0,0 +1,203 @@
+# Back In Time
+# Copyright (C) 2008-2022 Oprea Dan, Bart de Koning, Richard Bailey,
+# Germar Reitze
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation,Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+import os
+import sys
+import unittest
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+from test import generic
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+import config
+import retention
+import snapshots
+
+NOW = datetime(2016, 4, 24, 21, 51, 34)
+
+
+class TestRetention(unittest.TestCase):
+    def catalog(self, count=100, **kwargs):
+        return retention.syntheticCatalog(count,
+                                          end=NOW,
+                                          interval=timedelta(days=1),
+                                          **kwargs)
+
+    def test_catalog(self):
+        catalog = self.catalog(10)
+        self.assertEqual(len(catalog), 10)
+        self.assertEqual(catalog.newest.sid, '20160424-215134-123')
+        self.assertListEqual(catalog.keys, sorted(catalog.keys))
+        self.assertEqual(catalog.bounds('20160420-000000-123',
+                                        '20160422-000000-123'), (5, 7))
+
+    def test_sidBound(self):
+        self.assertEqual(retention.sidBound(date(2016, 4, 24), '123'),
+                         '20160424-000000-123')
+        self.assertEqual(retention.sidBound(NOW, '123'),
+                         '20160424-215134-123')
+
+    def test_remove_older_than(self):
+        catalog = self.catalog(10, namedRatio=0.5, keepNamed=True, seed=1)
+        plan = retention.plan(catalog, [
+            retention.RemoveOlderThan(date(2016, 4, 20), '123')])
+
+        for sid in catalog:
+            if sid.sid < '20160420' and not sid.name:
+                self.assertEqual(plan.remove[sid], 'older')
+            else:
+                self.assertNotIn(sid, plan.remove)
+
+    def test_remove_older_than_keeps_newest(self):
+        catalog = self.catalog(10)
+        plan = retention.plan(catalog, [
+            retention.RemoveOlderThan(date(2017, 1, 1), '123')])
+        self.assertEqual(len(plan.remove), 9)
+        self.assertNotIn(catalog.newest, plan.remove)
+
+    def test_compose(self):
+        catalog = self.catalog(400)
+        older = retention.RemoveOlderThan(date(2015, 6, 1), '123')
+        smart = retention.SmartRemove(NOW, 3, 7, 5, 3, '123')
+        plan = retention.plan(catalog, [older, smart])
+
+        for sid in catalog:
+            if sid.sid < '20150601':
+                self.assertEqual(plan.remove[sid], 'older')
+
+        # Smart Remove only sees snapshots which are not removed yet
+        self.assertIn('smart', plan.remove.values())
+        self.assertTrue(set(plan.keep).isdisjoint(plan.remove))
+        self.assertEqual(len(plan.keep) + len(plan.remove), len(catalog))
+
+    def test_min_free_space(self):
+        catalog = self.catalog(10, size=100)
+        storage = retention.SimulatedStorage(freeSpace=50)
+        policy = retention.MinFreeSpace(320, storage.freeSpace)
+        plan, *_ = retention.simulate(catalog, [policy], storage)
+
+        # 4 * 100 MiB are needed to get 320 MiB free space
+        self.assertListEqual(storage.removed, catalog.snapshots[:3])
+        self.assertEqual(len(plan.remove), 3)
+        self.assertEqual(storage.freeSpace(), 350)
+
+    def test_min_free_space_unknown(self):
+        catalog = self.catalog(10)
+        storage = retention.SimulatedStorage()
+        policy = retention.MinFreeSpace(320, lambda: None)
+        plan, *_ = retention.simulate(catalog, [policy], storage)
+        self.assertListEqual(storage.removed, [])
+
+    def test_min_free_inodes(self):
+        catalog = self.catalog(10, inodes=1000, namedRatio=0.3,
+                               keepNamed=True, seed=3)
+        storage = retention.SimulatedStorage(freeInodes=0, totalInodes=10000)
+        policy = retention.MinFreeInodes(30, storage.inodes)
+        retention.simulate(catalog, [policy], storage)
+
+        self.assertEqual(len(storage.removed), 3)
+        self.assertFalse(any(sid.name for sid in storage.removed))
+        self.assertNotIn(catalog.newest, storage.removed)
+
+    def test_execute_batch(self):
+        catalog = self.catalog(100)
+        plan = retention.plan(catalog, [
+            retention.RemoveOlderThan(date(2016, 3, 1), '123'),
+            retention.SmartRemove(NOW, 3, 7, 5, 3, '123')])
+        batches = []
+        single = []
+        removed = retention.execute(plan, single.append, batches.append)
+
+        self.assertEqual(len(batches), 1)
+        self.assertListEqual(single, [])
+        self.assertListEqual(batches[0], list(plan.remove))
+        self.assertListEqual(removed, batches[0])
+
+    def test_simulate_large_history(self):
+        # 10 years of hourly snapshots
+        catalog = retention.syntheticCatalog(24 * 365 * 10,
+                                             end=NOW,
+                                             failedRatio=0.1,
+                                             seed=42)
+        storage = retention.SimulatedStorage(freeSpace=0)
+        policies = [retention.RemoveOlderThan(date(2008, 1, 1), '123'),
+                    retention.SmartRemove(NOW, 2, 7, 4, 24, '123'),
+                    retention.MinFreeSpace(200, storage.freeSpace)]
+        plan, planTime, executeTime = retention.simulate(catalog,
+                                                         policies,
+                                                         storage)
+
+        remaining = [sid for sid in catalog if sid not in plan.remove]
+        # 2 days with all 24 snapshots + 7 days + 4 weeks + 24 months +
+        # 10 years at most, minus 2 removed to get free space
+        self.assertLess(len(remaining), 48 + 7 + 4 + 24 + 11)
+        self.assertEqual(storage.freeSpace(),
+                         100 * len(storage.removed))
+        self.assertLess(planTime, 10)
+
+
+class TestFreeSpace(generic.SnapshotsTestCase):
+    def setUp(self):
+        super(TestFreeSpace, self).setUp()
+        self.cfg.setProfileStrValue('snapshots.tag', '123')
+        self.cfg.setRemoveOldSnapshots(False, 10, config.Config.YEAR)
+        self.cfg.setSmartRemove(False, 2, 7, 4, 24)
+        self.cfg.setMinFreeSpace(False, 1, config.Config.DISK_UNIT_GB)
+        self.cfg.setMinFreeInodes(False, 2)
+        self.sids = []
+        for i in range(20):
+            sid = snapshots.SID(NOW - timedelta(days=i * 10), self.cfg)
+            sid.makeDirs()
+            self.sids.append(sid)
+
+    @patch('snapshots.Snapshots.remove')
+    def test_remove_old_and_smart_remove_batched(self, mock_remove):
+        self.cfg.setRemoveOldSnapshots(True, 100, config.Config.DAY)
+        self.cfg.setSmartRemove(True, 0, 0, 0, 3)
+        with patch.object(self.cfg, 'removeOldSnapshotsDate',
+                          return_value=NOW.date() - timedelta(days=100)), \
+             patch.object(self.sn, 'smartRemove') as mock_smart:
+            self.sn.freeSpace(NOW)
+
+        mock_smart.assert_called_once()
+        removed = [str(sid) for sid in mock_smart.call_args[0][0]]
+        ascending = [str(sid) for sid in sorted(self.sids)]
+        # all older than 100 days and all but the newest per month
+        keep = ['20160224-215134-123',
+                '20160325-215134-123',
+                '20160424-215134-123']
+        self.assertListEqual(removed[:10], ascending[:10])
+        self.assertListEqual(removed[10:],
+                             [sid for sid in ascending[10:] if sid not in keep])
+        mock_remove.assert_not_called()
+
+    @patch('snapshots.Snapshots.remove')
+    def test_min_free_space(self, mock_remove):
+        self.cfg.setMinFreeSpace(True, 1, config.Config.DISK_UNIT_MB)
+        free = iter((0, 0, 0, 1))
+        with patch.object(self.sn, 'statFreeSpaceLocal',
+                          side_effect=lambda path: next(free)), \
+             patch.object(self.sn, 'smartRemove') as mock_smart:
+            self.sn.freeSpace(NOW)
+
+        mock_smart.assert_not_called()
+        self.assertListEqual([str(c[0][0]) for c in mock_remove.call_args_list],
+                             [str(sid) for sid in sorted(self.sids)[:3]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+#    Back In Time
+#    Copyright (C) 2008-2022 Oprea Dan, Bart de Koning, Richard Bailey,
+#    Germar Reitze
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+import os
+import sys
+import subprocess
+import unittest
+from datetime import datetime
+from threading import Thread
+from unittest.mock import patch
+from test import generic
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+import scheduler
+
+
+class TestCronMatch(unittest.TestCase):
+    def test_every_minute(self):
+        self.assertTrue(scheduler.cronMatch('* * * * *',
+                                            datetime(2024, 1, 1, 12, 34)))
+
+    def test_step(self):
+        self.assertTrue(scheduler.cronMatch('*/5 * * * *',
+                                            datetime(2024, 1, 1, 12, 35)))
+        self.assertFalse(scheduler.cronMatch('*/5 * * * *',
+                                             datetime(2024, 1, 1, 12, 36)))
+        self.assertTrue(scheduler.cronMatch('0 */2 * * *',
+                                            datetime(2024, 1, 1, 14, 0)))
+        self.assertFalse(scheduler.cronMatch('0 */2 * * *',
+                                             datetime(2024, 1, 1, 15, 0)))
+
+    def test_list_and_range(self):
+        self.assertTrue(scheduler.cronMatch('0 8,12,18 * * *',
+                                            datetime(2024, 1, 1, 12, 0)))
+        self.assertFalse(scheduler.cronMatch('0 8,12,18 * * *',
+                                             datetime(2024, 1, 1, 13, 0)))
+        self.assertTrue(scheduler.cronMatch('0 9-17 * * *',
+                                            datetime(2024, 1, 1, 17, 0)))
+
+    def test_weekday(self):
+        # 2024-01-07 is a sunday
+        sunday = datetime(2024, 1, 7, 22, 30)
+        self.assertTrue(scheduler.cronMatch('30 22 * * 7', sunday))
+        self.assertTrue(scheduler.cronMatch('30 22 * * 0', sunday))
+        self.assertFalse(scheduler.cronMatch('30 22 * * 1', sunday))
+
+    def test_invalid(self):
+        self.assertFalse(scheduler.cronMatch('@reboot',
+                                             datetime(2024, 1, 1)))
+        self.assertFalse(scheduler.cronMatch('*/0 * * * *',
+                                             datetime(2024, 1, 1)))
+
+
+class TestSchedulerDaemon(generic.TestCaseCfg):
+    def setUp(self):
+        super(TestSchedulerDaemon, self).setUp()
+        self.daemon = scheduler.SchedulerDaemon(self.cfg)
+
+    def test_due(self):
+        now = datetime(2024, 1, 1, 10, 0)
+        self.assertFalse(self.daemon.due('1', now))
+
+        self.cfg.setScheduleMode(self.cfg._1_HOUR)
+        self.assertTrue(self.daemon.due('1', now))
+        self.assertFalse(self.daemon.due('1', now.replace(minute=5)))
+
+        self.cfg.setScheduleMode(self.cfg.AT_EVERY_BOOT)
+        self.assertFalse(self.daemon.due('1', now))
+
+    @patch('scheduler.SchedulerDaemon.spawn', return_value=1234)
+    def test_handleRequest_backup(self, spawn):
+        answer = self.daemon.handleRequest({'command': 'backup',
+                                            'profile_id': '1',
+                                            'force': False})
+        self.assertDictEqual(answer, {'result': 'ok', 'pid': 1234})
+        spawn.assert_called_once_with('1', force=False, checksum=False,
+                                      scheduled=True)
+
+        answer = self.daemon.handleRequest({'command': 'backup',
+                                            'profile_id': '99'})
+        self.assertEqual(answer['result'], 'error')
+
+    @patch('scheduler.SchedulerDaemon.spawn', return_value=1234)
+    def test_handleRequest_backup_already_triggered(self, spawn):
+        # cron job and daemon trigger the same schedule in the same minute
+        self.cfg.setSchedulerDaemon(True)
+        now = datetime.now().replace(second=0, microsecond=0)
+        self.daemon.handleRequest({'command': 'backup',
+                                   'profile_id': '1',
+                                   'force': False})
+        with patch.object(self.daemon, 'due', return_value=True):
+            self.daemon.schedule(now)
+        answer = self.daemon.handleRequest({'command': 'backup',
+                                            'profile_id': '1',
+                                            'force': False})
+        self.assertDictEqual(answer, {'result': 'ok', 'pid': None})
+        spawn.assert_called_once()
+
+        # manual snapshots are not affected
+        self.daemon.handleRequest({'command': 'backup', 'profile_id': '1'})
+        self.assertEqual(spawn.call_count, 2)
+
+    @patch('scheduler.SchedulerDaemon.spawn', return_value=1234)
+    def test_schedule_disabled(self, spawn):
+        with patch.object(self.daemon, 'due', return_value=True):
+            self.daemon.schedule(datetime(2024, 1, 1, 10, 0))
+            spawn.assert_not_called()
+
+            self.cfg.setSchedulerDaemon(True)
+            self.daemon.schedule(datetime(2024, 1, 1, 10, 0))
+            spawn.assert_called_once_with('1', force=False, checksum=False,
+                                          scheduled=True)
+
+    @patch('subprocess.run')
+    @patch('os.nice', return_value=0)
+    @patch('tools.checkCommand', return_value=True)
+    def test_setPriority(self, checkCommand, nice, run):
+        self.cfg.setNiceOnCron(True)
+        self.cfg.setIoniceOnCron(True)
+        self.cfg.setIoniceOnUser(False)
+
+        self.daemon.setPriority(scheduled=True)
+        nice.assert_called_with(19)
+        run.assert_called_once_with(
+            ['ionice', '-c2', '-n7', '-p', str(os.getpid())],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        nice.reset_mock()
+        run.reset_mock()
+        self.daemon.setPriority(scheduled=False)
+        nice.assert_not_called()
+        run.assert_not_called()
+
+    def test_handleRequest_other_config(self):
+        answer = self.daemon.handleRequest({'command': 'status',
+                                            'config': '/foo/config'})
+        self.assertEqual(answer['result'], 'error')
+
+    def test_handleRequest_unknown(self):
+        answer = self.daemon.handleRequest({'command': 'foo'})
+        self.assertEqual(answer['result'], 'error')
+
+    def test_request(self):
+        self.assertIsNone(scheduler.request(self.cfg, 'status'))
+
+        self.daemon.listen()
+        self.addCleanup(self.daemon.shutdown)
+        thread = Thread(target=self.daemon.handleClient)
+        thread.start()
+        answer = scheduler.request(self.cfg, 'status')
+        thread.join()
+
+        self.assertEqual(answer['result'], 'ok')
+        self.assertEqual(answer['pid'], os.getpid())
+        self.assertDictEqual(answer['running'], {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -130,6 +130,9 @@ class TestSID(generic.SnapshotsTestCase):
         with open(sid.path('failed'), 'wt') as f:
             pass
 
+        # changed behind the back of sid
+        self.assertEqual(sid.displayName, '2015-12-19 01:03:24 - foo')
+        sid.invalidate()
         self.assertRegex(sid.displayName, r'2015-12-19 01:03:24 - foo (.+?)')
 
     def test_withoutTag(self):
@@ -244,6 +247,7 @@ class TestSID(generic.SnapshotsTestCase):
             pass
         d = datetime(2015, 12, 19, 2, 3, 24)
         os.utime(infoFile, (d.timestamp(), d.timestamp()))
+        sid.invalidate()
         self.assertEqual(sid.lastChecked, '2015-12-19 02:03:24')
 
         #setLastChecked and check if it matches current date
@@ -394,6 +398,88 @@ class TestSID(generic.SnapshotsTestCase):
             msg = 'writing to {} raised PermissionError unexpectedly!'
             self.fail(msg.format(testFile))
 
+    def test_immutable(self):
+        sid = snapshots.SID('20151219-010324-123', self.cfg)
+        with self.assertRaises(AttributeError):
+            sid.sid = '20151219-010324-124'
+        with self.assertRaises(AttributeError):
+            sid.profileID = '2'
+        with self.assertRaises(AttributeError):
+            sid.foo = 'bar'
+        self.assertEqual(sid, '20151219-010324-123')
+
+    def test_path_memoized(self):
+        sid = snapshots.SID('20151219-010324-123', self.cfg)
+        path = sid.path()
+        sid.path(sid.INFO)
+        with patch.object(self.cfg, 'snapshotsFullPath') as mock:
+            self.assertEqual(sid.path(), path)
+            self.assertEqual(sid.path(sid.INFO), os.path.join(path, 'info'))
+        mock.assert_not_called()
+
+        # config changed
+        self.cfg.setHostUserProfile('foo', 'bar', '42')
+        self.assertNotEqual(sid.path(), path)
+        self.assertTrue(sid.path().endswith(
+            os.path.join('foo', 'bar', '42', '20151219-010324-123')))
+
+    def test_metadata_cached(self):
+        sid = snapshots.SID('20151219-010324-123', self.cfg)
+        os.makedirs(os.path.join(self.snapshotPath, '20151219-010324-123'))
+        sid.name = 'foo'
+        self.assertFalse(sid.failed)
+        with patch('os.path.isfile', side_effect=AssertionError('fs access')):
+            self.assertEqual(sid.name, 'foo')
+            self.assertFalse(sid.failed)
+
+        sid.failed = True
+        self.assertTrue(sid.failed)
+
+        sid2 = snapshots.SID('20151219-010324-123', self.cfg)
+        sid2.name = 'bar'
+        self.assertEqual(sid.name, 'foo')
+        sid.invalidate()
+        self.assertEqual(sid.name, 'bar')
+
+    def test_prefetch(self):
+        sid = snapshots.SID('20151219-010324-123', self.cfg)
+        snapshotPath = os.path.join(self.snapshotPath, '20151219-010324-123')
+        os.makedirs(snapshotPath)
+        with open(os.path.join(snapshotPath, sid.NAME), 'wt') as f:
+            f.write('foo')
+        with open(os.path.join(snapshotPath, sid.FAILED), 'wt'):
+            pass
+        infoFile = os.path.join(snapshotPath, sid.INFO)
+        with open(infoFile, 'wt'):
+            pass
+        d = datetime(2015, 12, 19, 2, 3, 24)
+        os.utime(infoFile, (d.timestamp(), d.timestamp()))
+
+        sid.prefetch()
+        with patch('os.path.isfile', side_effect=AssertionError('fs access')), \
+             patch('os.path.exists', side_effect=AssertionError('fs access')):
+            self.assertEqual(sid.displayName,
+                             '2015-12-19 01:03:24 - foo (WITH ERRORS !)')
+            self.assertEqual(sid.lastChecked, '2015-12-19 02:03:24')
+
+        # prefetch reloads changed metadata
+        os.remove(os.path.join(snapshotPath, sid.FAILED))
+        os.remove(infoFile)
+        sid.prefetch()
+        self.assertFalse(sid.failed)
+        self.assertEqual(sid.lastChecked, '2015-12-19 01:03:24')
+
+    def test_info_copy(self):
+        sid = snapshots.SID('20151219-010324-123', self.cfg)
+        os.makedirs(os.path.join(self.snapshotPath, '20151219-010324-123'))
+        i = configfile.ConfigFile()
+        i.setStrValue('foo', 'bar')
+        sid.info = i
+
+        i = sid.info
+        i.setStrValue('foo', 'baz')
+        self.assertEqual(sid.info.strValue('foo'), 'bar')
+
 class TestNewSnapshot(generic.SnapshotsTestCase):
     def test_create_new(self):
         new = snapshots.NewSnapshot(self.cfg)
@@ -0,0 +1,231 @@
+# Back In Time
+# Copyright (C) 2008-2022 Oprea Dan, Bart de Koning, Richard Bailey,
+# Germar Reitze
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation,Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+import os
+import sys
+import unittest
+from unittest.mock import patch
+from test import generic
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+import configfile
+import pathindex
+import snapshotdiff
+import snapshots
+from test.test_encfstools import FakeDecode
+from snapshotdiff import Change, ADDED, REMOVED, MODIFIED
+
+
+class TestSnapshotDiff(generic.SnapshotsTestCase):
+    def setUp(self):
+        super(TestSnapshotDiff, self).setUp()
+        self.sid1 = snapshots.SID('20151219-010324-123', self.cfg)
+        self.sid2 = snapshots.SID('20151219-020324-123', self.cfg)
+        self.old = self.sid1.pathBackup()
+        self.new = self.sid2.pathBackup()
+
+        self.write(self.old, 'foo/unchanged', 'foo')
+        self.write(self.old, 'foo/modified', 'foo')
+        self.write(self.old, 'foo/removed', 'foo')
+        self.write(self.old, 'foo/sub/deep', 'foo')
+        self.write(self.old, 'gone/file', 'foo')
+        os.symlink('unchanged', os.path.join(self.old, 'foo', 'link'))
+
+        # unchanged files are hardlinked like rsync --link-dest does
+        self.link('foo/unchanged')
+        self.link('foo/sub/deep')
+        self.write(self.new, 'foo/modified', 'foobar')
+        self.write(self.new, 'foo/added', 'foo')
+        self.write(self.new, 'new/file', 'foo')
+        os.symlink('modified', os.path.join(self.new, 'foo', 'link'))
+
+    def write(self, root, path, content):
+        path = os.path.join(root, path)
+        os.makedirs(os.path.dirname(path), exist_ok = True)
+        with open(path, 'wt') as f:
+            f.write(content)
+
+    def link(self, path):
+        dest = os.path.join(self.new, path)
+        os.makedirs(os.path.dirname(dest), exist_ok = True)
+        os.link(os.path.join(self.old, path), dest)
+
+    def paths(self, root):
+        paths = set()
+        for folder, dirs, files in os.walk(root):
+            for name in dirs + files:
+                paths.add(os.sep + os.path.relpath(os.path.join(folder, name),
+                                                   root))
+        return paths
+
+    def index(self, sid):
+        pathindex.write(sid.path(pathindex.FILENAME),
+                        [os.fsencode(p) for p in self.paths(sid.pathBackup())]
+                        + [b'/'])
+
+    def setPrevious(self, sid, prev):
+        info = configfile.ConfigFile()
+        info.setStrValue('snapshot_previous', prev.sid)
+        sid.info = info
+
+    def expected(self):
+        return [Change(MODIFIED, '/foo/link', False),
+                Change(REMOVED, '/foo/removed', False),
+                Change(ADDED, '/foo/added', False),
+                Change(MODIFIED, '/foo/modified', False),
+                Change(REMOVED, '/gone', True),
+                Change(ADDED, '/new', True)]
+
+    def test_change_str(self):
+        self.assertEqual(str(Change(ADDED, '/foo', True)), '+ /foo/')
+        self.assertEqual(str(Change(REMOVED, '/foo', False)), '- /foo')
+        self.assertEqual(str(Change(MODIFIED, '/', True)), 'M /')
+
+    def test_walk(self):
+        self.assertCountEqual(snapshotdiff.walk(self.old, self.new),
+                              self.expected())
+
+    def test_walk_skips_hardlinks(self):
+        with patch('snapshotdiff.modified', return_value = True) as mock:
+            changes = list(snapshotdiff.walk(self.old, self.new))
+        # only the modified files and the symlink were compared
+        self.assertEqual(mock.call_count, 2)
+        self.assertNotIn('/foo/unchanged', [c.path for c in changes])
+        self.assertNotIn('/foo/sub/deep', [c.path for c in changes])
+
+    def test_walk_path(self):
+        self.assertEqual(list(snapshotdiff.walk(self.old, self.new, '/foo/sub')),
+                         [])
+        self.assertEqual(list(snapshotdiff.walk(self.old, self.new, 'gone')),
+                         [Change(REMOVED, '/gone', True)])
+        self.assertEqual(list(snapshotdiff.walk(self.old, self.new, '/foo/modified')),
+                         [Change(MODIFIED, '/foo/modified', False)])
+        self.assertEqual(list(snapshotdiff.walk(self.old, self.new, '/missing')),
+                         [])
+
+    def test_walk_interrupted(self):
+        self.assertEqual(list(snapshotdiff.walk(self.old, self.new,
+                                                interrupted = lambda: True)),
+                         [])
+
+    def test_logPaths(self):
+        lines = ['========== Take snapshot (profile 1): Sat Dec 19 ==========',
+                 '[I] Take snapshot (rsync: symlinks are copied as symlinks)',
+                 '[C] >f+++++++++ foo/added',
+                 '[C] .d..t...... foo/',
+                 '[C] cLc.T...... foo/link -> modified',
+                 '[C] hf+++++++++ foo/hard => foo/added',
+                 '[E] Error: rsync: send_files failed to open "/foo"']
+        self.assertEqual(list(snapshotdiff.logPaths(lines)),
+                         ['/foo/added', '/foo', '/foo/link', '/foo/hard'])
+
+    def test_fromIndex(self):
+        # removed files and new folders are not listed in the logs
+        candidates = {'/foo/added', '/foo/modified', '/foo/link',
+                      '/new/file', '/foo/unchanged'}
+        self.assertEqual(list(snapshotdiff.fromIndex(self.old, self.new,
+                                                     self.paths(self.old),
+                                                     self.paths(self.new),
+                                                     candidates)),
+                         sorted(self.expected(), key = lambda c: c.path))
+        self.assertEqual(list(snapshotdiff.fromIndex(self.old, self.new,
+                                                     self.paths(self.old),
+                                                     self.paths(self.new),
+                                                     candidates, '/new')),
+                         [Change(ADDED, '/new', True)])
+        self.assertEqual(list(snapshotdiff.fromIndex(self.old, self.new,
+                                                     self.paths(self.old),
+                                                     self.paths(self.new),
+                                                     set(), '/foo')),
+                         [Change(ADDED, '/foo/added', False),
+                          Change(REMOVED, '/foo/removed', False)])
+
+    def test_indexedPaths(self):
+        self.assertIsNone(snapshotdiff.indexedPaths(self.sid2))
+        self.index(self.sid2)
+        self.assertSetEqual(snapshotdiff.indexedPaths(self.sid2),
+                            self.paths(self.new) | {'/'})
+
+    def test_historyComplete(self):
+        self.assertFalse(snapshotdiff.historyComplete(self.sid1, [self.sid2]))
+        self.setPrevious(self.sid2, self.sid1)
+        self.assertTrue(snapshotdiff.historyComplete(self.sid1, [self.sid2]))
+        self.assertTrue(snapshotdiff.historyComplete(self.sid1, []))
+
+    def test_diff_logs(self):
+        self.index(self.sid1)
+        self.index(self.sid2)
+        self.setPrevious(self.sid2, self.sid1)
+        self.sid2.setLog('[C] >f+++++++++ foo/added\n'
+                         '[C] >f+++++++++ foo/modified\n'
+                         '[C] >f+++++++++ new/file\n')
+        self.sid1.setLog('[C] >f+++++++++ foo/unchanged\n')
+        self.assertEqual(list(snapshotdiff.diff(self.sid1, self.sid2,
+                                                useLogs = True)),
+                         [Change(ADDED, '/foo/added', False),
+                          Change(MODIFIED, '/foo/modified', False),
+                          Change(REMOVED, '/foo/removed', False),
+                          Change(REMOVED, '/gone', True),
+                          Change(ADDED, '/new', True)])
+
+    @patch('logger.info')
+    def test_diff_logs_removed_snapshot(self, mock_logger):
+        self.index(self.sid1)
+        self.index(self.sid2)
+        # the snapshot taken before sid2 was removed
+        self.setPrevious(self.sid2,
+                         snapshots.SID('20151219-013000-123', self.cfg))
+        self.sid2.setLog('[C] >f+++++++++ foo/added\n')
+        self.assertCountEqual(snapshotdiff.diff(self.sid1, self.sid2,
+                                                useLogs = True),
+                              self.expected())
+        mock_logger.assert_called_once()
+
+    @patch('logger.info')
+    def test_diff_logs_no_index(self, mock_logger):
+        self.index(self.sid2)
+        self.setPrevious(self.sid2, self.sid1)
+        self.sid2.setLog('[C] >f+++++++++ foo/added\n')
+        self.assertCountEqual(snapshotdiff.diff(self.sid1, self.sid2,
+                                                useLogs = True),
+                              self.expected())
+        mock_logger.assert_called_once()
+
+    def test_changedPaths_decode(self):
+        self.cfg.SNAPSHOT_MODES['local'] = \
+            (lambda cfg: None, ) + self.cfg.SNAPSHOT_MODES['local'][1:]
+        decode = FakeDecode(self.cfg)
+        self.addCleanup(decode.close)
+        self.sid2.setLog('[C] >f+++++++++ foo/added\n'
+                         '[C] cL+++++++++ foo/link -> foo/target\n')
+        self.assertSetEqual(snapshotdiff.changedPaths([self.sid2], decode),
+                            {'/FOO/ADDED', '/FOO/LINK'})
+
+    @patch('logger.info')
+    def test_diff_logs_incomplete(self, mock_logger):
+        self.index(self.sid1)
+        self.index(self.sid2)
+        self.setPrevious(self.sid2, self.sid1)
+        self.sid2.setLog('[I] Take snapshot\n')
+        self.assertCountEqual(snapshotdiff.diff(self.sid1, self.sid2,
+                                                useLogs = True),
+                              self.expected())
+        mock_logger.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
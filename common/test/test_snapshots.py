@@ -23,11 +23,12 @@ import stat
 import pwd
 import grp
 import re
+import glob
 import random
 import string
 import unittest
 from unittest.mock import patch
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from threading import Thread
 from tempfile import TemporaryDirectory
 from test import generic
@@ -232,6 +233,65 @@ class TestSnapshots(generic.SnapshotsTestCase):
         thread.join()
         self.assertFalse(thread.is_alive())
 
+    def removeFlockSlots(self):
+        for path in glob.glob(self.sn.GLOBAL_FLOCK + '.*'):
+            os.remove(path)
+
+    def test_flockExclusive_parallel(self):
+        self.cfg.setGlobalFlock(True)
+        self.cfg.setGlobalFlockMaxParallel(2)
+        self.cfg.setGlobalFlockMaxParallelPerTarget(2)
+        self.sn.FLOCK_POLL_INTERVAL = 0.01
+        self.addCleanup(self.removeFlockSlots)
+
+        sn2 = snapshots.Snapshots(self.cfg)
+        sn2.GLOBAL_FLOCK = self.sn.GLOBAL_FLOCK
+        self.sn.flockExclusive()
+        self.addCleanup(self.sn.flockRelease)
+        sn2.flockExclusive()
+        self.addCleanup(sn2.flockRelease)
+
+        # all global slots are taken
+        thread = Thread(target = self.flockSecondInstance, args = ())
+        thread.start()
+        thread.join(0.05)
+        self.assertTrue(thread.is_alive())
+
+        # the first slot is shared with a single global flock
+        self.sn.flockRelease()
+        thread.join()
+        self.assertFalse(thread.is_alive())
+
+    def test_flockExclusive_per_target(self):
+        self.cfg.setGlobalFlock(True)
+        self.cfg.setGlobalFlockMaxParallel(4)
+        self.sn.FLOCK_POLL_INTERVAL = 0.01
+        self.addCleanup(self.removeFlockSlots)
+        self.sn.flockExclusive()
+        self.addCleanup(self.sn.flockRelease)
+
+        sn2 = snapshots.Snapshots(self.cfg)
+        sn2.GLOBAL_FLOCK = self.sn.GLOBAL_FLOCK
+        sn2.FLOCK_POLL_INTERVAL = 0.01
+        thread = Thread(target = sn2.flockExclusive, args = ())
+        thread.start()
+        thread.join(0.05)
+        # same target and only one slot per target
+        self.assertTrue(thread.is_alive())
+
+        self.sn.flockRelease()
+        thread.join()
+        self.assertFalse(thread.is_alive())
+        sn2.flockRelease()
+
+    def test_flockTarget(self):
+        self.assertRegex(self.sn.flockTarget(), r'^dev:\d+$')
+
+        self.cfg.setSnapshotsMode('ssh')
+        self.cfg.setSshHost('foo')
+        self.cfg.setSshPort(2222)
+        self.assertEqual(self.sn.flockTarget(), 'ssh:foo:2222')
+
     def test_statFreeSpaceLocal(self):
         self.assertIsInstance(self.sn.statFreeSpaceLocal('/'), int)
 
@@ -288,6 +348,18 @@ class TestSnapshots(generic.SnapshotsTestCase):
         self.assertListEqual(list(i2), ['--include=/',
                                         '--include=/**'])
 
+    def test_rsyncInclude_expanded(self):
+        i1, i2 = self.sn.rsyncInclude([('/foo/bar', 0),
+                                       ('/foo/baz', 1),
+                                       ('/blub', 0)],
+                                      expandedFolders = ['/foo'])
+        self.assertListEqual(list(i1), ['--include=/foo/',
+                                        '--include=/blub/'])
+        self.assertListEqual(list(i2), ['--include=/foo/bar/',
+                                        '--include=/foo/bar/**',
+                                        '--include=/foo/baz',
+                                        '--include=/blub/**'])
+
     def test_rsyncSuffix(self):
         suffix = self.sn.rsyncSuffix(includeFolders = [('/foo', 0),
                                                        ('/bar', 1),
@@ -311,6 +383,46 @@ class TestSnapshots(generic.SnapshotsTestCase):
                                            r'--include=/baz/1/2 '   +
                                            r'--exclude=\* /$')
 
+    def test_rsyncShards(self):
+        shards = self.sn.rsyncShards([('/foo', 0), ('/bar', 1), ('/baz', 0)], 2)
+        self.assertEqual(shards, [[('/foo', 0), ('/baz', 0)], [('/bar', 1)]])
+
+    def test_rsyncShards_nested(self):
+        items = [('/foo', 0), ('/foo/bar', 0), ('/baz', 0)]
+        self.assertEqual(self.sn.rsyncShards(items, 4), [items])
+
+    def test_rsyncShards_expand(self):
+        with TemporaryDirectory() as tmp:
+            for name in ('a', 'b', 'c'):
+                os.mkdir(os.path.join(tmp, name))
+            with open(os.path.join(tmp, 'file'), 'wt'):
+                pass
+            with open(os.path.join(tmp, 'file.tmp'), 'wt'):
+                pass
+            self.cfg.setExclude(['*.tmp'])
+
+            shards = self.sn.rsyncShards([(tmp, 0)], 2)
+
+            # excludes are left to rsync
+            self.assertEqual(
+                shards,
+                [[(os.path.join(tmp, 'a'), 0), (os.path.join(tmp, 'c'), 0),
+                  (os.path.join(tmp, 'file.tmp'), 1)],
+                 [(os.path.join(tmp, 'b'), 0), (os.path.join(tmp, 'file'), 1)]])
+
+    def test_rsyncShards_expand_empty(self):
+        with TemporaryDirectory() as tmp:
+            empty = os.path.join(tmp, 'empty')
+            os.mkdir(empty)
+            shards = self.sn.rsyncShards([(empty, 0), ('/foo', 1)], 4)
+            self.assertEqual(shards, [[(empty, 0)], [('/foo', 1)]])
+
+    def test_rsyncProtect(self):
+        protect = self.sn.rsyncProtect([('/foo/bar', 0), ('/foo/baz', 1)])
+        self.assertEqual(list(protect), ['--filter=P /foo/bar',
+                                         '--filter=P /foo',
+                                         '--filter=P /foo/baz'])
+
     ############################################################################
     ###                            callback                                  ###
     ############################################################################
@@ -382,6 +494,13 @@ class TestSnapshots(generic.SnapshotsTestCase):
     ############################################################################
     ###                          smart remove                                ###
     ############################################################################
+    def test_smartRemoveRemoteCommand(self):
+        self.cfg.setSmartRemoveRemoteParallel(4)
+        cmd = self.sn.smartRemoveRemoteCommand('/tmp/foo bar/smartremove.lck')
+        self.assertEqual(cmd[:2], ['bash', '-c'])
+        self.assertEqual(cmd[4:6], ['4', "'/tmp/foo bar/smartremove.lck'"])
+        self.assertIn('rsync', cmd[6:])
+
     def test_incMonth(self):
         self.assertEqual(self.sn.incMonth(date(2016,  4, 21)), date(2016, 5, 1))
         self.assertEqual(self.sn.incMonth(date(2016, 12, 24)), date(2017, 1, 1))
@@ -521,6 +640,76 @@ class TestSnapshots(generic.SnapshotsTestCase):
                                              sid22, sid24, sid27, sid28, sid30])
 
 
+    def test_smartRemovePlan_reasons(self):
+        sid1 = snapshots.SID('20160424-215134-123', self.cfg)
+        sid2 = snapshots.SID('20160424-015134-123', self.cfg)
+        sid3 = snapshots.SID('20160420-013218-123', self.cfg)
+        sid4 = snapshots.SID('20160416-013218-123', self.cfg)
+        sid5 = snapshots.SID('20150904-134327-123', self.cfg)
+        sids = [sid1, sid2, sid3, sid4, sid5]
+        now = datetime(2016, 4, 24, 21, 51, 34)
+
+        keep = self.sn.smartRemovePlan(sids, now, 1, 2, 2, 0)
+        self.assertListEqual(keep[sid1], ['last', 'all', 'day', 'week', 'year'])
+        self.assertListEqual(keep[sid2], ['all'])
+        self.assertNotIn(sid3, keep)
+        self.assertListEqual(keep[sid4], ['week'])
+        self.assertListEqual(keep[sid5], ['year'])
+
+        self.assertDictEqual(self.sn.smartRemovePlan([], now, 1, 2, 1, 0), {})
+
+    def test_smartRemovePlan_equals_buckets(self):
+        """
+        The plan must match keeping the first snapshot of each bucket
+        with smartRemoveKeepAll/smartRemoveKeepFirst.
+        """
+        rnd = random.Random(42)
+        now = datetime(2016, 4, 24, 21, 51, 34)
+        start = datetime(2013, 1, 1).timestamp()
+        stamps = rnd.sample(range(int(start), int(now.timestamp())), 400)
+        sids = [snapshots.SID(datetime.fromtimestamp(t), self.cfg)
+                for t in stamps]
+        sids.sort(reverse=True)
+        for sid in rnd.sample(sids, 60):
+            sid.makeDirs()
+            sid.failed = True
+
+        for keep_all, per_day, per_week, per_month in ((0, 0, 0, 0),
+                                                       (2, 7, 4, 24),
+                                                       (14, 365, 52, 120)):
+            expected = set((sids[0],))
+            today = now.date()
+            if keep_all:
+                expected |= self.sn.smartRemoveKeepAll(
+                    sids, today - timedelta(days=keep_all-1),
+                    today + timedelta(days=1))
+            d = today
+            for i in range(per_day):
+                expected |= self.sn.smartRemoveKeepFirst(
+                    sids, d, d + timedelta(days=1), keep_healthy=True)
+                d -= timedelta(days=1)
+            d = today - timedelta(days=today.weekday() + 1)
+            for i in range(per_week):
+                expected |= self.sn.smartRemoveKeepFirst(
+                    sids, d, d + timedelta(days=8), keep_healthy=True)
+                d -= timedelta(days=7)
+            d1 = date(today.year, today.month, 1)
+            d2 = self.sn.incMonth(d1)
+            for i in range(per_month):
+                expected |= self.sn.smartRemoveKeepFirst(
+                    sids, d1, d2, keep_healthy=True)
+                d2 = d1
+                d1 = self.sn.decMonth(d1)
+            for y in range(2013, today.year + 1):
+                expected |= self.sn.smartRemoveKeepFirst(
+                    sids, date(y, 1, 1), date(y + 1, 1, 1), keep_healthy=True)
+
+            keep = self.sn.smartRemovePlan(
+                sids, now, keep_all, per_day, per_week, per_month)
+            with self.subTest(keep_all=keep_all, per_day=per_day):
+                self.assertSetEqual(set(keep), expected)
+
+
 class TestSnapshotWithSID(generic.SnapshotsWithSidTestCase):
     def test_backupConfig(self):
         self.sn.backupConfig(self.sid)
@@ -585,6 +774,123 @@ user.size=.+''', re.MULTILINE))
         self.assertTupleEqual(d[testDir],  (16893, CURRENTUSER.encode(), CURRENTGROUP.encode()))
         self.assertTupleEqual(d[testFile], (33204, CURRENTUSER.encode(), CURRENTGROUP.encode()))
 
+class TestCowSnapshot(generic.SnapshotsWithSidTestCase):
+    def setUp(self):
+        super(TestCowSnapshot, self).setUp()
+        self.new = snapshots.NewSnapshot(self.cfg)
+        self.new.makeDirs()
+
+    def test_cowBackend(self):
+        self.assertIsNone(self.sn.cowBackend())
+
+        self.cfg.setCowBackend('reflink')
+        self.assertEqual(self.sn.cowBackend(), 'reflink')
+
+        self.cfg.setSnapshotsMode('ssh')
+        self.assertIsNone(self.sn.cowBackend())
+
+    @patch('tools.filesystem', return_value='xfs')
+    def test_cowBackend_auto(self, filesystem):
+        self.cfg.setCowBackend('auto')
+        with patch('tools.reflinkSupported', return_value=True):
+            self.assertEqual(self.sn.cowBackend(), 'reflink')
+        with patch('tools.reflinkSupported', return_value=False):
+            self.assertIsNone(self.sn.cowBackend())
+
+    def test_cowClone_reflink(self):
+        with patch('tools.Execute') as execute:
+            execute.return_value.run.return_value = 0
+            self.assertTrue(self.sn.cowClone(self.sid, self.new, 'reflink'))
+
+        cmd = execute.call_args[0][0]
+        self.assertEqual(cmd[:3], ['cp', '-a', '--reflink=always'])
+        self.assertEqual(cmd[-2:], [self.sid.pathBackup() + os.sep + '.',
+                                    self.new.pathBackup()])
+
+    @patch('tools.isBtrfsSubvolume', return_value=True)
+    def test_cowClone_btrfs(self, isBtrfsSubvolume):
+        with patch('tools.Execute') as execute:
+            execute.return_value.run.return_value = 0
+            self.assertTrue(self.sn.cowClone(self.sid, self.new, 'btrfs'))
+
+        execute.assert_called_once()
+        self.assertEqual(execute.call_args[0][0],
+                         ['btrfs', 'subvolume', 'snapshot',
+                          self.sid.pathBackup(), self.new.pathBackup()])
+
+    def test_cowClone_failed(self):
+        with patch('tools.Execute') as execute:
+            execute.return_value.run.return_value = 1
+            self.assertFalse(self.sn.cowClone(self.sid, self.new, 'reflink'))
+
+        self.assertIsDir(self.new.pathBackup())
+        self.assertListEqual(os.listdir(self.new.pathBackup()), [])
+
+
+class TestChangeTrackerClone(generic.SnapshotsWithSidTestCase):
+    def setUp(self):
+        super(TestChangeTrackerClone, self).setUp()
+        self.new = snapshots.NewSnapshot(self.cfg)
+        self.new.makeDirs()
+        self.src = TemporaryDirectory()
+        self.addCleanup(self.src.cleanup)
+        for path in ('changed/file', 'changed/sub/file', 'new/sub/file'):
+            path = os.path.join(self.src.name, path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wt') as f:
+                f.write('foo')
+
+    def filesFrom(self, files_from):
+        self.assertIsNotNone(files_from)
+        with open(files_from, 'rt') as f:
+            lines = f.read().splitlines()
+        os.remove(files_from)
+        return lines
+
+    def test_cloneSnapshot(self):
+        changed = os.path.join(self.src.name, 'changed')
+        new = os.path.join(self.src.name, 'new')
+        files_from = self.sn.cloneSnapshot(
+            self.sid, self.new,
+            [(changed, False),
+             (os.path.join(changed, 'deleted'), False),
+             (new, True)],
+            [(self.src.name, 0)],
+            cloned=True)
+
+        rel = self.src.name.lstrip(os.sep)
+        self.assertListEqual(self.filesFrom(files_from),
+                             [rel + '/changed/',
+                              rel + '/new/',
+                              rel + '/new/sub/'])
+
+    def test_cloneSnapshot_include_folder_new(self):
+        self.assertIsNone(self.sn.cloneSnapshot(self.sid, self.new,
+                                                [(self.src.name, True)],
+                                                [(self.src.name, 0)],
+                                                cloned=True))
+
+    def test_hardlinkClone(self):
+        prev = self.sid.pathBackup()
+        for path in ('changed/file', 'changed/sub/file', 'new/file', 'other'):
+            path = os.path.join(prev, path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wt') as f:
+                f.write('foo')
+
+        self.assertTrue(self.sn.hardlinkClone(self.sid, self.new,
+                                              [('/changed', False),
+                                               ('/new', True)]))
+
+        dest = self.new.pathBackup()
+        self.assertNotExists(os.path.join(dest, 'changed', 'file'))
+        self.assertNotExists(os.path.join(dest, 'new'))
+        # unchanged files are hardlinked
+        for path in ('changed/sub/file', 'other'):
+            self.assertEqual(os.stat(os.path.join(dest, path)).st_ino,
+                             os.stat(os.path.join(prev, path)).st_ino)
+        self.assertExists(os.path.join(prev, 'changed', 'file'))
+
 
 class TestRestorePathInfo(generic.SnapshotsTestCase):
     def setUp(self):
@@ -774,6 +1080,23 @@ class TestSshSnapshots(generic.SSHTestCase):
     def test_statFreeSpaceSsh(self):
         self.assertIsInstance(self.sn.statFreeSpaceSsh(), int)
 
+    def test_smartRemoveRemote(self):
+        self.cfg.setSmartRemoveRunRemoteInBackground(True)
+        sids = []
+        for sid in ('20151219-010324-123',
+                    '20151219-020324-123',
+                    '20151219-030324-123'):
+            os.makedirs(os.path.join(self.remoteFullPath, sid, 'backup', 'foo'))
+            sids.append(snapshots.SID(sid, self.cfg))
+
+        messages = []
+        self.sn.smartRemove(sids, log = messages.append)
+
+        for sid in sids:
+            self.assertNotExists(self.remoteFullPath, sid.sid)
+        self.assertEqual(len(messages), 3)
+        self.assertIn('3/3', messages[-1])
+
 
 def _rand_string(self, max_length=10, min_length=1):
     """Create a string with random uppercase characters and digits and
@@ -170,7 +170,7 @@ class TestSSH(generic.SSHTestCase):
         self.cfg.setNiceOnRemote(tools.checkCommand('nice'))
         self.cfg.setIoniceOnRemote(tools.checkCommand('ionice'))
         self.cfg.setNocacheOnRemote(tools.checkCommand('nocache'))
-        self.cfg.setSmartRemoveRunRemoteInBackground(tools.checkCommand('screen') and tools.checkCommand('flock'))
+        self.cfg.setSmartRemoveRunRemoteInBackground(tools.checkCommand('xargs') and tools.checkCommand('flock'))
         os.mkdir(self.remotePath)
         ssh = sshtools.SSH(cfg = self.cfg)
         ssh.checkRemoteCommands()
@@ -186,8 +186,8 @@ class TestSSH(generic.SSHTestCase):
         if tools.checkCommand('nocache'):
             cmds.append('nocache')
             self.cfg.setNocacheOnRemote(True)
-        if tools.checkCommand('screen') and tools.checkCommand('flock'):
-            cmds.extend(('screen', 'flock', 'rmdir', 'mktemp'))
+        if tools.checkCommand('xargs') and tools.checkCommand('flock'):
+            cmds.extend(('xargs', 'flock', 'rmdir', 'mktemp'))
             self.cfg.setSmartRemoveRunRemoteInBackground(True)
 
         # make one after an other command from 'cmds' fail by symlink them
@@ -214,7 +214,7 @@ class TestSSH(generic.SSHTestCase):
             ssh.checkRemoteCommands()
 
     def test_check_remote_command_with_spaces(self):
-        self.cfg.setSmartRemoveRunRemoteInBackground(tools.checkCommand('screen') and tools.checkCommand('flock'))
+        self.cfg.setSmartRemoveRunRemoteInBackground(tools.checkCommand('xargs') and tools.checkCommand('flock'))
         self.remotePath = os.path.join(self.tmpDir.name, 'foo bar')
         self.cfg.setSshSnapshotsPath(self.remotePath)
         os.mkdir(self.remotePath)
@@ -487,3 +487,63 @@ class SSHCopyID(unittest.TestCase):
             'ProxyJump=non_existing_proxy_user@non_existing_proxy_host'
             f':{proxy_port}',
             sut)
+
+
+class TestBenchmarkTransport(generic.TestCaseCfg):
+    def setUp(self):
+        super(TestBenchmarkTransport, self).setUp()
+        self.cfg.setSnapshotsMode('ssh')
+        self.cfg.setSshHost('remote')
+        self.cfg.setSshUser('user')
+        self.cfg.setSshProxyHost('proxy')
+        self.cfg.setSshProxyUser('puser')
+        self.cfg.setSshProxyPort('2222')
+        self.ssh = sshtools.SSH(cfg=self.cfg)
+        self.proxy = 'ProxyJump=puser@proxy:2222'
+
+    @patch('sshtools.SSH._benchmarkTime', return_value=2)
+    def test_scp_rsync_commands(self, mock_time):
+        self.ssh._benchmarkScp('/tmp/big', '/dest', 4, 'aes128-ctr', True)
+        scp = mock_time.call_args[0][0]
+        self.assertEqual(scp[0], 'scp')
+        self.assertIn(self.proxy, scp)
+        self.assertIn('Ciphers=aes128-ctr', scp)
+        self.assertIn('Compression=yes', scp)
+
+        self.ssh._benchmarkRsync('/tmp/small', '/dest', 10, 'default', False)
+        for call in mock_time.call_args_list[1:]:
+            rsh = [arg for arg in call[0][0] if arg.startswith('--rsh=')][0]
+            self.assertIn(self.proxy, rsh)
+
+    @patch('subprocess.call')
+    @patch('sshtools.SSH._benchmarkTime', return_value=None)
+    def test_sshfs_command(self, mock_time, mock_call):
+        self.ssh._benchmarkSshfs('/dest', 'default', False)
+        sshfs = mock_time.call_args[0][0]
+        self.assertIn(self.proxy, sshfs)
+
+    @patch('subprocess.call', return_value=0)
+    def test_remote_command(self, mock_call):
+        self.ssh._benchmarkRemote(['true'])
+        self.assertIn('-J', mock_call.call_args[0][0])
+
+    def test_without_proxy(self):
+        self.cfg.setSshProxyHost('')
+        ssh = sshtools.SSH(cfg=self.cfg)
+        self.assertFalse([arg for arg in ssh._benchmarkSshArgs('default', False)
+                          if arg.startswith('ProxyJump')])
+
+    @patch('sshtools.SSH._benchmarkRemote', return_value=255)
+    def test_remote_failed(self, mock_remote):
+        with self.assertRaises(MountException):
+            self.ssh.benchmarkTransport(size=0, files=0, ciphers=['default'])
+
+    @patch('sshtools.SSH._benchmarkScp')
+    @patch('sshtools.SSH._benchmarkRemote', side_effect=[0, 255, 0, 0])
+    def test_run_failed(self, mock_remote, mock_scp):
+        results = self.ssh.benchmarkTransport(size=0, files=0,
+                                              ciphers=['default'],
+                                              compression=(False,))
+        self.assertEqual(len(results['results']), 1)
+        self.assertIn('error', results['results'][0])
+        mock_scp.assert_not_called()
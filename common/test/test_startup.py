@@ -0,0 +1,74 @@
+# Back In Time
+# Copyright (C) 2008-2022 Oprea Dan, Bart de Koning, Richard Bailey,
+# Germar Reitze
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation,Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+import os
+import re
+import json
+import subprocess
+import sys
+import unittest
+
+COMMON = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+
+# Modules which must not be imported just by starting the CLI
+HEAVY_MODULES = ('config', 'snapshots', 'sshtools', 'mount', 'password',
+                 'encfstools', 'diagnostics', 'languages', 'keyring',
+                 'packaging.version')
+
+# Upper limit for 'import backintime' in microseconds. This is far above
+# the usual import time and only catches serious regressions.
+IMPORT_TIME_LIMIT = 300000
+
+
+class TestStartup(unittest.TestCase):
+    def python(self, *args):
+        proc = subprocess.run([sys.executable] + list(args),
+                              cwd=COMMON,
+                              stdout=subprocess.PIPE,
+                              stderr=subprocess.PIPE,
+                              universal_newlines=True)
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+        return proc
+
+    def test_lazy_imports(self):
+        proc = self.python('-c', 'import sys, json, backintime; '
+                                 'print(json.dumps(sorted(sys.modules)))')
+        modules = json.loads(proc.stdout)
+        for module in HEAVY_MODULES:
+            self.assertNotIn(module, modules)
+
+    def test_no_translation(self):
+        proc = self.python('-c', 'import builtins, backintime; '
+                                 'print(builtins._.__name__)')
+        self.assertEqual(proc.stdout.strip(), 'func')
+
+    def test_import_time(self):
+        # best of three to reduce noise
+        times = []
+        for _ in range(3):
+            proc = self.python('-X', 'importtime', '-c', 'import backintime')
+            m = re.search(r'^import time:\s+\d+ \|\s+(\d+) \| backintime$',
+                          proc.stderr, re.MULTILINE)
+            self.assertIsNotNone(m, proc.stderr)
+            times.append(int(m.group(1)))
+
+        self.assertLess(min(times), IMPORT_TIME_LIMIT,
+                        'Importing backintime took %sus' % min(times))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+# Back In Time
+# Copyright (C) 2008-2022 Oprea Dan, Bart de Koning, Richard Bailey,
+# Germar Reitze
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation,Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+import os
+import sys
+import socket
+import unittest
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+import statusevents
+from test import generic
+
+
+class TestStatusEvents(unittest.TestCase):
+    def setUp(self):
+        self.tmpDir = TemporaryDirectory()
+        self.folder = os.path.join(self.tmpDir.name, 'events')
+        self.listener = statusevents.Listener(self.folder)
+        self.notifier = statusevents.Notifier(self.folder, '1')
+
+    def tearDown(self):
+        self.notifier.close()
+        self.listener.close()
+        self.tmpDir.cleanup()
+
+    def test_roundtrip(self):
+        self.assertEqual(self.notifier.send(statusevents.STARTED), 1)
+        self.assertEqual(self.notifier.send(statusevents.MESSAGE), 1)
+        self.assertEqual(self.listener.read(),
+                         [('1', statusevents.STARTED),
+                          ('1', statusevents.MESSAGE)])
+        self.assertEqual(self.listener.read(), [])
+
+    def test_multiple_listeners(self):
+        other = statusevents.Listener(self.folder)
+        try:
+            self.assertEqual(self.notifier.send(statusevents.FINISHED), 2)
+            self.assertEqual(other.read(), [('1', statusevents.FINISHED)])
+            self.assertEqual(self.listener.read(),
+                             [('1', statusevents.FINISHED)])
+        finally:
+            other.close()
+
+    def test_progress_rate_limit(self):
+        notifier = statusevents.Notifier(self.folder, '1', minInterval = 60)
+        try:
+            self.assertEqual(notifier.send(statusevents.PROGRESS), 1)
+            self.assertEqual(notifier.send(statusevents.PROGRESS), 0)
+            # other events are never dropped
+            self.assertEqual(notifier.send(statusevents.MESSAGE), 1)
+        finally:
+            notifier.close()
+        self.assertEqual(self.listener.read(),
+                         [('1', statusevents.PROGRESS),
+                          ('1', statusevents.MESSAGE)])
+
+    def test_stale_listener(self):
+        # socket left behind by a listener which crashed
+        stale = os.path.join(self.folder, 'stale' + statusevents.SUFFIX)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sock.bind(stale)
+        sock.close()
+
+        self.assertEqual(self.notifier.send(statusevents.MESSAGE), 1)
+        self.assertFalse(os.path.exists(stale))
+        self.assertEqual(self.listener.read(), [('1', statusevents.MESSAGE)])
+
+    def test_close_removes_socket(self):
+        path = self.listener.path
+        self.assertTrue(os.path.exists(path))
+        self.listener.close()
+        self.assertFalse(os.path.exists(path))
+
+    def test_no_listeners(self):
+        notifier = statusevents.Notifier(
+            os.path.join(self.tmpDir.name, 'missing'), '1')
+        self.assertEqual(notifier.send(statusevents.MESSAGE), 0)
+        self.assertIsNone(notifier.sock)
+
+
+class TestSnapshotsStatusEvents(generic.SnapshotsTestCase):
+    def setUp(self):
+        super(TestSnapshotsStatusEvents, self).setUp()
+        self.eventsDir = TemporaryDirectory()
+        patcher = patch.object(self.cfg, 'takeSnapshotEventsFolder',
+                               return_value = self.eventsDir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.listener = statusevents.Listener(self.eventsDir.name)
+
+    def tearDown(self):
+        self.listener.close()
+        self.eventsDir.cleanup()
+        super(TestSnapshotsStatusEvents, self).tearDown()
+
+    def test_setTakeSnapshotMessage(self):
+        self.sn.setTakeSnapshotMessage(0, 'foo')
+        self.assertEqual(self.listener.read(),
+                         [(self.cfg.currentProfile(), statusevents.MESSAGE)])
+
+
+if __name__ == '__main__':
+    unittest.main()
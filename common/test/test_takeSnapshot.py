@@ -181,6 +181,76 @@ class TestTakeSnapshot(generic.SnapshotsTestCase):
                   'save_to_continue'):
             self.assertNotExists(sid1.path(f))
 
+    @patch('time.sleep') # speed up unittest
+    def test_takeSnapshot_parallel(self, sleep):
+        self.cfg.setParallelRsync(True, 2)
+        now = datetime.today() - timedelta(minutes = 2)
+        sid1 = snapshots.SID(now, self.cfg)
+
+        self.assertListEqual([True, False], self.sn.takeSnapshot(sid1, now, [(self.include.name, 0),]))
+        self.assertTrue(sid1.isExistingPathInsideSnapshotFolder(os.path.join(self.include.name, 'foo', 'bar', 'baz')))
+        self.assertTrue(sid1.isExistingPathInsideSnapshotFolder(os.path.join(self.include.name, 'test')))
+        self.assertTrue(sid1.isExistingPathInsideSnapshotFolder(os.path.join(self.include.name, 'file with spaces')))
+
+        # nothing changed
+        now = datetime.today()
+        sid2 = snapshots.SID(now, self.cfg)
+        self.assertListEqual([False, False], self.sn.takeSnapshot(sid2, now, [(self.include.name, 0),]))
+        self.assertFalse(sid2.exists())
+
+    @patch('time.sleep') # speed up unittest
+    @patch('changetracker.ChangeTracker.commit')
+    @patch('changetracker.ChangeTracker.dirtyFolders', return_value = [])
+    @patch('snapshots.Snapshots.rsyncSingle')
+    def test_takeSnapshot_change_tracker_nothing_changed(self, rsync, dirty, commit, sleep):
+        self.cfg.setChangeTrackerEnabled(True)
+        sid1 = snapshots.SID(datetime.today() - timedelta(minutes = 6), self.cfg)
+        sid1.makeDirs()
+
+        now = datetime.today()
+        sid2 = snapshots.SID(now, self.cfg)
+        self.assertListEqual([False, False], self.sn.takeSnapshot(sid2, now, [(self.include.name, 0),]))
+        self.assertFalse(sid2.exists())
+        rsync.assert_not_called()
+        commit.assert_called_once_with()
+
+    @patch('time.sleep') # speed up unittest
+    @patch('changetracker.ChangeTracker.commit')
+    @patch('snapshots.Snapshots.hardlinkClone', return_value = True)
+    @patch('snapshots.Snapshots.rsyncSingle', return_value = 1)
+    def test_takeSnapshot_change_tracker_dirty(self, rsync, clone, commit, sleep):
+        self.cfg.setChangeTrackerEnabled(True)
+        sid1 = snapshots.SID(datetime.today() - timedelta(minutes = 6), self.cfg)
+        sid1.makeDirs()
+
+        now = datetime.today()
+        sid2 = snapshots.SID(now, self.cfg)
+        with patch('changetracker.ChangeTracker.dirtyFolders',
+                   return_value = [(os.path.join(self.include.name, 'foo'), False)]):
+            self.sn.takeSnapshot(sid2, now, [(self.include.name, 0),])
+        clone.assert_called_once()
+        cmd = rsync.call_args[0][0]
+        self.assertIn('--no-recursive', cmd)
+        self.assertIn('--dirs', cmd)
+        self.assertTrue([arg for arg in cmd if arg.startswith('--files-from=')])
+
+    @patch('time.sleep') # speed up unittest
+    @patch('snapshots.Snapshots.cowClone', return_value = True)
+    @patch('snapshots.Snapshots.cowBackend', return_value = 'reflink')
+    @patch('snapshots.Snapshots.rsyncSingle', return_value = 1)
+    def test_takeSnapshot_cow(self, rsync, backend, clone, sleep):
+        sid1 = snapshots.SID(datetime.today() - timedelta(minutes = 6), self.cfg)
+        sid1.makeDirs()
+
+        now = datetime.today()
+        sid2 = snapshots.SID(now, self.cfg)
+        self.sn.takeSnapshot(sid2, now, [(self.include.name, 0),])
+        clone.assert_called_once()
+        cmd = rsync.call_args[0][0]
+        self.assertIn('--inplace', cmd)
+        self.assertIn('--no-whole-file', cmd)
+        self.assertFalse([arg for arg in cmd if arg.startswith('--link-dest')])
+
     @patch('time.sleep') # speed up unittest
     def test_takeSnapshot_error(self, sleep):
         with generic.mockPermissions(os.path.join(self.include.name, 'test')):
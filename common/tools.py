@@ -35,33 +35,51 @@ except ImportError:
 import hashlib
 import ipaddress
 import atexit
+import importlib
 from datetime import datetime
-from packaging.version import Version
 from time import sleep
 
 import logger
 
-# Try to import keyring
-is_keyring_available = False
-try:
-    # Jan 4, 2024 aryoda: The env var BIT_USE_KEYRING is neither documented
-    #                     anywhere nor used at all in the code.
-    #                     Via "git blame" I have found a commit message saying:
-    #                     "block subsequent 'import keyring' if it failed once"
-    #                     So I assume it is an internal temporary env var only.
-    # Note: os.geteuid() is used instead of tools.isRoot() here
-    #       because the latter is still not available here in the global
-    #       module code.
-    if os.getenv('BIT_USE_KEYRING', 'true') == 'true' and os.geteuid() != 0:
-        import keyring
-        from keyring import backend
-        import keyring.util.platform_
-        is_keyring_available = True
-except Exception as e:
+# keyring is imported on first use (see _importKeyring()) because it is slow
+# and not needed by most commands.
+is_keyring_available = None
+keyring = None
+backend = None
+
+
+def _importKeyring():
+    """
+    Try to import keyring once.
+
+    Returns:
+        bool:   ``True`` if keyring could be imported
+    """
+    global is_keyring_available, keyring, backend
+
+    if is_keyring_available is not None:
+        return is_keyring_available
+
     is_keyring_available = False
-    # block subsequent 'import keyring' if it failed once before
-    os.putenv('BIT_USE_KEYRING', 'false')
-    logger.warning(f"'import keyring' failed with: {repr(e)}")
+    try:
+        # Jan 4, 2024 aryoda: The env var BIT_USE_KEYRING is neither documented
+        #                     anywhere nor used at all in the code.
+        #                     Via "git blame" I have found a commit message saying:
+        #                     "block subsequent 'import keyring' if it failed once"
+        #                     So I assume it is an internal temporary env var only.
+        if os.getenv('BIT_USE_KEYRING', 'true') == 'true' and not isRoot():
+            import keyring as keyring_
+            from keyring import backend as backend_
+            import keyring.util.platform_
+            keyring, backend = keyring_, backend_
+            is_keyring_available = True
+    except Exception as e:
+        is_keyring_available = False
+        # block subsequent 'import keyring' if it failed once before
+        os.putenv('BIT_USE_KEYRING', 'false')
+        logger.warning(f"'import keyring' failed with: {repr(e)}")
+
+    return is_keyring_available
 
 # getting dbus imports to work in Travis CI is a huge pain
 # use conditional dbus import
@@ -79,9 +97,9 @@ except ImportError:
 
 import configfile
 import bcolors
+import probecache
 from applicationinstance import ApplicationInstance
 from exceptions import Timeout, InvalidChar, InvalidCmd, LimitExceeded, PermissionDeniedByPolicy
-import languages
 
 DISK_BY_UUID = '/dev/disk/by-uuid'
 
@@ -211,6 +229,29 @@ def _determine_current_used_language_code(translation, language_code):
     return current_used_language_code
 
 
+def initiate_lazy_translation():
+    """Install placeholders for ``_()`` and ``ngettext()`` into ``builtins``
+    which call :py:func:`initiate_translation` with the systems current
+    locale on first use. Commands which never show translated strings don't
+    need to load the translation at all.
+
+    Nothing is done if translation was already initiated.
+    """
+    import builtins
+
+    if hasattr(builtins, '_'):
+        return
+
+    def placeholder(name):
+        def func(*args):
+            initiate_translation(None)
+            return getattr(builtins, name)(*args)
+        return func
+
+    builtins._ = placeholder('_')
+    builtins.ngettext = placeholder('ngettext')
+
+
 def initiate_translation(language_code):
     """Initiate Class-based API of GNU gettext.
 
@@ -288,6 +329,8 @@ def get_language_names(language_code):
         e.g. ``ja`` (Japanese) for ``de`` (German) locale
         is ``('Japanisch', '日本語', 'Japanese')``.
     """
+    import languages
+
     result = {}
     codes = ['en'] + get_available_language_codes()
 
@@ -329,6 +372,8 @@ def get_native_language_and_completeness(language_code):
         A two-entry tuple with language name as string and a percent as
         integer.
     """
+    import languages
+
     name = languages.names[language_code][language_code]
     completeness = languages.completeness[language_code]
 
@@ -513,6 +558,8 @@ def checkCommand(cmd):
     return not which(cmd) is None
 
 
+_WHICH_CACHE = {}
+
 def which(cmd):
     """
     Get the fullpath of executable command ``cmd``. Works like
@@ -526,6 +573,12 @@ def which(cmd):
                     not available
     """
     pathenv = os.getenv('PATH', '')
+
+    # remember found commands as long as they exist
+    cached = _WHICH_CACHE.get((cmd, pathenv))
+    if cached and os.path.isfile(cached) and os.access(cached, os.X_OK):
+        return cached
+
     path = pathenv.split(":")
     common = backintimePath('common')
 
@@ -536,11 +589,50 @@ def which(cmd):
         fullpath = os.path.join(directory, cmd)
 
         if os.path.isfile(fullpath) and os.access(fullpath, os.X_OK):
+            _WHICH_CACHE[(cmd, pathenv)] = fullpath
             return fullpath
 
     return None
 
 
+class LazyModule(object):
+    """
+    Placeholder for a module which is imported on first attribute access.
+    The module itself is imported the usual way, so circular imports
+    between modules keep working.
+
+    Args:
+        name (str): module name
+    """
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+    def __repr__(self):
+        return '<lazy module %r>' % self._name
+
+
+def lazyImport(name):
+    """
+    Import module ``name`` on first use instead of now.
+
+    Args:
+        name (str): module name
+
+    Returns:
+        module:     the module if it was already imported, otherwise a
+                    :py:class:`LazyModule`
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    return LazyModule(name)
+
+
 def makeDirs(path):
     """
     Create directories ``path`` recursive and return success.
@@ -888,11 +980,10 @@ def rsyncCaps(data = None):
         list:       List of str with rsyncs capabilities
     """
     if not data:
-        proc = subprocess.Popen(['rsync', '--version'],
-                                stdout = subprocess.PIPE,
-                                universal_newlines = True)
-        data = proc.communicate()[0]
+        data = probecache.probe(['rsync', '--version'])[1]
     caps = []
+    from packaging.version import Version
+
     #rsync >= 3.1 does provide --info=progress2
     matchers = [r'rsync\s*version\s*(\d\.\d)', r'rsync\s*version\s*v(\d\.\d.\d)']
     for matcher in matchers:
@@ -1204,7 +1295,7 @@ def keyringSupported():
          bool: ``True`` if a supported keyring could be loaded
     """
 
-    if not is_keyring_available:
+    if not _importKeyring():
         logger.debug('No keyring due to import error.')
         return False
 
@@ -1298,14 +1389,14 @@ def keyringSupported():
 
 def password(*args):
 
-    if is_keyring_available:
+    if _importKeyring():
         return keyring.get_password(*args)
     return None
 
 
 def setPassword(*args):
 
-    if is_keyring_available:
+    if _importKeyring():
         return keyring.set_password(*args)
     return False
 
@@ -1417,6 +1508,50 @@ def filesystem(path):
         return args[2]
     return None
 
+def isBtrfsSubvolume(path):
+    """
+    Check if ``path`` is the root of a btrfs subvolume.
+
+    Args:
+        path (str): full path
+
+    Returns:
+        bool:       ``True`` if ``path`` is a btrfs subvolume
+    """
+    try:
+        # root directories of btrfs subvolumes always have inode 256
+        if os.lstat(path).st_ino != 256:
+            return False
+    except OSError:
+        return False
+    return filesystem(path) == 'btrfs'
+
+def reflinkSupported(path):
+    """
+    Check if the filesystem of ``path`` supports reflink copies
+    (``cp --reflink=always``) by cloning a small test file.
+
+    Args:
+        path (str): full path to a writable folder
+
+    Returns:
+        bool:       ``True`` if reflinks work in ``path``
+    """
+    try:
+        with tempfile.TemporaryDirectory(prefix='.reflink_', dir=path) as tmp:
+            src = os.path.join(tmp, 'src')
+            with open(src, 'wb') as f:
+                f.write(b'backintime')
+            proc = subprocess.run(['cp', '--reflink=always', src,
+                                   os.path.join(tmp, 'dest')],
+                                  stdout=subprocess.DEVNULL,
+                                  stderr=subprocess.DEVNULL)
+            return proc.returncode == 0
+    except OSError as e:
+        logger.debug('Failed to check reflink support in %s: %s'
+                     % (path, str(e)))
+        return False
+
 def _uuidFromDev_via_filesystem(dev):
     """Get the UUID for the block device ``dev`` from ``/dev/disk/by-uuid`` in
     the filesystem.
@@ -2286,6 +2421,8 @@ class ShutDown(object):
         unity_version = proc.communicate()[0]
         m = re.match(r'unity ([\d\.]+)', unity_version)
 
+        from packaging.version import Version
+
         return m and Version(m.group(1)) >= Version('7.0') and processExists('unity-panel-service')
 
 
@@ -21,13 +21,12 @@ import sys
 if not os.getenv('DISPLAY', ''):
     os.putenv('DISPLAY', ':0.0')
 
+import bisect
 import pathlib
 import re
 import subprocess
-import shutil
 import signal
 from contextlib import contextmanager
-from tempfile import TemporaryDirectory
 
 # We need to import common/tools.py
 import qttools_path
@@ -46,6 +45,8 @@ import snapshots
 import guiapplicationinstance
 import mount
 import progress
+import preview
+import statusevents
 from exceptions import MountException
 
 from PyQt6.QtGui import (QAction,
@@ -53,8 +54,7 @@ from PyQt6.QtGui import (QAction,
                          QDesktopServices,
                          QPalette,
                          QColor,
-                         QIcon,
-                         QFileSystemModel)
+                         QIcon)
 from PyQt6.QtWidgets import (QWidget,
                              QFrame,
                              QMainWindow,
@@ -84,25 +84,27 @@ from PyQt6.QtWidgets import (QWidget,
                              )
 from PyQt6.QtCore import (Qt,
                           QObject,
-                          QPoint,
                           pyqtSlot,
                           pyqtSignal,
                           QTimer,
                           QThread,
                           QEvent,
-                          QSortFilterProxyModel,
-                          QDir,
+                          QModelIndex,
+                          QSocketNotifier,
                           QSize,
                           QUrl,
                           pyqtRemoveInputHook,
                           )
 import settingsdialog
 import snapshotsdialog
+import searchdialog
+import snapshotdiffdialog
 import logviewdialog
 from restoredialog import RestoreDialog
 import languagedialog
 import messagebox
 from aboutdlg import AboutDlg
+from filesviewmodel import FilesViewModel
 
 
 class MainWindow(QMainWindow):
@@ -213,19 +215,10 @@ class MainWindow(QMainWindow):
         self.filesView.header().setSectionsMovable(False)
         self.filesView.header().setSortIndicatorShown(True)
 
-        self.filesViewModel = QFileSystemModel(self)
-        self.filesViewModel.setRootPath(QDir().rootPath())
-        self.filesViewModel.setReadOnly(True)
-        self.filesViewModel.setFilter(QDir.Filter.AllDirs |
-                                      QDir.Filter.AllEntries |
-                                      QDir.Filter.NoDotAndDotDot |
-                                      QDir.Filter.Hidden)
-
-        self.filesViewProxyModel = QSortFilterProxyModel(self)
-        self.filesViewProxyModel.setDynamicSortFilter(True)
-        self.filesViewProxyModel.setSourceModel(self.filesViewModel)
-
-        self.filesView.setModel(self.filesViewProxyModel)
+        self.filesViewModel = FilesViewModel(self)
+        self.filesView.setModel(self.filesViewModel)
+        # all rows have the same height which avoids measuring each row
+        self.filesView.setUniformRowHeights(True)
 
         self.filesViewDelegate = QStyledItemDelegate(self)
         self.filesView.setItemDelegate(self.filesViewDelegate)
@@ -296,6 +289,7 @@ class MainWindow(QMainWindow):
         self.status.setText(_('Done'))
 
         self.snapshotsList = []
+        self.snapshotsListLoader = None
         self.sid = snapshots.RootSnapshot(self.config)
         self.path = self.config.profileStrValue(
             'qt.last_path',
@@ -378,7 +372,7 @@ class MainWindow(QMainWindow):
                 "Can't find snapshots folder.\nIf it is on a removable "
                 "drive please plug it in and then press OK."))
 
-        self.filesViewProxyModel.layoutChanged.connect(self.dirListerCompleted)
+        self.filesViewModel.directoryLoaded.connect(self.dirListerCompleted)
 
         # populate lists
         self.updateProfiles()
@@ -395,6 +389,8 @@ class MainWindow(QMainWindow):
         self.filesView.activated.connect(self.filesViewItemActivated)
 
         self.forceWaitLockCounter = 0
+        self.searchDialog = None
+        self.snapshotDiffDialog = None
 
         self.timerRaiseApplication = QTimer(self)
         self.timerRaiseApplication.setInterval(1000)
@@ -402,10 +398,27 @@ class MainWindow(QMainWindow):
         self.timerRaiseApplication.timeout.connect(self.raiseApplication)
         self.timerRaiseApplication.start()
 
+        # backups push events whenever their message or progress changed.
+        # The timer is only a fallback in case events get lost.
+        self.statusListener = None
+        self.statusNotifier = None
+        try:
+            self.statusListener = statusevents.Listener(
+                self.config.takeSnapshotEventsFolder())
+        except OSError as e:
+            logger.warning('Failed to listen for backup events: {}'
+                           .format(str(e)), self)
+        else:
+            self.statusNotifier = QSocketNotifier(
+                self.statusListener.fileno(),
+                QSocketNotifier.Type.Read,
+                self)
+            self.statusNotifier.activated.connect(self.statusEvent)
+
         self.timerUpdateTakeSnapshot = QTimer(self)
-        self.timerUpdateTakeSnapshot.setInterval(1000)
+        self.timerUpdateTakeSnapshot.setInterval(self.updateTakeSnapshotInterval())
         self.timerUpdateTakeSnapshot.setSingleShot(False)
-        self.timerUpdateTakeSnapshot.timeout.connect(self.updateTakeSnapshot)
+        self.timerUpdateTakeSnapshot.timeout.connect(self.updateTakeSnapshotTimeout)
         self.timerUpdateTakeSnapshot.start()
 
         SetupCron(self).start()
@@ -497,6 +510,14 @@ class MainWindow(QMainWindow):
                 icon.REMOVE_SNAPSHOT, _('Remove snapshot'),
                 self.btnRemoveSnapshotClicked, ['Delete'],
                 None),
+            'act_search': (
+                icon.SEARCH, _('Search in all snapshots…'),
+                self.btnSearchClicked, ['Ctrl+F'],
+                None),
+            'act_snapshot_diff': (
+                icon.SNAPSHOT_DIFF, _('Show changes between snapshots…'),
+                self.btnSnapshotDiffClicked, None,
+                None),
             'act_snapshot_logview': (
                 icon.VIEW_SNAPSHOT_LOG, _('View snapshot log'),
                 self.btnSnapshotLogViewClicked, None,
@@ -642,6 +663,8 @@ class MainWindow(QMainWindow):
                 self.act_take_snapshot_checksum,
                 self.act_settings,
                 self.act_snapshots_dialog,
+                self.act_search,
+                self.act_snapshot_diff,
                 self.act_name_snapshot,
                 self.act_remove_snapshot,
                 self.act_snapshot_logview,
@@ -826,8 +849,24 @@ class MainWindow(QMainWindow):
         self.config.setIntValue('qt.main_window.files_view.sort.column', self.filesView.header().sortIndicatorSection())
         self.config.setBoolValue('qt.main_window.files_view.sort.ascending', self.filesView.header().sortIndicatorOrder() == Qt.SortOrder.AscendingOrder)
 
+        self.filesViewModel.close()
         self.filesViewModel.deleteLater()
 
+        if self.searchDialog is not None:
+            self.searchDialog.stopSearch(wait = True)
+
+        if self.snapshotDiffDialog is not None:
+            self.snapshotDiffDialog.stopDiff(wait = True)
+
+        if self.statusListener is not None:
+            self.statusNotifier.setEnabled(False)
+            self.statusListener.close()
+
+        # cleanup previews of files which were opened in GUI. Must be done
+        # before unmounting because reflink clones are next to the snapshots
+        for d in self.tmpDirs:
+            d.cleanup()
+
         #umount
         try:
             mnt = mount.Mount(cfg = self.config, parent = self)
@@ -837,10 +876,6 @@ class MainWindow(QMainWindow):
 
         self.config.save()
 
-        # cleanup temporary local copies of files which were opened in GUI
-        for d in self.tmpDirs:
-            d.cleanup()
-
         event.accept()
 
     def updateProfiles(self):
@@ -921,12 +956,40 @@ class MainWindow(QMainWindow):
         logger.debug("Raise cmd: %s" %raiseCmd, self)
         self.qapp.alert(self)
 
+    def updateTakeSnapshotInterval(self):
+        """Interval of `self.timerUpdateTakeSnapshot` in milliseconds.
+
+        With working backup events the timer is only a slow fallback. While
+        waiting for a just started backup to take the lock it runs every
+        second, because `self.forceWaitLockCounter` counts timer ticks.
+        """
+        if self.statusListener is None or self.forceWaitLockCounter > 0:
+            return 1000
+        return 5000
+
+    def statusEvent(self):
+        """Called when a backup sent events. See `statusevents`."""
+        profileID = self.config.currentProfile()
+        events = self.statusListener.read()
+        if any(profile == profileID for profile, event in events):
+            self.updateTakeSnapshot()
+
+    def updateTakeSnapshotTimeout(self):
+        """Called by `self.timerUpdateTakeSnapshot`. Only timer ticks count
+        down `self.forceWaitLockCounter`, so backup events can't shorten the
+        time to wait for a just started backup.
+        """
+        if self.forceWaitLockCounter > 0:
+            self.forceWaitLockCounter = self.forceWaitLockCounter - 1
+        self.updateTakeSnapshot()
+
     def updateTakeSnapshot(self, force_wait_lock=False):
         """Update the statusbar and progress indicator with latest message
         from the snapshot message file.
 
-        This method is called via a timeout event. See
-        `self.timerUpdateTakeSnapshot`. Also see
+        This method is called when a backup sent an event (see
+        `self.statusEvent()`) and via the fallback timer
+        `self.updateTakeSnapshotTimeout()`. Also see
         `Snapshots.takeSnapshotMessage()` for further details.
         """
         if force_wait_lock:
@@ -940,11 +1003,12 @@ class MainWindow(QMainWindow):
         else:
             paused = False
 
-        if self.forceWaitLockCounter > 0:
-            self.forceWaitLockCounter = self.forceWaitLockCounter - 1
-
         fake_busy = busy or self.forceWaitLockCounter > 0
 
+        interval = self.updateTakeSnapshotInterval()
+        if self.timerUpdateTakeSnapshot.interval() != interval:
+            self.timerUpdateTakeSnapshot.setInterval(interval)
+
         message = _('Working:')
         takeSnapshotMessage = self.snapshots.takeSnapshotMessage()
 
@@ -983,17 +1047,9 @@ class MainWindow(QMainWindow):
                            self.act_stop_take_snapshot):
                 action.setVisible(False)
 
-            # TODO: check if there is a more elegant way than always get a
-            # new snapshot list which is very expensive (time)
-            snapshotsList = snapshots.listSnapshots(self.config)
-
-            if snapshotsList != self.snapshotsList:
-                self.snapshotsList = snapshotsList
-                self.updateTimeLine(False)
-                takeSnapshotMessage = (0, _('Done'))
-            else:
-                if takeSnapshotMessage[0] == 0:
-                    takeSnapshotMessage = (0, _('Done, no backup needed'))
+            # the final message depends on whether a new snapshot was
+            # created. See snapshotsListLoaded()
+            self.loadSnapshotsList(takeSnapshotDone = True)
 
             self.shutdown.shutdown()
 
@@ -1173,15 +1229,51 @@ class MainWindow(QMainWindow):
         self.timeLine.addRoot(snapshots.RootSnapshot(self.config))
         if refreshSnapshotsList:
             self.snapshotsList = []
-            thread = FillTimeLineThread(self)
-            thread.addSnapshot.connect(self.timeLine.addSnapshot)
-            thread.finished.connect(self.timeLine.checkSelection)
-            thread.start()
+            self.loadSnapshotsList()
         else:
             for sid in self.snapshotsList:
                 item = self.timeLine.addSnapshot(sid)
             self.timeLine.checkSelection()
 
+    def loadSnapshotsList(self, takeSnapshotDone = False):
+        """
+        Reload the list of snapshots in background and update the timeline
+        with the differences once it is done.
+
+        Args:
+            takeSnapshotDone (bool):    a snapshot has just finished. Show
+                                        whether it created a new snapshot
+        """
+        if self.snapshotsListLoader is not None:
+            self.snapshotsListLoader.requestInterruption()
+            takeSnapshotDone = takeSnapshotDone \
+                or self.snapshotsListLoader.takeSnapshotDone
+        loader = SnapshotsListLoader(self, takeSnapshotDone)
+        loader.loaded.connect(self.snapshotsListLoaded)
+        self.snapshotsListLoader = loader
+        loader.start()
+
+    def snapshotsListLoaded(self, sids):
+        loader = self.sender()
+        # ignore results of outdated loaders
+        if loader is not self.snapshotsListLoader:
+            return
+        self.snapshotsListLoader = None
+
+        changed = self.timeLine.updateSnapshots(sids)
+        self.snapshotsList = sids
+        self.timeLine.checkSelection()
+
+        if loader.takeSnapshotDone and not self.snapshots.busy():
+            if changed:
+                self.lastTakeSnapshotMessage = (0, _('Done'))
+            elif self.lastTakeSnapshotMessage is None \
+                    or self.lastTakeSnapshotMessage[0] == 0:
+                self.lastTakeSnapshotMessage = (0, _('Done, no backup needed'))
+            else:
+                return
+            self.status.setText(self.lastTakeSnapshotMessage[1])
+
     def btnTakeSnapshotClicked(self):
         backintime.takeSnapshotAsync(self.config)
         self.updateTakeSnapshot(True)
@@ -1198,7 +1290,7 @@ class MainWindow(QMainWindow):
         self.snapshots.setTakeSnapshotMessage(0, 'Snapshot terminated')
 
     def btnUpdateSnapshotsClicked(self):
-        self.updateTimeLine()
+        self.loadSnapshotsList()
         self.updateFilesView(2)
 
     def btnNameSnapshotClicked(self):
@@ -1278,7 +1370,7 @@ class MainWindow(QMainWindow):
                 self.timeLine.selectRootItem()
 
         thread = RemoveSnapshotThread(self, items)
-        thread.refreshSnapshotList.connect(self.updateTimeLine)
+        thread.refreshSnapshotList.connect(self.loadSnapshotsList)
         thread.hideTimelineItem.connect(hideItem)
         thread.start()
 
@@ -1539,6 +1631,40 @@ files that the receiver requests to be transferred.""")
                 if dlg.sid != self.sid:
                     self.timeLine.setCurrentSnapshotID(dlg.sid)
 
+    def btnSearchClicked(self):
+        # the dialog is not modal, so results can be looked at in the main
+        # window while it stays open
+        if self.searchDialog is None:
+            self.searchDialog = searchdialog.SearchDialog(self)
+        self.searchDialog.show()
+        self.searchDialog.raise_()
+        self.searchDialog.activateWindow()
+
+    def btnSnapshotDiffClicked(self):
+        if self.snapshotDiffDialog is None:
+            self.snapshotDiffDialog = snapshotdiffdialog.SnapshotDiffDialog(self)
+        if self.snapshotDiffDialog.diffThread is None:
+            self.snapshotDiffDialog.setSnapshots(self.sid, self.path)
+        self.snapshotDiffDialog.show()
+        self.snapshotDiffDialog.raise_()
+        self.snapshotDiffDialog.activateWindow()
+
+    def showSnapshotPath(self, sid, path):
+        """Show snapshot ``sid`` in the files view with ``path`` selected.
+
+        Used by the search and snapshot diff dialogs to show their results.
+        """
+        self.path = os.path.dirname(path) or '/'
+        self.path_history.append(self.path)
+
+        if sid != self.sid:
+            # set before changing the timeline so timeLineChanged() will not
+            # update the files view a second time
+            self.sid = sid
+            self.timeLine.setCurrentSnapshotID(sid)
+
+        self.updateFilesView(1, selected_file = os.path.basename(path))
+
     def btnFolderUpClicked(self):
 
         if len(self.path) <= 1:
@@ -1606,39 +1732,39 @@ files that the receiver requests to be transferred.""")
         if model_index is None:
             return
 
-        rel_path = str(self.filesViewProxyModel.data(model_index))
+        rel_path = self.filesViewModel.fileName(model_index)
 
         if not rel_path:
             return
 
         self.openPath(rel_path)
 
-    def tmpCopy(self, full_path, sid = None):
+    def previewPath(self, full_path, sid = None):
         """
-        Create a temporary local copy of the file ``full_path`` and add the
-        temp folder to ``self.tmpDirs`` which will remove them on exit.
+        Prepare the file or folder ``full_path`` from a snapshot to be opened
+        by other applications without risking the backup data. Files which
+        can't be changed anyway are used directly, otherwise a reflink clone
+        or as last resort a copy is created (see :py:mod:`preview`).
+        Temporary folders are added to ``self.tmpDirs`` which will remove
+        them on exit.
 
         Args:
             full_path (str):        path to original file
             sid (snapshots.SID):    snapshot ID used as temp folder suffix
 
         Returns:
-            str:                    temporary path to file
+            str:                    path which can be opened safely
         """
-        if sid:
-            sid = '_' + sid.sid
+        suffix = '_' + sid.sid if sid else ''
 
-        d = TemporaryDirectory(suffix = sid)
-        tmp_file = os.path.join(d.name, os.path.basename(full_path))
+        path, d, method = preview.create(
+            full_path, suffix, cowDir = self.config.snapshotsFullPath())
+        logger.debug('Preview {} ({})'.format(full_path, method), self)
 
-        if os.path.isdir(full_path):
-            shutil.copytree(full_path, tmp_file)
-        else:
-            shutil.copy(full_path, d.name)
+        if d is not None:
+            self.tmpDirs.append(d)
 
-        self.tmpDirs.append(d)
-
-        return tmp_file
+        return path
 
     def openPath(self, rel_path):
         rel_path = os.path.join(self.path, rel_path)
@@ -1657,9 +1783,8 @@ files that the receiver requests to be transferred.""")
 
             else:
                 # prevent backup data from being accidentally overwritten
-                # by create a temporary local copy and only open that one
                 if not isinstance(self.sid, snapshots.RootSnapshot):
-                    full_path = self.tmpCopy(full_path, self.sid)
+                    full_path = self.previewPath(full_path, self.sid)
 
                 file_url = QUrl('file://' + full_path)
                 self.run = QDesktopServices.openUrl(file_url)
@@ -1701,22 +1826,17 @@ files that the receiver requests to be transferred.""")
         full_path = self.sid.pathBackup(self.path)
 
         if os.path.isdir(full_path):
-            if self.showHiddenFiles:
-                self.filesViewProxyModel.setFilterRegularExpression(r'')
-            else:
-                self.filesViewProxyModel.setFilterRegularExpression(r'^[^\.]')
-
-            model_index = self.filesViewModel.setRootPath(full_path)
-            proxy_model_index = self.filesViewProxyModel.mapFromSource(model_index)
-            self.filesView.setRootIndex(proxy_model_index)
+            self.filesViewModel.setShowHidden(self.showHiddenFiles)
 
             self.toolbar_filesview.setEnabled(False)
             self.stackFilesView.setCurrentWidget(self.filesView)
 
-            # TODO: find a signal for this
-            self.dirListerCompleted()
+            # emits directoryLoaded which calls dirListerCompleted()
+            self.filesViewModel.setDirectory(self.sid, self.path, full_path)
+            self.prefetchNeighbours()
 
         else:
+            self.filesViewModel.stopLoader()
             self._enable_restore_ui_elements(False)
             self.act_snapshots_dialog.setEnabled(False)
             self.stackFilesView.setCurrentWidget(self.lblFolderDontExists)
@@ -1731,6 +1851,20 @@ files that the receiver requests to be transferred.""")
         # update folder_up button state
         self.act_folder_up.setEnabled(len(self.path) > 1)
 
+    def prefetchNeighbours(self, count = 2):
+        """
+        Read the current folder of the ``count`` snapshots before and after
+        the current one in background, so switching to them is instant.
+        """
+        if self.sid.isRoot or not self.snapshotsList:
+            return
+        index = bisect.bisect_left(self.snapshotsList, self.sid)
+        neighbours = self.snapshotsList[index + 1:index + 1 + count] \
+                   + self.snapshotsList[max(0, index - count):index]
+        self.filesViewModel.prefetch(
+            [(sid, self.path, sid.pathBackup(self.path))
+             for sid in neighbours])
+
     def _enable_restore_ui_elements(self, enable):
         """Enable or disable all buttons and menu entries related to the
         restore feature.
@@ -1755,7 +1889,7 @@ files that the receiver requests to be transferred.""")
         self.act_restore_to.setEnabled(enable)
 
     def dirListerCompleted(self):
-        has_files = (self.filesViewProxyModel.rowCount(self.filesView.rootIndex()) > 0)
+        has_files = self.filesViewModel.rowCount() > 0
 
         # update restore button state
         enable = not self.sid.isRoot and has_files
@@ -1772,26 +1906,17 @@ files that the receiver requests to be transferred.""")
         found = False
 
         if self.selected_file:
-            index = self.filesView.indexAt(QPoint(0,0))
-
-            if not index.isValid():
-                return
+            index = self.filesViewModel.indexOf(self.selected_file)
 
-            while index.isValid():
-                file_name = (str(self.filesViewProxyModel.data(index)))
-
-                if file_name == self.selected_file:
-                    # TODO: doesn't work reliable
-                    self.filesView.setCurrentIndex(index)
-                    found = True
-                    break
-
-                index = self.filesView.indexBelow(index)
+            if index.isValid():
+                self.filesView.setCurrentIndex(index)
+                self.filesView.scrollTo(index)
+                found = True
 
             self.selected_file = ''
 
         if not found and has_files:
-            self.filesView.setCurrentIndex(self.filesViewProxyModel.index(0, 0))
+            self.filesView.setCurrentIndex(self.filesViewModel.index(0, 0))
 
     def fileSelected(self, fullPath=False):
         """Return path and index of the currently in Files View highlighted
@@ -1804,13 +1929,11 @@ files that the receiver requests to be transferred.""")
             (tuple): Path as a string and the index.
         """
         idx = qttools.indexFirstColumn(self.filesView.currentIndex())
-        selected_file = str(self.filesViewProxyModel.data(idx))
+        selected_file = self.filesViewModel.fileName(idx)
 
-        if selected_file == '/':
+        if not selected_file:
             # nothing is selected
-            selected_file = ''
-            idx = self.filesViewProxyModel.mapFromSource(
-                self.filesViewModel.index(self.path, 0))
+            idx = QModelIndex()
 
         if fullPath:
             # resolve to full path
@@ -1824,9 +1947,9 @@ files that the receiver requests to be transferred.""")
             if idx.column() > 0:
                 continue
 
-            selected_file = str(self.filesViewProxyModel.data(idx))
+            selected_file = self.filesViewModel.fileName(idx)
 
-            if selected_file == '/':
+            if not selected_file:
                 continue
 
             count += 1
@@ -1838,7 +1961,7 @@ files that the receiver requests to be transferred.""")
 
         if not count:
             # nothing is selected
-            idx = self.filesViewProxyModel.mapFromSource(self.filesViewModel.index(self.path, 0))
+            idx = QModelIndex()
             if fullPath:
                 selected_file = self.path
             else:
@@ -1953,22 +2076,25 @@ class RemoveSnapshotThread(QThread):
         if self.config.inhibitCookie:
             self.config.inhibitCookie = tools.unInhibitSuspend(*self.config.inhibitCookie)
 
-class FillTimeLineThread(QThread):
+class SnapshotsListLoader(QThread):
     """
-    add snapshot IDs to timeline in background
+    List snapshots and prefetch their metadata (name, failed, last check)
+    in background, so the GUI never blocks on the snapshots folder.
     """
-    addSnapshot = pyqtSignal(snapshots.SID)
-    def __init__(self, parent):
-        self.parent = parent
+    loaded = pyqtSignal(list)
+
+    def __init__(self, parent, takeSnapshotDone = False):
         self.config = parent.config
-        super(FillTimeLineThread, self).__init__(parent)
+        self.takeSnapshotDone = takeSnapshotDone
+        super(SnapshotsListLoader, self).__init__(parent)
 
     def run(self):
-        for sid in snapshots.iterSnapshots(self.config):
-            self.addSnapshot.emit(sid)
-            self.parent.snapshotsList.append(sid)
-
-        self.parent.snapshotsList.sort()
+        sids = snapshots.listSnapshots(self.config, reverse = False)
+        for sid in sids:
+            if self.isInterruptionRequested():
+                return
+            sid.prefetch()
+        self.loaded.emit(sids)
 
 class SetupCron(QThread):
     """
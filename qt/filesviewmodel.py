@@ -0,0 +1,380 @@
+#    Back In Time
+#    Copyright (C) 2008-2022 Oprea Dan, Bart de Koning, Richard Bailey,
+#    Germar Reitze
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""Model of the files view in the main window.
+
+Unlike ``QFileSystemModel`` the folder is read in a background thread and
+shown in batches while it is read, so folders with hundreds of thousands of
+entries do not block the GUI. Complete listings are cached per snapshot,
+path and folder modification time, and the same folder in neighbouring
+snapshots can be prefetched in background so stepping through the timeline
+doesn't need to wait for the disk.
+"""
+import os
+from PyQt6.QtCore import (Qt,
+                          QAbstractTableModel,
+                          QDateTime,
+                          QLocale,
+                          QModelIndex,
+                          QThread,
+                          pyqtSignal)
+from PyQt6.QtWidgets import QFileIconProvider
+import dirlisting
+import logger
+
+
+class FilesViewModel(QAbstractTableModel):
+    """
+    Flat model of one folder in a snapshot.
+
+    Signals:
+        directoryLoaded:    the folder was read completely
+    """
+    directoryLoaded = pyqtSignal()
+
+    COLUMNS = (dirlisting.NAME,
+               dirlisting.SIZE,
+               dirlisting.TYPE,
+               dirlisting.MTIME)
+
+    def __init__(self, parent = None):
+        super(FilesViewModel, self).__init__(parent)
+        self.cache = dirlisting.ListingCache()
+        self.sid = None
+        self.path = None
+        self.fullPath = None
+        self.mtime = None
+        self.showHidden = False
+        self.sortColumn = dirlisting.NAME
+        self.sortReverse = False
+        self.loading = False
+
+        # all entries of the folder, also hidden ones
+        self.entries = []
+        # visible entries in display order
+        self.rows = []
+        # name -> row of visible entries for restoring selections
+        self.rowByName = {}
+
+        self.loader = None
+        self.prefetcher = None
+        self.generation = 0
+
+        provider = QFileIconProvider()
+        self.iconFolder = provider.icon(QFileIconProvider.IconType.Folder)
+        self.iconFile = provider.icon(QFileIconProvider.IconType.File)
+        self.locale = QLocale()
+
+    def setDirectory(self, sid, path, fullPath):
+        """
+        Show folder ``path`` of snapshot ``sid``. Cached listings are shown
+        immediately, otherwise the folder is read in background.
+        :py:data:`directoryLoaded` is emitted once the folder is complete.
+
+        Args:
+            sid (snapshots.SID):    snapshot
+            path (str):             path inside the snapshot
+            fullPath (str):         path of the folder on disk
+        """
+        self.stopLoader()
+        self.generation += 1
+        self.sid = sid
+        self.path = path
+        self.fullPath = fullPath
+
+        entries = None
+        reference = None
+        try:
+            self.mtime = dirlisting.mtime(fullPath)
+        except OSError:
+            self.mtime = None
+        # 'Now' shows live files which must be read again every time
+        if not sid.isRoot and self.mtime is not None:
+            entries = self.cache.get(sid, path, self.mtime)
+            reference = self.cache.reference(path)
+
+        self.beginResetModel()
+        self.entries = list(entries) if entries is not None else []
+        self._updateRows()
+        self.endResetModel()
+
+        if entries is not None:
+            self.loading = False
+            self.directoryLoaded.emit()
+            return
+
+        self.loading = True
+        self.loader = DirLoaderThread(self, fullPath, self.generation,
+                                      reference)
+        self.loader.batchLoaded.connect(self._addBatch)
+        self.loader.loaded.connect(self._loaded)
+        self.loader.start()
+
+    def reload(self):
+        """
+        Read the current folder again.
+        """
+        if self.sid is None:
+            return
+        self.cache.remove(self.sid, self.path)
+        self.setDirectory(self.sid, self.path, self.fullPath)
+
+    def stopLoader(self, wait = False):
+        """
+        Stop reading the current folder. Results which are still on their
+        way are ignored.
+
+        Args:
+            wait (bool):    block until the thread has finished. Reading a
+                            folder on a slow or hung mount might block
+                            for long, so only use this on exit
+        """
+        if self.loader is None:
+            return
+        self.loader.requestInterruption()
+        if wait:
+            self.loader.wait()
+        self.loader = None
+
+    def prefetch(self, jobs):
+        """
+        Read folders in background and add them to the cache. A prefetch
+        which is still running is stopped.
+
+        Args:
+            jobs (list):    tuples of (sid, path, full path on disk)
+        """
+        self.stopPrefetch()
+        if not jobs:
+            return
+        self.prefetcher = PrefetchThread(self, self.cache, jobs)
+        self.prefetcher.start()
+
+    def stopPrefetch(self, wait = False):
+        if self.prefetcher is None:
+            return
+        self.prefetcher.requestInterruption()
+        if wait:
+            self.prefetcher.wait()
+        self.prefetcher = None
+
+    def close(self):
+        """
+        Stop all background threads. Use this before the model is deleted.
+        """
+        self.stopLoader(wait = True)
+        self.stopPrefetch(wait = True)
+        logger.debug('Files view cache hit rate {:.0%} ({} hits, {} misses)'
+                     .format(self.cache.hitRate(),
+                             self.cache.hits,
+                             self.cache.misses),
+                     self)
+
+    def setShowHidden(self, show):
+        if show == self.showHidden:
+            return
+        self.showHidden = show
+        self.beginResetModel()
+        self._updateRows()
+        self.endResetModel()
+
+    def _visible(self, entry):
+        return self.showHidden or not entry.hidden
+
+    def _updateRows(self):
+        """
+        Rebuild visible rows from all entries in current sort order.
+        """
+        entries = [e for e in self.entries if self._visible(e)]
+        order = dirlisting.sortOrder(entries, self.sortColumn, self.sortReverse)
+        self.rows = [entries[i] for i in order]
+        self.rowByName = {e.name: row for row, e in enumerate(self.rows)}
+
+    def _addBatch(self, generation, batch):
+        if generation != self.generation:
+            return
+        self.entries.extend(batch)
+        visible = [e for e in batch if self._visible(e)]
+        if not visible:
+            return
+        # append unsorted while loading, sorted once the folder is complete
+        first = len(self.rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(visible) - 1)
+        self.rows.extend(visible)
+        for row, e in enumerate(visible, first):
+            self.rowByName[e.name] = row
+        self.endInsertRows()
+
+    def _loaded(self, generation, complete):
+        if generation != self.generation:
+            return
+        self.loader = None
+        self.loading = False
+        self._sortRows()
+        if complete and not self.sid.isRoot and self.mtime is not None:
+            self.cache.put(self.sid, self.path, self.mtime, self.entries)
+        self.directoryLoaded.emit()
+
+    def sort(self, column, order = Qt.SortOrder.AscendingOrder):
+        self.sortColumn = self.COLUMNS[column] if column < len(self.COLUMNS) \
+                          else dirlisting.NAME
+        self.sortReverse = order == Qt.SortOrder.DescendingOrder
+        self._sortRows()
+
+    def _sortRows(self):
+        """
+        Sort visible rows and keep selection and current index.
+        """
+        self.layoutAboutToBeChanged.emit()
+        order = dirlisting.sortOrder(self.rows, self.sortColumn, self.sortReverse)
+        newRow = [0] * len(order)
+        for row, old in enumerate(order):
+            newRow[old] = row
+        persistent = self.persistentIndexList()
+        self.changePersistentIndexList(
+            persistent,
+            [self.index(newRow[i.row()], i.column())
+             if i.row() < len(newRow) else QModelIndex()
+             for i in persistent])
+        self.rows = [self.rows[i] for i in order]
+        self.rowByName = {e.name: row for row, e in enumerate(self.rows)}
+        self.layoutChanged.emit()
+
+    def fileName(self, index):
+        """
+        Name of the file at ``index`` or ``''`` if ``index`` is invalid.
+        """
+        if not index.isValid() or index.row() >= len(self.rows):
+            return ''
+        return self.rows[index.row()].name
+
+    def indexOf(self, name):
+        """
+        Index of file ``name`` in first column. Invalid if it isn't shown.
+        """
+        row = self.rowByName.get(name)
+        if row is None:
+            return QModelIndex()
+        return self.index(row, 0)
+
+    def rowCount(self, parent = QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.rows)
+
+    def columnCount(self, parent = QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.COLUMNS)
+
+    def headerData(self, section, orientation,
+                   role = Qt.ItemDataRole.DisplayRole):
+        if orientation != Qt.Orientation.Horizontal \
+                or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        return (_('Name'), _('Size'), _('Type'), _('Date Modified'))[section]
+
+    def data(self, index, role = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.rows):
+            return None
+        entry = self.rows[index.row()]
+        column = index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == dirlisting.NAME:
+                return entry.name
+            if column == dirlisting.SIZE:
+                if entry.isDir:
+                    return ''
+                return self.locale.formattedDataSize(entry.size)
+            if column == dirlisting.TYPE:
+                if entry.isDir:
+                    return _('Folder')
+                ext = dirlisting.extension(entry.name)
+                if ext:
+                    return _('{extension} File').format(extension = ext)
+                return _('File')
+            if column == dirlisting.MTIME:
+                return self.locale.toString(
+                    QDateTime.fromSecsSinceEpoch(int(entry.mtime)),
+                    QLocale.FormatType.ShortFormat)
+
+        elif role == Qt.ItemDataRole.DecorationRole:
+            if column == dirlisting.NAME:
+                return self.iconFolder if entry.isDir else self.iconFile
+
+        elif role == Qt.ItemDataRole.TextAlignmentRole:
+            if column == dirlisting.SIZE:
+                return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+
+        elif role == Qt.ItemDataRole.UserRole:
+            return os.path.join(self.fullPath, entry.name)
+
+        return None
+
+
+class DirLoaderThread(QThread):
+    """
+    Read a folder in background and emit its entries in batches.
+
+    Signals:
+        batchLoaded(int, list): generation and batch of
+                                :py:class:`dirlisting.Entry`
+        loaded(int, bool):      generation and whether the folder was read
+                                completely
+    """
+    batchLoaded = pyqtSignal(int, list)
+    loaded = pyqtSignal(int, bool)
+
+    def __init__(self, parent, path, generation, reference = None):
+        self.path = path
+        self.generation = generation
+        self.reference = reference
+        super(DirLoaderThread, self).__init__(parent)
+        self.finished.connect(self.deleteLater)
+
+    def run(self):
+        try:
+            for batch in dirlisting.scan(self.path,
+                                         reference = self.reference):
+                if self.isInterruptionRequested():
+                    return
+                self.batchLoaded.emit(self.generation, batch)
+        except OSError as e:
+            logger.debug('Failed to read {}: {}'.format(self.path, str(e)),
+                         self)
+            self.loaded.emit(self.generation, False)
+            return
+        self.loaded.emit(self.generation, True)
+
+
+class PrefetchThread(QThread):
+    """
+    Read folders into a :py:class:`dirlisting.ListingCache` in background.
+    """
+    def __init__(self, parent, cache, jobs):
+        self.cache = cache
+        self.jobs = jobs
+        super(PrefetchThread, self).__init__(parent)
+        self.finished.connect(self.deleteLater)
+
+    def run(self):
+        count = dirlisting.prefetch(self.cache, self.jobs,
+                                    self.isInterruptionRequested)
+        logger.debug('Prefetched {} of {} folders'.format(count,
+                                                          len(self.jobs)),
+                     self)
@@ -101,6 +101,15 @@ SNAPSHOTS           = QIcon.fromTheme('file-manager',
                       QIcon.fromTheme('view-list-details',
                       QIcon.fromTheme('system-file-manager')))
 
+#Search dialog
+SEARCH              = QIcon.fromTheme('edit-find',
+                      QIcon.fromTheme('system-search'))
+
+#Snapshot diff dialog
+SNAPSHOT_DIFF       = QIcon.fromTheme('document-compare',
+                      QIcon.fromTheme('view-split-left-right',
+                      SNAPSHOTS))
+
 #Snapshot dialog
 DIFF_OPTIONS        = SETTINGS
 DELETE_FILE         = REMOVE_SNAPSHOT
@@ -25,7 +25,7 @@ from PyQt6.QtWidgets import (QDialog,
                              QDialogButtonBox,
                              QCheckBox,
                              )
-from PyQt6.QtCore import QFileSystemWatcher
+from PyQt6.QtCore import QFileSystemWatcher, QThread, pyqtSignal
 import qttools
 import snapshots
 import encfstools
@@ -55,6 +55,9 @@ class LogViewDialog(QDialog):
         self.sid = sid
         self.enableUpdate = False
         self.decode = None
+        self.thread = None
+        # log file which changed while the full log was still decoded
+        self.pendingWatchPath = None
 
         w = self.config.intValue('qt.logview.width', 800)
         h = self.config.intValue('qt.logview.height', 500)
@@ -152,9 +155,10 @@ class LogViewDialog(QDialog):
     def cbDecodeChanged(self):
         if self.cbDecode.isChecked():
             if not self.decode:
-                self.decode = encfstools.Decode(self.config)
+                self.decode = encfstools.DecodePool(self.config)
 
         else:
+            self.stopThread()
             if self.decode is not None:
                 self.decode.close()
             self.decode = None
@@ -232,6 +236,13 @@ class LogViewDialog(QDialog):
 
         mode = self.comboFilter.itemData(self.comboFilter.currentIndex())
 
+        if watchPath and self.thread is not None and self.thread.isRunning():
+            # the full log is still being decoded. Lines which were added
+            # meanwhile will be appended once it has finished
+            self.pendingWatchPath = watchPath
+            return
+        self.stopThread()
+
         # TODO This expressions is hard to understand (watchPath is not a boolean!)
         if watchPath and self.sid is None:
             # remove path from watch to prevent multiple updates at the same time
@@ -250,11 +261,84 @@ class LogViewDialog(QDialog):
 
         elif self.sid is None:
             log = snapshotlog.SnapshotLog(self.config, self.comboProfiles.currentProfileID())
-            self.txtLogView.setPlainText('\n'.join(log.get(mode = mode, decode = self.decode)))
+            self.showLog(log.get(mode = mode, decode = self.decode))
         else:
-            self.txtLogView.setPlainText('\n'.join(self.sid.log(mode, decode = self.decode)))
+            self.showLog(self.sid.log(mode, decode = self.decode))
+
+    def showLog(self, lines):
+        """
+        Show ``lines`` in the GUI. Decoding is slow, so decoded lines are
+        produced in a background thread and appended as they arrive.
+
+        Args:
+            lines: generator of log lines
+        """
+        if self.decode is None:
+            self.txtLogView.setPlainText('\n'.join(lines))
+            return
+
+        self.txtLogView.clear()
+        self.thread = DecodeLogThread(self, lines)
+        self.thread.linesDecoded.connect(self.appendLines)
+        self.thread.finished.connect(self.threadFinished)
+        self.thread.start()
+
+    def appendLines(self, lines):
+        # ignore lines still queued from a stopped thread
+        if self.sender() is self.thread:
+            self.txtLogView.appendPlainText('\n'.join(lines))
+
+    def threadFinished(self):
+        if self.sender() is not self.thread:
+            return
+        # 'finished' is emitted right before the thread returns
+        self.thread.wait()
+        watchPath = self.pendingWatchPath
+        self.pendingWatchPath = None
+        if watchPath:
+            self.updateLog(watchPath)
+
+    def stopThread(self):
+        """
+        Stop decoding the currently shown log.
+        """
+        self.pendingWatchPath = None
+        if self.thread is None:
+            return
+        self.thread.requestInterruption()
+        self.thread.wait()
+        self.thread = None
 
     def closeEvent(self, event):
+        self.stopThread()
         self.config.setIntValue('qt.logview.width', self.width())
         self.config.setIntValue('qt.logview.height', self.height())
         event.accept()
+
+
+class DecodeLogThread(QThread):
+    """
+    Decode log lines in background so the GUI will not freeze. Lines are
+    emitted in chunks as soon as they are decoded.
+    """
+    linesDecoded = pyqtSignal(list)
+    CHUNK = 500
+
+    def __init__(self, parent, lines):
+        self.lines = lines
+        super(DecodeLogThread, self).__init__(parent)
+
+    def run(self):
+        chunk = []
+        try:
+            for line in self.lines:
+                if self.isInterruptionRequested():
+                    return
+                chunk.append(line)
+                if len(chunk) >= self.CHUNK:
+                    self.linesDecoded.emit(chunk)
+                    chunk = []
+            if chunk:
+                self.linesDecoded.emit(chunk)
+        finally:
+            self.lines.close()
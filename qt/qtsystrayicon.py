@@ -42,8 +42,9 @@ import snapshots
 import progress
 import logviewdialog
 import encfstools
+import statusevents
 
-from PyQt6.QtCore import QTimer
+from PyQt6.QtCore import QTimer, QSocketNotifier
 from PyQt6.QtWidgets import QSystemTrayIcon, QMenu, QProgressBar, QWidget
 from PyQt6.QtGui import QRegion
 
@@ -130,9 +131,29 @@ class QtSysTrayIcon:
         self.timer = QTimer()
         self.timer.timeout.connect(self.updateInfo)
 
+        # the backup pushes events whenever message or progress changed.
+        # The timer is only a fallback in case events get lost.
+        self.listener = None
+        self.notifier = None
+        try:
+            self.listener = statusevents.Listener(
+                self.config.takeSnapshotEventsFolder())
+        except OSError as e:
+            logger.warning('Failed to listen for backup events: {}'
+                           .format(str(e)), self)
+        else:
+            self.notifier = QSocketNotifier(self.listener.fileno(),
+                                            QSocketNotifier.Type.Read)
+            self.notifier.activated.connect(self.onStatusEvent)
+
     def prepareExit(self):
         self.timer.stop()
 
+        if not self.listener is None:
+            self.notifier.setEnabled(False)
+            self.listener.close()
+            self.listener = None
+
         if not self.status_icon is None:
             self.status_icon.hide()
             self.status_icon = None
@@ -147,7 +168,7 @@ class QtSysTrayIcon:
         if not self.snapshots.busy():
             sys.exit()
         self.status_icon.show()
-        self.timer.start(500)
+        self.timer.start(500 if self.listener is None else 5000)
 
         # logger.debug("begin loop", self)
 
@@ -157,6 +178,14 @@ class QtSysTrayIcon:
 
         self.prepareExit()
 
+    def onStatusEvent(self):
+        if self.listener is None:
+            return
+        for profileID, event in self.listener.read():
+            if profileID == self.config.currentProfile():
+                self.updateInfo()
+                break
+
     def updateInfo(self):
 
         # Exit this systray icon "app" when the snapshots is taken
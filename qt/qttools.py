@@ -521,6 +521,56 @@ class TimeLine(QTreeWidget):
 
         return True
 
+    def updateSnapshots(self, sids):
+        """
+        Update the timeline to show ``sids``. Only items of new or removed
+        snapshots are touched, so selection and scroll position are kept.
+
+        Args:
+            sids (list):    :py:class:`snapshots.SID` with prefetched
+                            metadata
+
+        Returns:
+            bool:           ``True`` if snapshots were added or removed
+        """
+        items = {item.snapshotID(): item
+                 for item in self.iterSnapshotItems()
+                 if not item.snapshotID().isRoot}
+        new = set(sids)
+
+        removed = [item for sid, item in items.items() if sid not in new]
+        for item in removed:
+            if item is self.currentItem():
+                self.selectRootItem()
+            self.takeTopLevelItem(self.indexOfTopLevelItem(item))
+        if removed:
+            self._removeEmptyHeaders()
+
+        added = False
+        for sid in sids:
+            item = items.get(sid)
+            if item is None:
+                self.addSnapshot(sid)
+                added = True
+            else:
+                # name or failed flag might have changed
+                item.setData(0, Qt.ItemDataRole.UserRole, sid)
+                item.updateText()
+
+        return added or bool(removed)
+
+    def _removeEmptyHeaders(self):
+        dates = [item.snapshotID().date for item in self.iterSnapshotItems()
+                 if not item.snapshotID().isRoot]
+        ranges = {endDate: startDate
+                  for text, startDate, endDate in self.headerData}
+
+        for item in list(self.iterHeaderItems()):
+            endDate = item.snapshotID().date
+            startDate = ranges.get(endDate, datetime.min)
+            if not any(startDate <= d <= endDate for d in dates):
+                self.takeTopLevelItem(self.indexOfTopLevelItem(item))
+
     @pyqtSlot()
     def checkSelection(self):
         if self.currentItem() is None:
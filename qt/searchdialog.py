@@ -0,0 +1,214 @@
+#    Back In Time
+#    Copyright (C) 2008-2022 Oprea Dan, Bart de Koning, Richard Bailey,
+#    Germar Reitze
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""Dialog to search files and folders in all snapshots.
+
+The search runs in background on the path index of each snapshot (see
+:py:mod:`pathindex`) and matches are shown while searching.
+"""
+import os
+from PyQt6.QtCore import Qt, QThread, pyqtSignal
+from PyQt6.QtWidgets import (QDialog,
+                             QVBoxLayout,
+                             QHBoxLayout,
+                             QLineEdit,
+                             QCheckBox,
+                             QPushButton,
+                             QTreeWidget,
+                             QTreeWidgetItem,
+                             QLabel,
+                             QDialogButtonBox)
+import pathindex
+import snapshots
+
+
+class SearchDialog(QDialog):
+    """
+    Non modal dialog to search in all snapshots of the current profile.
+    Activating a match shows it in the main window.
+    """
+    # stop searching after this many matches to keep the GUI responsive
+    MAX_RESULTS = 10000
+
+    def __init__(self, parent):
+        super(SearchDialog, self).__init__(parent)
+        self.parent = parent
+        self.config = parent.config
+        self.searchThread = None
+        self.count = 0
+        import icon
+
+        self.setWindowIcon(icon.SEARCH)
+        self.setWindowTitle(_('Search in all snapshots'))
+        self.resize(700, 500)
+
+        layout = QVBoxLayout(self)
+
+        searchLayout = QHBoxLayout()
+        layout.addLayout(searchLayout)
+        self.editPattern = QLineEdit(self)
+        self.editPattern.setPlaceholderText(_('File name or pattern like *.txt'))
+        self.editPattern.returnPressed.connect(self.btnSearchClicked)
+        searchLayout.addWidget(self.editPattern)
+
+        self.cbCaseSensitive = QCheckBox(_('Case sensitive'), self)
+        searchLayout.addWidget(self.cbCaseSensitive)
+
+        self.btnSearch = QPushButton(_('Search'), self)
+        self.btnSearch.clicked.connect(self.btnSearchClicked)
+        searchLayout.addWidget(self.btnSearch)
+
+        self.results = QTreeWidget(self)
+        self.results.setRootIsDecorated(False)
+        self.results.setAllColumnsShowFocus(True)
+        self.results.setHeaderLabels([_('Snapshot'), _('Path')])
+        self.results.itemActivated.connect(self.resultActivated)
+        layout.addWidget(self.results)
+
+        self.lblStatus = QLabel(self)
+        layout.addWidget(self.lblStatus)
+
+        buttonBox = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        buttonBox.rejected.connect(self.reject)
+        layout.addWidget(buttonBox)
+
+        self.editPattern.setFocus()
+
+    def btnSearchClicked(self):
+        if self.searchThread is not None:
+            self.stopSearch()
+            self.lblStatus.setText(_('Search stopped.'))
+            return
+
+        pattern = self.editPattern.text().strip()
+        if not pattern:
+            return
+
+        self.results.clear()
+        self.count = 0
+
+        self.searchThread = SearchThread(self,
+                                         pattern,
+                                         self.cbCaseSensitive.isChecked())
+        self.searchThread.found.connect(self.addResults)
+        self.searchThread.searching.connect(self.updateStatus)
+        self.searchThread.finished.connect(self.searchFinished)
+        self.btnSearch.setText(_('Stop'))
+        self.searchThread.start()
+
+    def stopSearch(self, wait = False):
+        """
+        Stop the running search. Matches which are still on their way are
+        ignored.
+
+        Args:
+            wait (bool):    block until the search thread has finished
+        """
+        if self.searchThread is None:
+            return
+        self.searchThread.requestInterruption()
+        if wait:
+            self.searchThread.wait()
+        self.searchThread = None
+        self.btnSearch.setText(_('Search'))
+
+    def addResults(self, results):
+        if self.sender() is not self.searchThread:
+            return
+        items = []
+        for sid, path in results:
+            item = QTreeWidgetItem([sid.displayName, path])
+            item.setData(0, Qt.ItemDataRole.UserRole, sid)
+            items.append(item)
+        self.results.addTopLevelItems(items)
+        self.count += len(results)
+        if self.count >= self.MAX_RESULTS:
+            self.stopSearch()
+            self.lblStatus.setText(
+                _('Found more than {count} matches. Please use a more '
+                  'specific pattern.').format(count = self.MAX_RESULTS))
+
+    def updateStatus(self, index, total):
+        if self.sender() is not self.searchThread:
+            return
+        self.lblStatus.setText(
+            _('Searching snapshot {current} of {total}…').format(
+                current = index + 1, total = total))
+
+    def searchFinished(self):
+        if self.sender() is not self.searchThread:
+            return
+        self.searchThread = None
+        self.btnSearch.setText(_('Search'))
+        self.results.resizeColumnToContents(0)
+        self.lblStatus.setText(
+            ngettext('Found {count} match.',
+                     'Found {count} matches.',
+                     self.count).format(count = self.count))
+
+    def resultActivated(self, item, column):
+        sid = item.data(0, Qt.ItemDataRole.UserRole)
+        self.parent.showSnapshotPath(sid, item.text(1))
+
+    def done(self, result):
+        self.stopSearch()
+        super(SearchDialog, self).done(result)
+
+
+class SearchThread(QThread):
+    """
+    Search in all snapshots in background. Snapshots are listed in the
+    thread, too, as this can take a while on slow remote hosts.
+
+    Signals:
+        found(list):            matches as tuples of (sid, path). Emitted in
+                                chunks
+        searching(int, int):    index of the snapshot which is searched now
+                                and total number of snapshots
+    """
+    found = pyqtSignal(list)
+    searching = pyqtSignal(int, int)
+    CHUNK = 200
+
+    def __init__(self, parent, pattern, caseSensitive):
+        self.config = parent.config
+        self.pattern = pattern
+        self.caseSensitive = caseSensitive
+        self.chunk = []
+        super(SearchThread, self).__init__(parent)
+        self.finished.connect(self.deleteLater)
+
+    def run(self):
+        sids = snapshots.listSnapshots(self.config)
+        for index, sid in enumerate(sids):
+            if self.isInterruptionRequested():
+                return
+            self.searching.emit(index, len(sids))
+            for sid, path in pathindex.search([sid],
+                                              self.pattern,
+                                              self.caseSensitive,
+                                              interrupted = self.isInterruptionRequested):
+                self.chunk.append((sid, os.fsdecode(path)))
+                if len(self.chunk) >= self.CHUNK:
+                    self.emitChunk()
+            # show matches of this snapshot before moving on
+            self.emitChunk()
+
+    def emitChunk(self):
+        if self.chunk:
+            self.found.emit(self.chunk)
+            self.chunk = []
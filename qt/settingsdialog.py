@@ -772,10 +772,14 @@ class SettingsDialog(QDialog):
 
         self.cbSmartRemoveRunRemoteInBackground = QCheckBox(
             '{} {}!'.format(
-                _('Run in background on remote host.'),
+                _('Remove snapshots on remote host.'),
                 _('EXPERIMENTAL')
             ),
             self)
+        self.cbSmartRemoveRunRemoteInBackground.setToolTip(
+            _('Remove all snapshots with one job on the remote host over a '
+              'single SSH connection. The backup waits until it has '
+              'finished.'))
         smlayout.addWidget(self.cbSmartRemoveRunRemoteInBackground, 0, 0, 1, 3)
 
         smlayout.addWidget(
@@ -0,0 +1,252 @@
+#    Back In Time
+#    Copyright (C) 2008-2022 Oprea Dan, Bart de Koning, Richard Bailey,
+#    Germar Reitze
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""Dialog to show the differences between two snapshots.
+
+Snapshots are compared in background (see :py:mod:`snapshotdiff`) and
+differences are shown while comparing.
+"""
+from PyQt6.QtCore import Qt, QThread, pyqtSignal
+from PyQt6.QtWidgets import (QDialog,
+                             QVBoxLayout,
+                             QHBoxLayout,
+                             QLineEdit,
+                             QCheckBox,
+                             QPushButton,
+                             QTreeWidget,
+                             QTreeWidgetItem,
+                             QLabel,
+                             QDialogButtonBox)
+import encfstools
+import snapshotdiff
+import snapshots
+import qttools
+
+
+class SnapshotDiffDialog(QDialog):
+    """
+    Non modal dialog to compare two snapshots of the current profile.
+    Activating a difference shows it in the main window.
+    """
+    def __init__(self, parent):
+        super(SnapshotDiffDialog, self).__init__(parent)
+        self.parent = parent
+        self.config = parent.config
+        self.diffThread = None
+        self.sids = (None, None)
+        self.count = 0
+        self.statusNames = {snapshotdiff.ADDED: _('Added'),
+                            snapshotdiff.REMOVED: _('Removed'),
+                            snapshotdiff.MODIFIED: _('Modified')}
+        import icon
+
+        self.setWindowIcon(icon.SNAPSHOT_DIFF)
+        self.setWindowTitle(_('Changes between snapshots'))
+        self.resize(700, 500)
+
+        layout = QVBoxLayout(self)
+
+        snapshotLayout = QHBoxLayout()
+        layout.addLayout(snapshotLayout)
+        snapshotLayout.addWidget(QLabel(_('From:'), self))
+        self.comboSnapshot1 = qttools.SnapshotCombo(self)
+        snapshotLayout.addWidget(self.comboSnapshot1)
+        snapshotLayout.addWidget(QLabel(_('To:'), self))
+        self.comboSnapshot2 = qttools.SnapshotCombo(self)
+        snapshotLayout.addWidget(self.comboSnapshot2)
+
+        pathLayout = QHBoxLayout()
+        layout.addLayout(pathLayout)
+        self.editPath = QLineEdit('/', self)
+        self.editPath.returnPressed.connect(self.btnCompareClicked)
+        pathLayout.addWidget(self.editPath)
+
+        self.cbUseLogs = QCheckBox(_('Use snapshot logs'), self)
+        self.cbUseLogs.setToolTip(
+            _('Only check files listed as changed in the snapshot logs for '
+              'modifications. Much faster. All files are compared if logs '
+              'are incomplete or snapshots in between were removed.'))
+        pathLayout.addWidget(self.cbUseLogs)
+
+        self.btnCompare = QPushButton(_('Compare'), self)
+        self.btnCompare.clicked.connect(self.btnCompareClicked)
+        pathLayout.addWidget(self.btnCompare)
+
+        self.results = QTreeWidget(self)
+        self.results.setRootIsDecorated(False)
+        self.results.setAllColumnsShowFocus(True)
+        self.results.setHeaderLabels([_('Status'), _('Path')])
+        self.results.itemActivated.connect(self.resultActivated)
+        layout.addWidget(self.results)
+
+        self.lblStatus = QLabel(self)
+        layout.addWidget(self.lblStatus)
+
+        buttonBox = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        buttonBox.rejected.connect(self.reject)
+        layout.addWidget(buttonBox)
+
+        self.updateSnapshots()
+
+    def updateSnapshots(self):
+        self.comboSnapshot1.clear()
+        self.comboSnapshot2.clear()
+        for sid in snapshots.iterSnapshots(self.config):
+            self.comboSnapshot1.addSnapshotID(sid)
+            self.comboSnapshot2.addSnapshotID(sid)
+
+    def setSnapshots(self, sid, path):
+        """
+        Preselect snapshot ``sid`` and the snapshot before it.
+
+        Args:
+            sid (snapshots.SID):    snapshot to compare to. The last snapshot
+                                    is used for ``Now``
+            path (str):             folder to compare
+        """
+        self.updateSnapshots()
+        sids = snapshots.listSnapshots(self.config)
+        if not sids:
+            return
+        if sid.isRoot or sid not in sids:
+            sid = sids[0]
+        index = sids.index(sid)
+        self.comboSnapshot2.setCurrentSnapshotID(sid)
+        self.comboSnapshot1.setCurrentSnapshotID(
+            sids[min(index + 1, len(sids) - 1)])
+        self.editPath.setText(path)
+
+    def btnCompareClicked(self):
+        if self.diffThread is not None:
+            self.stopDiff()
+            self.lblStatus.setText(_('Comparison stopped.'))
+            return
+
+        sid1 = self.comboSnapshot1.currentSnapshotID()
+        sid2 = self.comboSnapshot2.currentSnapshotID()
+        if sid1 is None or sid2 is None:
+            return
+
+        self.results.clear()
+        self.count = 0
+        self.sids = (sid1, sid2)
+
+        self.diffThread = DiffThread(self,
+                                     sid1,
+                                     sid2,
+                                     self.editPath.text().strip() or '/',
+                                     self.cbUseLogs.isChecked())
+        self.diffThread.found.connect(self.addResults)
+        self.diffThread.finished.connect(self.diffFinished)
+        self.btnCompare.setText(_('Stop'))
+        self.lblStatus.setText(_('Comparing…'))
+        self.diffThread.start()
+
+    def stopDiff(self, wait = False):
+        """
+        Stop the running comparison. Differences which are still on their
+        way are ignored.
+
+        Args:
+            wait (bool):    block until the diff thread has finished
+        """
+        if self.diffThread is None:
+            return
+        self.diffThread.requestInterruption()
+        if wait:
+            self.diffThread.wait()
+        self.diffThread = None
+        self.btnCompare.setText(_('Compare'))
+
+    def addResults(self, changes):
+        if self.sender() is not self.diffThread:
+            return
+        items = []
+        for change in changes:
+            item = QTreeWidgetItem([self.statusNames[change.status], change.path])
+            item.setData(0, Qt.ItemDataRole.UserRole, change)
+            items.append(item)
+        self.results.addTopLevelItems(items)
+        self.count += len(changes)
+
+    def diffFinished(self):
+        if self.sender() is not self.diffThread:
+            return
+        self.diffThread = None
+        self.btnCompare.setText(_('Compare'))
+        self.results.resizeColumnToContents(0)
+        self.lblStatus.setText(
+            ngettext('Found {count} change.',
+                     'Found {count} changes.',
+                     self.count).format(count = self.count))
+
+    def resultActivated(self, item, column):
+        change = item.data(0, Qt.ItemDataRole.UserRole)
+        sid1, sid2 = self.sids
+        # removed files only exist in the older snapshot
+        sid = sid1 if change.status == snapshotdiff.REMOVED else sid2
+        self.parent.showSnapshotPath(sid, change.path)
+
+    def done(self, result):
+        self.stopDiff()
+        super(SnapshotDiffDialog, self).done(result)
+
+
+class DiffThread(QThread):
+    """
+    Compare two snapshots in background.
+
+    Signals:
+        found(list):    :py:class:`snapshotdiff.Change` instances. Emitted
+                        in chunks
+    """
+    found = pyqtSignal(list)
+    CHUNK = 200
+
+    def __init__(self, parent, sid1, sid2, path, useLogs):
+        self.sid1 = sid1
+        self.sid2 = sid2
+        self.path = path
+        self.useLogs = useLogs
+        self.config = parent.config
+        self.chunk = []
+        super(DiffThread, self).__init__(parent)
+        self.finished.connect(self.deleteLater)
+
+    def run(self):
+        decode = None
+        if self.useLogs and self.config.snapshotsMode() == 'ssh_encfs':
+            decode = encfstools.Decode(self.config)
+        try:
+            for change in snapshotdiff.diff(self.sid1,
+                                            self.sid2,
+                                            self.path,
+                                            useLogs = self.useLogs,
+                                            decode = decode,
+                                            interrupted = self.isInterruptionRequested):
+                self.chunk.append(change)
+                if len(self.chunk) >= self.CHUNK:
+                    self.emitChunk()
+            self.emitChunk()
+        finally:
+            if decode:
+                decode.close()
+
+    def emitChunk(self):
+        if self.chunk:
+            self.found.emit(self.chunk)
+            self.chunk = []
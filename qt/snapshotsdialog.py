@@ -29,6 +29,7 @@ import restoredialog
 import messagebox
 import qttools
 import snapshots
+import preview
 import logger
 
 DIFF_PARAMS = '%1 %2'
@@ -334,9 +335,8 @@ class SnapshotsDialog(QDialog):
             return
 
         # prevent backup data from being accidentally overwritten
-        # by create a temporary local copy and only open that one
         if not isinstance(self.sid, snapshots.RootSnapshot):
-            full_path = self.parent.tmpCopy(full_path, sid)
+            full_path = self.parent.previewPath(full_path, sid)
 
         self.run = QDesktopServices.openUrl(QUrl(full_path))
 
@@ -355,15 +355,21 @@ class SnapshotsDialog(QDialog):
                 self, _("You can't compare a snapshot to itself."))
             return
 
+        # unchanged files are hardlinked between snapshots
+        if preview.identical(path1, path2):
+            messagebox.info(
+                _('The file is the same in both snapshots.'),
+                widget_to_center_on = self)
+            return
+
         diffCmd = self.config.strValue('qt.diff.cmd', DIFF_CMD)
         diffParams = self.config.strValue('qt.diff.params', DIFF_PARAMS)
 
         # prevent backup data from being accidentally overwritten
-        # by create a temporary local copy and only open that one
         if not isinstance(sid1, snapshots.RootSnapshot):
-            path1 = self.parent.tmpCopy(path1, sid1)
+            path1 = self.parent.previewPath(path1, sid1)
         if not isinstance(sid2, snapshots.RootSnapshot):
-            path2 = self.parent.tmpCopy(path2, sid2)
+            path2 = self.parent.previewPath(path2, sid2)
 
         params = diffParams
         params = params.replace('%1', '"%s"' % path1)
@@ -3,13 +3,10 @@
 translation platform (currently Weblate).
 """
 import sys
-import io
-import datetime
 import json
 import re
 import tempfile
 import shutil
-import pprint
 from pathlib import Path
 from subprocess import run, check_output
 from common import languages
@@ -25,7 +22,7 @@ except ImportError:
 # "locales")
 LOCAL_DIR = Path('common') / 'po'
 TEMPLATE_PO = LOCAL_DIR / 'messages.pot'
-LANGUAGE_NAMES_PY = Path('common') / 'languages.py'
+LANGUAGE_NAMES_JSON = Path('common') / 'languages.json'
 WEBLATE_URL = 'https://translate.codeberg.org/git/backintime/common'
 PACKAGE_NAME = 'Back In Time'
 PACKAGE_VERSION = Path('VERSION').read_text('utf-8').strip()
@@ -209,46 +206,30 @@ def create_completeness_dict():
 
 
 def create_languages_file():
-    """Create the languages.py file containing language names and the
-    completeness of their translation.
+    """Create the languages.json file containing language names and the
+    completeness of their translation. It is loaded by ``languages.py``.
 
     See the following functions for further details.
     - ``update_language_names()``
     - ``create_completeness_dict()``
     """
-
-    # Convert language names dict to python code as a string
     names = update_language_names()
-    stream = io.StringIO()
-    pprint.pprint(names, indent=2, stream=stream, sort_dicts=True)
-    stream.seek(0)
-    names = stream.read()
-
-    # the same with completeness dict
     compl_dict = create_completeness_dict()
-    stream = io.StringIO()
-    pprint.pprint(compl_dict, indent=2, stream=stream, sort_dicts=True)
-    stream.seek(0)
-    completeness = stream.read()
-
-    with LANGUAGE_NAMES_PY.open('w', encoding='utf8') as handle:
-
-        date_now = datetime.datetime.now().strftime('%c')
-        handle.write(
-            f'# Generated at {date_now} with help of package "babel" '
-            'and "polib".\n')
-        handle.write('# https://babel.pocoo.org\n')
-        handle.write('# https://github.com/python-babel/babel\n')
-
-        handle.write('\nnames = {\n')
-        handle.write(names[1:])
 
-        handle.write('\n')
+    def _compact(obj):
+        return json.dumps(obj, ensure_ascii=False, sort_keys=True,
+                          separators=(',', ':'))
 
-        handle.write('\ncompleteness = {\n')
-        handle.write(completeness[1:])
+    # One language per line keeps the file compact but diff-friendly
+    with LANGUAGE_NAMES_JSON.open('w', encoding='utf8') as handle:
+        handle.write('{"names": {\n')
+        handle.write(',\n'.join(
+            f'{json.dumps(code)}: {_compact(names[code])}'
+            for code in sorted(names)))
+        handle.write('\n},\n')
+        handle.write(f'"completeness": {_compact(compl_dict)}}}\n')
 
-    print(f'Result written to {LANGUAGE_NAMES_PY}.')
+    print(f'Result written to {LANGUAGE_NAMES_JSON}.')
 
     # Completeness statistics (English is excluded)
     compl = list(compl_dict.values())
@@ -291,7 +272,7 @@ def create_language_names_dict(language_codes: list) -> dict:
     if 'en' not in language_codes:
         language_codes.append('en')
 
-    # Don't use defaultdict because pprint can't handle it
+    # Don't use defaultdict to keep the result a plain dict
     result = {}
 
     for code in language_codes: